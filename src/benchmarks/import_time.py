@@ -0,0 +1,93 @@
+"""
+Import-time benchmark of the package entry modules.
+
+Every module is imported in a fresh interpreter started with -X importtime, cumulative import time of the module
+(without imports done by interpreter startup) is compared with the module budget. Heavy optional dependencies
+(pandas, matplotlib, pydotplus, pdfkit) must not be imported as a side effect of importing the module, they are
+imported only when a feature requiring them is used. Exits with status 1 if any budget is exceeded or a heavy
+dependency was imported.
+
+Usage (from repository root):
+    python -m src.benchmarks.import_time
+    python -m src.benchmarks.import_time --repeats 10 --scale 2 --top 15
+"""
+import argparse
+import subprocess
+import sys
+
+budgets = {
+    "src.bpmn_python.bpmn_diagram_rep": 0.5,
+    "src.bpmn_python.bpmn_diagram_metrics": 0.5,
+    "src.bpmn_python.diagram_layout_metrics": 0.5,
+    "src.bpmn_python.bpmn_diagram_layouter": 0.5,
+    "src.report_generator": 0.7,
+    "src.report_service": 0.7,
+}
+heavy_modules = ("pandas", "matplotlib", "pydotplus", "pdfkit")
+
+
+def parse_importtime(output: str) -> list[tuple[int, int, int, str]]:
+    """ Parses -X importtime log into (self us, cumulative us, nesting level, module name) tuples. """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_field, cumulative_field, name_field = line[len("import time:"):].split("|", 2)
+        stripped = name_field.lstrip(" ")
+        level = (len(name_field) - len(stripped) - 1) // 2
+        entries.append((int(self_field), int(cumulative_field), level, stripped))
+    return entries
+
+
+def run_interpreter(code: str) -> tuple[list, str]:
+    """ Runs code in a fresh interpreter, returns parsed import log and standard output. """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               capture_output=True, text=True, check=True)
+    return parse_importtime(completed.stderr), completed.stdout
+
+
+def measure(module: str, startup_modules: set, repeats: int) -> dict:
+    """ Returns minimal cumulative import time of the module, its heaviest dependencies and heavy modules loaded. """
+    code = f"import sys, {module}; print(','.join(name for name in {heavy_modules!r} if name in sys.modules))"
+    best = None
+    for _ in range(repeats):
+        entries, stdout = run_interpreter(code)
+        entries = [entry for entry in entries if entry[3] not in startup_modules]
+        total = sum(cumulative for _, cumulative, level, _ in entries if level == 0)
+        if best is None or total < best["seconds"] * 1e6:
+            best = {"seconds": total / 1e6, "entries": entries,
+                    "heavy": [name for name in stdout.strip().split(",") if name]}
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default="", help="comma separated modules, all budgeted modules if empty")
+    parser.add_argument("--repeats", type=int, default=5, help="number of fresh interpreters per module")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of all budgets, e.g. for slow machines")
+    parser.add_argument("--top", type=int, default=10, help="number of heaviest imports listed for failed modules")
+    arguments = parser.parse_args()
+
+    modules = [module for module in arguments.modules.split(",") if module] or list(budgets)
+    startup_entries, _ = run_interpreter("pass")
+    startup_modules = {entry[3] for entry in startup_entries}
+    failed = False
+    for module in modules:
+        result = measure(module, startup_modules, arguments.repeats)
+        budget = budgets.get(module, 0.5) * arguments.scale
+        status = "OK"
+        if result["heavy"]:
+            status = "HEAVY " + ",".join(result["heavy"])
+        elif result["seconds"] > budget:
+            status = "OVER BUDGET"
+        print(f"{module:<45} {result['seconds'] * 1000:9.1f} ms  (budget {budget * 1000:.0f} ms)  {status}")
+        if status != "OK":
+            failed = True
+            for self_time, _, _, name in sorted(result["entries"], reverse=True)[:arguments.top]:
+                print(f"    {self_time / 1000:9.1f} ms  {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Memory benchmark of node attribute representations.
+
+Builds a synthetic diagram (or imports given BPMN files) and measures memory held by the diagram with plain
+node dictionaries and after conversion into CompactNodeRecord objects.
+
+Usage (from repository root):
+    python -m src.benchmarks.node_memory --nodes 100000
+    python -m src.benchmarks.node_memory examples/01_Obsluga_zgloszen.bpmn --copies 2000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from src.bpmn_python.bpmn_diagram_rep import BpmnDiagramGraph
+
+
+def build_synthetic_diagram(nodes: int) -> BpmnDiagramGraph:
+    """ Creates diagram with a single process, containing a chain of tasks. """
+    diagram = BpmnDiagramGraph()
+    diagram.create_new_diagram_graph(diagram_name="benchmark")
+    process_id = diagram.add_process_to_diagram()
+    previous_id, _ = diagram.add_start_event_to_diagram(process_id, start_event_name="start")
+    for index in range(nodes):
+        task_id, _ = diagram.add_task_to_diagram(process_id, task_name=f"Task {index}")
+        diagram.add_sequence_flow_to_diagram(process_id, previous_id, task_id)
+        previous_id = task_id
+    return diagram
+
+
+def load_diagrams(file_paths: list[str], copies: int) -> list[BpmnDiagramGraph]:
+    """ Imports every file copies times. """
+    diagrams = []
+    for _ in range(copies):
+        for file_path in file_paths:
+            diagram = BpmnDiagramGraph()
+            diagram.load_diagram_from_xml_file(file_path)
+            diagrams.append(diagram)
+    return diagrams
+
+
+def traced_memory() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def run(nodes: int, file_paths: list[str], copies: int) -> dict:
+    """ Returns dictionary with memory (in bytes) held by diagrams before and after compaction. """
+    tracemalloc.start()
+    baseline = traced_memory()
+    if file_paths:
+        diagrams = load_diagrams(file_paths, copies)
+    else:
+        diagrams = [build_synthetic_diagram(nodes)]
+    plain = traced_memory() - baseline
+
+    converted = sum(diagram.compact_nodes() for diagram in diagrams)
+    compact = traced_memory() - baseline
+    tracemalloc.stop()
+
+    return {
+        "nodes": converted,
+        "plain_bytes": plain,
+        "compact_bytes": compact,
+        "plain_bytes_per_node": plain / converted if converted else 0.0,
+        "compact_bytes_per_node": compact / converted if converted else 0.0,
+        "saved_ratio": 1 - compact / plain if plain else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="BPMN files to import, synthetic diagram is used if omitted")
+    parser.add_argument("--nodes", type=int, default=50000, help="number of tasks of synthetic diagram")
+    parser.add_argument("--copies", type=int, default=1000, help="number of imports of every file")
+    arguments = parser.parse_args()
+    print(json.dumps(run(arguments.nodes, arguments.files, arguments.copies), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Scaling benchmark of import, layout, metrics, export and report rendering.
+
+Generates synthetic models of growing size (see bpmn_diagram_generator), times every stage on each of them and
+stores results as JSON, so that runs can be compared for regressions. Estimated growth exponent between
+consecutive sizes (1 - linear, 2 - quadratic) is reported for every stage. Stage which exceeds time budget is
+skipped for larger sizes, so exponential stages do not stall the run.
+
+Usage (from repository root):
+    python -m src.benchmarks.scaling --sizes 25,50,100,200 --output benchmark_results/baseline.json
+    python -m src.benchmarks.scaling --sizes 25,50,100,200 --compare benchmark_results/baseline.json
+    python -m src.benchmarks.scaling --benchmarks import,layout --split-depth 2 --loops 3 --lanes 2
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import signal
+import statistics
+import sys
+import time
+
+from src.bpmn_python import bpmn_diagram_generator as generator
+from src.bpmn_python import bpmn_execution_paths as execution_paths
+from src.bpmn_python import bpmn_diagram_layouter as layouter
+from src.bpmn_python import bpmn_diagram_metrics as metrics
+from src.bpmn_python import diagram_layout_metrics as layout_metrics
+from src.bpmn_python.bpmn_diagram_rep import BpmnDiagramGraph
+
+
+class Inputs:
+    """ Generated inputs of a single size, shared by all benchmarks. """
+
+    def __init__(self, parameters: generator.GeneratorParameters):
+        self.parameters = parameters
+        self.xml = generator.generate_xml_bytes(parameters)
+        self.csv = generator.generate_csv(parameters)
+
+    def diagram(self) -> BpmnDiagramGraph:
+        diagram = BpmnDiagramGraph()
+        diagram.load_diagram_from_bytes(self.xml)
+        return diagram
+
+
+def import_xml(inputs: Inputs):
+    return lambda: BpmnDiagramGraph().load_diagram_from_bytes(inputs.xml)
+
+
+def import_csv(inputs: Inputs):
+    return lambda: BpmnDiagramGraph().load_diagram_from_csv_stream(io.StringIO(inputs.csv))
+
+
+def layout(inputs: Inputs):
+    diagram = inputs.diagram()
+    return lambda: layouter.generate_layout(diagram)
+
+
+def export_xml(inputs: Inputs):
+    diagram = inputs.diagram()
+    return diagram.export_xml_bytes
+
+
+def export_csv(inputs: Inputs):
+    diagram = inputs.diagram()
+    return diagram.export_csv_bytes
+
+
+def render_report(inputs: Inputs):
+    # imported here, report generation requires matplotlib and jinja2, other benchmarks do not
+    from src.report_generator import ReportGenerator
+    generator_ = ReportGenerator(inputs.diagram())
+    return generator_.render_html_report
+
+
+def count_paths(inputs: Inputs):
+    diagram = inputs.diagram()
+    return lambda: execution_paths.count_paths(diagram)
+
+
+def covering_paths(inputs: Inputs):
+    engines = execution_paths.path_engines(inputs.diagram())
+    return lambda: [list(engine.covering_paths()) for engine in engines.values()]
+
+
+def metric(function):
+    def setup(inputs: Inputs):
+        diagram = inputs.diagram()
+        return lambda: function(diagram)
+    return setup
+
+
+def get_benchmarks() -> dict:
+    """ Returns dictionary of benchmark setups, key is benchmark name. """
+    benchmarks = {"import.xml": import_xml, "import.csv": import_csv, "layout": layout,
+                  "export.xml": export_xml, "export.csv": export_csv}
+    for name in sorted(dir(metrics)):
+        if name.endswith("_metric"):
+            benchmarks[f"metrics.{name}"] = metric(getattr(metrics, name))
+    for name in ("count_crossing_points", "count_segments", "compute_longest_path", "compute_longest_path_tasks"):
+        benchmarks[f"layout_metrics.{name}"] = metric(getattr(layout_metrics, name))
+    benchmarks["paths.count"] = count_paths
+    benchmarks["paths.cover"] = covering_paths
+    benchmarks["report.html"] = render_report
+    return benchmarks
+
+
+class BudgetExceeded(Exception):
+    """ Raised when a single run exceeds time budget. """
+
+
+@contextlib.contextmanager
+def time_limit(seconds: float):
+    """ Interrupts the block after given number of seconds, only on platforms supporting SIGALRM. """
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def interrupt(signum, frame):
+        raise BudgetExceeded()
+
+    previous = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def measure(setup, inputs: Inputs, repeats: int, budget: float) -> dict:
+    """ Runs benchmark repeats times, each run on freshly prepared input. """
+    durations = []
+    for _ in range(repeats):
+        function = setup(inputs)
+        try:
+            with time_limit(budget):
+                start = time.perf_counter()
+                function()
+                durations.append(time.perf_counter() - start)
+        except BudgetExceeded:
+            return {"skipped": f"single run exceeded {budget} s"}
+        except Exception as exception:  # failures are part of the results
+            return {"error": f"{type(exception).__name__}: {exception}"}
+        if sum(durations) > budget:
+            break
+    return {"min": min(durations), "median": statistics.median(durations), "repeats": len(durations)}
+
+
+def growth_exponents(sizes: list[int], results: dict) -> dict:
+    """ Estimated exponent k of t ~ n^k between consecutive sizes with successful measurements. """
+    exponents = {}
+    measured = [(size, results[str(size)]["min"]) for size in sizes
+                if "min" in results.get(str(size), {}) and results[str(size)]["min"] > 0]
+    for (size_a, time_a), (size_b, time_b) in zip(measured, measured[1:]):
+        exponents[f"{size_a}-{size_b}"] = round(math.log(time_b / time_a) / math.log(size_b / size_a), 2)
+    return exponents
+
+
+def run(sizes: list[int], parameters: dict, selected: list[str], repeats: int, budget: float) -> dict:
+    """ Runs selected benchmarks for every size, returns results document. """
+    benchmarks = {name: setup for name, setup in get_benchmarks().items()
+                  if not selected or any(name.startswith(prefix) for prefix in selected)}
+    results = {name: {} for name in benchmarks}
+    exhausted = set()
+    model_sizes = {}
+    for size in sizes:
+        inputs = Inputs(generator.GeneratorParameters(tasks=size, **parameters))
+        diagram = inputs.diagram()
+        model_sizes[str(size)] = {"nodes": diagram.diagram_graph.number_of_nodes(),
+                                  "flows": len(diagram.sequence_flows), "xml_bytes": len(inputs.xml)}
+        for name, setup in benchmarks.items():
+            if name in exhausted:
+                results[name][str(size)] = {"skipped": "time budget exceeded for a smaller size"}
+                continue
+            result = measure(setup, inputs, repeats, budget)
+            results[name][str(size)] = result
+            if "skipped" in result or result.get("min", 0) > budget:
+                exhausted.add(name)
+            print(f"{size:>8} {name:<50} {format_result(result)}", file=sys.stderr)
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "generator": parameters,
+        "model_sizes": model_sizes,
+        "results": results,
+        "growth": {name: growth_exponents(sizes, sizes_results) for name, sizes_results in results.items()},
+    }
+
+
+def format_result(result: dict) -> str:
+    if "min" in result:
+        return f"{result['min'] * 1000:10.3f} ms"
+    return result.get("error") or result.get("skipped")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """ Returns list of regressions - benchmarks slower than baseline by more than threshold ratio. """
+    regressions = []
+    for name, sizes_results in current["results"].items():
+        for size, result in sizes_results.items():
+            base = baseline.get("results", {}).get(name, {}).get(size, {})
+            if "min" in result and "min" in base and base["min"] > 0:
+                ratio = result["min"] / base["min"]
+                if ratio > threshold:
+                    regressions.append(f"{name} [{size}]: {base['min'] * 1000:.3f} ms -> "
+                                       f"{result['min'] * 1000:.3f} ms ({ratio:.2f}x)")
+            elif "min" in base and "min" not in result:
+                regressions.append(f"{name} [{size}]: {format_result(result)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="25,50,100,200,400", help="comma separated numbers of tasks")
+    parser.add_argument("--benchmarks", default="", help="comma separated benchmark name prefixes, all if empty")
+    parser.add_argument("--repeats", type=int, default=5, help="maximal number of runs of every benchmark")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="time budget (seconds) of a benchmark for a single size")
+    parser.add_argument("--split-depth", type=int, default=1)
+    parser.add_argument("--branches", type=int, default=2)
+    parser.add_argument("--loops", type=int, default=0)
+    parser.add_argument("--lanes", type=int, default=0)
+    parser.add_argument("--pools", type=int, default=1)
+    parser.add_argument("--gateway-type", default=generator.MIXED,
+                        choices=(generator.PARALLEL, generator.EXCLUSIVE, generator.MIXED))
+    parser.add_argument("--output", help="JSON file for results, benchmark_results/<timestamp>.json by default")
+    parser.add_argument("--compare", help="JSON file with baseline results")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as regression when comparing with baseline")
+    arguments = parser.parse_args()
+
+    parameters = {"split_depth": arguments.split_depth, "branches": arguments.branches, "loops": arguments.loops,
+                  "lanes": arguments.lanes, "pools": arguments.pools, "gateway_type": arguments.gateway_type}
+    sizes = [int(size) for size in arguments.sizes.split(",")]
+    selected = [prefix for prefix in arguments.benchmarks.split(",") if prefix]
+    document = run(sizes, parameters, selected, arguments.repeats, arguments.budget)
+
+    output = arguments.output or os.path.join(
+        "benchmark_results", datetime.datetime.now().strftime("scaling_%Y%m%d_%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as output_file:
+        json.dump(document, output_file, indent=2)
+    print(f"Results saved to {output}")
+    for name, exponents in document["growth"].items():
+        if exponents:
+            print(f"{name:<50} growth exponents: {exponents}")
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("generator") != document["generator"]:
+            print(f"WARNING baseline was generated with different parameters: {baseline.get('generator')}")
+        regressions = compare(document, baseline, arguments.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,25 @@
 # coding=utf-8
 """
 Package init file
+
+Submodules are imported on first attribute access (PEP 562), so importing the package does not import
+heavy dependencies of modules which are not used, e.g. pandas (CSV import) or matplotlib and pydotplus (visualizer).
 """
+import importlib
+
 __all__ = ["bpmn_diagram_export", "bpmn_diagram_import", "bpmn_diagram_layouter",
            "bpmn_diagram_exception", "bpmn_diagram_metrics", "bpmn_diagram_visualizer", "bpmn_import_utils",
-           "bpmn_process_csv_export", "diagram_layout_metrics", "grid_cell_class", "bpmn_diagram_rep"]
+           "bpmn_process_csv_export", "diagram_layout_metrics", "grid_cell_class", "bpmn_diagram_rep",
+           "bpmn_canonical_hash", "bpmn_compact_nodes", "bpmn_critical_path", "bpmn_cycle_analysis",
+           "bpmn_diagram_diff", "bpmn_diagram_generator", "bpmn_execution_paths", "bpmn_instrumentation",
+           "bpmn_lazy_attributes", "bpmn_process_structure", "bpmn_simulation", "bpmn_soundness", "bpmn_typed_model"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,240 @@
+# coding=utf-8
+"""
+Canonical, content-addressed fingerprints of process models.
+
+Fingerprint is computed with Weisfeiler-Lehman refinement - every node starts with a label derived from its content,
+in each iteration label of a node is rehashed together with sorted labels of its predecessors and successors
+(and labels of connecting flows). Graph hash is a multiset hash (sum modulo 2^128) of labels of all nodes from
+all iterations, so it does not depend on element ordering, ids or Diagram Interchange coordinates.
+
+Two kinds of fingerprints are available:
+
+- topology hash - node labels consist of node type only, flows are unlabeled,
+- semantic hash - node labels consist of type, normalized name and event definition types, flow labels consist
+  of normalized name and condition expression.
+
+Equal models always get equal fingerprints. As with every WL-based fingerprint, some non-isomorphic graphs
+(e.g. certain regular ones) are not distinguished, so equal fingerprints should be treated as duplicate candidates
+when exactness matters.
+
+Labels of a node depend only on its neighbourhood of radius equal to the number of iterations, hence
+IncrementalHasher recomputes only labels of nodes close to edited elements.
+"""
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import bpmn_diagram_rep
+from . import bpmn_python_consts as consts
+
+default_iterations = 3
+_modulus = 1 << 128
+
+
+def normalize_name(name):
+    """
+    :param name: name of an element, may be None.
+    :return: name with whitespace collapsed and lower-cased.
+    """
+    return " ".join((name or "").split()).lower()
+
+
+def _digest(*parts):
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IncrementalHasher(object):
+    """
+    Keeps WL labels of every node of BpmnDiagramGraph, so that fingerprint can be updated after the graph is edited.
+    After adding, removing or changing nodes or flows, ids of touched nodes (for flows - their source and target)
+    have to be passed to update method. Labels are recomputed for nodes within distance of 'iterations' flows only.
+    """
+
+    def __init__(self, bpmn_graph, semantic=True, iterations=default_iterations):
+        """
+        :param bpmn_graph: BpmnDiagramGraph object,
+        :param semantic: boolean flag, semantic hash if True, topology hash otherwise,
+        :param iterations: number of WL refinement iterations.
+        """
+        self.bpmn_graph = bpmn_graph
+        self.semantic = semantic
+        self.iterations = iterations
+        self.labels = [{} for _ in range(iterations + 1)]
+        self.neighbours = {}
+        self.total = 0
+        self.update(self.bpmn_graph.diagram_graph._node.keys())
+
+    def hexdigest(self):
+        """
+        :return: fingerprint of current state of the graph as a hexadecimal string.
+        """
+        kind = "semantic" if self.semantic else "topology"
+        return _digest(kind, str(self.iterations), str(len(self.neighbours)), format(self.total, "032x"))
+
+    def update(self, node_ids):
+        """
+        Recomputes labels affected by changes of given nodes.
+        :param node_ids: iterable of ids of added, removed or changed nodes, including source and target nodes
+            of added, removed or changed flows.
+        """
+        nodes = self.bpmn_graph.diagram_graph._node
+        dirty = set(node_ids)
+        # neighbourhoods are taken from both previous and current version of the graph
+        balls = [set(dirty)]
+        frontier = dirty
+        for _ in range(self.iterations):
+            reached = set()
+            for node_id in frontier:
+                reached.update(neighbour_id for _, _, neighbour_id in self.neighbours.get(node_id, ()))
+                if node_id in nodes:
+                    reached.update(neighbour_id for _, _, neighbour_id in self._current_neighbours(node_id))
+            frontier = reached - balls[-1]
+            balls.append(balls[-1] | frontier)
+
+        # adjacency changes only for dirty nodes and their direct (previous or current) neighbours
+        for node_id in balls[min(1, self.iterations)]:
+            self.neighbours.pop(node_id, None)
+            if node_id in nodes:
+                self.neighbours[node_id] = self._current_neighbours(node_id)
+        for node_id in balls[0]:
+            self._set_label(0, node_id, self._initial_label(nodes[node_id]) if node_id in nodes else None)
+        for iteration in range(1, self.iterations + 1):
+            previous = self.labels[iteration - 1]
+            for node_id in balls[iteration]:
+                if node_id not in nodes:
+                    self._set_label(iteration, node_id, None)
+                    continue
+                incoming = sorted(_digest(edge_label, previous[neighbour_id])
+                                  for direction, edge_label, neighbour_id in self.neighbours[node_id]
+                                  if direction == "in")
+                outgoing = sorted(_digest(edge_label, previous[neighbour_id])
+                                  for direction, edge_label, neighbour_id in self.neighbours[node_id]
+                                  if direction == "out")
+                self._set_label(iteration, node_id,
+                                _digest(previous[node_id], "in", *incoming, "out", *outgoing))
+
+    def _set_label(self, iteration, node_id, label):
+        labels = self.labels[iteration]
+        old_label = labels.pop(node_id, None)
+        if old_label is not None:
+            self.total = (self.total - int(old_label, 16)) % _modulus
+        if label is not None:
+            labels[node_id] = label
+            self.total = (self.total + int(label, 16)) % _modulus
+
+    def _initial_label(self, node):
+        node_type = node.get(consts.Consts.type, "")
+        if not self.semantic:
+            return _digest(node_type)
+        definitions = sorted(definition.get(consts.Consts.definition_type, "")
+                             for definition in node.get(consts.Consts.event_definitions) or ())
+        return _digest(node_type, normalize_name(node.get(consts.Consts.node_name)), *definitions)
+
+    def _current_neighbours(self, node_id):
+        """
+        :return: tuple of (direction, flow label, neighbour id) triples of the node in current version of the graph.
+        """
+        graph = self.bpmn_graph.diagram_graph
+        node = graph._node[node_id]
+        sequence_flows = self.bpmn_graph.sequence_flows
+        neighbours = []
+        for direction, flows_key, neighbour_key in (("in", consts.Consts.incoming_flow, consts.Consts.source_ref),
+                                                    ("out", consts.Consts.outgoing_flow, consts.Consts.target_ref)):
+            for flow_id in node.get(flows_key) or ():
+                flow = sequence_flows.get(flow_id)
+                if flow is None or flow[neighbour_key] not in graph._node:
+                    continue
+                neighbours.append((direction, self._flow_label(flow), flow[neighbour_key]))
+        return tuple(neighbours)
+
+    def _flow_label(self, flow):
+        if not self.semantic:
+            return ""
+        edge = self.bpmn_graph.diagram_graph.get_edge_data(flow[consts.Consts.source_ref],
+                                                           flow[consts.Consts.target_ref]) or {}
+        condition = edge.get(consts.Consts.condition_expression)
+        if isinstance(condition, dict):
+            condition = condition.get(consts.Consts.condition_expression)
+        return _digest(normalize_name(flow.get(consts.Consts.name)), " ".join((condition or "").split()))
+
+
+def topology_hash(bpmn_graph, iterations=default_iterations):
+    """
+    :param bpmn_graph: BpmnDiagramGraph object,
+    :param iterations: number of WL refinement iterations.
+    :return: fingerprint of node types and flow structure, as a hexadecimal string.
+    """
+    return IncrementalHasher(bpmn_graph, semantic=False, iterations=iterations).hexdigest()
+
+
+def semantic_hash(bpmn_graph, iterations=default_iterations):
+    """
+    :param bpmn_graph: BpmnDiagramGraph object,
+    :param iterations: number of WL refinement iterations.
+    :return: fingerprint of node types, names, event definitions, flow names and conditions, as a hexadecimal string.
+    """
+    return IncrementalHasher(bpmn_graph, semantic=True, iterations=iterations).hexdigest()
+
+
+def hash_file(filepath, semantic=True, iterations=default_iterations):
+    """
+    :param filepath: path to BPMN 2.0 XML file,
+    :param semantic: boolean flag, semantic hash if True, topology hash otherwise,
+    :param iterations: number of WL refinement iterations.
+    :return: fingerprint of the model stored in file.
+    """
+    bpmn_graph = bpmn_diagram_rep.BpmnDiagramGraph()
+    # names are not needed by topology hash, so its import skips everything but the topology
+    bpmn_graph.load_diagram_from_xml_file(filepath, topology_only=not semantic)
+    return IncrementalHasher(bpmn_graph, semantic, iterations).hexdigest()
+
+
+def _hash_file_task(arguments):
+    filepath, semantic, iterations = arguments
+    try:
+        return filepath, hash_file(filepath, semantic, iterations)
+    except Exception:  # unreadable models are skipped by find_duplicates
+        return filepath, None
+
+
+def find_duplicates(paths, semantic=True, iterations=default_iterations, max_workers=None):
+    """
+    Groups models of a corpus by their fingerprints.
+    :param paths: iterable of paths to files, directories (searched recursively for .bpmn and .xml files)
+        or glob patterns,
+    :param semantic: boolean flag, compares semantic hashes if True, topology hashes otherwise,
+    :param iterations: number of WL refinement iterations,
+    :param max_workers: maximal number of worker processes, number of CPUs by default, 1 hashes files in the
+        calling process.
+    :return: a tuple of dictionary mapping fingerprint to sorted list of paths of models sharing it (only groups of
+        two or more models) and list of paths of files which could not be imported.
+    """
+    filepaths = sorted(set(_expand_paths(paths)))
+    tasks = [(filepath, semantic, iterations) for filepath in filepaths]
+    if max_workers == 1 or len(tasks) < 2:
+        results = map(_hash_file_task, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_hash_file_task, tasks, chunksize=max(1, len(tasks) // 64)))
+    groups = {}
+    failed = []
+    for filepath, fingerprint in results:
+        if fingerprint is None:
+            failed.append(filepath)
+        else:
+            groups.setdefault(fingerprint, []).append(filepath)
+    return {fingerprint: group for fingerprint, group in groups.items() if len(group) > 1}, failed
+
+
+def _expand_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in os.walk(path):
+                for filename in filenames:
+                    if filename.lower().endswith((".bpmn", ".xml")):
+                        yield os.path.join(directory, filename)
+        elif os.path.isfile(path):
+            yield path
+        else:
+            yield from (match for match in glob.glob(path, recursive=True) if os.path.isfile(match))
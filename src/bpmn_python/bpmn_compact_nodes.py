@@ -0,0 +1,203 @@
+# coding=utf-8
+"""
+Compact representation of node attributes.
+
+Plain node dictionaries hold 10-15 string keys each. CompactNodeRecord stores the common attributes in __slots__,
+interns flow IDs and short string values (types, process IDs and defaults such as "No data provided." are shared
+between nodes) and keeps incoming/outgoing flow lists as tuples. Records implement MutableMapping, so code reading
+node attributes by key works unchanged.
+"""
+import copy
+import sys
+from collections.abc import MutableMapping
+
+from . import bpmn_lazy_attributes as lazy_attributes
+from . import bpmn_python_consts as consts
+
+# string values up to this length are interned, longer ones (e.g. documentation) are rarely repeated
+INTERN_MAX_LENGTH = 64
+
+_FLOW_KEYS = frozenset((consts.Consts.incoming_flow, consts.Consts.outgoing_flow))
+# values unique for every node, interning them would only grow the interned strings table
+_UNIQUE_VALUE_KEYS = frozenset((consts.Consts.id, consts.Consts.node_name))
+_MISSING = object()
+# key order tuples shared between records, nodes of the same type usually have identical key order
+_key_orders = {}
+
+
+def _intern(value):
+    if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class CompactNodeRecord(MutableMapping):
+    """
+    Node attributes record. Attributes listed in slot_keys are stored in slots, the others in 'extra' dictionary,
+    created only when needed. Keys are iterated in insertion order, like in a plain dictionary - the order is kept
+    as a tuple shared between records with the same keys. Values of incoming/outgoing flows are stored as tuples,
+    so they can not be modified in place - assign a new sequence or use extend_flows instead. Deep copies are plain
+    dictionaries with flow lists, so algorithms working on copies of nodes may modify them freely.
+    """
+    slot_keys = (consts.Consts.id, consts.Consts.type, consts.Consts.node_name, consts.Consts.process,
+                 consts.Consts.incoming_flow, consts.Consts.outgoing_flow, consts.Consts.x, consts.Consts.y,
+                 consts.Consts.width, consts.Consts.height, consts.Consts.implementation,
+                 consts.Consts.compensation, consts.Consts.quantity, consts.Consts.documentation)
+    __slots__ = ("id", "type", "node_name", "process", "incoming", "outgoing", "x", "y", "width", "height",
+                 "implementation", "compensation", "quantity", "documentation", "extra", "key_order")
+    _slot_names = dict(zip(slot_keys, __slots__))
+
+    def __init__(self, attributes=()):
+        for slot_name in CompactNodeRecord.__slots__[:-2]:
+            object.__setattr__(self, slot_name, _MISSING)
+        self.extra = None
+        self.key_order = ()
+        self.update(attributes)
+
+    @classmethod
+    def from_mapping(cls, attributes):
+        """
+        Creates new record with attributes copied from given mapping.
+
+        :param attributes: mapping with node attributes.
+        """
+        return cls(attributes)
+
+    def __getitem__(self, key):
+        slot_name = CompactNodeRecord._slot_names.get(key)
+        if slot_name is not None:
+            value = getattr(self, slot_name)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def get(self, key, default=None):
+        slot_name = CompactNodeRecord._slot_names.get(key)
+        if slot_name is not None:
+            value = getattr(self, slot_name)
+            return default if value is _MISSING else value
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key, value):
+        if key in _FLOW_KEYS:
+            value = tuple(sys.intern(flow_id) for flow_id in value)
+        elif key not in _UNIQUE_VALUE_KEYS:
+            value = _intern(value)
+        key = sys.intern(key)
+        if key not in self:
+            key_order = self.key_order + (key,)
+            self.key_order = _key_orders.setdefault(key_order, key_order)
+        slot_name = CompactNodeRecord._slot_names.get(key)
+        if slot_name is not None:
+            setattr(self, slot_name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        slot_name = CompactNodeRecord._slot_names.get(key)
+        if slot_name is not None:
+            if getattr(self, slot_name) is _MISSING:
+                raise KeyError(key)
+            setattr(self, slot_name, _MISSING)
+        else:
+            if self.extra is None:
+                raise KeyError(key)
+            del self.extra[key]
+            if not self.extra:
+                self.extra = None
+        key_order = tuple(ordered_key for ordered_key in self.key_order if ordered_key != key)
+        self.key_order = _key_orders.setdefault(key_order, key_order)
+
+    def __iter__(self):
+        return iter(self.key_order)
+
+    def __len__(self):
+        return len(self.key_order)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, dict(self.items()))
+
+    def copy(self):
+        """
+        Returns shallow copy of the record, as a plain dictionary.
+        """
+        return dict(self.items())
+
+    def extend_flows(self, key, flow_ids):
+        """
+        Appends flow IDs to incoming or outgoing flows of the node.
+
+        :param key: incoming or outgoing flow key,
+        :param flow_ids: an iterable of flow IDs.
+        """
+        self[key] = (*self.get(key, ()), *flow_ids)
+
+    def __reduce__(self):
+        return CompactNodeRecord.from_mapping, (dict(self.items()),)
+
+    def __deepcopy__(self, memo):
+        attributes = {}
+        for key, value in self.items():
+            attributes[key] = list(value) if key in _FLOW_KEYS else copy.deepcopy(value, memo)
+        return attributes
+
+
+def extend_flows(attributes, key, flow_ids):
+    """
+    Appends flow IDs to incoming or outgoing flows of the node - in place for list-backed nodes, through
+    CompactNodeRecord.extend_flows for compact records.
+
+    :param attributes: node attributes, a dictionary or CompactNodeRecord,
+    :param key: incoming or outgoing flow key,
+    :param flow_ids: an iterable of flow IDs.
+    """
+    if isinstance(attributes, CompactNodeRecord):
+        attributes.extend_flows(key, flow_ids)
+    else:
+        attributes[key].extend(flow_ids)
+
+
+def compact_nodes(bpmn_graph):
+    """
+    Replaces attribute dictionaries of all nodes of the diagram with CompactNodeRecord objects.
+    Nodes imported in topology-only mode, which attributes were not loaded yet, are left unchanged.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: number of converted nodes.
+    """
+    node_attributes = bpmn_graph.diagram_graph._node
+    converted = 0
+    for node_id, attributes in node_attributes.items():
+        if isinstance(attributes, CompactNodeRecord):
+            continue
+        if isinstance(attributes, lazy_attributes.LazyNodeAttributes) and not attributes.is_materialized():
+            continue
+        node_attributes[node_id] = CompactNodeRecord(attributes)
+        converted += 1
+    return converted
+
+
+def expand_nodes(bpmn_graph):
+    """
+    Replaces CompactNodeRecord objects of the diagram with plain dictionaries (with flow lists).
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: number of converted nodes.
+    """
+    node_attributes = bpmn_graph.diagram_graph._node
+    converted = 0
+    for node_id, attributes in node_attributes.items():
+        if isinstance(attributes, CompactNodeRecord):
+            node_attributes[node_id] = copy.deepcopy(attributes)
+            converted += 1
+    return converted
@@ -0,0 +1,253 @@
+# coding=utf-8
+"""
+Critical path analysis of processes - earliest and latest start and finish of every node, its slack, and duration
+of the whole process, for many duration scenarios at once.
+
+Back flows (see bpmn_cycle_analysis) are removed, so every loop is counted once, and nodes are scheduled in
+topological order - a forward pass computes earliest times, a backward pass latest ones, both O(N + E). Times
+are numpy arrays of shape (scenarios, nodes), columns indexed by position of the node in topological order,
+so every step of the passes is a vectorized operation over all scenarios.
+
+Joins are combined according to gateway semantics:
+
+- parallel, inclusive and complex joins synchronize incoming flows - a node starts after the latest predecessor,
+- exclusive merges (exclusive and event based gateways, other nodes with several incoming flows) take either
+  the expected value of finish times of predecessors, weighted by probabilities of reaching them through
+  the incoming flows (EXPECTED mode), or their maximum (WORST mode). In EXPECTED mode a branch of an exclusive
+  merge is only delayed by its own nodes, so nodes of the branch share slack of the merge.
+
+Durations and branch probabilities are given with SimulationParameters (see bpmn_simulation), by default
+activities last 1 time unit and other nodes 0, exclusive branches are equally probable.
+"""
+import numpy as np
+
+from . import bpmn_cycle_analysis as cycle_analysis
+from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_python_consts as consts
+from . import bpmn_simulation as simulation
+
+EXPECTED = "expected"
+WORST = "worst"
+
+SYNCHRONIZING_TYPES = (consts.Consts.parallel_gateway, consts.Consts.inclusive_gateway,
+                       consts.Consts.complex_gateway)
+EXCLUSIVE_TYPES = (consts.Consts.exclusive_gateway, consts.Consts.event_based_gateway)
+
+# tolerance of comparisons of slack with zero
+_epsilon = 1e-9
+
+
+class ScheduleGraph(object):
+    """
+    Diagram without back flows, compiled for scheduling:
+
+    - order - list of node ids in topological order, index - dictionary mapping node id to its position,
+    - predecessors - list of numpy arrays of positions of predecessors (one per incoming flow) of every node,
+    - weights - list of numpy arrays of probabilities of predecessors of exclusive merges (None for other nodes),
+    - reach - numpy array of probabilities of reaching nodes,
+    - sinks - numpy array of positions of nodes without outgoing flows.
+    """
+
+    def __init__(self, order):
+        self.order = order
+        self.index = {node_id: position for position, node_id in enumerate(order)}
+        self.predecessors = []
+        self.weights = []
+        self.reach = np.zeros(len(order))
+        self.sinks = None
+
+
+class CriticalPath(object):
+    """
+    Result of critical path analysis. Arrays of times have shape (scenarios, nodes), columns ordered as
+    graph.order, duration is an array of process durations of scenarios.
+    """
+
+    def __init__(self, graph, durations, mode):
+        self.graph = graph
+        self.durations = durations
+        self.mode = mode
+        self.earliest_start = None
+        self.earliest_finish = None
+        self.latest_start = None
+        self.latest_finish = None
+        self.duration = None
+
+    @property
+    def slack(self):
+        return self.latest_start - self.earliest_start
+
+    def critical_nodes(self, scenario=0):
+        """
+        :return: a list of ids of nodes with zero slack in the scenario, in topological order.
+        """
+        return [self.graph.order[position] for position in np.flatnonzero(self.slack[scenario] <= _epsilon)]
+
+    def path(self, scenario=0):
+        """
+        :return: a list of node ids of the critical path of the scenario, from a node without incoming flows
+            to a node without outgoing flows.
+        """
+        if not self.graph.order:
+            return []
+        slack = self.slack[scenario]
+        finish = self.earliest_finish[scenario]
+
+        def most_critical(positions):
+            return min(positions, key=lambda position: (slack[position] > _epsilon, -finish[position]))
+        position = most_critical(self.graph.sinks)
+        path = [position]
+        while len(self.graph.predecessors[position]):
+            position = most_critical(self.graph.predecessors[position])
+            path.append(position)
+        return [self.graph.order[position] for position in reversed(path)]
+
+    def as_dict(self, scenario=0):
+        """
+        :return: dictionary with duration, critical path and times of nodes of the scenario.
+        """
+        times = (self.earliest_start[scenario], self.earliest_finish[scenario], self.latest_start[scenario],
+                 self.latest_finish[scenario], self.slack[scenario])
+        return {"mode": self.mode, "duration": float(self.duration[scenario]), "path": self.path(scenario),
+                "nodes": {node_id: dict(zip(("earliest_start", "earliest_finish", "latest_start", "latest_finish",
+                                             "slack"), (float(values[position]) for values in times)))
+                          for position, node_id in enumerate(self.graph.order)}}
+
+
+def critical_path(bpmn_graph, parameters=None, mode=EXPECTED, scenarios=None, seed=None):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param parameters: SimulationParameters object with durations and branch probabilities, default parameters
+        if not given,
+    :param mode: EXPECTED or WORST, semantics of exclusive merges,
+    :param scenarios: number of scenarios with durations sampled from distributions, None computes a single
+        scenario with mean durations,
+    :param seed: seed of sampled durations.
+    :return: CriticalPath object.
+    """
+    parameters = parameters or simulation.SimulationParameters()
+    graph = compile_graph(bpmn_graph, parameters)
+    return schedule(graph, sample_durations(bpmn_graph, graph, parameters, scenarios, seed), mode)
+
+
+def compile_graph(bpmn_graph, parameters=None):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param parameters: SimulationParameters object with branch probabilities.
+    :return: ScheduleGraph object.
+    """
+    parameters = parameters or simulation.SimulationParameters()
+    analysis = cycle_analysis.get_cycle_analysis(bpmn_graph)
+    nodes = bpmn_graph.diagram_graph._node
+    graph = ScheduleGraph(list(analysis.topological_order))
+    incoming = [[] for _ in graph.order]
+    outgoing = [[] for _ in graph.order]
+    for flow_id, flow in bpmn_graph.sequence_flows.items():
+        source = graph.index.get(flow[consts.Consts.source_ref])
+        target = graph.index.get(flow[consts.Consts.target_ref])
+        if source is not None and target is not None and flow_id not in analysis.back_flows:
+            outgoing[source].append(flow_id)
+            incoming[target].append((flow_id, source))
+
+    # probability of taking every flow, once the source is reached - loops are left through their forward flows
+    flow_probability = {}
+    for position, node_id in enumerate(graph.order):
+        if nodes[node_id][consts.Consts.type] in EXCLUSIVE_TYPES and len(outgoing[position]) > 1:
+            flow_probability.update(zip(outgoing[position], simulation.branch_probabilities(
+                bpmn_graph, parameters, node_id, outgoing[position]).tolist()))
+
+    for position, node_id in enumerate(graph.order):
+        flows = incoming[position]
+        graph.predecessors.append(np.array([source for _, source in flows], dtype=np.intp))
+        probabilities = np.array([graph.reach[source] * flow_probability.get(flow_id, 1.0)
+                                  for flow_id, source in flows])
+        graph.reach[position] = min(probabilities.sum(), 1.0) if flows else 1.0
+        if len(flows) > 1 and nodes[node_id][consts.Consts.type] not in SYNCHRONIZING_TYPES:
+            total = probabilities.sum()
+            graph.weights.append(probabilities / total if total > 0 else np.full(len(flows), 1.0 / len(flows)))
+        else:
+            graph.weights.append(None)
+    graph.sinks = np.array([position for position in range(len(graph.order)) if not outgoing[position]],
+                           dtype=np.intp)
+    return graph
+
+
+def sample_durations(bpmn_graph, graph, parameters=None, scenarios=None, seed=None):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param graph: ScheduleGraph of the diagram,
+    :param parameters: SimulationParameters object with durations,
+    :param scenarios: number of sampled scenarios, None returns a single scenario with mean durations,
+    :param seed: seed of sampled durations.
+    :return: numpy array of durations of shape (scenarios, nodes), columns ordered as graph.order.
+    """
+    parameters = parameters or simulation.SimulationParameters()
+    nodes = bpmn_graph.diagram_graph._node
+    generator = np.random.default_rng(seed)
+    durations = np.zeros((1 if scenarios is None else scenarios, len(graph.order)))
+    for position, node_id in enumerate(graph.order):
+        distribution = simulation.node_duration(parameters, node_id, nodes[node_id])
+        if distribution is not None:
+            durations[:, position] = distribution.mean if scenarios is None \
+                else distribution.sample(generator, scenarios)
+    return durations
+
+
+def schedule(graph, durations, mode=EXPECTED):
+    """
+    Forward and backward pass over the graph, vectorized over scenarios.
+
+    :param graph: ScheduleGraph object,
+    :param durations: numpy array of durations of shape (scenarios, nodes), columns ordered as graph.order,
+    :param mode: EXPECTED or WORST, semantics of exclusive merges.
+    :return: CriticalPath object.
+    """
+    if mode not in (EXPECTED, WORST):
+        raise bpmn_exception.BpmnPythonError(f"Invalid critical path mode: {mode}")
+    durations = np.atleast_2d(np.asarray(durations, dtype=float))
+    result = CriticalPath(graph, durations, mode)
+    earliest_start = np.zeros_like(durations)
+    earliest_finish = np.zeros_like(durations)
+    averaged = [weights is not None and mode == EXPECTED for weights in graph.weights]
+    for position, predecessors in enumerate(graph.predecessors):
+        if len(predecessors) == 1:
+            earliest_start[:, position] = earliest_finish[:, predecessors[0]]
+        elif averaged[position]:
+            earliest_start[:, position] = earliest_finish[:, predecessors] @ graph.weights[position]
+        elif len(predecessors):
+            earliest_start[:, position] = earliest_finish[:, predecessors].max(axis=1)
+        earliest_finish[:, position] = earliest_start[:, position] + durations[:, position]
+
+    # process ends like an exclusive merge of its end nodes, if they are alternatives, otherwise when the last
+    # of them finishes
+    latest_finish = np.full_like(durations, np.inf)
+    sinks = graph.sinks
+    sink_reach = graph.reach[sinks]
+    if mode == EXPECTED and len(sinks) > 1 and abs(sink_reach.sum() - 1.0) <= 1e-6:
+        result.duration = earliest_finish[:, sinks] @ sink_reach
+        latest_finish[:, sinks] = earliest_finish[:, sinks]
+    elif len(sinks):
+        result.duration = earliest_finish[:, sinks].max(axis=1)
+        latest_finish[:, sinks] = result.duration[:, None]
+    else:
+        result.duration = np.zeros(len(durations))
+
+    latest_start = np.zeros_like(durations)
+    for position in range(len(graph.order) - 1, -1, -1):
+        latest_start[:, position] = latest_finish[:, position] - durations[:, position]
+        predecessors = graph.predecessors[position]
+        if not len(predecessors):
+            continue
+        if averaged[position]:
+            # a branch of exclusive merge is only delayed by its own nodes
+            slack = latest_start[:, position] - earliest_start[:, position]
+            constraint = earliest_finish[:, predecessors] + slack[:, None]
+        else:
+            constraint = np.repeat(latest_start[:, position][:, None], len(predecessors), axis=1)
+        latest_finish[:, predecessors] = np.minimum(latest_finish[:, predecessors], constraint)
+
+    result.earliest_start = earliest_start
+    result.earliest_finish = earliest_finish
+    result.latest_start = latest_start
+    result.latest_finish = latest_finish
+    return result
@@ -0,0 +1,206 @@
+# coding=utf-8
+"""
+Cycle analysis of sequence flow graph - strongly connected components, loops with their entries and exits
+and a minimal set of back flows, whose removal makes the graph acyclic.
+
+All results come from a single iterative depth-first search (Tarjan's algorithm), started from nodes without
+incoming flows, so the whole analysis is O(N + E). Back flows are flows leading to a node on the current search
+path. Every back flow closes a cycle with the search tree path from its target to its source, so no back flow
+can be restored without creating a cycle - the set is minimal (although, finding the minimum one is NP-hard).
+
+Analysis is cached per diagram object and recomputed only when its version (see graph_version) changes, so
+layouter, layout metrics and CSV export share a single computation. The cache is kept outside of the diagram, so
+it is neither copied nor pickled with it.
+"""
+import threading
+import weakref
+
+from . import bpmn_python_consts as consts
+
+# diagram -> (version, analysis), entries are dropped together with diagrams
+_cache = weakref.WeakKeyDictionary()
+_cache_lock = threading.Lock()
+
+
+class Loop(object):
+    """
+    Loop of the process - strongly connected component with more than one node or a node with a flow to itself.
+
+    - header - first node of the loop reached by the search (target of back flows for structured loops),
+    - nodes - set of ids of nodes of the loop,
+    - entries / exits - ids of nodes entered from outside of the loop / left to nodes outside of the loop,
+    - back_flows - ids of back flows of the loop.
+    """
+    __slots__ = ("header", "nodes", "entries", "exits", "back_flows")
+
+    def __init__(self, header, nodes):
+        self.header = header
+        self.nodes = nodes
+        self.entries = []
+        self.exits = []
+        self.back_flows = []
+
+    def __repr__(self):
+        return f"Loop({self.header!r}, nodes={len(self.nodes)}, entries={self.entries!r}, exits={self.exits!r})"
+
+
+class CycleAnalysis(object):
+    """
+    Result of cycle analysis of the diagram:
+
+    - components - strongly connected components (lists of node ids), in topological order of the condensation,
+    - component_of - dictionary mapping node id to index of its component,
+    - loops - list of Loop objects, in topological order, loop_of - dictionary mapping node id to its Loop,
+    - back_flows - set of ids of back flows,
+    - topological_order - list of node ids, topologically sorted after removal of back flows.
+    """
+
+    def __init__(self):
+        self.components = []
+        self.component_of = {}
+        self.loops = []
+        self.loop_of = {}
+        self.back_flows = set()
+        self.topological_order = []
+
+    def is_back_flow(self, flow_id):
+        return flow_id in self.back_flows
+
+    def in_loop(self, node_id):
+        return node_id in self.loop_of
+
+
+def graph_version(bpmn_graph):
+    """
+    Version of diagram topology - ids of nodes and ids, sources and targets of sequence flows, so it changes when
+    nodes are added, removed or relabelled and when flows are added, removed or retargeted in place. Computing it
+    is O(N + E), but much cheaper than the analysis itself.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: hashable version of the diagram.
+    """
+    source_ref, target_ref = consts.Consts.source_ref, consts.Consts.target_ref
+    return (tuple(bpmn_graph.diagram_graph._node),
+            tuple((flow_id, flow[source_ref], flow[target_ref]) for flow_id, flow in bpmn_graph.sequence_flows.items()))
+
+
+def get_cycle_analysis(bpmn_graph):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: CycleAnalysis of the diagram, computed once per version of the diagram.
+    """
+    version = graph_version(bpmn_graph)
+    with _cache_lock:
+        cached = _cache.get(bpmn_graph)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    analysis = analyze(bpmn_graph)
+    with _cache_lock:
+        _cache[bpmn_graph] = (version, analysis)
+    return analysis
+
+
+def invalidate(bpmn_graph):
+    """
+    Drops cached analysis of the diagram.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    """
+    with _cache_lock:
+        _cache.pop(bpmn_graph, None)
+
+
+def analyze(bpmn_graph):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: CycleAnalysis of the diagram (not cached, see get_cycle_analysis).
+    """
+    node_ids = list(bpmn_graph.diagram_graph._node)
+    outgoing = {node_id: [] for node_id in node_ids}
+    has_incoming = set()
+    for flow_id, flow in bpmn_graph.sequence_flows.items():
+        source, target = flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+        if source in outgoing and target in outgoing:
+            outgoing[source].append((flow_id, target))
+            has_incoming.add(target)
+
+    analysis = CycleAnalysis()
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    on_path = set()
+    postorder = []
+    components = []
+    # search starts from nodes without incoming flows, the remaining ones are only reachable through cycles
+    roots = [node_id for node_id in node_ids if node_id not in has_incoming] + node_ids
+    for root in roots:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        on_path.add(root)
+        work = [(root, iter(outgoing[root]))]
+        while work:
+            node_id, successors = work[-1]
+            for flow_id, target in successors:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    on_path.add(target)
+                    work.append((target, iter(outgoing[target])))
+                    break
+                if target in on_path:
+                    analysis.back_flows.add(flow_id)
+                if target in on_stack and index[target] < low[node_id]:
+                    low[node_id] = index[target]
+            else:
+                work.pop()
+                on_path.discard(node_id)
+                postorder.append(node_id)
+                if work and low[node_id] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node_id]
+                if low[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+
+    # Tarjan's algorithm emits components in reverse topological order, reverse postorder of the search
+    # is a topological order of the graph without back flows
+    analysis.components = components[::-1]
+    analysis.topological_order = postorder[::-1]
+    for component_index, component in enumerate(analysis.components):
+        for node_id in component:
+            analysis.component_of[node_id] = component_index
+
+    loops = {}
+    for component_index, component in enumerate(analysis.components):
+        if len(component) > 1 or any(target == component[0] for _, target in outgoing[component[0]]):
+            loops[component_index] = Loop(min(component, key=index.__getitem__), set(component))
+    for source, flows in outgoing.items():
+        source_component = analysis.component_of[source]
+        for flow_id, target in flows:
+            target_component = analysis.component_of[target]
+            if source_component == target_component:
+                if flow_id in analysis.back_flows:
+                    loops[source_component].back_flows.append(flow_id)
+                continue
+            if source_component in loops and source not in loops[source_component].exits:
+                loops[source_component].exits.append(source)
+            if target_component in loops and target not in loops[target_component].entries:
+                loops[target_component].entries.append(target)
+    for component_index, loop in loops.items():
+        # loop without incoming flows from outside (e.g. whole process is a cycle) is entered at its header
+        if not loop.entries:
+            loop.entries.append(loop.header)
+    analysis.loops = [loops[component_index] for component_index in sorted(loops)]
+    for loop in analysis.loops:
+        analysis.loop_of.update(dict.fromkeys(loop.nodes, loop))
+    return analysis
@@ -0,0 +1,327 @@
+# coding=utf-8
+"""
+Structural diff between two versions of BpmnDiagramGraph.
+
+Nodes and sequence flows are matched by id first. Elements left unmatched (e.g. regenerated with new uuid4 ids) are
+matched by similarity hashes of decreasing strictness - type, name and names of neighbours, then type and name,
+then type and neighbours only, finally type and already matched neighbours. Only hashes unique on both sides are
+matched, so ambiguous elements are reported as removed and added rather than paired arbitrarily. Flows left unmatched
+by id are matched by their (already matched) endpoints, processes left unmatched by id by the process containing most
+counterparts of their nodes, so references to regenerated ids are not reported as modifications. Every step is
+a single pass with dictionaries, so diff runs in time linear in the size of both diagrams (neighbour signatures are
+sorted, which adds a logarithm of the node degree).
+"""
+import collections
+
+from . import bpmn_python_consts as consts
+
+geometry_keys = frozenset((consts.Consts.x, consts.Consts.y, consts.Consts.width, consts.Consts.height))
+ignored_node_keys = geometry_keys | {consts.Consts.id, consts.Consts.incoming_flow, consts.Consts.outgoing_flow}
+
+
+class DiagramDiff(object):
+    """
+    Result of diff. Added and removed elements are lists of dictionaries describing the element, modified
+    elements list changed attributes as {attribute: (old value, new value)}, moved nodes list old and new
+    coordinates. Ids of matched elements from both versions are available in node_mapping, flow_mapping and
+    process_mapping.
+    """
+
+    def __init__(self):
+        self.node_mapping = {}
+        self.flow_mapping = {}
+        self.process_mapping = {}
+        self.added_nodes = []
+        self.removed_nodes = []
+        self.modified_nodes = []
+        self.moved_nodes = []
+        self.added_flows = []
+        self.removed_flows = []
+        self.modified_flows = []
+
+    def is_empty(self):
+        """
+        :return: True if both versions are structurally equal (ids may differ).
+        """
+        return not (self.added_nodes or self.removed_nodes or self.modified_nodes or self.moved_nodes
+                    or self.added_flows or self.removed_flows or self.modified_flows)
+
+    def summary(self):
+        """
+        :return: a dictionary with number of elements in every category of changes.
+        """
+        return {"added_nodes": len(self.added_nodes), "removed_nodes": len(self.removed_nodes),
+                "modified_nodes": len(self.modified_nodes), "moved_nodes": len(self.moved_nodes),
+                "added_flows": len(self.added_flows), "removed_flows": len(self.removed_flows),
+                "modified_flows": len(self.modified_flows)}
+
+    def as_dict(self):
+        """
+        :return: JSON serializable dictionary with all changes.
+        """
+        return {"summary": self.summary(), "added_nodes": self.added_nodes, "removed_nodes": self.removed_nodes,
+                "modified_nodes": [dict(change, changes={key: list(values)
+                                                         for key, values in change["changes"].items()})
+                                   for change in self.modified_nodes],
+                "moved_nodes": self.moved_nodes, "added_flows": self.added_flows,
+                "removed_flows": self.removed_flows,
+                "modified_flows": [dict(change, changes={key: list(values)
+                                                         for key, values in change["changes"].items()})
+                                   for change in self.modified_flows]}
+
+
+def diff(graph_a, graph_b):
+    """
+    Compares two versions of the diagram.
+    :param graph_a: BpmnDiagramGraph, old version,
+    :param graph_b: BpmnDiagramGraph, new version.
+    :return: DiagramDiff object.
+    """
+    result = DiagramDiff()
+    nodes_a = graph_a.diagram_graph._node
+    nodes_b = graph_b.diagram_graph._node
+    flows_a = graph_a.sequence_flows
+    flows_b = graph_b.sequence_flows
+
+    node_mapping = {node_id: node_id for node_id in nodes_a if node_id in nodes_b}
+    mapped_b = set(node_mapping.values())
+    neighbours_a = _neighbours(nodes_a, flows_a)
+    neighbours_b = _neighbours(nodes_b, flows_b)
+    for signature in (_full_signature, _name_signature, _neighbour_signature):
+        unmatched_a = [node_id for node_id in nodes_a if node_id not in node_mapping]
+        unmatched_b = [node_id for node_id in nodes_b if node_id not in mapped_b]
+        if not unmatched_a or not unmatched_b:
+            break
+        buckets_a = _unique_buckets(unmatched_a, lambda node_id: signature(nodes_a, neighbours_a, node_id))
+        buckets_b = _unique_buckets(unmatched_b, lambda node_id: signature(nodes_b, neighbours_b, node_id))
+        for key, node_id in buckets_a.items():
+            if key in buckets_b:
+                node_mapping[node_id] = buckets_b[key]
+                mapped_b.add(buckets_b[key])
+    _match_by_matched_neighbours(nodes_a, neighbours_a, nodes_b, neighbours_b, node_mapping, mapped_b)
+    result.node_mapping = node_mapping
+
+    flow_mapping = {flow_id: flow_id for flow_id in flows_a if flow_id in flows_b
+                    and _endpoints(flows_b[flow_id]) == _mapped_endpoints(flows_a[flow_id], node_mapping)}
+    mapped_flows_b = set(flow_mapping.values())
+    unmatched_flows_b = {}
+    for flow_id, flow in flows_b.items():
+        if flow_id not in mapped_flows_b:
+            unmatched_flows_b.setdefault(_endpoints(flow), []).append(flow_id)
+    for flow_id, flow in flows_a.items():
+        if flow_id in flow_mapping:
+            continue
+        candidates = unmatched_flows_b.get(_mapped_endpoints(flow, node_mapping))
+        if candidates and len(candidates) == 1:
+            flow_mapping[flow_id] = candidates.pop()
+            mapped_flows_b.add(flow_mapping[flow_id])
+    result.flow_mapping = flow_mapping
+    result.process_mapping = _process_mapping(graph_a, graph_b, node_mapping)
+    # references to other elements are compared in ids of the new version
+    references = {consts.Consts.default: flow_mapping, consts.Consts.attached_to_ref: node_mapping,
+                  consts.Consts.process: {**node_mapping, **result.process_mapping}}
+
+    for node_id, node in nodes_a.items():
+        if node_id not in node_mapping:
+            result.removed_nodes.append(_describe_node(node_id, node))
+            continue
+        new_id = node_mapping[node_id]
+        new_node = nodes_b[new_id]
+        changes = _node_changes(node, new_node, references)
+        if changes:
+            result.modified_nodes.append({"id": node_id, "new_id": new_id, "type": new_node.get(consts.Consts.type),
+                                          "name": new_node.get(consts.Consts.node_name, ""), "changes": changes})
+        if _position(node) != _position(new_node):
+            result.moved_nodes.append({"id": node_id, "new_id": new_id, "type": new_node.get(consts.Consts.type),
+                                       "name": new_node.get(consts.Consts.node_name, ""),
+                                       "old_position": _position(node), "new_position": _position(new_node)})
+    for node_id, node in nodes_b.items():
+        if node_id not in mapped_b:
+            result.added_nodes.append(_describe_node(node_id, node))
+
+    for flow_id, flow in flows_a.items():
+        if flow_id not in flow_mapping:
+            result.removed_flows.append(_describe_flow(flow_id, flow, nodes_a))
+            continue
+        new_id = flow_mapping[flow_id]
+        changes = _flow_changes(graph_a, flow, graph_b, flows_b[new_id])
+        if changes:
+            result.modified_flows.append({"id": flow_id, "new_id": new_id,
+                                          "name": flows_b[new_id].get(consts.Consts.name, ""), "changes": changes})
+    for flow_id, flow in flows_b.items():
+        if flow_id not in mapped_flows_b:
+            result.added_flows.append(_describe_flow(flow_id, flow, nodes_b))
+    return result
+
+
+def _neighbours(nodes, flows):
+    """
+    :return: dictionary mapping node id to a list of (direction, neighbour id) pairs.
+    """
+    neighbours = {node_id: [] for node_id in nodes}
+    for flow in flows.values():
+        source, target = _endpoints(flow)
+        if source in neighbours and target in neighbours:
+            neighbours[source].append(("out", target))
+            neighbours[target].append(("in", source))
+    return neighbours
+
+
+def _normalize(name):
+    return " ".join((name or "").split()).lower()
+
+
+def _label(node):
+    return node.get(consts.Consts.type), _normalize(node.get(consts.Consts.node_name))
+
+
+def _full_signature(nodes, neighbours, node_id):
+    return _label(nodes[node_id]), _neighbour_labels(nodes, neighbours, node_id)
+
+
+def _name_signature(nodes, neighbours, node_id):
+    return _label(nodes[node_id])
+
+
+def _neighbour_signature(nodes, neighbours, node_id):
+    return nodes[node_id].get(consts.Consts.type), _neighbour_labels(nodes, neighbours, node_id)
+
+
+def _neighbour_labels(nodes, neighbours, node_id):
+    return tuple(sorted((direction, _label(nodes[neighbour_id])) for direction, neighbour_id in neighbours[node_id]))
+
+
+def _match_by_matched_neighbours(nodes_a, neighbours_a, nodes_b, neighbours_b, node_mapping, mapped_b):
+    """
+    Last resort for nodes both renamed and reconnected - matches nodes of the same type by their already matched
+    neighbours, unmatched neighbours are ignored.
+    """
+    unmatched_a = [node_id for node_id in nodes_a if node_id not in node_mapping]
+    unmatched_b = [node_id for node_id in nodes_b if node_id not in mapped_b]
+    if not unmatched_a or not unmatched_b:
+        return
+    # anchors of both versions are expressed in ids of the new version
+    identity_b = {new_id: new_id for new_id in mapped_b}
+
+    def anchors(nodes, neighbours, node_id, mapping):
+        matched = tuple(sorted((direction, mapping[neighbour_id]) for direction, neighbour_id in neighbours[node_id]
+                               if neighbour_id in mapping))
+        return (nodes[node_id].get(consts.Consts.type), matched) if matched else None
+
+    buckets_a = _unique_buckets(unmatched_a, lambda node_id: anchors(nodes_a, neighbours_a, node_id, node_mapping))
+    buckets_b = _unique_buckets(unmatched_b, lambda node_id: anchors(nodes_b, neighbours_b, node_id, identity_b))
+    for key, node_id in buckets_a.items():
+        if key is not None and key in buckets_b:
+            node_mapping[node_id] = buckets_b[key]
+            mapped_b.add(buckets_b[key])
+
+
+def _process_mapping(graph_a, graph_b, node_mapping):
+    """
+    :return: dictionary mapping ids of processes of the old version to ids of their counterparts in the new one.
+        Processes missing in the new version are matched with the process, which contains most counterparts of
+        their nodes.
+    """
+    nodes_a = graph_a.diagram_graph._node
+    nodes_b = graph_b.diagram_graph._node
+    mapping = {process_id: process_id for process_id in graph_a.process_elements
+               if process_id in graph_b.process_elements}
+    votes = collections.Counter()
+    for node_id, new_id in node_mapping.items():
+        process_id = nodes_a[node_id].get(consts.Consts.process)
+        new_process_id = nodes_b[new_id].get(consts.Consts.process)
+        if process_id in graph_a.process_elements and process_id not in mapping \
+                and new_process_id in graph_b.process_elements:
+            votes[process_id, new_process_id] += 1
+    mapped = set(mapping.values())
+    for (process_id, new_process_id), _ in votes.most_common():
+        if process_id not in mapping and new_process_id not in mapped:
+            mapping[process_id] = new_process_id
+            mapped.add(new_process_id)
+    return mapping
+
+
+def _unique_buckets(node_ids, signature):
+    """
+    :return: dictionary mapping signature to node id, only for signatures shared by no other node.
+    """
+    buckets = {}
+    ambiguous = set()
+    for node_id in node_ids:
+        key = signature(node_id)
+        if key in buckets:
+            ambiguous.add(key)
+        else:
+            buckets[key] = node_id
+    for key in ambiguous:
+        del buckets[key]
+    return buckets
+
+
+def _endpoints(flow):
+    return flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+
+
+def _mapped_endpoints(flow, node_mapping):
+    source, target = _endpoints(flow)
+    return node_mapping.get(source), node_mapping.get(target)
+
+
+def _position(node):
+    return _coordinate(node.get(consts.Consts.x)), _coordinate(node.get(consts.Consts.y))
+
+
+def _coordinate(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _node_changes(node, new_node, references):
+    """
+    :param references: dictionary mapping attribute, which references another element, to mapping of ids of
+        referenced elements.
+    """
+    changes = {}
+    for key in node.keys() | new_node.keys():
+        if key in ignored_node_keys:
+            continue
+        old_value = node.get(key)
+        new_value = new_node.get(key)
+        if key in references and old_value in references[key]:
+            old_value = references[key][old_value]
+        if old_value != new_value:
+            changes[key] = (old_value, new_value)
+    return changes
+
+
+def _flow_changes(graph_a, flow, graph_b, new_flow):
+    changes = {}
+    if flow.get(consts.Consts.name, "") != new_flow.get(consts.Consts.name, ""):
+        changes[consts.Consts.name] = (flow.get(consts.Consts.name, ""), new_flow.get(consts.Consts.name, ""))
+    condition = _condition(graph_a, flow)
+    new_condition = _condition(graph_b, new_flow)
+    if condition != new_condition:
+        changes[consts.Consts.condition_expression] = (condition, new_condition)
+    return changes
+
+
+def _condition(bpmn_graph, flow):
+    edge = bpmn_graph.diagram_graph.get_edge_data(*_endpoints(flow)) or {}
+    condition = edge.get(consts.Consts.condition_expression)
+    if isinstance(condition, dict):
+        return condition.get(consts.Consts.condition_expression)
+    return condition
+
+
+def _describe_node(node_id, node):
+    return {"id": node_id, "type": node.get(consts.Consts.type), "name": node.get(consts.Consts.node_name, ""),
+            "process": node.get(consts.Consts.process)}
+
+
+def _describe_flow(flow_id, flow, nodes):
+    source, target = _endpoints(flow)
+    return {"id": flow_id, "name": flow.get(consts.Consts.name, ""), "source": source, "target": target,
+            "source_name": nodes.get(source, {}).get(consts.Consts.node_name, ""),
+            "target_name": nodes.get(target, {}).get(consts.Consts.node_name, "")}
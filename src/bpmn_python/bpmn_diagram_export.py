@@ -2,7 +2,7 @@
 """
 Package provides functionality for exporting graph representation to BPMN 2.0 XML
 """
-import errno
+import io
 import os
 import xml.etree.cElementTree as eTree
 
@@ -422,6 +422,40 @@ class BpmnDiagramGraphExport(object):
         :param filename: string representing output file name,
         :param bpmn_diagram: BPMNDiagramGraph class instantion representing a BPMN process diagram.
         """
+        tree = BpmnDiagramGraphExport.export_xml_tree(bpmn_diagram)
+        BpmnDiagramGraphExport.write_tree_to_file(tree, directory, filename)
+
+    @staticmethod
+    def export_xml_stream(stream, bpmn_diagram):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (with Diagram Interchange data) to a binary file-like object.
+
+        :param stream: binary file-like object (e.g. io.BytesIO, socket file or HTTP response body),
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        """
+        tree = BpmnDiagramGraphExport.export_xml_tree(bpmn_diagram)
+        tree.write(stream, encoding='utf-8', xml_declaration=True)
+
+    @staticmethod
+    def export_xml_bytes(bpmn_diagram):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (with Diagram Interchange data) and returns it as bytes.
+
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        :return: UTF-8 encoded XML document.
+        """
+        stream = io.BytesIO()
+        BpmnDiagramGraphExport.export_xml_stream(stream, bpmn_diagram)
+        return stream.getvalue()
+
+    @staticmethod
+    def export_xml_tree(bpmn_diagram):
+        """
+        Builds BPMN 2.0 XML element tree (with Diagram Interchange data) for diagram inner graph.
+
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        :return: xml.etree.ElementTree.ElementTree object.
+        """
         diagram_attributes = bpmn_diagram.diagram_attributes
         plane_attributes = bpmn_diagram.plane_attributes
         collaboration = bpmn_diagram.collaboration
@@ -505,13 +539,7 @@ class BpmnDiagramGraphExport(object):
             BpmnDiagramGraphExport.export_flow_di_data(params, plane)
 
         BpmnDiagramGraphExport.indent(definitions)
-        tree = eTree.ElementTree(definitions)
-        try:
-            os.makedirs(directory)
-        except OSError as exception:
-            if exception.errno != errno.EEXIST:
-                raise
-        tree.write(directory + filename, encoding='utf-8', xml_declaration=True)
+        return eTree.ElementTree(definitions)
 
     @staticmethod
     def export_xml_file_no_di(directory, filename, bpmn_diagram):
@@ -522,6 +550,40 @@ class BpmnDiagramGraphExport(object):
         :param filename: string representing output file name,
         :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
         """
+        tree = BpmnDiagramGraphExport.export_xml_tree_no_di(bpmn_diagram)
+        BpmnDiagramGraphExport.write_tree_to_file(tree, directory, filename)
+
+    @staticmethod
+    def export_xml_stream_no_di(stream, bpmn_diagram):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (without Diagram Interchange data) to a binary file-like object.
+
+        :param stream: binary file-like object (e.g. io.BytesIO, socket file or HTTP response body),
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        """
+        tree = BpmnDiagramGraphExport.export_xml_tree_no_di(bpmn_diagram)
+        tree.write(stream, encoding='utf-8', xml_declaration=True)
+
+    @staticmethod
+    def export_xml_bytes_no_di(bpmn_diagram):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (without Diagram Interchange data) and returns it as bytes.
+
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        :return: UTF-8 encoded XML document.
+        """
+        stream = io.BytesIO()
+        BpmnDiagramGraphExport.export_xml_stream_no_di(stream, bpmn_diagram)
+        return stream.getvalue()
+
+    @staticmethod
+    def export_xml_tree_no_di(bpmn_diagram):
+        """
+        Builds BPMN 2.0 XML element tree (without Diagram Interchange data) for diagram inner graph.
+
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        :return: xml.etree.ElementTree.ElementTree object.
+        """
         diagram_graph = bpmn_diagram.diagram_graph
         process_elements_dict = bpmn_diagram.process_elements
         definitions = BpmnDiagramGraphExport.export_definitions_element()
@@ -544,15 +606,22 @@ class BpmnDiagramGraphExport(object):
                 BpmnDiagramGraphExport.export_flow_process_data(params, process)
 
         BpmnDiagramGraphExport.indent(definitions)
-        tree = eTree.ElementTree(definitions)
-        try:
-            os.makedirs(directory)
-        except OSError as exception:
-            if exception.errno != errno.EEXIST:
-                raise
-        tree.write(directory + filename, encoding='utf-8', xml_declaration=True)
+        return eTree.ElementTree(definitions)
 
     # Helper methods
+    @staticmethod
+    def write_tree_to_file(tree, directory, filename):
+        """
+        Helper function, writes XML element tree to given file. Output directory is created if it does not exist.
+
+        :param tree: xml.etree.ElementTree.ElementTree object,
+        :param directory: string representing output directory,
+        :param filename: string representing output file name.
+        """
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tree.write(os.path.join(directory, filename), encoding='utf-8', xml_declaration=True)
+
     @staticmethod
     def indent(elem, level=0):
         """
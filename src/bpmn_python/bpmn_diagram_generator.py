@@ -0,0 +1,391 @@
+# coding=utf-8
+"""
+Parametric generator of synthetic, block-structured BPMN models, used for scaling benchmarks and load tests.
+
+A model consists of top-level segments. Segment of depth 0 is a single task, segment of depth d > 0 is a task,
+followed by a split into several branches (each being a segment of depth d - 1) and a join, followed by another
+task. Segments are repeated until the requested number of tasks is reached. The first 'loops' segments are
+wrapped in loops (exclusive join before the segment, exclusive split after it, with a flow back to the join and
+a flow to an additional task leaving the loop).
+Segments are assigned to lanes in round-robin order. Every pool holds a separate copy of the process, consecutive
+pools are connected by a message flow from end event to start event.
+
+Models are emitted as BpmnDiagramGraph (exportable to BPMN XML) or as CSV in notation proposed by Kluza K. and
+Wisniewski P. ("Spreadsheet-Based Business Process Modeling"). CSV describes the first pool only. Its loops are
+expressed with 'goto' rows, so they jump straight to the first task of the loop, without a join gateway.
+Exclusive splits with more than two branches can not be expressed in that notation - their conditions are imported
+as an inclusive gateway.
+"""
+import csv
+import io
+
+from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_python_consts as consts
+
+PARALLEL = "parallel"
+EXCLUSIVE = "exclusive"
+MIXED = "mixed"
+
+_task = "task"
+_split = "split"
+_loop = "loop"
+
+column_width = 150
+row_height = 100
+element_size = {consts.Consts.task: ("100", "80"), consts.Consts.start_event: ("36", "36"),
+                consts.Consts.end_event: ("36", "36")}
+gateway_size = ("40", "40")
+
+
+class GeneratorParameters(object):
+    """
+    Parameters of generated model.
+
+    Fields:
+    - tasks: minimal number of tasks of every process,
+    - split_depth: nesting depth of split/join blocks in a segment, 0 creates a sequence of tasks,
+    - branches: number of branches of every split,
+    - loops: number of segments wrapped in loops,
+    - lanes: number of lanes of every process, 0 creates processes without lane set,
+    - pools: number of pools (processes),
+    - gateway_type: "parallel", "exclusive" or "mixed" (parallel and exclusive splits alternate with depth).
+    """
+
+    def __init__(self, tasks=20, split_depth=1, branches=2, loops=0, lanes=0, pools=1, gateway_type=MIXED):
+        if tasks < 1 or split_depth < 0 or branches < 2 or loops < 0 or lanes < 0 or pools < 1:
+            raise bpmn_exception.BpmnPythonError("Invalid generator parameters: tasks and pools must be positive, "
+                                                 "split_depth, loops and lanes non-negative, branches at least 2")
+        if gateway_type not in (PARALLEL, EXCLUSIVE, MIXED):
+            raise bpmn_exception.BpmnPythonError("Invalid gateway type passed. Value passed: " + str(gateway_type))
+        self.tasks = tasks
+        self.split_depth = split_depth
+        self.branches = branches
+        self.loops = loops
+        self.lanes = lanes
+        self.pools = pools
+        self.gateway_type = gateway_type
+
+    def split_type(self, depth):
+        """
+        Returns type of split block placed at given nesting depth (1 is the outermost).
+        """
+        if self.gateway_type == MIXED:
+            return PARALLEL if depth % 2 else EXCLUSIVE
+        return self.gateway_type
+
+    def as_dict(self):
+        """
+        Returns a dictionary with parameter values.
+        """
+        return {"tasks": self.tasks, "split_depth": self.split_depth, "branches": self.branches,
+                "loops": self.loops, "lanes": self.lanes, "pools": self.pools, "gateway_type": self.gateway_type}
+
+
+def _segment_tasks(parameters, depth):
+    if depth == 0:
+        return 1
+    return 2 + parameters.branches * _segment_tasks(parameters, depth - 1)
+
+
+def _build_segment(parameters, depth, level=1):
+    if depth == 0:
+        return [(_task,)]
+    branches = [_build_segment(parameters, depth - 1, level + 1) for _ in range(parameters.branches)]
+    return [(_task,), (_split, parameters.split_type(level), branches), (_task,)]
+
+
+def build_structure(parameters):
+    """
+    Returns block structure of a single process: a list of top-level segments, every segment is a list of blocks.
+    Block is a tuple - ("task",), ("split", split type, list of branches) or ("loop", list of blocks).
+    """
+    segment_tasks = _segment_tasks(parameters, parameters.split_depth)
+    segments = []
+    tasks = 0
+    while tasks < parameters.tasks:
+        remaining = parameters.tasks - tasks
+        if remaining >= segment_tasks:
+            segment = _build_segment(parameters, parameters.split_depth)
+            tasks += segment_tasks
+        else:
+            segment = [(_task,)] * remaining
+            tasks += remaining
+        if len(segments) < parameters.loops:
+            segment = [(_loop, segment)]
+        segments.append(segment)
+    return segments
+
+
+class _ProcessBuilder(object):
+    """
+    Emits block structure as lists of node descriptions and sequence flows.
+    """
+
+    def __init__(self, prefix, y_offset):
+        self.prefix = prefix
+        self.y_offset = y_offset
+        self.nodes = []
+        self.flows = []
+        self.counter = 0
+        self.task_counter = 0
+        self.lane_nodes = {}
+        self.max_column = 0
+        self.rows = 1
+
+    def add_node(self, node_type, name, column, row, lane):
+        self.counter += 1
+        node_id = "{}{}_{}".format(self.prefix, node_type, self.counter)
+        width, height = element_size.get(node_type, gateway_size)
+        self.nodes.append({consts.Consts.id: node_id, consts.Consts.type: node_type, consts.Consts.node_name: name,
+                           consts.Consts.width: width, consts.Consts.height: height,
+                           consts.Consts.x: str(50 + column * column_width),
+                           consts.Consts.y: str(self.y_offset + 30 + row * row_height)})
+        self.lane_nodes.setdefault(lane, []).append(node_id)
+        self.max_column = max(self.max_column, column)
+        self.rows = max(self.rows, row + 1)
+        return node_id
+
+    def task_name(self):
+        self.task_counter += 1
+        return "Task {}".format(self.task_counter)
+
+    def emit_blocks(self, blocks, column, row, lane):
+        """
+        Emits sequence of blocks, returns tuple (first node ID, last node ID, next free column, used rows).
+        """
+        first = last = None
+        rows = 1
+        for block in blocks:
+            block_first, block_last, column, block_rows = self.emit_block(block, column, row, lane)
+            if last is not None:
+                self.flows.append((last, block_first, ""))
+            first = block_first if first is None else first
+            last = block_last
+            rows = max(rows, block_rows)
+        return first, last, column, rows
+
+    def emit_block(self, block, column, row, lane):
+        kind = block[0]
+        if kind == _task:
+            node_id = self.add_node(consts.Consts.task, self.task_name(), column, row, lane)
+            return node_id, node_id, column + 1, 1
+        if kind == _split:
+            split_type, branches = block[1], block[2]
+            gateway_type = consts.Consts.parallel_gateway if split_type == PARALLEL \
+                else consts.Consts.exclusive_gateway
+            split_id = self.add_node(gateway_type, "", column, row, lane)
+            ends = []
+            rows = 0
+            next_column = column + 1
+            for index, branch in enumerate(branches):
+                branch_first, branch_last, branch_column, branch_rows = self.emit_blocks(branch, column + 1,
+                                                                                         row + rows, lane)
+                name = "" if split_type == PARALLEL else "option {}".format(index + 1)
+                self.flows.append((split_id, branch_first, name))
+                ends.append(branch_last)
+                rows += branch_rows
+                next_column = max(next_column, branch_column)
+            join_id = self.add_node(gateway_type, "", next_column, row, lane)
+            for branch_last in ends:
+                self.flows.append((branch_last, join_id, ""))
+            return split_id, join_id, next_column + 1, rows
+        # loop - join, body, split with a flow back to the join and a task leaving the loop
+        join_id = self.add_node(consts.Consts.exclusive_gateway, "", column, row, lane)
+        body_first, body_last, next_column, rows = self.emit_blocks(block[1], column + 1, row, lane)
+        split_id = self.add_node(consts.Consts.exclusive_gateway, "", next_column, row, lane)
+        exit_id = self.add_node(consts.Consts.task, self.task_name(), next_column + 1, row, lane)
+        self.flows.append((join_id, body_first, ""))
+        self.flows.append((body_last, split_id, ""))
+        self.flows.append((split_id, join_id, "no"))
+        self.flows.append((split_id, exit_id, "yes"))
+        return join_id, exit_id, next_column + 2, rows
+
+
+def _add_process(bpmn_diagram, parameters, segments, pool_index, y_offset):
+    # imported here, since diagram representation module depends on modules of this package
+    from . import bpmn_diagram_rep
+    prefix = "p{}_".format(pool_index + 1) if parameters.pools > 1 else ""
+    process_id = prefix + "process"
+    bpmn_diagram.process_elements[process_id] = {consts.Consts.id: process_id,
+                                                 consts.Consts.name: "Process {}".format(pool_index + 1),
+                                                 consts.Consts.is_closed: "false",
+                                                 consts.Consts.is_executable: "false",
+                                                 consts.Consts.process_type: "None",
+                                                 consts.Consts.node_ids: []}
+
+    builder = _ProcessBuilder(prefix, y_offset)
+    start_id = builder.add_node(consts.Consts.start_event, "Start", 0, 0, 0)
+    last = start_id
+    column = 1
+    for index, segment in enumerate(segments):
+        lane = index % parameters.lanes if parameters.lanes else 0
+        first, segment_last, column, _ = builder.emit_blocks(segment, column, 0, lane)
+        builder.flows.append((last, first, ""))
+        last = segment_last
+    end_id = builder.add_node(consts.Consts.end_event, "End", column, 0, parameters.lanes - 1 if parameters.lanes
+                              else 0)
+    builder.flows.append((last, end_id, ""))
+
+    bpmn_diagram.add_nodes(process_id, builder.nodes)
+    flow_ids = bpmn_diagram_rep.BpmnDiagramGraph.counter_id_generator(prefix + "flow_", bpmn_diagram=bpmn_diagram)
+    bpmn_diagram.add_sequence_flows(process_id, builder.flows, flow_ids)
+
+    pool_width = 100 + (builder.max_column + 1) * column_width
+    pool_height = 60 + builder.rows * row_height
+    if parameters.lanes:
+        lane_height = pool_height // parameters.lanes
+        lanes = {}
+        for lane in range(parameters.lanes):
+            lane_id = "{}lane_{}".format(prefix, lane + 1)
+            lanes[lane_id] = {consts.Consts.id: lane_id, consts.Consts.name: "Lane {}".format(lane + 1),
+                              consts.Consts.child_lane_set: {},
+                              consts.Consts.flow_node_refs: builder.lane_nodes.get(lane, []),
+                              consts.Consts.is_horizontal: "true", consts.Consts.width: str(pool_width - 30),
+                              consts.Consts.height: str(lane_height), consts.Consts.x: "30",
+                              consts.Consts.y: str(y_offset + lane * lane_height)}
+        bpmn_diagram.process_elements[process_id][consts.Consts.lane_set] = {
+            consts.Consts.id: prefix + "lane_set", consts.Consts.lanes: lanes}
+    return process_id, start_id, end_id, pool_width, pool_height
+
+
+def generate_diagram(parameters=None, **kwargs):
+    """
+    Generates synthetic diagram.
+
+    :param parameters: an instance of GeneratorParameters class. If None, parameters are created from kwargs,
+    :param kwargs: fields of GeneratorParameters.
+    :return: an instance of BpmnDiagramGraph class.
+    """
+    # imported here, since diagram representation module depends on modules of this package
+    from . import bpmn_diagram_rep
+    parameters = parameters or GeneratorParameters(**kwargs)
+    segments = build_structure(parameters)
+    bpmn_diagram = bpmn_diagram_rep.BpmnDiagramGraph()
+    bpmn_diagram.diagram_attributes.update({consts.Consts.id: "diagram", consts.Consts.name: "Generated diagram"})
+    bpmn_diagram.plane_attributes[consts.Consts.id] = "plane"
+
+    pools = []
+    y_offset = 0
+    for pool_index in range(parameters.pools):
+        pool = _add_process(bpmn_diagram, parameters, segments, pool_index, y_offset)
+        pools.append(pool)
+        y_offset += pool[4] + 50
+
+    if parameters.pools == 1:
+        bpmn_diagram.plane_attributes[consts.Consts.bpmn_element] = pools[0][0]
+        return bpmn_diagram
+
+    participants = {}
+    message_flows = {}
+    y_offset = 0
+    for pool_index, (process_id, _, _, width, height) in enumerate(pools):
+        participants["participant_{}".format(pool_index + 1)] = {
+            consts.Consts.name: "Pool {}".format(pool_index + 1), consts.Consts.process_ref: process_id,
+            consts.Consts.is_horizontal: "true", consts.Consts.width: str(width), consts.Consts.height: str(height),
+            consts.Consts.x: "0", consts.Consts.y: str(y_offset)}
+        y_offset += height + 50
+    node_attributes = bpmn_diagram.diagram_graph._node
+    for pool_index in range(parameters.pools - 1):
+        source_ref, target_ref = pools[pool_index][2], pools[pool_index + 1][1]
+        flow_id = "message_flow_{}".format(pool_index + 1)
+        message_flows[flow_id] = {consts.Consts.id: flow_id, consts.Consts.name: "",
+                                  consts.Consts.source_ref: source_ref, consts.Consts.target_ref: target_ref}
+        source_node, target_node = node_attributes[source_ref], node_attributes[target_ref]
+        bpmn_diagram.diagram_graph.add_edge(source_ref, target_ref, **{
+            consts.Consts.id: flow_id, consts.Consts.name: "", consts.Consts.source_ref: source_ref,
+            consts.Consts.target_ref: target_ref,
+            consts.Consts.waypoints: [(source_node[consts.Consts.x], source_node[consts.Consts.y]),
+                                      (target_node[consts.Consts.x], target_node[consts.Consts.y])]})
+        source_node[consts.Consts.outgoing_flow].append(flow_id)
+        target_node[consts.Consts.incoming_flow].append(flow_id)
+    bpmn_diagram.collaboration = {consts.Consts.id: "collaboration", consts.Consts.participants: participants,
+                                  consts.Consts.message_flows: message_flows}
+    bpmn_diagram.plane_attributes[consts.Consts.bpmn_element] = "collaboration"
+    return bpmn_diagram
+
+
+def generate_xml_bytes(parameters=None, **kwargs):
+    """
+    Generates synthetic diagram and returns it as BPMN 2.0 XML (with Diagram Interchange data).
+
+    :param parameters: an instance of GeneratorParameters class. If None, parameters are created from kwargs,
+    :param kwargs: fields of GeneratorParameters.
+    """
+    return generate_diagram(parameters, **kwargs).export_xml_bytes()
+
+
+class _CsvBuilder(object):
+    """
+    Emits block structure as rows of CSV in Kluza notation.
+    """
+
+    def __init__(self, parameters):
+        self.parameters = parameters
+        self.rows = []
+        self.counter = 0
+
+    def add_row(self, order, activity="", condition="", who="", terminated=""):
+        self.rows.append((order, activity, condition, who, "", terminated))
+
+    def task_name(self):
+        self.counter += 1
+        return "Task {}".format(self.counter)
+
+    def emit_blocks(self, blocks, prefix, number, who, condition=""):
+        """
+        Emits sequence of blocks, numbered from given number, returns next free number.
+        """
+        for block in blocks:
+            number = self.emit_block(block, prefix, number, who, condition)
+            condition = ""
+        return number
+
+    def emit_block(self, block, prefix, number, who, condition):
+        kind = block[0]
+        if kind == _task:
+            self.add_row(prefix + str(number), self.task_name(), condition, who)
+            return number + 1
+        if kind == _split:
+            split_type, branches = block[1], block[2]
+            for index, branch in enumerate(branches):
+                letter = chr(ord("a") + index)
+                branch_condition = ""
+                if split_type == EXCLUSIVE:
+                    if len(branches) == 2:
+                        branch_condition = "yes" if index == 0 else "no"
+                    else:
+                        branch_condition = "option {}".format(index + 1)
+                self.emit_blocks(branch, prefix + str(number) + letter, 1, who, branch_condition)
+            return number + 1
+        # loop - body, then exclusive split: 'a' branch jumps back to the first task of the body
+        body_start = prefix + str(number)
+        number = self.emit_blocks(block[1], prefix, number, who, condition)
+        self.add_row(prefix + str(number) + "a1", "goto " + body_start, "no", who)
+        self.add_row(prefix + str(number) + "b1", self.task_name(), "yes", who)
+        return number + 1
+
+
+def generate_csv(parameters=None, **kwargs):
+    """
+    Generates synthetic process (first pool of the model) as CSV in Kluza notation, accepted by
+    BpmnDiagramGraph.load_diagram_from_csv_file.
+
+    :param parameters: an instance of GeneratorParameters class. If None, parameters are created from kwargs,
+    :param kwargs: fields of GeneratorParameters.
+    :return: string with CSV document.
+    """
+    parameters = parameters or GeneratorParameters(**kwargs)
+    builder = _CsvBuilder(parameters)
+    builder.add_row("0", "Start")
+    number = 1
+    for index, segment in enumerate(build_structure(parameters)):
+        who = "Lane {}".format(index % parameters.lanes + 1) if parameters.lanes else ""
+        number = builder.emit_blocks(segment, "", number, who)
+    builder.add_row(str(number), terminated="yes")
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow((consts.Consts.csv_order, consts.Consts.csv_activity, consts.Consts.csv_condition,
+                     consts.Consts.csv_who, consts.Consts.csv_subprocess, consts.Consts.csv_terminated))
+    writer.writerows(builder.rows)
+    return output.getvalue()
@@ -2,9 +2,16 @@
 """
 Package provides functionality for importing from BPMN 2.0 XML to graph representation
 """
+from concurrent.futures import ProcessPoolExecutor
 from xml.dom import minidom
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
+
+import networkx as nx
 
 from . import bpmn_import_utils as utils
+from . import bpmn_instrumentation as instrumentation
+from . import bpmn_lazy_attributes as lazy_attributes
 from . import bpmn_python_consts as consts
 
 
@@ -13,18 +20,98 @@ class BpmnDiagramGraphImport(object):
     Class BPMNDiagramGraphImport provides methods for importing BPMN 2.0 XML file.
     As a utility class, it only contains static methods. This class is meant to be used from BPMNDiagramGraph class.
     """
+    # keys of Diagram Interchange index entries, see build_di_index
+    di_tag = "tag"
+    di_element = "element"
+    di_bounds = "bounds"
+    # handlers of process child elements, key is a (namespace URI, local name) pair, see register_element_handler
+    any_namespace = "*"
+    element_handlers = {}
+    # handlers registered by default, their elements are imported as nodes in topology-only mode
+    default_element_handlers = {}
+    # local names of flow node elements with default handlers
+    flow_node_types = frozenset()
 
     def __init__(self):
         pass
 
     @staticmethod
-    def load_diagram_from_xml(filepath, bpmn_diagram):
+    def load_diagram_from_xml(filepath, bpmn_diagram, parallel=False, max_workers=None, topology_only=False):
         """
         Reads an XML file from given filepath and maps it into inner representation of BPMN diagram.
         Returns an instance of BPMNDiagramGraph class.
 
         :param filepath: string with output filepath,
-        :param bpmn_diagram: an instance of BpmnDiagramGraph class.
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param parallel: boolean flag, imports 'process' elements in worker processes,
+        :param max_workers: maximal number of worker processes used in parallel mode,
+        :param topology_only: boolean flag, imports only topology, remaining attributes are loaded lazily.
+        """
+        if topology_only or parallel:
+            with open(filepath, "rb") as xml_file:
+                BpmnDiagramGraphImport.load_diagram_from_xml_bytes(xml_file.read(), bpmn_diagram, parallel,
+                                                                   max_workers, topology_only)
+            return
+        with instrumentation.span("import.parse_xml"):
+            document = BpmnDiagramGraphImport.read_xml_file(filepath)
+        BpmnDiagramGraphImport.import_xml_document(document, bpmn_diagram)
+
+    @staticmethod
+    def load_diagram_from_xml_stream(stream, bpmn_diagram, parallel=False, max_workers=None, topology_only=False):
+        """
+        Reads BPMN 2.0 XML from a binary file-like object and maps it into inner representation of BPMN diagram.
+
+        :param stream: binary file-like object (e.g. io.BytesIO or HTTP request body),
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param parallel: boolean flag, imports 'process' elements in worker processes,
+        :param max_workers: maximal number of worker processes used in parallel mode,
+        :param topology_only: boolean flag, imports only topology, remaining attributes are loaded lazily.
+        """
+        if topology_only or parallel:
+            BpmnDiagramGraphImport.load_diagram_from_xml_bytes(stream.read(), bpmn_diagram, parallel, max_workers,
+                                                               topology_only)
+            return
+        with instrumentation.span("import.parse_xml"):
+            document = minidom.parse(stream)
+        BpmnDiagramGraphImport.import_xml_document(document, bpmn_diagram)
+
+    @staticmethod
+    def load_diagram_from_xml_bytes(data, bpmn_diagram, parallel=False, max_workers=None, topology_only=False):
+        """
+        Parses BPMN 2.0 XML document passed as bytes (or string) and maps it into inner representation of BPMN
+        diagram.
+
+        :param data: bytes or string object with XML document,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param parallel: boolean flag, imports 'process' elements in worker processes (see
+            import_xml_bytes_parallel), ignored in topology-only mode,
+        :param max_workers: maximal number of worker processes used in parallel mode,
+        :param topology_only: boolean flag, imports only topology, remaining attributes are loaded lazily.
+        """
+        if parallel and not topology_only:
+            BpmnDiagramGraphImport.import_xml_bytes_parallel(data.encode("UTF-8") if isinstance(data, str) else data,
+                                                             bpmn_diagram, max_workers)
+            return
+        with instrumentation.span("import.parse_xml"):
+            document = minidom.parseString(data)
+        attribute_source = None
+        if topology_only:
+            attribute_source = lazy_attributes.LazyAttributeSource(
+                data.encode("UTF-8") if isinstance(data, str) else data)
+        BpmnDiagramGraphImport.import_xml_document(document, bpmn_diagram, attribute_source)
+
+    @staticmethod
+    def import_xml_document(document, bpmn_diagram, attribute_source=None, partial_imports=None):
+        """
+        Maps already parsed BPMN 2.0 XML document into inner representation of BPMN diagram.
+
+        :param document: xml.dom.minidom.Document object,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param attribute_source: LazyAttributeSource with the same document. When given, only topology (id, type,
+            process, incoming and outgoing flows) of nodes is imported, without Diagram Interchange data.
+            Remaining attributes are loaded from attribute_source on first access,
+        :param partial_imports: iterable of results of import_process_partial. When given, processes are merged
+            from partial imports (see import_xml_bytes_parallel), instead of being imported from the document.
         """
         diagram_graph = bpmn_diagram.diagram_graph
         sequence_flows = bpmn_diagram.sequence_flows
@@ -33,26 +120,39 @@ class BpmnDiagramGraphImport(object):
         plane_attributes = bpmn_diagram.plane_attributes
         collaboration = bpmn_diagram.collaboration
 
-        document = BpmnDiagramGraphImport.read_xml_file(filepath)
         # According to BPMN 2.0 XML Schema, there's only one 'BPMNDiagram' and 'BPMNPlane'
         diagram_element = document.getElementsByTagNameNS("*", "BPMNDiagram")[0]
         plane_element = diagram_element.getElementsByTagNameNS("*", "BPMNPlane")[0]
         BpmnDiagramGraphImport.import_diagram_and_plane_attributes(diagram_attributes,
                                                                    plane_attributes,
                                                                    diagram_element, plane_element)
-
-        BpmnDiagramGraphImport.import_process_elements(document, diagram_graph, sequence_flows,
-                                                       process_elements_dict,
-                                                       plane_element)
-
-        collaboration_element_list = document.getElementsByTagNameNS("*",
-                                                                     consts.Consts.collaboration)
-        if collaboration_element_list is not None and len(collaboration_element_list) > 0:
-            # Diagram has multiple pools and lanes
-            collaboration_element = collaboration_element_list[0]
-            BpmnDiagramGraphImport.import_collaboration_element(diagram_graph,
-                                                                collaboration_element,
-                                                                collaboration)
+        bpmn_diagram.attribute_source = attribute_source
+        if attribute_source is None:
+            with instrumentation.span("import.di_index"):
+                di_index = BpmnDiagramGraphImport.build_di_index(plane_element)
+        else:
+            attribute_source.bpmn_diagram = bpmn_diagram
+            di_index = {}
+
+        with instrumentation.span("import.processes", parallel=partial_imports is not None,
+                                  topology_only=attribute_source is not None):
+            if partial_imports is not None:
+                BpmnDiagramGraphImport.merge_partial_imports(partial_imports, diagram_graph, sequence_flows,
+                                                             process_elements_dict, di_index)
+            else:
+                BpmnDiagramGraphImport.import_process_elements(document, diagram_graph, sequence_flows,
+                                                               process_elements_dict,
+                                                               di_index, attribute_source)
+
+        with instrumentation.span("import.collaboration"):
+            collaboration_element_list = document.getElementsByTagNameNS("*",
+                                                                         consts.Consts.collaboration)
+            if collaboration_element_list is not None and len(collaboration_element_list) > 0:
+                # Diagram has multiple pools and lanes
+                collaboration_element = collaboration_element_list[0]
+                BpmnDiagramGraphImport.import_collaboration_element(diagram_graph,
+                                                                    collaboration_element,
+                                                                    collaboration)
 
         if consts.Consts.message_flows in collaboration:
             message_flows = collaboration[consts.Consts.message_flows]
@@ -63,14 +163,70 @@ class BpmnDiagramGraphImport(object):
         if consts.Consts.participants in collaboration:
             participants = collaboration[consts.Consts.participants]
 
+        with instrumentation.span("import.di"):
+            for di_entry in di_index.values():
+                if di_entry[BpmnDiagramGraphImport.di_tag] == consts.Consts.bpmn_shape:
+                    BpmnDiagramGraphImport.import_shape_di(participants, diagram_graph,
+                                                           di_entry[BpmnDiagramGraphImport.di_element],
+                                                           di_entry[BpmnDiagramGraphImport.di_bounds])
+                else:
+                    BpmnDiagramGraphImport.import_flow_di(diagram_graph, sequence_flows, message_flows,
+                                                          di_entry[BpmnDiagramGraphImport.di_element],
+                                                          di_entry[consts.Consts.waypoints])
+
+    @staticmethod
+    def build_di_index(plane_element):
+        """
+        Builds Diagram Interchange index in a single pass over children of 'BPMNPlane' element.
+        Key is an ID of BPMN element referenced by 'bpmnElement' attribute, value is a dictionary with
+        DI element tag name, the element itself and its already parsed 'Bounds' (for BPMNShape)
+        or list of waypoints (for BPMNEdge). DI elements without 'bpmnElement' attribute are skipped, if many
+        of them reference the same BPMN element, the last one is used.
+
+        :param plane_element: object representing a BPMN XML 'plane' element.
+        :return: dictionary (associative list) of DI entries, in document order.
+        """
+        di_index = {}
         for element in utils.BpmnImportUtils.iterate_elements(plane_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
+            if element.nodeType == element.ELEMENT_NODE:
+                tag_name = element.localName
+                element_id = element.getAttribute(consts.Consts.bpmn_element)
+                if not element_id:
+                    continue
                 if tag_name == consts.Consts.bpmn_shape:
-                    BpmnDiagramGraphImport.import_shape_di(participants, diagram_graph, element)
+                    di_index[element_id] = {
+                        BpmnDiagramGraphImport.di_tag: tag_name,
+                        BpmnDiagramGraphImport.di_element: element,
+                        BpmnDiagramGraphImport.di_bounds: BpmnDiagramGraphImport.read_shape_bounds(element)}
                 elif tag_name == consts.Consts.bpmn_edge:
-                    BpmnDiagramGraphImport.import_flow_di(diagram_graph, sequence_flows,
-                                                          message_flows, element)
+                    di_index[element_id] = {
+                        BpmnDiagramGraphImport.di_tag: tag_name,
+                        BpmnDiagramGraphImport.di_element: element,
+                        consts.Consts.waypoints: BpmnDiagramGraphImport.read_edge_waypoints(element)}
+        return di_index
+
+    @staticmethod
+    def read_shape_bounds(shape_element):
+        """
+        Returns dictionary with width, height, x and y attributes of 'Bounds' element of given BPMNShape.
+
+        :param shape_element: object representing a BPMN XML 'BPMNShape' element.
+        """
+        bounds = shape_element.getElementsByTagNameNS("*", "Bounds")[0]
+        return {consts.Consts.width: bounds.getAttribute(consts.Consts.width),
+                consts.Consts.height: bounds.getAttribute(consts.Consts.height),
+                consts.Consts.x: bounds.getAttribute(consts.Consts.x),
+                consts.Consts.y: bounds.getAttribute(consts.Consts.y)}
+
+    @staticmethod
+    def read_edge_waypoints(flow_element):
+        """
+        Returns list of (x, y) tuples representing 'waypoint' elements of given BPMNEdge.
+
+        :param flow_element: object representing a BPMN XML 'BPMNEdge' element.
+        """
+        return [(waypoint.getAttribute(consts.Consts.x), waypoint.getAttribute(consts.Consts.y))
+                for waypoint in flow_element.getElementsByTagNameNS("*", consts.Consts.waypoint)]
 
     @staticmethod
     def import_collaboration_element(diagram_graph, collaboration_element, collaboration_dict):
@@ -90,8 +246,8 @@ class BpmnDiagramGraphImport(object):
         message_flows_dict = collaboration_dict[consts.Consts.message_flows]
 
         for element in utils.BpmnImportUtils.iterate_elements(collaboration_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
+            if element.nodeType == element.ELEMENT_NODE:
+                tag_name = element.localName
                 if tag_name == consts.Consts.participant:
                     BpmnDiagramGraphImport.import_participant_element(diagram_graph,
                                                                       participants_dict, element)
@@ -151,7 +307,7 @@ class BpmnDiagramGraphImport(object):
 
     @staticmethod
     def import_process_elements(document, diagram_graph, sequence_flows, process_elements_dict,
-                                plane_element):
+                                di_index, attribute_source=None):
         """
         Method for importing all 'process' elements in diagram.
 
@@ -160,156 +316,394 @@ class BpmnDiagramGraphImport(object):
         :param sequence_flows: a list of sequence flows existing in diagram,
         :param process_elements_dict: dictionary that holds attribute values for imported 'process' elements. Key is
             an ID of process, value - a dictionary of process attributes,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_index: Diagram Interchange index, created with build_di_index method,
+        :param attribute_source: LazyAttributeSource, when given only topology of flow nodes is imported.
         """
         for process_element in document.getElementsByTagNameNS("*", consts.Consts.process):
-            BpmnDiagramGraphImport.import_process_element(process_elements_dict, process_element)
-
-            process_id = process_element.getAttribute(consts.Consts.id)
-            process_attributes = process_elements_dict[process_id]
-
-            lane_set_list = process_element.getElementsByTagNameNS("*", consts.Consts.lane_set)
-            if lane_set_list is not None and len(lane_set_list) > 0:
-                # according to BPMN 2.0 XML Schema, there's at most one 'laneSet' element inside 'process'
-                lane_set = lane_set_list[0]
-                BpmnDiagramGraphImport.import_lane_set_element(process_attributes, lane_set,
-                                                               plane_element)
-
-            for element in utils.BpmnImportUtils.iterate_elements(process_element):
-                if element.nodeType != element.TEXT_NODE:
-                    # TODO fix skipping text fields - somewhat done
-                    tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(
-                        element.tagName)
-                    BpmnDiagramGraphImport.__import_element_by_tag_name(diagram_graph,
-                                                                        sequence_flows, process_id,
-                                                                        process_attributes,
-                                                                        element, tag_name)
-
-            for flow in utils.BpmnImportUtils.iterate_elements(process_element):
-                if flow.nodeType != flow.TEXT_NODE:
-                    tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(flow.tagName)
-                    if tag_name == consts.Consts.sequence_flow:
-                        BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph,
-                                                                             sequence_flows,
-                                                                             process_id,
-                                                                             flow)
-
-    @staticmethod
-    def __import_element_by_tag_name(diagram_graph, sequence_flows, process_id, process_attributes,
-                                     element, tag_name):
-        if tag_name in (consts.Consts.task, consts.Consts.user_task, consts.Consts.service_task,
-                        consts.Consts.manual_task, consts.Consts.send_task,
-                        consts.Consts.call_activity):
-            BpmnDiagramGraphImport.import_task_to_graph(diagram_graph, process_id,
-                                                        process_attributes, element)
-        elif tag_name == consts.Consts.subprocess:
-            BpmnDiagramGraphImport.import_subprocess_to_graph(diagram_graph, sequence_flows,
-                                                              process_id,
-                                                              process_attributes, element)
-        elif tag_name == consts.Consts.data_object:
-            BpmnDiagramGraphImport.import_data_object_to_graph(diagram_graph, process_id,
-                                                               process_attributes, element)
-        elif tag_name in (consts.Consts.inclusive_gateway, consts.Consts.exclusive_gateway):
-            BpmnDiagramGraphImport.import_incl_or_excl_gateway_to_graph(diagram_graph, process_id,
-                                                                        process_attributes,
-                                                                        element)
-        elif tag_name == consts.Consts.parallel_gateway:
-            BpmnDiagramGraphImport.import_parallel_gateway_to_graph(diagram_graph, process_id,
-                                                                    process_attributes,
-                                                                    element)
-        elif tag_name == consts.Consts.event_based_gateway:
-            BpmnDiagramGraphImport.import_event_based_gateway_to_graph(diagram_graph, process_id,
-                                                                       process_attributes,
-                                                                       element)
-        elif tag_name == consts.Consts.complex_gateway:
-            BpmnDiagramGraphImport.import_complex_gateway_to_graph(diagram_graph, process_id,
-                                                                   process_attributes,
-                                                                   element)
-        elif tag_name == consts.Consts.start_event:
-            BpmnDiagramGraphImport.import_start_event_to_graph(diagram_graph, process_id,
-                                                               process_attributes, element)
-        elif tag_name == consts.Consts.end_event:
-            BpmnDiagramGraphImport.import_end_event_to_graph(diagram_graph, process_id,
-                                                             process_attributes, element)
-        elif tag_name == consts.Consts.intermediate_catch_event:
-            BpmnDiagramGraphImport.import_intermediate_catch_event_to_graph(diagram_graph,
-                                                                            process_id,
-                                                                            process_attributes,
-                                                                            element)
-        elif tag_name == consts.Consts.intermediate_throw_event:
-            BpmnDiagramGraphImport.import_intermediate_throw_event_to_graph(diagram_graph,
-                                                                            process_id,
-                                                                            process_attributes,
-                                                                            element)
-        elif tag_name == consts.Consts.boundary_event:
-            BpmnDiagramGraphImport.import_boundary_event_to_graph(diagram_graph, process_id,
-                                                                  process_attributes,
-                                                                  element)
-
-    @staticmethod
-    def import_lane_set_element(process_attributes, lane_set_element, plane_element):
+            BpmnDiagramGraphImport.import_process(diagram_graph, sequence_flows, process_elements_dict,
+                                                  process_element, di_index, attribute_source)
+
+    @staticmethod
+    def import_process(diagram_graph, sequence_flows, process_elements_dict, process_element, di_index,
+                       attribute_source=None):
+        """
+        Method for importing single 'process' element with its lanes, flow nodes and sequence flows.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: a list of sequence flows existing in diagram,
+        :param process_elements_dict: dictionary that holds attribute values for imported 'process' elements. Key is
+            an ID of process, value - a dictionary of process attributes,
+        :param process_element: object representing a BPMN XML 'process' element,
+        :param di_index: Diagram Interchange index, created with build_di_index method,
+        :param attribute_source: LazyAttributeSource, when given only topology of flow nodes is imported.
+        """
+        BpmnDiagramGraphImport.import_process_element(process_elements_dict, process_element)
+
+        process_id = process_element.getAttribute(consts.Consts.id)
+        process_attributes = process_elements_dict[process_id]
+
+        lane_set_list = process_element.getElementsByTagNameNS("*", consts.Consts.lane_set)
+        if lane_set_list is not None and len(lane_set_list) > 0:
+            # according to BPMN 2.0 XML Schema, there's at most one 'laneSet' element inside 'process'
+            lane_set = lane_set_list[0]
+            BpmnDiagramGraphImport.import_lane_set_element(process_attributes, lane_set,
+                                                           di_index)
+
+        if attribute_source is None:
+            BpmnDiagramGraphImport.import_flow_elements(diagram_graph, sequence_flows, process_id,
+                                                        process_attributes, process_element)
+        else:
+            BpmnDiagramGraphImport.import_flow_elements_topology(diagram_graph, sequence_flows, process_id,
+                                                                 process_attributes, process_element,
+                                                                 attribute_source)
+
+    @staticmethod
+    def import_xml_bytes_parallel(data, bpmn_diagram, max_workers=None):
+        """
+        Imports BPMN 2.0 XML document, importing each 'process' element in a worker process.
+        The document is split into 'process' elements without building DOM tree (see split_process_documents),
+        each of them is parsed and imported only in its worker (see import_process_partial). Meanwhile, the parent
+        process parses the rest of the document (Diagram Interchange, collaboration) and merges partial imports
+        in document order. The result is identical to serial import. Diagrams with a single process are imported
+        serially.
+
+        Workers get element handlers registered in the parent process (see register_element_handler), so handlers
+        must be picklable - module level functions, static methods or handlers created with flow_node_handler.
+
+        :param data: bytes object with XML document,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param max_workers: maximal number of worker processes, number of CPUs by default.
+        """
+        with instrumentation.span("import.split_processes"):
+            skeleton, process_documents = BpmnDiagramGraphImport.split_process_documents(data)
+        if len(process_documents) < 2 or max_workers == 1:
+            with instrumentation.span("import.parse_xml"):
+                document = minidom.parseString(data)
+            BpmnDiagramGraphImport.import_xml_document(document, bpmn_diagram)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_set_element_handlers,
+                                 initargs=(dict(BpmnDiagramGraphImport.element_handlers),)) as executor:
+            futures = [executor.submit(BpmnDiagramGraphImport.import_process_partial, process_document)
+                       for process_document in process_documents]
+            with instrumentation.span("import.parse_xml"):
+                document = minidom.parseString(skeleton)
+            BpmnDiagramGraphImport.import_xml_document(document, bpmn_diagram,
+                                                       partial_imports=(future.result() for future in futures))
+
+    @staticmethod
+    def split_process_documents(data):
+        """
+        Splits BPMN 2.0 XML document into 'process' elements without building DOM tree. The document is scanned
+        with expat parser, which only records byte offsets of 'process' children of the root element.
+
+        :param data: bytes object with XML document.
+        :return: a tuple of the document without 'process' elements and a list of XML documents (bytes), each with
+            a single 'process' element wrapped in 'partialImport' element, which declares namespaces of the root.
+        """
+        parser = expat.ParserCreate()
+        ranges = []
+        root_attributes = {}
+        encoding = "UTF-8"
+        depth = 0
+        process_start = None
+        has_children = False
+
+        def declaration(version, declared_encoding, standalone):
+            nonlocal encoding
+            encoding = declared_encoding or encoding
+
+        def start_element(name, attributes):
+            nonlocal depth, process_start, has_children
+            if depth == 0:
+                root_attributes.update(attributes)
+            elif depth == 1 and name.rpartition(":")[2] == consts.Consts.process:
+                process_start = parser.CurrentByteIndex
+                has_children = False
+            else:
+                has_children = True
+            depth += 1
+
+        def end_element(name):
+            nonlocal depth, process_start
+            depth -= 1
+            if depth == 1 and process_start is not None:
+                # for an empty element expat reports the end of its tag, otherwise the start of its end tag
+                end = parser.CurrentByteIndex
+                if has_children or data[end - 2:end] != b"/>":
+                    end = data.index(b">", end) + 1
+                ranges.append((process_start, end))
+                process_start = None
+
+        parser.XmlDeclHandler = declaration
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.Parse(data, True)
+
+        namespace_declarations = " ".join("{}={}".format(name, quoteattr(value))
+                                          for name, value in root_attributes.items()
+                                          if name == "xmlns" or name.startswith("xmlns:"))
+        header = '<?xml version="1.0" encoding="{}"?><partialImport {}>'.format(encoding, namespace_declarations)
+        header = header.encode(encoding)
+        footer = "</partialImport>".encode(encoding)
+        skeleton = []
+        previous_end = 0
+        for start, end in ranges:
+            skeleton.append(data[previous_end:start])
+            previous_end = end
+        skeleton.append(data[previous_end:])
+        return b"".join(skeleton), [header + data[start:end] + footer for start, end in ranges]
+
+    @staticmethod
+    def merge_partial_imports(partial_imports, diagram_graph, sequence_flows, process_elements_dict, di_index):
+        """
+        Merges processes imported by import_process_partial into diagram, in order of partial imports.
+        Lane DI is resolved from the index, the result is identical to import_process_elements.
+
+        :param partial_imports: iterable of results of import_process_partial,
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: a list of sequence flows existing in diagram,
+        :param process_elements_dict: dictionary that holds attribute values for imported 'process' elements. Key is
+            an ID of process, value - a dictionary of process attributes,
+        :param di_index: Diagram Interchange index, created with build_di_index method.
+        """
+        for partial_process_elements, nodes, partial_sequence_flows, edges in partial_imports:
+            for process_id, process_attributes in partial_process_elements.items():
+                if consts.Consts.lane_set in process_attributes:
+                    BpmnDiagramGraphImport.import_lanes_di(
+                        process_attributes[consts.Consts.lane_set][consts.Consts.lanes], di_index)
+                process_elements_dict[process_id] = process_attributes
+            for node_id, node_attributes in nodes:
+                diagram_graph.add_node(node_id)
+                diagram_graph._node[node_id].update(node_attributes)
+            sequence_flows.update(partial_sequence_flows)
+            for source_ref, target_ref, edge_attributes in edges:
+                diagram_graph.add_edge(source_ref, target_ref, **edge_attributes)
+
+    @staticmethod
+    def import_process_partial(process_document):
+        """
+        Imports a single 'process' element into a new partial graph. Executed inside worker process.
+        Lanes are imported without DI, which is resolved by the caller.
+
+        :param process_document: bytes or string with XML document, which root element contains a 'process'
+            element.
+        :return: a tuple of process elements dictionary, list of (node ID, attributes) pairs, sequence flows
+            dictionary and list of (sourceRef, targetRef, attributes) edges, in order of creation.
+        """
+        document = minidom.parseString(process_document)
+        process_element = next(element for element in
+                               utils.BpmnImportUtils.iterate_elements(document.documentElement)
+                               if element.nodeType == element.ELEMENT_NODE)
+        diagram_graph = nx.Graph()
+        sequence_flows = {}
+        process_elements_dict = {}
+        BpmnDiagramGraphImport.import_process(diagram_graph, sequence_flows, process_elements_dict,
+                                              process_element, {})
+
+        # edges are replayed in order of sequence flow linking, so the merged graph keeps the same adjacency order
+        edges = []
+        imported_edges = set()
+        for flow in sequence_flows.values():
+            source_ref, target_ref = flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+            edge_attributes = diagram_graph[source_ref][target_ref]
+            if id(edge_attributes) not in imported_edges:
+                imported_edges.add(id(edge_attributes))
+                edges.append((source_ref, target_ref, edge_attributes))
+        return process_elements_dict, list(diagram_graph.nodes(data=True)), sequence_flows, edges
+
+    @staticmethod
+    def import_flow_elements(diagram_graph, sequence_flows, process_id, process_attributes, parent_element):
+        """
+        Imports child elements of 'process' or 'subProcess' element in a single traversal.
+        Elements are dispatched to handlers registered in element_handlers, by namespace and local name
+        (handlers registered for any_namespace are used as fallback). Sequence flows are collected during
+        the traversal and linked after all flow nodes of parent element are imported.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: a list of sequence flows existing in diagram,
+        :param process_id: string object, representing an ID of parent element,
+        :param process_attributes: dictionary that holds attribute values of parent element,
+        :param parent_element: object representing a BPMN XML 'process' or 'subProcess' element.
+        """
+        handlers = BpmnDiagramGraphImport.element_handlers
+        any_namespace = BpmnDiagramGraphImport.any_namespace
+        flow_elements = []
+        for element in utils.BpmnImportUtils.iterate_elements(parent_element):
+            if element.nodeType != element.ELEMENT_NODE:
+                continue
+            local_name = element.localName
+            if local_name == consts.Consts.sequence_flow:
+                flow_elements.append(element)
+                continue
+            handler = handlers.get((element.namespaceURI, local_name)) or handlers.get((any_namespace, local_name))
+            if handler is not None:
+                handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+
+        for flow_element in flow_elements:
+            BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id,
+                                                                 flow_element)
+
+    @staticmethod
+    def import_flow_elements_topology(diagram_graph, sequence_flows, process_id, process_attributes,
+                                      parent_element, attribute_source):
+        """
+        Topology-only counterpart of import_flow_elements. Flow nodes with default handlers (see
+        default_element_handlers) get only id, type, process and incoming/outgoing flow IDs, stored in
+        LazyNodeAttributes, which loads remaining attributes from attribute_source on first access. Elements with
+        handlers registered with register_element_handler are imported by these handlers, like in full import.
+        Sub-processes are imported recursively, sequence flows are linked after all flow nodes of parent element.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: a list of sequence flows existing in diagram,
+        :param process_id: string object, representing an ID of parent element,
+        :param process_attributes: dictionary that holds attribute values of parent element,
+        :param parent_element: object representing a BPMN XML 'process' or 'subProcess' element,
+        :param attribute_source: LazyAttributeSource with the imported document.
+        """
+        handlers = BpmnDiagramGraphImport.element_handlers
+        default_handlers = BpmnDiagramGraphImport.default_element_handlers
+        any_namespace = BpmnDiagramGraphImport.any_namespace
+        flow_elements = []
+        for element in utils.BpmnImportUtils.iterate_elements(parent_element):
+            if element.nodeType != element.ELEMENT_NODE:
+                continue
+            local_name = element.localName
+            if local_name == consts.Consts.sequence_flow:
+                flow_elements.append(element)
+                continue
+            handler = handlers.get((element.namespaceURI, local_name)) or handlers.get((any_namespace, local_name))
+            if handler is None:
+                continue
+            if handler is not default_handlers.get(local_name):
+                handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+            else:
+                element_id = element.getAttribute(consts.Consts.id)
+                incoming_list, outgoing_list = [], []
+                for flow_ref in utils.BpmnImportUtils.iterate_elements(element):
+                    if flow_ref.nodeType == flow_ref.ELEMENT_NODE:
+                        if flow_ref.localName == consts.Consts.incoming_flow:
+                            incoming_list.append(flow_ref.firstChild.nodeValue)
+                        elif flow_ref.localName == consts.Consts.outgoing_flow:
+                            outgoing_list.append(flow_ref.firstChild.nodeValue)
+                diagram_graph.add_node(element_id)
+                node_attributes = lazy_attributes.LazyNodeAttributes(attribute_source, {
+                    consts.Consts.id: element_id,
+                    consts.Consts.type: local_name,
+                    consts.Consts.process: process_id,
+                    consts.Consts.incoming_flow: incoming_list,
+                    consts.Consts.outgoing_flow: outgoing_list,
+                })
+                diagram_graph._node[element_id] = node_attributes
+                process_attributes[consts.Consts.node_ids].append(element_id)
+                if local_name == consts.Consts.subprocess:
+                    dict.__setitem__(node_attributes, consts.Consts.node_ids, [])
+                    BpmnDiagramGraphImport.import_flow_elements_topology(diagram_graph, sequence_flows, element_id,
+                                                                         node_attributes, element,
+                                                                         attribute_source)
+
+        for flow_element in flow_elements:
+            BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id,
+                                                                 flow_element)
+
+    @staticmethod
+    def register_element_handler(local_name, handler, namespace=any_namespace):
+        """
+        Registers handler used to import child elements of 'process' and 'subProcess' with given local name.
+        Handler is called as handler(diagram_graph, sequence_flows, process_id, process_attributes, element).
+        Handler registered for specific namespace takes precedence over the one registered for any namespace,
+        so it may be used both for extension elements and for overriding default handlers.
+
+        :param local_name: string with element tag name, without namespace prefix,
+        :param handler: callable importing the element,
+        :param namespace: string with namespace URI, any_namespace by default.
+        """
+        BpmnDiagramGraphImport.element_handlers[(namespace, local_name)] = handler
+
+    @staticmethod
+    def unregister_element_handler(local_name, namespace=any_namespace):
+        """
+        Removes handler registered for given local name and namespace.
+
+        :param local_name: string with element tag name, without namespace prefix,
+        :param namespace: string with namespace URI, any_namespace by default.
+        """
+        BpmnDiagramGraphImport.element_handlers.pop((namespace, local_name), None)
+
+    @staticmethod
+    def flow_node_handler(import_function):
+        """
+        Adapts flow node import function, which does not use sequence flows, to the element handler signature.
+
+        :param import_function: function called as import_function(diagram_graph, process_id, process_attributes,
+            element).
+        """
+        return FlowNodeHandler(import_function)
+
+    @staticmethod
+    def import_lane_set_element(process_attributes, lane_set_element, di_index):
         """
         Method for importing 'laneSet' element from diagram file.
 
         :param process_attributes: dictionary that holds attribute values of 'process' element, which is parent of
             imported flow node,
         :param lane_set_element: XML document element,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_index: Diagram Interchange index, created with build_di_index method.
         """
         lane_set_id = lane_set_element.getAttribute(consts.Consts.id)
         lanes_attr = {}
         for element in utils.BpmnImportUtils.iterate_elements(lane_set_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
+            if element.nodeType == element.ELEMENT_NODE:
+                tag_name = element.localName
                 if tag_name == consts.Consts.lane:
                     lane = element
                     lane_id = lane.getAttribute(consts.Consts.id)
-                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, plane_element)
+                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, di_index)
                     lanes_attr[lane_id] = lane_attr
 
         lane_set_attr = {consts.Consts.id: lane_set_id, consts.Consts.lanes: lanes_attr}
         process_attributes[consts.Consts.lane_set] = lane_set_attr
 
     @staticmethod
-    def import_child_lane_set_element(child_lane_set_element, plane_element):
+    def import_child_lane_set_element(child_lane_set_element, di_index):
         """
         Method for importing 'childLaneSet' element from diagram file.
 
         :param child_lane_set_element: XML document element,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_index: Diagram Interchange index, created with build_di_index method.
         """
         lane_set_id = child_lane_set_element.getAttribute(consts.Consts.id)
         lanes_attr = {}
         for element in utils.BpmnImportUtils.iterate_elements(child_lane_set_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
+            if element.nodeType == element.ELEMENT_NODE:
+                tag_name = element.localName
                 if tag_name == consts.Consts.lane:
                     lane = element
                     lane_id = lane.getAttribute(consts.Consts.id)
-                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, plane_element)
+                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, di_index)
                     lanes_attr[lane_id] = lane_attr
 
         child_lane_set_attr = {consts.Consts.id: lane_set_id, consts.Consts.lanes: lanes_attr}
         return child_lane_set_attr
 
     @staticmethod
-    def import_lane_element(lane_element, plane_element):
+    def import_lane_element(lane_element, di_index):
         """
         Method for importing 'laneSet' element from diagram file.
 
         :param lane_element: XML document element,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_index: Diagram Interchange index, created with build_di_index method.
         """
         lane_id = lane_element.getAttribute(consts.Consts.id)
         lane_name = lane_element.getAttribute(consts.Consts.name)
         child_lane_set_attr = {}
         flow_node_refs = []
         for element in utils.BpmnImportUtils.iterate_elements(lane_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
+            if element.nodeType == element.ELEMENT_NODE:
+                tag_name = element.localName
                 if tag_name == consts.Consts.child_lane_set:
                     child_lane_set_attr = BpmnDiagramGraphImport.import_child_lane_set_element(
-                        element, plane_element)
+                        element, di_index)
                 elif tag_name == consts.Consts.flow_node_ref:
                     flow_node_ref_id = element.firstChild.nodeValue
                     flow_node_refs.append(flow_node_ref_id)
@@ -317,21 +711,37 @@ class BpmnDiagramGraphImport(object):
         lane_attr = {consts.Consts.id: lane_id, consts.Consts.name: lane_name,
                      consts.Consts.child_lane_set: child_lane_set_attr,
                      consts.Consts.flow_node_refs: flow_node_refs}
+        BpmnDiagramGraphImport.import_lane_di(lane_attr, di_index)
+        return lane_attr
 
-        shape_element = None
-        for element in utils.BpmnImportUtils.iterate_elements(plane_element):
-            if element.nodeType != element.TEXT_NODE and element.getAttribute(
-                    consts.Consts.bpmn_element) == lane_id:
-                shape_element = element
-        if shape_element is not None:
-            bounds = shape_element.getElementsByTagNameNS("*", "Bounds")[0]
+    @staticmethod
+    def import_lane_di(lane_attr, di_index):
+        """
+        Adds Diagram Interchange information of the lane, if BPMNShape of the lane exists.
+
+        :param lane_attr: dictionary with lane attributes,
+        :param di_index: Diagram Interchange index, created with build_di_index method.
+        """
+        di_entry = di_index.get(lane_attr[consts.Consts.id])
+        if di_entry is not None and di_entry[BpmnDiagramGraphImport.di_tag] == consts.Consts.bpmn_shape:
+            shape_element = di_entry[BpmnDiagramGraphImport.di_element]
             lane_attr[consts.Consts.is_horizontal] = shape_element.getAttribute(
                 consts.Consts.is_horizontal)
-            lane_attr[consts.Consts.width] = bounds.getAttribute(consts.Consts.width)
-            lane_attr[consts.Consts.height] = bounds.getAttribute(consts.Consts.height)
-            lane_attr[consts.Consts.x] = bounds.getAttribute(consts.Consts.x)
-            lane_attr[consts.Consts.y] = bounds.getAttribute(consts.Consts.y)
-        return lane_attr
+            lane_attr.update(di_entry[BpmnDiagramGraphImport.di_bounds])
+
+    @staticmethod
+    def import_lanes_di(lanes_attr, di_index):
+        """
+        Adds Diagram Interchange information to already imported lanes and their child lanes.
+
+        :param lanes_attr: dictionary of lanes attributes, key is lane ID,
+        :param di_index: Diagram Interchange index, created with build_di_index method.
+        """
+        for lane_attr in lanes_attr.values():
+            child_lane_set_attr = lane_attr[consts.Consts.child_lane_set]
+            if child_lane_set_attr:
+                BpmnDiagramGraphImport.import_lanes_di(child_lane_set_attr[consts.Consts.lanes], di_index)
+            BpmnDiagramGraphImport.import_lane_di(lane_attr, di_index)
 
     @staticmethod
     def import_process_element(process_elements_dict, process_element):
@@ -404,7 +814,7 @@ class BpmnDiagramGraphImport(object):
             bpmn_graph._node[element_id][name_constant] = value
 
         element_id = flow_node_element.getAttribute(consts.Consts.id)
-        type_ = utils.BpmnImportUtils.remove_namespace_from_tag_name(flow_node_element.tagName)
+        type_ = flow_node_element.localName
         bpmn_graph.add_node(element_id)
         bpmn_graph._node[element_id][consts.Consts.id] = element_id
         bpmn_graph._node[element_id][consts.Consts.type] = type_
@@ -418,9 +828,8 @@ class BpmnDiagramGraphImport(object):
 
         incoming_list, outgoing_list, documentation = [], [], default_message
         for tmp_element in utils.BpmnImportUtils.iterate_elements(flow_node_element):
-            if tmp_element.nodeType != tmp_element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(
-                    tmp_element.tagName)
+            if tmp_element.nodeType == tmp_element.ELEMENT_NODE:
+                tag_name = tmp_element.localName
                 if tag_name == consts.Consts.incoming_flow:
                     incoming_list.append(tmp_element.firstChild.nodeValue)
                     continue
@@ -477,22 +886,8 @@ class BpmnDiagramGraphImport(object):
 
         subprocess_attributes = diagram_graph._node[subprocess_id]
         subprocess_attributes[consts.Consts.node_ids] = []
-        for element in utils.BpmnImportUtils.iterate_elements(subprocess_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
-                BpmnDiagramGraphImport.__import_element_by_tag_name(diagram_graph, sequence_flows,
-                                                                    subprocess_id,
-                                                                    subprocess_attributes, element,
-                                                                    tag_name)
-
-        for flow in utils.BpmnImportUtils.iterate_elements(subprocess_element):
-            if flow.nodeType != flow.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(flow.tagName)
-                if tag_name == consts.Consts.sequence_flow:
-                    BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph,
-                                                                         sequence_flows,
-                                                                         subprocess_id,
-                                                                         flow)
+        BpmnDiagramGraphImport.import_flow_elements(diagram_graph, sequence_flows, subprocess_id,
+                                                    subprocess_attributes, subprocess_element)
 
     @staticmethod
     def import_data_object_to_graph(diagram_graph, process_id, process_attributes,
@@ -832,8 +1227,8 @@ class BpmnDiagramGraphImport(object):
         diagram_graph[source_ref][target_ref][consts.Consts.source_ref] = source_ref
         diagram_graph[source_ref][target_ref][consts.Consts.target_ref] = target_ref
         for element in utils.BpmnImportUtils.iterate_elements(flow_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
+            if element.nodeType == element.ELEMENT_NODE:
+                tag_name = element.localName
                 if tag_name == consts.Consts.condition_expression:
                     condition_expression = element.firstChild.nodeValue
                     diagram_graph[source_ref][target_ref][consts.Consts.condition_expression] = {
@@ -908,7 +1303,7 @@ class BpmnDiagramGraphImport(object):
             incoming_list.append(flow_id)
 
     @staticmethod
-    def import_shape_di(participants_dict, diagram_graph, shape_element):
+    def import_shape_di(participants_dict, diagram_graph, shape_element, bounds=None):
         """
         Adds Diagram Interchange information (information about rendering a diagram) to appropriate
         BPMN diagram element in graph node.
@@ -921,33 +1316,33 @@ class BpmnDiagramGraphImport(object):
 
         :param participants_dict: dictionary with 'participant' elements attributes,
         :param diagram_graph: NetworkX graph representing a BPMN process diagram,
-        :param shape_element: object representing a BPMN XML 'BPMNShape' element.
+        :param shape_element: object representing a BPMN XML 'BPMNShape' element,
+        :param bounds: dictionary with already parsed 'Bounds' of shape (see read_shape_bounds), parsed from
+            shape_element when not given.
         """
         element_id = shape_element.getAttribute(consts.Consts.bpmn_element)
-        bounds = shape_element.getElementsByTagNameNS("*", "Bounds")[0]
+        if bounds is None:
+            bounds = BpmnDiagramGraphImport.read_shape_bounds(shape_element)
         if diagram_graph.has_node(element_id):
             node = diagram_graph._node[element_id]
-            node[consts.Consts.width] = bounds.getAttribute(consts.Consts.width)
-            node[consts.Consts.height] = bounds.getAttribute(consts.Consts.height)
+            node[consts.Consts.width] = bounds[consts.Consts.width]
+            node[consts.Consts.height] = bounds[consts.Consts.height]
 
             if node.get(consts.Consts.type, "Missing") == consts.Consts.subprocess:
                 node[consts.Consts.is_expanded] = \
                     shape_element.getAttribute(consts.Consts.is_expanded) \
                         if shape_element.hasAttribute(consts.Consts.is_expanded) else "false"
-            node[consts.Consts.x] = bounds.getAttribute(consts.Consts.x)
-            node[consts.Consts.y] = bounds.getAttribute(consts.Consts.y)
+            node[consts.Consts.x] = bounds[consts.Consts.x]
+            node[consts.Consts.y] = bounds[consts.Consts.y]
         if element_id in participants_dict:
             # BPMNShape is either connected with FlowNode or Participant
             participant_attr = participants_dict[element_id]
             participant_attr[consts.Consts.is_horizontal] = shape_element.getAttribute(
                 consts.Consts.is_horizontal)
-            participant_attr[consts.Consts.width] = bounds.getAttribute(consts.Consts.width)
-            participant_attr[consts.Consts.height] = bounds.getAttribute(consts.Consts.height)
-            participant_attr[consts.Consts.x] = bounds.getAttribute(consts.Consts.x)
-            participant_attr[consts.Consts.y] = bounds.getAttribute(consts.Consts.y)
+            participant_attr.update(bounds)
 
     @staticmethod
-    def import_flow_di(diagram_graph, sequence_flows, message_flows, flow_element):
+    def import_flow_di(diagram_graph, sequence_flows, message_flows, flow_element, waypoints=None):
         """
         Adds Diagram Interchange information (information about rendering a diagram) to appropriate
         BPMN sequence flow represented as graph edge.
@@ -961,17 +1356,13 @@ class BpmnDiagramGraphImport(object):
         :param message_flows: dictionary (associative list) of message flows existing in diagram.
             Key attribute is messageFlow ID, value is a dictionary consisting three key-value pairs: "name" (message
             flow name), "sourceRef" (ID of node, that is a flow source) and "targetRef" (ID of node, that is a flow target),
-        :param flow_element: object representing a BPMN XML 'BPMNEdge' element.
+        :param flow_element: object representing a BPMN XML 'BPMNEdge' element,
+        :param waypoints: list of already parsed waypoints of edge (see read_edge_waypoints), parsed from
+            flow_element when not given.
         """
         flow_id = flow_element.getAttribute(consts.Consts.bpmn_element)
-        waypoints_xml = flow_element.getElementsByTagNameNS("*", consts.Consts.waypoint)
-        length = len(waypoints_xml)
-
-        waypoints = [None] * length
-        for index in range(length):
-            waypoint_tmp = (waypoints_xml[index].getAttribute(consts.Consts.x),
-                            waypoints_xml[index].getAttribute(consts.Consts.y))
-            waypoints[index] = waypoint_tmp
+        if waypoints is None:
+            waypoints = BpmnDiagramGraphImport.read_edge_waypoints(flow_element)
 
         flow_data = None
         if flow_id in sequence_flows:
@@ -995,3 +1386,61 @@ class BpmnDiagramGraphImport(object):
         """
         dom_tree = minidom.parse(filepath)
         return dom_tree
+
+
+class FlowNodeHandler(object):
+    """
+    Element handler calling flow node import function, which does not use sequence flows. Unlike a closure, it can
+    be pickled (if the function can), so it is passed to worker processes of parallel import.
+    """
+    __slots__ = ("import_function",)
+
+    def __init__(self, import_function):
+        self.import_function = import_function
+
+    def __call__(self, diagram_graph, sequence_flows, process_id, process_attributes, element):
+        self.import_function(diagram_graph, process_id, process_attributes, element)
+
+
+def _set_element_handlers(element_handlers):
+    """
+    Initializer of worker processes of parallel import - replaces element handlers with the ones of the parent.
+    """
+    BpmnDiagramGraphImport.element_handlers.clear()
+    BpmnDiagramGraphImport.element_handlers.update(element_handlers)
+
+
+def _register_default_element_handlers():
+    flow_node_handler = BpmnDiagramGraphImport.flow_node_handler
+    default_handlers = {
+        consts.Consts.task: flow_node_handler(BpmnDiagramGraphImport.import_task_to_graph),
+        consts.Consts.user_task: flow_node_handler(BpmnDiagramGraphImport.import_task_to_graph),
+        consts.Consts.service_task: flow_node_handler(BpmnDiagramGraphImport.import_task_to_graph),
+        consts.Consts.manual_task: flow_node_handler(BpmnDiagramGraphImport.import_task_to_graph),
+        consts.Consts.send_task: flow_node_handler(BpmnDiagramGraphImport.import_task_to_graph),
+        consts.Consts.call_activity: flow_node_handler(BpmnDiagramGraphImport.import_task_to_graph),
+        consts.Consts.subprocess: BpmnDiagramGraphImport.import_subprocess_to_graph,
+        consts.Consts.data_object: flow_node_handler(BpmnDiagramGraphImport.import_data_object_to_graph),
+        consts.Consts.inclusive_gateway: flow_node_handler(
+            BpmnDiagramGraphImport.import_incl_or_excl_gateway_to_graph),
+        consts.Consts.exclusive_gateway: flow_node_handler(
+            BpmnDiagramGraphImport.import_incl_or_excl_gateway_to_graph),
+        consts.Consts.parallel_gateway: flow_node_handler(BpmnDiagramGraphImport.import_parallel_gateway_to_graph),
+        consts.Consts.event_based_gateway: flow_node_handler(
+            BpmnDiagramGraphImport.import_event_based_gateway_to_graph),
+        consts.Consts.complex_gateway: flow_node_handler(BpmnDiagramGraphImport.import_complex_gateway_to_graph),
+        consts.Consts.start_event: flow_node_handler(BpmnDiagramGraphImport.import_start_event_to_graph),
+        consts.Consts.end_event: flow_node_handler(BpmnDiagramGraphImport.import_end_event_to_graph),
+        consts.Consts.intermediate_catch_event: flow_node_handler(
+            BpmnDiagramGraphImport.import_intermediate_catch_event_to_graph),
+        consts.Consts.intermediate_throw_event: flow_node_handler(
+            BpmnDiagramGraphImport.import_intermediate_throw_event_to_graph),
+        consts.Consts.boundary_event: flow_node_handler(BpmnDiagramGraphImport.import_boundary_event_to_graph),
+    }
+    for local_name, handler in default_handlers.items():
+        BpmnDiagramGraphImport.register_element_handler(local_name, handler)
+    BpmnDiagramGraphImport.default_element_handlers.update(default_handlers)
+    BpmnDiagramGraphImport.flow_node_types = frozenset(default_handlers)
+
+
+_register_default_element_handlers()
@@ -2,8 +2,10 @@
 """
 Package with BPMNDiagramGraph - graph representation of BPMN diagram
 """
-import copy
 
+from . import bpmn_cycle_analysis as cycle_analysis
+from . import bpmn_instrumentation as instrumentation
+from . import bpmn_process_structure as process_structure
 from . import bpmn_python_consts as consts
 from . import grid_cell_class as cell_class
 
@@ -12,11 +14,20 @@ def generate_layout(bpmn_graph):
     """
     :param bpmn_graph: an instance of BPMNDiagramGraph class.
     """
-    classification = generate_elements_clasification(bpmn_graph)
-    (sorted_nodes_with_classification, backward_flows) = topological_sort(bpmn_graph, classification[0])
-    grid = grid_layout(bpmn_graph, sorted_nodes_with_classification)
-    set_coordinates_for_nodes(bpmn_graph, grid)
-    set_flows_waypoints(bpmn_graph)
+    with instrumentation.span("layout.classification"):
+        classification = generate_elements_clasification(bpmn_graph)
+    with instrumentation.span("layout.topological_sort"):
+        (sorted_nodes_with_classification, backward_flows) = topological_sort(bpmn_graph, classification[0])
+    with instrumentation.span("layout.structure"):
+        corresponding_splits = {}
+        for structure in process_structure.decompose(bpmn_graph).values():
+            corresponding_splits.update(structure.splits)
+    with instrumentation.span("layout.grid"):
+        grid = grid_layout(bpmn_graph, sorted_nodes_with_classification, corresponding_splits)
+    with instrumentation.span("layout.coordinates"):
+        set_coordinates_for_nodes(bpmn_graph, grid)
+    with instrumentation.span("layout.waypoints"):
+        set_flows_waypoints(bpmn_graph)
 
 
 def generate_elements_clasification(bpmn_graph):
@@ -144,77 +155,53 @@ def generate_elements_clasification(bpmn_graph):
 
 def topological_sort(bpmn_graph, nodes_with_classification):
     """
-    :return:
+    Sorts nodes topologically, ignoring back flows found by cycle analysis. Nodes are taken in rounds - nodes without
+    incoming flows first, then nodes whose all predecessors were sorted in previous rounds (in order of input list),
+    nodes of a single round are taken from the end.
+
+    :param bpmn_graph: an instance of BPMNDiagramGraph class,
+    :param nodes_with_classification: list of nodes with their classification,
+    :return: a tuple of sorted list of nodes with classification and list of backward flows.
     """
     node_param_name = "node"
-    classification_param_name = "classification"
 
-    tmp_nodes_with_classification = copy.deepcopy(nodes_with_classification)
-    sorted_nodes_with_classification = []
-    no_incoming_flow_nodes = []
-    backward_flows = []
+    back_flows = cycle_analysis.get_cycle_analysis(bpmn_graph).back_flows
+    positions = {}
+    incoming_counts = {}
+    for position, node_with_classification in enumerate(nodes_with_classification):
+        node = node_with_classification[node_param_name]
+        positions[node[0]] = position
+        incoming_counts[node[0]] = sum(1 for flow_id in node[1][consts.Consts.incoming_flow]
+                                       if flow_id not in back_flows)
 
-    while tmp_nodes_with_classification:
-        for node_with_classification in tmp_nodes_with_classification:
-            incoming_list = node_with_classification[node_param_name][1][consts.Consts.incoming_flow]
-            if len(incoming_list) == 0:
-                no_incoming_flow_nodes.append(node_with_classification)
-        if len(no_incoming_flow_nodes) > 0:
-            while len(no_incoming_flow_nodes) > 0:
-                node_with_classification = no_incoming_flow_nodes.pop()
-                tmp_nodes_with_classification.remove(node_with_classification)
-                sorted_nodes_with_classification \
-                    .append(next(tmp_node for tmp_node in nodes_with_classification
-                                 if tmp_node[node_param_name][0] == node_with_classification[node_param_name][0]))
-
-                outgoing_list = list(node_with_classification[node_param_name][1][consts.Consts.outgoing_flow])
-                tmp_outgoing_list = list(outgoing_list)
-
-                for flow_id in tmp_outgoing_list:
-                    '''
-                    - Remove the outgoing flow for source flow node (the one without incoming flows)
-                    - Get the target node
-                    - Remove the incoming flow for target flow node
-                    '''
-                    outgoing_list.remove(flow_id)
-                    node_with_classification[node_param_name][1][consts.Consts.outgoing_flow].remove(flow_id)
-
-                    flow = bpmn_graph.get_flow_by_id(flow_id)
-                    target_id = flow[2][consts.Consts.target_ref]
-                    target = next(tmp_node[node_param_name]
-                                  for tmp_node in tmp_nodes_with_classification
-                                  if tmp_node[node_param_name][0] == target_id)
-                    target[1][consts.Consts.incoming_flow].remove(flow_id)
-        else:
-            for node_with_classification in tmp_nodes_with_classification:
-                if "Join" in node_with_classification[classification_param_name]:
-                    incoming_list = list(node_with_classification[node_param_name][1][consts.Consts.incoming_flow])
-                    tmp_incoming_list = list(incoming_list)
-                    for flow_id in tmp_incoming_list:
-                        incoming_list.remove(flow_id)
-
-                        flow = bpmn_graph.get_flow_by_id(flow_id)
-
-                        source_id = flow[2][consts.Consts.source_ref]
-                        source = next(tmp_node[node_param_name]
-                                      for tmp_node in tmp_nodes_with_classification
-                                      if tmp_node[node_param_name][0] == source_id)
-                        source[1][consts.Consts.outgoing_flow].remove(flow_id)
-
-                        target_id = flow[2][consts.Consts.target_ref]
-                        target = next(tmp_node[node_param_name]
-                                      for tmp_node in tmp_nodes_with_classification
-                                      if tmp_node[node_param_name][0] == target_id)
-                        target[1][consts.Consts.incoming_flow].remove(flow_id)
-                        backward_flows.append(flow)
+    sorted_nodes_with_classification = []
+    no_incoming_flow_nodes = [node_id for node_id, count in incoming_counts.items() if count == 0]
+    while no_incoming_flow_nodes:
+        next_round = []
+        while no_incoming_flow_nodes:
+            node_with_classification = nodes_with_classification[positions[no_incoming_flow_nodes.pop()]]
+            sorted_nodes_with_classification.append(node_with_classification)
+            for flow_id in node_with_classification[node_param_name][1][consts.Consts.outgoing_flow]:
+                if flow_id in back_flows:
+                    continue
+                target_id = bpmn_graph.sequence_flows[flow_id][consts.Consts.target_ref]
+                if target_id not in incoming_counts:
+                    # node of type not handled by classification
+                    continue
+                incoming_counts[target_id] -= 1
+                if incoming_counts[target_id] == 0:
+                    next_round.append(target_id)
+        no_incoming_flow_nodes = sorted(next_round, key=positions.__getitem__)
+    backward_flows = [bpmn_graph.get_flow_by_id(flow_id) for flow_id in back_flows]
     return sorted_nodes_with_classification, backward_flows
 
 
-def grid_layout(bpmn_graph, sorted_nodes_with_classification):
+def grid_layout(bpmn_graph, sorted_nodes_with_classification, corresponding_splits=None):
     """
 
     :param sorted_nodes_with_classification:
     :param bpmn_graph:
+    :param corresponding_splits: dictionary mapping join id to id of its corresponding split,
     :return:
     """
     tmp_nodes_with_classification = list(sorted_nodes_with_classification)
@@ -225,12 +212,13 @@ def grid_layout(bpmn_graph, sorted_nodes_with_classification):
     while tmp_nodes_with_classification:
         node_with_classification = tmp_nodes_with_classification.pop(0)
         (grid, last_row, last_col) = place_element_in_grid(node_with_classification, grid, last_row, last_col,
-                                                           bpmn_graph, tmp_nodes_with_classification)
+                                                           bpmn_graph, tmp_nodes_with_classification,
+                                                           corresponding_splits=corresponding_splits)
     return grid
 
 
 def place_element_in_grid(node_with_classification, grid, last_row, last_col, bpmn_graph, nodes_with_classification,
-                          enforced_row_num=None):
+                          enforced_row_num=None, corresponding_splits=None):
     """
 
     :param node_with_classification:
@@ -240,6 +228,7 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
     :param bpmn_graph:
     :param nodes_with_classification:
     :param enforced_row_num:
+    :param corresponding_splits: dictionary mapping join id to id of its corresponding split,
     :return:
     """
     node_param_name = "node"
@@ -274,21 +263,30 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
     # TODO consider rule for split/join node
     else:
         # find the rightmost predecessor - put into next column
-        # if last_split was passed, use row number from it, otherwise compute mean from predecessors
+        # if corresponding split was already placed, use row number from it, otherwise compute mean from predecessors
         predecessors_id_list = []
         for flow_id in incoming_flows:
             flow = bpmn_graph.get_flow_by_id(flow_id)
             predecessors_id_list.append(flow[2][consts.Consts.source_ref])
+        split_id = corresponding_splits.get(node_id) if corresponding_splits else None
 
         max_col_num = 0
         row_num_sum = 0
-        # TODO try to implement corresponding split finding
+        placed_predecessors_num = 0
+        split_row = None
         for grid_cell in grid:
             if grid_cell.node_id in predecessors_id_list:
                 row_num_sum += grid_cell.row
+                placed_predecessors_num += 1
                 if grid_cell.col > max_col_num:
                     max_col_num = grid_cell.col
-        current_element_row = row_num_sum // len(predecessors_id_list)
+            if grid_cell.node_id == split_id:
+                split_row = grid_cell.row
+        # sources of backward flows (e.g. loop headers) are not placed yet
+        if split_row is not None:
+            current_element_row = split_row
+        else:
+            current_element_row = row_num_sum // max(placed_predecessors_num, 1)
         current_element_col = max_col_num + 1
         if enforced_row_num:
             insert_into_grid(grid, enforced_row_num, current_element_col, node_id)
@@ -300,9 +298,10 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
         for flow_id in outgoing_flows:
             flow = bpmn_graph.get_flow_by_id(flow_id)
             successors_id_list.append(flow[2][consts.Consts.target_ref])
-        num_of_successors = len(successors_id_list)
         successor_node_list = [successor_node for successor_node in nodes_with_classification
                                       if successor_node[node_param_name][0] in successors_id_list]
+        # targets of backward flows (loop headers) are already placed
+        num_of_successors = len(successor_node_list)
 
         if num_of_successors % 2 != 0:
             # if number of successors is even, put one half over the split, second half below
@@ -312,19 +311,22 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
                 # place element above split
                 successor_node = successor_node_list[index]
                 (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row + ((index + 1) * consts.Consts.grid_column_width))
+                                                                   bpmn_graph,nodes_with_classification, current_element_row + ((index + 1) * consts.Consts.grid_column_width),
+                                                                   corresponding_splits=corresponding_splits)
 
                 nodes_with_classification.remove(successor_node)
 
             successor_node = successor_node_list[centre]
             (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                               bpmn_graph,nodes_with_classification, current_element_row)
+                                                               bpmn_graph,nodes_with_classification, current_element_row,
+                                                               corresponding_splits=corresponding_splits)
             nodes_with_classification.remove(successor_node)
             for index in range(centre + 1, num_of_successors):
                 # place element below split
                 successor_node = successor_node_list[index]
                 (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row - ((index - centre) * consts.Consts.grid_column_width))
+                                                                   bpmn_graph,nodes_with_classification, current_element_row - ((index - centre) * consts.Consts.grid_column_width),
+                                                                   corresponding_splits=corresponding_splits)
 
                 nodes_with_classification.remove(successor_node)
         else:
@@ -333,7 +335,8 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
                 # place element above split
                 successor_node = successor_node_list[index]
                 (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row + (index + 1) * consts.Consts.grid_column_width)
+                                                                   bpmn_graph,nodes_with_classification, current_element_row + (index + 1) * consts.Consts.grid_column_width,
+                                                                   corresponding_splits=corresponding_splits)
 
                 nodes_with_classification.remove(successor_node)
 
@@ -342,7 +345,8 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
                 # place element below split
                 successor_node = successor_node_list[index]
                 (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row - ((index - centre + 1) * consts.Consts.grid_column_width))
+                                                                   bpmn_graph,nodes_with_classification, current_element_row - ((index - centre + 1) * consts.Consts.grid_column_width),
+                                                                   corresponding_splits=corresponding_splits)
 
                 nodes_with_classification.remove(successor_node)
 
@@ -369,7 +373,7 @@ def insert_into_grid(grid, row, col, node_id):
     if occupied_cell:
         for grid_cell in grid:
             if grid_cell.row >= row:
-                grid_cell.row += consts.Consts.width
+                grid_cell.row += consts.Consts.grid_column_width
     grid.append(cell_class.GridCell(row, col, node_id))
 
 
@@ -8,6 +8,8 @@ from collections import Counter
 
 from math import sqrt
 
+from . import bpmn_process_structure as process_structure
+
 GATEWAY_TYPES = ['inclusiveGateway', 'exclusiveGateway', 'parallelGateway', 'eventBasedGateway', 'complexGateway']
 EVENT_TYPES = ['startEvent', 'endEvent', 'intermediateCatchEvent', 'intermediateThrowEvent']
 
@@ -344,3 +346,54 @@ def PerfectSquare_metric(bpmn_graph):
             potential_perfect_square -= 1
 
     return 0
+
+
+def NestingDepth_metric(bpmn_graph):
+    """
+    Returns the value of the Nesting Depth metric
+    ("Maximal number of single-entry-single-exit fragments - blocks and loops - nested in each other")
+    for the BPMNDiagramGraph instance.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph representing BPMN model.
+    """
+
+    return max((structure.max_depth() for structure in process_structure.decompose(bpmn_graph).values()), default=0)
+
+
+def Structuredness_metric(bpmn_graph):
+    """
+    Returns the value of the Structuredness metric
+    ("Ratio of the number of split and join gateways paired in single-entry-single-exit fragments
+    to the total number of split and join gateways")
+    for the BPMNDiagramGraph instance, 1.0 for models without split and join gateways.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph representing BPMN model.
+    """
+
+    paired = set()
+    for structure in process_structure.decompose(bpmn_graph).values():
+        paired.update(structure.pairs)
+        paired.update(structure.splits)
+        paired.update(structure.loops)
+        paired.update(structure.loops.values())
+    gateways_ids = [gateway[0] for gateway in get_all_gateways(bpmn_graph)
+                    if len(gateway[1]['incoming']) > 1 or len(gateway[1]['outgoing']) > 1]
+    if not gateways_ids:
+        return 1.0
+
+    return float(sum(1 for gateway_id in gateways_ids if gateway_id in paired)) / float(len(gateways_ids))
+
+
+def CriticalPathDuration_metric(bpmn_graph):
+    """
+    Returns the value of the Critical Path Duration metric
+    ("Expected duration of the process, with activities lasting one time unit and equally probable
+    exclusive branches")
+    for the BPMNDiagramGraph instance.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph representing BPMN model.
+    """
+
+    # imported here, since the analysis depends on numpy
+    from . import bpmn_critical_path as critical_path
+    return float(critical_path.critical_path(bpmn_graph).duration[0])
@@ -2,16 +2,18 @@
 """
 Package with BPMNDiagramGraph - graph representation of BPMN diagram
 """
+import itertools
 import uuid
 
 import networkx as nx
 
+from . import bpmn_compact_nodes as compact_nodes
 from . import bpmn_diagram_exception as bpmn_exception
 from . import bpmn_diagram_export as bpmn_export
 from . import bpmn_diagram_import as bpmn_import
 from . import bpmn_process_csv_export as bpmn_csv_export
-from . import bpmn_process_csv_import as bpmn_csv_import
 from . import bpmn_python_consts as consts
+from . import bpmn_typed_model as typed_model
 
 
 class BpmnDiagramGraph(object):
@@ -36,11 +38,27 @@ class BpmnDiagramGraph(object):
         Key is an ID of process, value is a dictionary of all process attributes,
 
     * diagram_attributes - dictionary that contains BPMN diagram element attributes,
-    * plane_attributes - dictionary that contains BPMN plane element attributes.
+    * plane_attributes - dictionary that contains BPMN plane element attributes,
+    * attribute_source - LazyAttributeSource of diagram imported in topology-only mode, None otherwise.
     """
 
     # String "constants" used in multiple places
     id_prefix = "id"
+    # default values of type specific attributes of nodes added with add_nodes, the same as defaults of single
+    # element methods (e.g. add_start_event_to_diagram)
+    node_type_defaults = {
+        consts.Consts.subprocess: {consts.Consts.is_expanded: "false", consts.Consts.triggered_by_event: "false"},
+        consts.Consts.start_event: {consts.Consts.parallel_multiple: "false", consts.Consts.is_interrupting: "true",
+                                    consts.Consts.event_definitions: []},
+        consts.Consts.end_event: {consts.Consts.event_definitions: []},
+        consts.Consts.intermediate_catch_event: {consts.Consts.parallel_multiple: "false",
+                                                 consts.Consts.event_definitions: []},
+        consts.Consts.intermediate_throw_event: {consts.Consts.event_definitions: []},
+        consts.Consts.exclusive_gateway: {consts.Consts.gateway_direction: "Unspecified"},
+        consts.Consts.inclusive_gateway: {consts.Consts.gateway_direction: "Unspecified"},
+        consts.Consts.parallel_gateway: {consts.Consts.gateway_direction: "Unspecified"},
+        consts.Consts.complex_gateway: {consts.Consts.gateway_direction: "Unspecified"},
+    }
     bpmndi_namespace = "bpmndi:"
 
     def __init__(self):
@@ -53,16 +71,93 @@ class BpmnDiagramGraph(object):
         self.diagram_attributes = {}
         self.plane_attributes = {}
         self.collaboration = {}
+        self.attribute_source = None
 
-    def load_diagram_from_xml_file(self, filepath):
+    def load_diagram_from_xml_file(self, filepath, parallel=False, max_workers=None, topology_only=False):
         """
         Reads an XML file from given filepath and maps it into inner representation of BPMN diagram.
         Returns an instance of BPMNDiagramGraph class.
 
-        :param filepath: string with output filepath.
+        :param filepath: string with output filepath,
+        :param parallel: boolean flag, imports each 'process' element in a worker process,
+        :param max_workers: maximal number of worker processes used in parallel mode,
+        :param topology_only: boolean flag, imports only id, type, process and flow IDs of nodes, remaining
+            attributes are loaded on first access (see materialize_attributes).
+        """
+
+        bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml(filepath, self, parallel, max_workers,
+                                                                 topology_only)
+
+    def load_diagram_from_xml_stream(self, stream, parallel=False, max_workers=None, topology_only=False):
+        """
+        Reads BPMN 2.0 XML from a binary file-like object and maps it into inner representation of BPMN diagram.
+
+        :param stream: binary file-like object (e.g. io.BytesIO or HTTP request body),
+        :param parallel: boolean flag, imports each 'process' element in a worker process,
+        :param max_workers: maximal number of worker processes used in parallel mode,
+        :param topology_only: boolean flag, imports only id, type, process and flow IDs of nodes, remaining
+            attributes are loaded on first access (see materialize_attributes).
+        """
+        bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml_stream(stream, self, parallel, max_workers,
+                                                                        topology_only)
+
+    def load_diagram_from_bytes(self, data, parallel=False, max_workers=None, topology_only=False):
+        """
+        Parses BPMN 2.0 XML document passed as bytes and maps it into inner representation of BPMN diagram.
+
+        :param data: bytes (or string) object with XML document,
+        :param parallel: boolean flag, imports each 'process' element in a worker process,
+        :param max_workers: maximal number of worker processes used in parallel mode,
+        :param topology_only: boolean flag, imports only id, type, process and flow IDs of nodes, remaining
+            attributes are loaded on first access (see materialize_attributes).
+        """
+        bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml_bytes(data, self, parallel, max_workers,
+                                                                       topology_only)
+
+    def compact_nodes(self):
+        """
+        Converts attributes of all nodes into memory efficient CompactNodeRecord objects, which are still
+        accessed as mappings. Incoming and outgoing flows of compacted nodes are stored as tuples.
+
+        :return: number of converted nodes.
+        """
+        return compact_nodes.compact_nodes(self)
+
+    def expand_nodes(self):
+        """
+        Converts CompactNodeRecord objects back into plain attribute dictionaries.
+
+        :return: number of converted nodes.
         """
+        return compact_nodes.expand_nodes(self)
 
-        bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml(filepath, self)
+    def to_typed_model(self, validate=False):
+        """
+        Converts diagram into typed object model (classes from graph.classes package).
+
+        :param validate: boolean flag, if set, every value is type checked by setters of typed classes.
+        :return: a dictionary, where key is process ID and value is an instance of Process class.
+        """
+        return typed_model.to_typed_model(self, validate)
+
+    def load_diagram_from_typed_model(self, processes):
+        """
+        Creates a new diagram from typed object model.
+
+        :param processes: an iterable of Process objects or a dictionary with Process objects as values.
+        """
+        self.create_new_diagram_graph()
+        typed_model.from_typed_model(processes, self)
+
+    def materialize_attributes(self):
+        """
+        Loads all attributes skipped by topology-only import: remaining node attributes, edge attributes
+        (e.g. waypoints), lanes and participants DI. Node attributes are also loaded implicitly on first access,
+        other attributes require this call. Does nothing for diagrams imported with all attributes.
+        """
+        if self.attribute_source is not None:
+            self.attribute_source.materialize_diagram(self)
+            self.attribute_source = None
 
     def export_xml_file(self, directory, filename):
         """
@@ -73,6 +168,22 @@ class BpmnDiagramGraph(object):
         """
         bpmn_export.BpmnDiagramGraphExport.export_xml_file(directory, filename, self)
 
+    def export_xml_stream(self, stream):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (with Diagram Interchange data) to a binary file-like object.
+
+        :param stream: binary file-like object.
+        """
+        bpmn_export.BpmnDiagramGraphExport.export_xml_stream(stream, self)
+
+    def export_xml_bytes(self):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (with Diagram Interchange data).
+
+        :return: UTF-8 encoded XML document.
+        """
+        return bpmn_export.BpmnDiagramGraphExport.export_xml_bytes(self)
+
     def export_xml_file_no_di(self, directory, filename):
         """
         Exports diagram inner graph to BPMN 2.0 XML file (without Diagram Interchange data).
@@ -82,6 +193,22 @@ class BpmnDiagramGraph(object):
         """
         bpmn_export.BpmnDiagramGraphExport.export_xml_file_no_di(directory, filename, self)
 
+    def export_xml_stream_no_di(self, stream):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (without Diagram Interchange data) to a binary file-like object.
+
+        :param stream: binary file-like object.
+        """
+        bpmn_export.BpmnDiagramGraphExport.export_xml_stream_no_di(stream, self)
+
+    def export_xml_bytes_no_di(self):
+        """
+        Exports diagram inner graph as BPMN 2.0 XML (without Diagram Interchange data).
+
+        :return: UTF-8 encoded XML document.
+        """
+        return bpmn_export.BpmnDiagramGraphExport.export_xml_bytes_no_di(self)
+
     def load_diagram_from_csv_file(self, filepath):
         """
         Reads an CSV file from given filepath and maps it into inner representation of BPMN diagram.
@@ -89,9 +216,20 @@ class BpmnDiagramGraph(object):
 
         :param filepath: string with output filepath.
         """
-
+        # imported here, CSV import requires pandas, which is slow to import and not needed otherwise
+        from . import bpmn_process_csv_import as bpmn_csv_import
         bpmn_csv_import.BpmnDiagramGraphCSVImport.load_diagram_from_csv(filepath, self)
 
+    def load_diagram_from_csv_stream(self, stream):
+        """
+        Reads CSV from a file-like object and maps it into inner representation of BPMN diagram.
+
+        :param stream: binary or text file-like object.
+        """
+        # imported here, CSV import requires pandas, which is slow to import and not needed otherwise
+        from . import bpmn_process_csv_import as bpmn_csv_import
+        bpmn_csv_import.BpmnDiagramGraphCSVImport.load_diagram_from_csv(stream, self)
+
     def export_csv_file(self, directory, filename):
         """
         Exports diagram inner graph to BPMN 2.0 XML file (with Diagram Interchange data).
@@ -101,6 +239,22 @@ class BpmnDiagramGraph(object):
         """
         bpmn_csv_export.BpmnDiagramGraphCsvExport.export_process_to_csv(self, directory, filename)
 
+    def export_csv_stream(self, stream):
+        """
+        Exports diagram inner graph to CSV and writes it to a binary file-like object.
+
+        :param stream: binary file-like object.
+        """
+        bpmn_csv_export.BpmnDiagramGraphCsvExport.export_process_to_csv_stream(self, stream)
+
+    def export_csv_bytes(self):
+        """
+        Exports diagram inner graph to CSV.
+
+        :return: UTF-8 encoded CSV document.
+        """
+        return bpmn_csv_export.BpmnDiagramGraphCsvExport.export_process_to_csv_bytes(self)
+
     # Querying methods
     def get_nodes(self, node_type=""):
         """
@@ -530,12 +684,170 @@ class BpmnDiagramGraph(object):
              (target_node[consts.Consts.x], target_node[consts.Consts.y])]
 
         # add target node (target_ref_id) as outgoing node from source node (source_ref_id)
-        source_node[consts.Consts.outgoing_flow].append(sequence_flow_id)
+        compact_nodes.extend_flows(source_node, consts.Consts.outgoing_flow, (sequence_flow_id,))
 
         # add source node (source_ref_id) as incoming node to target node (target_ref_id)
-        target_node[consts.Consts.incoming_flow].append(sequence_flow_id)
+        compact_nodes.extend_flows(target_node, consts.Consts.incoming_flow, (sequence_flow_id,))
         return sequence_flow_id, flow
 
+    @staticmethod
+    def uuid_id_generator():
+        """
+        Returns ID generator (function without parameters, returning a new ID on each call), which creates
+        IDs from uuid4 - the same way as single element methods, e.g. add_task_to_diagram.
+        """
+        return lambda: BpmnDiagramGraph.id_prefix + str(uuid.uuid4())
+
+    @staticmethod
+    def counter_id_generator(prefix=id_prefix + "_", start=None, bpmn_diagram=None):
+        """
+        Returns ID generator, which creates IDs from given prefix and consecutive numbers. It is much cheaper than
+        uuid4, but IDs are unique only within a single diagram - generated IDs are checked against the diagram
+        before insertion. A generator may be reused by many calls of add_nodes and add_sequence_flows.
+
+        :param prefix: string object. Prefix of generated IDs. Default value - "id_",
+        :param start: integer. First number used. Default value - None, the number following the greatest number
+            used with given prefix by IDs of nodes, sequence flows and processes of bpmn_diagram (1 if no diagram
+            is given),
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class, which IDs are skipped by the generator.
+        """
+        if start is None:
+            start = 1
+            if bpmn_diagram is not None:
+                for element_id in itertools.chain(bpmn_diagram.diagram_graph._node, bpmn_diagram.sequence_flows,
+                                                  bpmn_diagram.process_elements):
+                    if isinstance(element_id, str) and element_id.startswith(prefix):
+                        number = element_id[len(prefix):]
+                        if number.isdigit():
+                            start = max(start, int(number) + 1)
+        counter = itertools.count(start)
+        return lambda: prefix + str(next(counter))
+
+    def add_nodes(self, process_id, nodes, id_generator=None):
+        """
+        Adds many Flow Nodes to diagram at once. All nodes are validated before any of them is inserted, so
+        diagram is not modified if any node is invalid.
+
+        Each node is described either by a tuple (node type, node name) or by a mapping with node attributes,
+        where "type" is required, "node_name" and "id" are optional, and remaining attributes (e.g.
+        "gatewayDirection") are copied to the node. Missing attributes get the same default values as in single
+        element methods (e.g. add_start_event_to_diagram), including default size and position.
+
+        :param process_id: string object. ID of parent process,
+        :param nodes: an iterable of node descriptions,
+        :param id_generator: ID generator (see counter_id_generator) used for nodes without ID. Default value -
+            None, uuid4 based IDs are used. IDs must not be used by other nodes or sequence flows.
+        :return: a list of IDs of added nodes, in order of descriptions.
+        """
+        if process_id not in self.process_elements:
+            raise bpmn_exception.BpmnPythonError("Process '" + str(process_id) + "' does not exist")
+        if id_generator is None:
+            id_generator = BpmnDiagramGraph.uuid_id_generator()
+        node_types = bpmn_import.BpmnDiagramGraphImport.flow_node_types
+        existing_nodes = self.diagram_graph._node
+        type_defaults = BpmnDiagramGraph.node_type_defaults
+        new_nodes = {}
+        for node in nodes:
+            if isinstance(node, tuple):
+                (node_type, name), description = node, None
+            else:
+                description = node
+                node_type = description.get(consts.Consts.type)
+                name = description.get(consts.Consts.node_name, "")
+            if node_type not in node_types:
+                raise bpmn_exception.BpmnPythonError("Invalid node type passed. Value passed: " + str(node_type))
+            node_id = description.get(consts.Consts.id) if description is not None else None
+            if node_id is None:
+                node_id = id_generator()
+            if node_id in existing_nodes or node_id in new_nodes:
+                raise bpmn_exception.BpmnPythonError("Node with ID '" + str(node_id) + "' already exists")
+            if node_id in self.sequence_flows:
+                raise bpmn_exception.BpmnPythonError("Sequence flow with ID '" + str(node_id) + "' already exists")
+            attributes = {consts.Consts.id: node_id, consts.Consts.type: node_type, consts.Consts.node_name: name,
+                          consts.Consts.incoming_flow: [], consts.Consts.outgoing_flow: [],
+                          consts.Consts.process: process_id, consts.Consts.width: "100",
+                          consts.Consts.height: "100", consts.Consts.x: "100", consts.Consts.y: "100"}
+            defaults = type_defaults.get(node_type)
+            if defaults is not None:
+                for key, value in defaults.items():
+                    attributes[key] = list(value) if isinstance(value, list) else value
+            if description is not None:
+                for key, value in description.items():
+                    if key not in (consts.Consts.id, consts.Consts.incoming_flow, consts.Consts.outgoing_flow,
+                                   consts.Consts.process):
+                        attributes[key] = value
+            gateway_direction = attributes.get(consts.Consts.gateway_direction, "Unspecified")
+            if gateway_direction not in ("Unspecified", "Converging", "Diverging", "Mixed"):
+                raise bpmn_exception.BpmnPythonError("Invalid value passed as gatewayDirection parameter. "
+                                                     "Value passed: " + str(gateway_direction))
+            new_nodes[node_id] = attributes
+
+        self.diagram_graph.add_nodes_from(new_nodes.items())
+        node_ids = self.process_elements[process_id].get(consts.Consts.node_ids)
+        if node_ids is not None:
+            node_ids.extend(new_nodes)
+        return list(new_nodes)
+
+    def add_sequence_flows(self, process_id, flows, id_generator=None):
+        """
+        Adds many SequenceFlow elements to diagram at once. All flows are validated before any of them is inserted,
+        so diagram is not modified if any flow is invalid. Incoming and outgoing flow lists of each node are updated
+        once per call.
+
+        :param process_id: string object. ID of parent process,
+        :param flows: an iterable of tuples (source node ID, target node ID) or (source node ID, target node ID,
+            sequence flow name),
+        :param id_generator: ID generator (see counter_id_generator). Default value - None, uuid4 based IDs are
+            used. IDs must not be used by other sequence flows or nodes.
+        :return: a list of IDs of added sequence flows, in order of descriptions.
+        """
+        if process_id not in self.process_elements:
+            raise bpmn_exception.BpmnPythonError("Process '" + str(process_id) + "' does not exist")
+        if id_generator is None:
+            id_generator = BpmnDiagramGraph.uuid_id_generator()
+        node_attributes = self.diagram_graph._node
+        new_flows = []
+        flow_ids = set()
+        for flow in flows:
+            if len(flow) == 3:
+                source_ref_id, target_ref_id, name = flow
+            else:
+                (source_ref_id, target_ref_id), name = flow, ""
+            for node_id in (source_ref_id, target_ref_id):
+                if node_id not in node_attributes:
+                    raise bpmn_exception.BpmnPythonError("Node with ID '" + str(node_id) + "' does not exist")
+            flow_id = id_generator()
+            if flow_id in self.sequence_flows or flow_id in flow_ids:
+                raise bpmn_exception.BpmnPythonError("Sequence flow with ID '" + str(flow_id) + "' already exists")
+            if flow_id in node_attributes:
+                raise bpmn_exception.BpmnPythonError("Node with ID '" + str(flow_id) + "' already exists")
+            flow_ids.add(flow_id)
+            new_flows.append((flow_id, source_ref_id, target_ref_id, name))
+
+        sequence_flows = {}
+        outgoing_flows = {}
+        incoming_flows = {}
+        edges = []
+        for flow_id, source_ref_id, target_ref_id, name in new_flows:
+            sequence_flows[flow_id] = {consts.Consts.name: name, consts.Consts.source_ref: source_ref_id,
+                                       consts.Consts.target_ref: target_ref_id}
+            source_node = node_attributes[source_ref_id]
+            target_node = node_attributes[target_ref_id]
+            edges.append((source_ref_id, target_ref_id, {
+                consts.Consts.id: flow_id, consts.Consts.name: name, consts.Consts.process: process_id,
+                consts.Consts.source_ref: source_ref_id, consts.Consts.target_ref: target_ref_id,
+                consts.Consts.waypoints: [(source_node[consts.Consts.x], source_node[consts.Consts.y]),
+                                          (target_node[consts.Consts.x], target_node[consts.Consts.y])]}))
+            outgoing_flows.setdefault(source_ref_id, []).append(flow_id)
+            incoming_flows.setdefault(target_ref_id, []).append(flow_id)
+        self.sequence_flows.update(sequence_flows)
+        self.diagram_graph.add_edges_from(edges)
+        for node_id, flow_ids in outgoing_flows.items():
+            compact_nodes.extend_flows(node_attributes[node_id], consts.Consts.outgoing_flow, flow_ids)
+        for node_id, flow_ids in incoming_flows.items():
+            compact_nodes.extend_flows(node_attributes[node_id], consts.Consts.incoming_flow, flow_ids)
+        return [flow[0] for flow in new_flows]
+
     def get_nodes_positions(self):
         """
         Getter method for nodes positions.
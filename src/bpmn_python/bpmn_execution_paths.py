@@ -0,0 +1,295 @@
+# coding=utf-8
+"""
+Execution paths of processes - exact counting, lazy enumeration and a small set of paths covering every sequence
+flow, e.g. for generation of test scenarios.
+
+Execution path is a single run of a process from a start to the end: exclusive gateways take one outgoing flow,
+parallel gateways (and other nodes with several outgoing flows) all of them, inclusive and complex gateways any
+non-empty subset. Back flows (see bpmn_cycle_analysis) are removed, so loops are executed once. Branches of
+parallel and inclusive splits are combined, so a path through a parallel block with branches of a and b paths
+is one of a * b combinations, through an inclusive block one of (a + 1) * (b + 1) - 1.
+
+Splits are matched with their joins by the SESE decomposition (see bpmn_process_structure) and numbers of paths
+are computed bottom-up, in reverse topological order, for every node up to the join of the innermost enclosing
+block. That is a single O(N + E) pass with Python integers, so numbers of paths do not overflow. Paths are
+numbered: every number in range(count) is decoded (in time linear in the size of the path) into a distinct path,
+so paths are enumerated lazily, and can be sampled uniformly, without enumerating the preceding ones.
+
+Counting is exact, when branches of every parallel or inclusive split without a matching join never meet again
+(e.g. each ends with its own end event) - such branches run independently. Branches of an unmatched split, which
+meet in a node (an unstructured region, like a parallel join synchronizing branches of different splits), are
+not independent, so PathEngine raises BpmnPythonError for such processes instead of returning a wrong number.
+Unmatched exclusive splits are always counted exactly, since their branches are alternatives.
+
+Covering paths are decoded from the same structure: a sequence of fragments needs as many paths as the most
+demanding fragment, alternative branches the sum of their needs, parallel branches the maximum. The result is
+minimal for models built from nested blocks, for unstructured ones it is an upper bound.
+"""
+import random
+
+from . import bpmn_cycle_analysis as cycle_analysis
+from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_python_consts as consts
+from . import bpmn_process_structure as process_structure
+
+_exclusive = 0
+_parallel = 1
+_inclusive = 2
+
+
+class ExecutionPath(object):
+    """
+    Execution path - ids of executed nodes, in topological order, and ids of taken sequence flows, ordered by their
+    sources.
+    """
+    __slots__ = ("nodes", "flows")
+
+    def __init__(self, nodes, flows):
+        self.nodes = nodes
+        self.flows = flows
+
+    def __repr__(self):
+        return f"ExecutionPath(nodes={len(self.nodes)}, flows={len(self.flows)})"
+
+
+class PathEngine(object):
+    """
+    Execution paths of a single process (or subprocess):
+
+    - count - number of execution paths,
+    - cover_size - number of paths returned by covering_paths.
+    """
+
+    def __init__(self, bpmn_graph, process_id, node_ids=None, structure=None):
+        """
+        :param bpmn_graph: an instance of BpmnDiagramGraph class,
+        :param process_id: id of process (or subprocess),
+        :param node_ids: ids of nodes of the process, taken from 'process' attribute of nodes if not given,
+        :param structure: ProcessStructure of the process, computed if not given.
+        """
+        nodes = bpmn_graph.diagram_graph._node
+        if node_ids is None:
+            node_ids = [node_id for node_id, node in nodes.items() if node.get(consts.Consts.process) == process_id]
+        members = set(node_ids)
+        analysis = cycle_analysis.get_cycle_analysis(bpmn_graph)
+        structure = structure or process_structure.decompose_process(bpmn_graph, process_id, node_ids)
+        self.process_id = process_id
+        self.order = [node_id for node_id in analysis.topological_order if node_id in members]
+        self.position = {node_id: position for position, node_id in enumerate(self.order)}
+        self.outgoing = {node_id: [] for node_id in self.order}
+        has_incoming = set()
+        for flow_id, flow in bpmn_graph.sequence_flows.items():
+            source, target = flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+            if source in members and target in members and flow_id not in analysis.back_flows:
+                self.outgoing[source].append((flow_id, target))
+                has_incoming.add(target)
+        self.sources = [node_id for node_id in self.order if node_id not in has_incoming]
+        self.kinds = {}
+        for node_id in self.order:
+            node_type = nodes[node_id][consts.Consts.type]
+            if node_type in (consts.Consts.exclusive_gateway, consts.Consts.event_based_gateway):
+                self.kinds[node_id] = _exclusive
+            elif node_type in (consts.Consts.inclusive_gateway, consts.Consts.complex_gateway):
+                self.kinds[node_id] = _inclusive
+            else:
+                self.kinds[node_id] = _parallel
+        self.joins = {split: join for split, join in structure.pairs.items() if join in members}
+
+        # nodes of a block are counted up to its join, nodes outside of blocks up to the end of the process
+        fragment_stops = {structure.root: None}
+        for fragment in structure.fragments:
+            fragment_stops[fragment] = fragment.exit if fragment.kind == process_structure.BLOCK \
+                else fragment_stops[fragment.parent]
+        self.stops = {node_id: fragment_stops[structure.fragment_of[node_id]] for node_id in self.order}
+
+        self.counts = {}
+        self.covers = {}
+        for node_id in reversed(self.order):
+            flows = self.outgoing[node_id]
+            if not flows:
+                self.counts[node_id] = self.covers[node_id] = 1
+                continue
+            join = self.joins.get(node_id)
+            stop = join if join is not None else self.stops[node_id]
+            kind = self.kinds[node_id]
+            if join is None and kind != _exclusive and len(flows) > 1:
+                self._check_independent(node_id, stop)
+            counts, covers = self._branches(flows, stop)
+            self.counts[node_id] = _combine_counts(kind, counts)
+            self.covers[node_id] = _combine_covers(kind, covers)
+            if join is not None:
+                self.counts[node_id] *= self.counts[join]
+                self.covers[node_id] = max(self.covers[node_id], self.covers[join])
+        self.count = sum(self.counts[source] for source in self.sources)
+        self.cover_size = sum(self.covers[source] for source in self.sources)
+
+    def path(self, number):
+        """
+        :param number: number of the path, in range(count).
+        :return: ExecutionPath object.
+        """
+        if not 0 <= number < self.count:
+            raise IndexError(f"Path number {number} out of range, process has {self.count} paths")
+        return self._decode(number, self.counts, False)
+
+    def paths(self, limit=None, start=0):
+        """
+        Generates execution paths lazily, in order of their numbers.
+
+        :param limit: maximal number of generated paths, all paths if None,
+        :param start: number of the first generated path.
+        """
+        end = self.count if limit is None else min(self.count, start + limit)
+        for number in range(start, end):
+            yield self._decode(number, self.counts, False)
+
+    def sample(self, size, seed=None):
+        """
+        :param size: number of paths,
+        :param seed: seed of random numbers.
+        :return: a list of execution paths drawn uniformly, with replacement.
+        """
+        generator = random.Random(seed)
+        return [self._decode(generator.randrange(self.count), self.counts, False) for _ in range(size)]
+
+    def covering_paths(self):
+        """
+        Generates cover_size execution paths, which together take every sequence flow of the process (except back
+        flows).
+        """
+        for number in range(self.cover_size):
+            yield self._decode(number, self.covers, True)
+
+    def _check_independent(self, split, stop):
+        """
+        Checks, that branches of a split without matching join do not meet before the stop node. Blocks nested
+        in branches are skipped, since their nodes are only reachable through their splits.
+        """
+        branch_of = {}
+        for index, (_, target) in enumerate(self.outgoing[split]):
+            stack = [target]
+            while stack:
+                node_id = stack.pop()
+                if node_id == stop:
+                    continue
+                branch = branch_of.get(node_id)
+                if branch == index:
+                    continue
+                if branch is not None:
+                    raise bpmn_exception.BpmnPythonError(
+                        f"Process '{self.process_id}' is not structured - branches of split '{split}' meet in node "
+                        f"'{node_id}', which is not the matching join, so execution paths cannot be counted")
+                branch_of[node_id] = index
+                join = self.joins.get(node_id)
+                stack.extend([join] if join is not None else [next_id for _, next_id in self.outgoing[node_id]])
+
+    def _branches(self, flows, stop):
+        """
+        :return: a tuple of lists of numbers of paths and covering paths of branches starting with the flows,
+            up to the stop node.
+        """
+        counts = [1 if target == stop else self.counts[target] for _, target in flows]
+        covers = [1 if target == stop else self.covers[target] for _, target in flows]
+        return counts, covers
+
+    def _decode(self, number, values, cover):
+        """
+        Decodes path number (in mixed radix given by numbers of paths of branches) into a path. For covering
+        paths, every fragment uses the number modulo its number of covering paths.
+        """
+        for source in self.sources:
+            if number < values[source]:
+                break
+            number -= values[source]
+        nodes = set()
+        flows = []
+        stack = [(source, number)]
+        while stack:
+            node_id, number = stack.pop()
+            nodes.add(node_id)
+            outgoing = self.outgoing[node_id]
+            if not outgoing:
+                continue
+            join = self.joins.get(node_id)
+            stop = join if join is not None else self.stops[node_id]
+            counts, covers = self._branches(outgoing, stop)
+            branches = covers if cover else counts
+            kind = self.kinds[node_id]
+            if join is not None:
+                if cover:
+                    stack.append((join, number % values[join]))
+                    number %= _combine_covers(kind, branches)
+                else:
+                    number, rest = divmod(number, values[join])
+                    stack.append((join, rest))
+            for index, branch_number in _choose(kind, branches, number, cover):
+                flow_id, target = outgoing[index]
+                flows.append((self.position[node_id], flow_id))
+                if target != stop:
+                    stack.append((target, branch_number))
+        return ExecutionPath(tuple(sorted(nodes, key=self.position.__getitem__)),
+                             tuple(flow_id for _, flow_id in sorted(flows)))
+
+
+def path_engines(bpmn_graph):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: dictionary mapping process (or subprocess) id to its PathEngine.
+    """
+    nodes_by_process = {}
+    for node_id, node in bpmn_graph.diagram_graph._node.items():
+        nodes_by_process.setdefault(node.get(consts.Consts.process), []).append(node_id)
+    return {process_id: PathEngine(bpmn_graph, process_id, node_ids)
+            for process_id, node_ids in nodes_by_process.items()}
+
+
+def count_paths(bpmn_graph):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: dictionary mapping process (or subprocess) id to number of its execution paths.
+    """
+    return {process_id: engine.count for process_id, engine in path_engines(bpmn_graph).items()}
+
+
+def _combine_counts(kind, counts):
+    result = 1
+    if kind == _exclusive:
+        return sum(counts)
+    if kind == _parallel:
+        for count in counts:
+            result *= count
+        return result
+    for count in counts:
+        result *= count + 1
+    return result - 1
+
+
+def _combine_covers(kind, covers):
+    return sum(covers) if kind == _exclusive else max(covers)
+
+
+def _choose(kind, branches, number, cover):
+    """
+    :return: a list of (index of branch, number of path of the branch) pairs of taken branches.
+    """
+    if kind == _exclusive:
+        for index, count in enumerate(branches):
+            if number < count:
+                return [(index, number)]
+            number -= count
+        raise IndexError("Path number out of range")
+    if cover:
+        return [(index, number % count) for index, count in enumerate(branches)]
+    chosen = []
+    if kind == _parallel:
+        for index, count in enumerate(branches):
+            number, branch_number = divmod(number, count)
+            chosen.append((index, branch_number))
+        return chosen
+    # inclusive - digit 0 of the branch means it is not taken, digit d means its path d - 1
+    number += 1
+    for index, count in enumerate(branches):
+        number, digit = divmod(number, count + 1)
+        if digit:
+            chosen.append((index, digit - 1))
+    return chosen
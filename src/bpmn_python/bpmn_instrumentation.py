@@ -0,0 +1,226 @@
+# coding=utf-8
+"""
+Lightweight instrumentation of import, layout and report generation stages.
+
+Code is instrumented with named spans (``with span("import.processes"): ...``). Span durations are passed to
+registered sinks - logging, JSON lines or in-process histogram. When no sink is registered, span() returns
+a shared no-op context manager, so instrumentation costs only a single list check.
+"""
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+_sinks = []
+_sinks_lock = threading.Lock()
+
+
+class _NullSpan(object):
+    """
+    No-op span, returned when instrumentation is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """
+    Context manager measuring wall clock duration of a named stage and passing it to all registered sinks.
+    """
+    __slots__ = ("name", "attributes", "start")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        for sink in list(_sinks):
+            sink.emit(self.name, duration, self.attributes)
+        return False
+
+
+def span(name, **attributes):
+    """
+    Returns context manager measuring duration of the stage with given name.
+
+    :param name: string with stage name, dot separated (e.g. 'report.render'),
+    :param attributes: additional values passed to sinks together with the duration.
+    """
+    if not _sinks:
+        return _NULL_SPAN
+    return Span(name, attributes)
+
+
+def is_enabled():
+    """
+    Returns True if at least one sink is registered.
+    """
+    return bool(_sinks)
+
+
+def add_sink(sink):
+    """
+    Registers sink. Sink is any object with method emit(name, duration, attributes).
+
+    :param sink: sink object.
+    :return: the registered sink.
+    """
+    with _sinks_lock:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    """
+    Unregisters previously registered sink.
+
+    :param sink: sink object.
+    """
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def clear_sinks():
+    """
+    Unregisters all sinks, disabling instrumentation.
+    """
+    with _sinks_lock:
+        del _sinks[:]
+
+
+class LoggingSink(object):
+    """
+    Sink writing every span to the logger.
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("bpmn_python.instrumentation")
+        self.level = level
+
+    def emit(self, name, duration, attributes):
+        self.logger.log(self.level, "%s took %.6f s %s", name, duration, attributes or "")
+
+
+class JsonLinesSink(object):
+    """
+    Sink writing every span as a single JSON line to a text stream or a file.
+    """
+
+    def __init__(self, output):
+        self.lock = threading.Lock()
+        if isinstance(output, (str, os.PathLike)):
+            self.stream = open(output, "a")
+            self.owns_stream = True
+        else:
+            self.stream = output
+            self.owns_stream = False
+
+    def emit(self, name, duration, attributes):
+        record = {"name": name, "duration": duration, "timestamp": time.time()}
+        record.update(attributes)
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.stream.write(line + "\n")
+
+    def close(self):
+        """
+        Closes underlying file, if it was opened by the sink.
+        """
+        if self.owns_stream:
+            self.stream.close()
+
+
+class HistogramSink(object):
+    """
+    Sink collecting span durations in memory, grouped by span name.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = {}
+
+    def emit(self, name, duration, attributes):
+        with self.lock:
+            self.durations.setdefault(name, []).append(duration)
+
+    def summary(self):
+        """
+        Returns a dictionary, key is span name, value is a dictionary with count, total, min, max, mean,
+        median (p50) and 95th percentile (p95) of durations in seconds.
+        """
+        with self.lock:
+            durations = {name: sorted(values) for name, values in self.durations.items()}
+        result = {}
+        for name, values in durations.items():
+            count = len(values)
+            total = sum(values)
+            result[name] = {"count": count, "total": total, "min": values[0], "max": values[-1],
+                            "mean": total / count, "p50": values[(count - 1) // 2],
+                            "p95": values[min(count - 1, int(round(0.95 * (count - 1))))]}
+        return result
+
+    def reset(self):
+        """
+        Removes all collected durations.
+        """
+        with self.lock:
+            self.durations.clear()
+
+
+@contextlib.contextmanager
+def capture_profile(name, directory, memory=True, memory_top=25):
+    """
+    Opt-in profiling of a block of code. Writes cProfile statistics to '<directory>/<name>.prof' and, if memory
+    is set, top tracemalloc allocation sites to '<directory>/<name>_memory.txt'.
+    When directory is None, nothing is captured.
+
+    :param name: string used as output file name prefix,
+    :param directory: output directory or None,
+    :param memory: boolean flag, enables tracemalloc capture,
+    :param memory_top: number of allocation sites written to memory report.
+    """
+    if directory is None:
+        yield
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(directory, name + ".prof"))
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            with open(os.path.join(directory, name + "_memory.txt"), "w") as memory_file:
+                memory_file.write("Peak traced memory: {} B\n".format(peak))
+                for statistic in snapshot.statistics("lineno")[:memory_top]:
+                    memory_file.write(str(statistic) + "\n")
@@ -0,0 +1,202 @@
+# coding=utf-8
+"""
+Lazy attributes of nodes imported in topology-only mode.
+
+Topology-only import keeps on each node just its id, type, process and incoming/outgoing flow ids. The remaining
+attributes are loaded from retained, compressed XML source the first time any of them is accessed. Loading fills
+the whole diagram at once and releases the source, so a loaded diagram takes as much memory as one imported with
+all attributes.
+"""
+import copy
+import threading
+import zlib
+
+from . import bpmn_python_consts as consts
+
+
+class LazyAttributeSource(object):
+    """
+    Compressed XML document, from which remaining attributes of diagram imported in topology-only mode are loaded
+    on first request. The document is imported once, its attributes are moved into the topology-only diagram
+    (values are shared, not copied) and both the imported diagram and the compressed document are released.
+    """
+
+    def __init__(self, document_bytes):
+        self.compressed_document = zlib.compress(document_bytes)
+        self.lock = threading.Lock()
+        # diagram imported in topology-only mode, set by the importer
+        self.bpmn_diagram = None
+
+    def is_loaded(self):
+        """
+        Returns True if attributes were already loaded and the document released.
+        """
+        return self.compressed_document is None
+
+    def materialize_node(self, node_attributes):
+        """
+        Loads remaining attributes of the diagram, which the node belongs to. Node removed from the diagram before
+        loading is filled as well, if it is the one requesting attributes.
+
+        :param node_attributes: LazyNodeAttributes object created with this source.
+        """
+        with self.lock:
+            if self.compressed_document is not None:
+                self._load(self.bpmn_diagram, node_attributes)
+            node_attributes.source = None
+
+    def materialize_diagram(self, bpmn_diagram):
+        """
+        Loads all remaining attributes of nodes, edges (e.g. waypoints), processes and participants
+        (e.g. lane and pool DI) into diagram imported in topology-only mode.
+
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class, imported in topology-only mode.
+        """
+        with self.lock:
+            if self.compressed_document is not None:
+                self._load(bpmn_diagram)
+
+    def _load(self, bpmn_diagram, node_attributes=None):
+        # imported here, since the importer itself depends on this module
+        from . import bpmn_diagram_rep
+        full_diagram = bpmn_diagram_rep.BpmnDiagramGraph()
+        full_diagram.load_diagram_from_bytes(zlib.decompress(self.compressed_document))
+        self.compressed_document = None
+        self.bpmn_diagram = None
+        full_nodes = full_diagram.diagram_graph._node
+        if node_attributes is not None:
+            _fill_node(node_attributes, full_nodes.get(dict.get(node_attributes, consts.Consts.id), {}))
+        if bpmn_diagram is None:
+            return
+        bpmn_diagram.attribute_source = None
+
+        full_graph = full_diagram.diagram_graph
+        diagram_graph = bpmn_diagram.diagram_graph
+        for node_id, attributes in diagram_graph._node.items():
+            _fill_node(attributes, full_nodes.get(node_id, {}))
+        for source_ref, target_ref, edge_attributes in diagram_graph.edges(data=True):
+            if full_graph.has_edge(source_ref, target_ref):
+                for key, value in full_graph[source_ref][target_ref].items():
+                    edge_attributes.setdefault(key, value)
+        for process_id, process_attributes in full_diagram.process_elements.items():
+            target_attributes = bpmn_diagram.process_elements.setdefault(process_id, {})
+            for key, value in process_attributes.items():
+                if key == consts.Consts.lane_set:
+                    target_attributes[key] = value
+                else:
+                    target_attributes.setdefault(key, value)
+        participants = bpmn_diagram.collaboration.get(consts.Consts.participants, {})
+        for participant_id, participant_attributes in \
+                full_diagram.collaboration.get(consts.Consts.participants, {}).items():
+            if participant_id in participants:
+                for key, value in participant_attributes.items():
+                    participants[participant_id].setdefault(key, value)
+        for key in (consts.Consts.id, consts.Consts.name):
+            if key in full_diagram.diagram_attributes:
+                bpmn_diagram.diagram_attributes.setdefault(key, full_diagram.diagram_attributes[key])
+        bpmn_diagram.plane_attributes.update(full_diagram.plane_attributes)
+
+
+def _fill_node(attributes, full_attributes):
+    """
+    Adds attributes missing in node attributes. Nodes imported by element handlers (not in topology-only form)
+    get only attributes skipped by topology-only import, e.g. Diagram Interchange bounds.
+    """
+    if isinstance(attributes, LazyNodeAttributes):
+        for key, value in full_attributes.items():
+            if not dict.__contains__(attributes, key):
+                dict.__setitem__(attributes, key, value)
+        attributes.source = None
+    else:
+        for key, value in full_attributes.items():
+            if key not in attributes:
+                attributes[key] = value
+
+
+class LazyNodeAttributes(dict):
+    """
+    Node attributes dictionary, which holds topology attributes only. First access to any other key (including
+    'in' checks, iteration and copying) loads the remaining attributes of the whole diagram from attribute source.
+    Attributes already stored on the node are never overwritten.
+    """
+    __slots__ = ("source",)
+
+    def __init__(self, source=None, *args, **kwargs):
+        super(LazyNodeAttributes, self).__init__(*args, **kwargs)
+        self.source = source
+
+    def materialize(self):
+        """
+        Loads remaining attributes of the node from attribute source.
+        """
+        source = self.source
+        if source is not None:
+            source.materialize_node(self)
+
+    def is_materialized(self):
+        """
+        Returns True if remaining attributes were already loaded.
+        """
+        return self.source is None
+
+    def __missing__(self, key):
+        if self.source is None:
+            raise KeyError(key)
+        self.materialize()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if not dict.__contains__(self, key) and self.source is not None:
+            self.materialize()
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if not dict.__contains__(self, key) and self.source is not None:
+            self.materialize()
+        return dict.get(self, key, default)
+
+    def __iter__(self):
+        self.materialize()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.materialize()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self.materialize()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self.materialize()
+        return dict.__ne__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self.materialize()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self.materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self.materialize()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize()
+        return dict.items(self)
+
+    def copy(self):
+        self.materialize()
+        return dict(self)
+
+    def __reduce__(self):
+        self.materialize()
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo):
+        self.materialize()
+        return copy.deepcopy(dict(self), memo)
@@ -6,18 +6,19 @@ Process Modeling" by Kluza k. and Wisniewski P.
 from __future__ import print_function
 
 import copy
-import errno
+import io
 import os
 import string
 
 from . import bpmn_python_consts as consts
 from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_cycle_analysis as cycle_analysis
 from . import bpmn_import_utils as utils
+from . import bpmn_process_structure as process_structure
 
 
 class BpmnDiagramGraphCsvExport(object):
     # TODO read user and add 'who' param
-    # TODO loops
     """
     Class that provides implementation of exporting process to CSV functionality
     """
@@ -40,6 +41,8 @@ class BpmnDiagramGraphCsvExport(object):
     def __init__(self):
         pass
 
+    csv_header = "Order,Activity,Condition,Who,Subprocess,Terminated\n"
+
     @staticmethod
     def export_process_to_csv(bpmn_diagram, directory, filename):
         """
@@ -49,6 +52,46 @@ class BpmnDiagramGraphCsvExport(object):
         :param directory: a string object, which is a path of output directory,
         :param filename: a string object, which is a name of output file.
         """
+        export_elements = BpmnDiagramGraphCsvExport.export_process_elements(bpmn_diagram)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, filename), "w") as file_object:
+            file_object.write(BpmnDiagramGraphCsvExport.csv_header)
+            BpmnDiagramGraphCsvExport.write_export_node_to_file(file_object, export_elements)
+
+    @staticmethod
+    def export_process_to_csv_stream(bpmn_diagram, stream):
+        """
+        Exports process to CSV and writes it, UTF-8 encoded, to a binary file-like object.
+
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param stream: binary file-like object (e.g. io.BytesIO, socket file or HTTP response body).
+        """
+        stream.write(BpmnDiagramGraphCsvExport.export_process_to_csv_bytes(bpmn_diagram))
+
+    @staticmethod
+    def export_process_to_csv_bytes(bpmn_diagram):
+        """
+        Exports process to CSV and returns it as bytes.
+
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class.
+        :return: UTF-8 encoded CSV document.
+        """
+        export_elements = BpmnDiagramGraphCsvExport.export_process_elements(bpmn_diagram)
+        text_buffer = io.StringIO()
+        text_buffer.write(BpmnDiagramGraphCsvExport.csv_header)
+        BpmnDiagramGraphCsvExport.write_export_node_to_file(text_buffer, export_elements)
+        return text_buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def export_process_elements(bpmn_diagram):
+        """
+        Walks the process from its start event and returns the list of rows used in exported CSV document.
+
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class.
+        :return: a list of dictionaries, one per exported CSV row.
+        """
         nodes = copy.deepcopy(bpmn_diagram.get_nodes())
         start_nodes = []
         export_elements = []
@@ -61,22 +104,23 @@ class BpmnDiagramGraphCsvExport(object):
             raise bpmn_exception.BpmnPythonError("Exporting to CSV format accepts only one start event")
 
         nodes_classification = utils.BpmnImportUtils.generate_nodes_clasification(bpmn_diagram)
+        pairs = process_structure.split_join_pairs(bpmn_diagram)
+        back_flows = cycle_analysis.get_cycle_analysis(bpmn_diagram).back_flows
+        loops = {flow_id: bpmn_diagram.sequence_flows[flow_id][consts.Consts.target_ref] for flow_id in back_flows}
+        # loop header is not a join, if it merges only its entry flow with back flows
+        for node_id, node_classification in nodes_classification.items():
+            if BpmnDiagramGraphCsvExport.classification_join in node_classification:
+                incoming_flows = bpmn_diagram.diagram_graph._node[node_id][consts.Consts.incoming_flow]
+                if sum(1 for flow_id in incoming_flows if flow_id not in back_flows) < 2:
+                    node_classification.remove(BpmnDiagramGraphCsvExport.classification_join)
         start_node = start_nodes.pop()
-        BpmnDiagramGraphCsvExport.export_node(bpmn_diagram, export_elements, start_node, nodes_classification)
-
-        try:
-            os.makedirs(directory)
-        except OSError as exception:
-            if exception.errno != errno.EEXIST:
-                raise
-        file_object = open(directory + filename, "w")
-        file_object.write("Order,Activity,Condition,Who,Subprocess,Terminated\n")
-        BpmnDiagramGraphCsvExport.write_export_node_to_file(file_object, export_elements)
-        file_object.close()
+        BpmnDiagramGraphCsvExport.export_node(bpmn_diagram, export_elements, start_node, nodes_classification,
+                                              pairs=pairs, loops=loops, loop_starts={})
+        return export_elements
 
     @staticmethod
     def export_node(bpmn_graph, export_elements, node, nodes_classification, order=0, prefix="", condition="", who="",
-                    add_join=False):
+                    add_join=False, pairs=None, loops=None, loop_starts=None):
         """
         General method for node exporting
 
@@ -90,25 +134,30 @@ class BpmnDiagramGraphCsvExport(object):
                the branch
         :param condition: the condition param of exported node,
         :param who: the condition param of exported node,
-        :param add_join: boolean flag. Used to indicate if "Join" element should be added to CSV.
+        :param add_join: boolean flag. Used to indicate if "Join" element should be added to CSV,
+        :param pairs: dictionary mapping split id to id of its corresponding join,
+        :param loops: dictionary mapping id of back flow to id of its target (loop header),
+        :param loop_starts: dictionary mapping id of exported node to index of its first row in export_elements.
         :return: None or the next node object if the exported node was a gateway join.
         """
         node_type = node[1][consts.Consts.type]
         if node_type == consts.Consts.start_event:
             return BpmnDiagramGraphCsvExport.export_start_event(bpmn_graph, export_elements, node, nodes_classification,
                                                                 order=order, prefix=prefix, condition=condition,
-                                                                who=who)
+                                                                who=who, pairs=pairs,
+                                                                loops=loops, loop_starts=loop_starts)
         elif node_type == consts.Consts.end_event:
             return BpmnDiagramGraphCsvExport.export_end_event(export_elements, node, order=order, prefix=prefix,
                                                               condition=condition, who=who)
         else:
             return BpmnDiagramGraphCsvExport.export_element(bpmn_graph, export_elements, node, nodes_classification,
                                                             order=order, prefix=prefix, condition=condition, who=who,
-                                                            add_join=add_join)
+                                                            add_join=add_join, pairs=pairs,
+                                                            loops=loops, loop_starts=loop_starts)
 
     @staticmethod
     def export_element(bpmn_graph, export_elements, node, nodes_classification, order=0, prefix="", condition="",
-                       who="", add_join=False):
+                       who="", add_join=False, pairs=None, loops=None, loop_starts=None):
         """
         Export a node with "Element" classification (task, subprocess or gateway)
 
@@ -122,7 +171,10 @@ class BpmnDiagramGraphCsvExport(object):
                the branch
         :param condition: the condition param of exported node,
         :param who: the condition param of exported node,
-        :param add_join: boolean flag. Used to indicate if "Join" element should be added to CSV.
+        :param add_join: boolean flag. Used to indicate if "Join" element should be added to CSV,
+        :param pairs: dictionary mapping split id to id of its corresponding join,
+        :param loops: dictionary mapping id of back flow to id of its target (loop header),
+        :param loop_starts: dictionary mapping id of exported node to index of its first row in export_elements.
         :return: None or the next node object if the exported node was a gateway join.
         """
         node_type = node[1][consts.Consts.type]
@@ -137,16 +189,10 @@ class BpmnDiagramGraphCsvExport(object):
 
         if BpmnDiagramGraphCsvExport.classification_join in node_classification and not add_join:
             # If the node is a join, then retract the recursion back to the split.
-            # In case of activity - return current node. In case of gateway - return outgoing node
-            # (we are making assumption that join has only one outgoing node)
-            if node_type == consts.Consts.task or node_type == consts.Consts.subprocess:
-                return node
-            else:
-                outgoing_flow_id = outgoing_flows[0]
-                outgoing_flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
-                outgoing_node = bpmn_graph.get_node_by_id(outgoing_flow[2][consts.Consts.target_ref])
-                return outgoing_node
+            return BpmnDiagramGraphCsvExport.get_node_after_join(bpmn_graph, node)
         else:
+            if loop_starts is not None:
+                loop_starts.setdefault(node[0], len(export_elements))
             if node_type == consts.Consts.task:
                 export_elements.append({"Order": prefix + str(order), "Activity": node[1][consts.Consts.node_name],
                                         "Condition": condition, "Who": who, "Subprocess": "", "Terminated": ""})
@@ -157,6 +203,10 @@ class BpmnDiagramGraphCsvExport(object):
         if BpmnDiagramGraphCsvExport.classification_split in node_classification:
             next_node = None
             alphabet_suffix_index = 0
+            # split closing a loop with a single flow leaving it - export continues after the split, like after
+            # a join, both branches are "goto" rows
+            forward_flows = [flow_id for flow_id in outgoing_flows if not loops or flow_id not in loops]
+            loop_exit_flow_id = forward_flows[0] if len(forward_flows) == 1 < len(outgoing_flows) else None
             for outgoing_flow_id in outgoing_flows:
                 outgoing_flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
                 outgoing_node = bpmn_graph.get_node_by_id(outgoing_flow[2][consts.Consts.target_ref])
@@ -172,41 +222,133 @@ class BpmnDiagramGraphCsvExport(object):
                 else:
                     condition = ""
 
-                if BpmnDiagramGraphCsvExport.classification_join in nodes_classification[outgoing_node[0]]:
+                if loops and outgoing_flow_id in loops:
+                    export_elements.append(
+                        {"Order": next_prefix + str(1),
+                         "Activity": "goto " + BpmnDiagramGraphCsvExport.get_loop_start_order(
+                             export_elements, outgoing_node[0], loop_starts, prefix + str(order + 1)),
+                         "Condition": condition, "Who": who, "Subprocess": "", "Terminated": ""})
+                elif outgoing_flow_id == loop_exit_flow_id:
+                    next_node = BpmnDiagramGraphCsvExport.export_loop_exit(bpmn_graph, export_elements, outgoing_node,
+                                                                           next_prefix, order, prefix, condition, who)
+                elif BpmnDiagramGraphCsvExport.classification_join in nodes_classification[outgoing_node[0]]:
                     export_elements.append(
                         {"Order": next_prefix + str(1), "Activity": "goto " + prefix + str(order + 1),
                          "Condition": condition, "Who": who, "Subprocess": "", "Terminated": ""})
                 elif outgoing_flow_id == default_flow_id:
                     tmp_next_node = BpmnDiagramGraphCsvExport.export_node(bpmn_graph, export_elements, outgoing_node,
                                                                           nodes_classification, 1, next_prefix, "else",
-                                                                          who)
+                                                                          who, pairs=pairs,
+                                                                          loops=loops, loop_starts=loop_starts)
                     if tmp_next_node is not None:
                         next_node = tmp_next_node
                 else:
                     tmp_next_node = BpmnDiagramGraphCsvExport.export_node(bpmn_graph, export_elements, outgoing_node,
                                                                           nodes_classification, 1, next_prefix,
-                                                                          condition, who)
+                                                                          condition, who, pairs=pairs,
+                                                                          loops=loops, loop_starts=loop_starts)
                     if tmp_next_node is not None:
                         next_node = tmp_next_node
 
+            if pairs and node[0] in pairs:
+                # export continues after the corresponding join, also if no branch reached it (e.g. all branches
+                # lead directly to the join or some of them end with an end event)
+                join_node = bpmn_graph.get_node_by_id(pairs[node[0]])
+                next_node = BpmnDiagramGraphCsvExport.get_node_after_join(bpmn_graph, join_node)
             if next_node is not None:
                 return BpmnDiagramGraphCsvExport.export_node(bpmn_graph, export_elements, next_node,
                                                              nodes_classification, order=(order + 1), prefix=prefix,
-                                                             who=who, add_join=True)
-
+                                                             who=who, add_join=True, pairs=pairs,
+                                                             loops=loops, loop_starts=loop_starts)
+
+        elif len(outgoing_flows) == 1 and loops and outgoing_flows[0] in loops:
+            # flow back to the loop header, which was already exported
+            export_elements.append(
+                {"Order": prefix + str(order + 1),
+                 "Activity": "goto " + BpmnDiagramGraphCsvExport.get_loop_start_order(
+                     export_elements, loops[outgoing_flows[0]], loop_starts, prefix + str(order + 1)),
+                 "Condition": "", "Who": who, "Subprocess": "", "Terminated": ""})
+            return None
         elif len(outgoing_flows) == 1:
             outgoing_flow_id = outgoing_flows[0]
             outgoing_flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
             outgoing_node = bpmn_graph.get_node_by_id(outgoing_flow[2][consts.Consts.target_ref])
+            # gateway without split and join (e.g. loop header) is not exported as a row, so it does not use order
+            if node_type == consts.Consts.task or node_type == consts.Consts.subprocess:
+                order += 1
             return BpmnDiagramGraphCsvExport.export_node(bpmn_graph, export_elements, outgoing_node,
-                                                         nodes_classification, order=(order + 1), prefix=prefix,
-                                                         who=who)
+                                                         nodes_classification, order=order, prefix=prefix,
+                                                         who=who, pairs=pairs, loops=loops, loop_starts=loop_starts)
         else:
             return None
 
+    @staticmethod
+    def export_loop_exit(bpmn_graph, export_elements, node, branch_prefix, order, prefix, condition, who):
+        """
+        Exports the branch leaving a loop. Activity leaving the loop is exported as the only element of the branch
+        (the same way as loops are written by hand), otherwise the branch is a "goto" to the element following
+        the split.
+
+        :param bpmn_graph: an instance of BpmnDiagramGraph class,
+        :param export_elements: a list of already exported rows,
+        :param node: networkx.Node object, the first node after the loop,
+        :param branch_prefix: the prefix of the branch,
+        :param order: the order param of split closing the loop,
+        :param prefix: the prefix of split closing the loop,
+        :param condition: the condition param of the branch,
+        :param who: the condition param of exported node.
+        :return: the node object, at which export continues after the split.
+        """
+        node_type = node[1][consts.Consts.type]
+        outgoing_flows = node[1][consts.Consts.outgoing_flow]
+        if (node_type == consts.Consts.task or node_type == consts.Consts.subprocess) and len(outgoing_flows) == 1:
+            export_elements.append({"Order": branch_prefix + str(1), "Activity": node[1][consts.Consts.node_name],
+                                    "Condition": condition, "Who": who,
+                                    "Subprocess": "yes" if node_type == consts.Consts.subprocess else "",
+                                    "Terminated": ""})
+            outgoing_flow = bpmn_graph.get_flow_by_id(outgoing_flows[0])
+            return bpmn_graph.get_node_by_id(outgoing_flow[2][consts.Consts.target_ref])
+        export_elements.append({"Order": branch_prefix + str(1), "Activity": "goto " + prefix + str(order + 1),
+                                "Condition": condition, "Who": who, "Subprocess": "", "Terminated": ""})
+        return node
+
+    @staticmethod
+    def get_loop_start_order(export_elements, header_id, loop_starts, default_order):
+        """
+        Returns order of the first row exported for loop header (or after it, if header is a gateway),
+        which is the target of "goto" row closing the loop.
+
+        :param export_elements: a list of already exported rows,
+        :param header_id: string object, ID of loop header,
+        :param loop_starts: dictionary mapping id of exported node to index of its first row in export_elements,
+        :param default_order: order returned if no row was exported for header yet.
+        :return: string object, order of the row.
+        """
+        position = loop_starts.get(header_id) if loop_starts is not None else None
+        if position is None or position >= len(export_elements):
+            return default_order
+        return export_elements[position]["Order"]
+
+    @staticmethod
+    def get_node_after_join(bpmn_graph, join_node):
+        """
+        Returns the node, at which export continues after the join. In case of activity - the join itself,
+        in case of gateway - its outgoing node (we are making assumption that join has only one outgoing node).
+
+        :param bpmn_graph: an instance of BpmnDiagramGraph class,
+        :param join_node: networkx.Node object of the join.
+        :return: networkx.Node object.
+        """
+        node_type = join_node[1][consts.Consts.type]
+        if node_type == consts.Consts.task or node_type == consts.Consts.subprocess:
+            return join_node
+        outgoing_flow_id = join_node[1][consts.Consts.outgoing_flow][0]
+        outgoing_flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
+        return bpmn_graph.get_node_by_id(outgoing_flow[2][consts.Consts.target_ref])
+
     @staticmethod
     def export_start_event(bpmn_graph, export_elements, node, nodes_classification, order=0, prefix="", condition="",
-                           who=""):
+                           who="", pairs=None, loops=None, loop_starts=None):
         """
         Start event export
 
@@ -220,6 +362,9 @@ class BpmnDiagramGraphCsvExport(object):
                the branch
         :param condition: the condition param of exported node,
         :param who: the condition param of exported node,
+        :param pairs: dictionary mapping split id to id of its corresponding join,
+        :param loops: dictionary mapping id of back flow to id of its target (loop header),
+        :param loop_starts: dictionary mapping id of exported node to index of its first row in export_elements.
         :return: None or the next node object if the exported node was a gateway join.
         """
 
@@ -246,7 +391,8 @@ class BpmnDiagramGraphCsvExport(object):
         outgoing_flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
         outgoing_node = bpmn_graph.get_node_by_id(outgoing_flow[2][consts.Consts.target_ref])
         return BpmnDiagramGraphCsvExport.export_node(bpmn_graph, export_elements, outgoing_node, nodes_classification,
-                                                     order + 1, prefix, who)
+                                                     order + 1, prefix, who, pairs=pairs,
+                                                     loops=loops, loop_starts=loop_starts)
 
     @staticmethod
     def export_end_event(export_elements, node, order=0, prefix="", condition="", who=""):
@@ -0,0 +1,315 @@
+# coding=utf-8
+"""
+Single-entry-single-exit (SESE) decomposition of processes, based on dominator and postdominator trees.
+
+Every process (and every subprocess - its nodes are decomposed separately) is turned into a flow graph with
+a virtual entry connected to nodes without incoming flows and a virtual exit reached from nodes without outgoing
+flows. Fragment is a pair of nodes (entry, exit) such that entry dominates exit and exit postdominates entry,
+so every path reaching the fragment interior passes the entry and every path leaving it passes the exit:
+
+- block - split node paired with its immediate postdominator (the corresponding join), if the split dominates it
+  and the postdominator merges flows,
+- loop - loop header (target of a back flow) paired with the node closing the loop (source of the back flow),
+  if the closing node postdominates the header.
+
+Fragments form a tree (root fragment represents the whole process), nesting depth of a node is the number of
+fragments containing it in their interior (entry and exit nodes belong to the enclosing fragment).
+
+Dominators are computed with the iterative algorithm of Cooper, Harvey and Kennedy, which needs two or three
+linear passes on the graphs of process models. Assigning nodes to fragments costs O(N * d), d being the maximal
+nesting depth, so the whole decomposition is linear for models of bounded nesting.
+"""
+from . import bpmn_python_consts as consts
+
+BLOCK = "block"
+LOOP = "loop"
+PROCESS = "process"
+
+_entry = object()
+_exit = object()
+
+
+class Fragment(object):
+    """
+    SESE fragment. Entry and exit are node ids (None for the root fragment of a process), nodes lists ids of nodes
+    for which this is the innermost fragment, the remaining nodes of the interior belong to child fragments.
+    """
+    __slots__ = ("entry", "exit", "kind", "parent", "children", "depth", "nodes")
+
+    def __init__(self, entry, exit_, kind, parent=None):
+        self.entry = entry
+        self.exit = exit_
+        self.kind = kind
+        self.parent = parent
+        self.children = []
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.nodes = []
+
+    def all_nodes(self):
+        """
+        :return: a list of ids of all nodes in the interior of the fragment, including nested fragments.
+        """
+        result = []
+        stack = [self]
+        while stack:
+            fragment = stack.pop()
+            result.extend(fragment.nodes)
+            stack.extend(fragment.children)
+        return result
+
+    def __repr__(self):
+        return f"Fragment({self.kind}, {self.entry!r} -> {self.exit!r}, depth={self.depth})"
+
+
+class ProcessStructure(object):
+    """
+    Result of decomposition of a single process:
+
+    - idom / ipdom - immediate dominator / postdominator of every node (None if it is the virtual entry / exit),
+    - pairs - dictionary mapping split to its corresponding join, splits - the inverse one, mapping join to its
+      split (the outermost one, if more splits are closed by the same join),
+    - loops - dictionary mapping loop header to the node closing the loop,
+    - root - root fragment of the process, fragments - list of all fragments except root, in nesting order,
+    - fragment_of - dictionary mapping node id to its innermost fragment.
+    """
+
+    def __init__(self, process_id):
+        self.process_id = process_id
+        self.idom = {}
+        self.ipdom = {}
+        self.pairs = {}
+        self.splits = {}
+        self.loops = {}
+        self.root = Fragment(None, None, PROCESS)
+        self.fragments = []
+        self.fragment_of = {}
+
+    def depth(self, node_id):
+        """
+        :return: nesting depth of the node, 0 for nodes not nested in any fragment.
+        """
+        return self.fragment_of[node_id].depth
+
+    def max_depth(self):
+        """
+        :return: maximal nesting depth of nodes of the process.
+        """
+        return max((fragment.depth for fragment in self.fragment_of.values()), default=0)
+
+
+def decompose(bpmn_graph):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: dictionary mapping process (or subprocess) id to its ProcessStructure.
+    """
+    nodes_by_process = {}
+    for node_id, node in bpmn_graph.diagram_graph._node.items():
+        nodes_by_process.setdefault(node.get(consts.Consts.process), []).append(node_id)
+    return {process_id: decompose_process(bpmn_graph, process_id, node_ids)
+            for process_id, node_ids in nodes_by_process.items()}
+
+
+def split_join_pairs(bpmn_graph, structures=None):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param structures: result of decompose, computed if not given.
+    :return: dictionary mapping split to its corresponding join, for all processes of the diagram.
+    """
+    pairs = {}
+    for structure in (structures or decompose(bpmn_graph)).values():
+        pairs.update(structure.pairs)
+    return pairs
+
+
+def decompose_process(bpmn_graph, process_id, node_ids=None):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param process_id: id of process (or subprocess) to decompose,
+    :param node_ids: ids of nodes of the process, taken from 'process' attribute of nodes if not given.
+    :return: ProcessStructure object.
+    """
+    nodes = bpmn_graph.diagram_graph._node
+    if node_ids is None:
+        node_ids = [node_id for node_id, node in nodes.items() if node.get(consts.Consts.process) == process_id]
+    members = set(node_ids)
+    successors = {node_id: [] for node_id in node_ids}
+    predecessors = {node_id: [] for node_id in node_ids}
+    for flow in bpmn_graph.sequence_flows.values():
+        source, target = flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+        if source in members and target in members:
+            successors[source].append(target)
+            predecessors[target].append(source)
+
+    successors[_entry], predecessors[_entry] = [], []
+    successors[_exit], predecessors[_exit] = [], []
+    for node_id in node_ids:
+        if not predecessors[node_id]:
+            successors[_entry].append(node_id)
+            predecessors[node_id].append(_entry)
+        if not successors[node_id]:
+            predecessors[_exit].append(node_id)
+            successors[node_id].append(_exit)
+    _connect_unreachable(_entry, successors, predecessors, node_ids)
+    _connect_unreachable(_exit, predecessors, successors, node_ids)
+
+    structure = ProcessStructure(process_id)
+    idom, dominator_order = _dominators(_entry, successors, predecessors)
+    ipdom, _ = _dominators(_exit, predecessors, successors)
+    structure.idom = {node_id: (None if idom[node_id] is _entry else idom[node_id]) for node_id in node_ids}
+    structure.ipdom = {node_id: (None if ipdom[node_id] is _exit else ipdom[node_id]) for node_id in node_ids}
+    dominates = _ancestor_test(idom, _entry)
+    postdominates = _ancestor_test(ipdom, _exit)
+
+    # fragments entered at each node, loops before blocks, since a loop header which is also a split encloses
+    # the block started by it
+    entered = {}
+    for node_id in node_ids:
+        for predecessor in predecessors[node_id]:
+            if predecessor is not _entry and node_id not in structure.loops and dominates(node_id, predecessor) \
+                    and postdominates(predecessor, node_id):
+                structure.loops[node_id] = predecessor
+                entered.setdefault(node_id, []).append((predecessor, LOOP))
+    for node_id in dominator_order:
+        join = ipdom.get(node_id)
+        if node_id is not _entry and len(successors[node_id]) > 1 and join is not _exit \
+                and len(predecessors[join]) > 1 and dominates(node_id, join):
+            structure.pairs[node_id] = join
+            structure.splits.setdefault(join, node_id)
+            entered.setdefault(node_id, []).append((join, BLOCK))
+
+    # nodes are visited in dominator tree preorder, chain holds fragments (entered at strict dominators of a node),
+    # which contain the node in their interior - outermost first, so its length is bounded by nesting depth
+    children = {}
+    for node_id in dominator_order:
+        if node_id is not _entry:
+            children.setdefault(idom[node_id], []).append(node_id)
+    stack = [(_entry, ())]
+    while stack:
+        node_id, chain = stack.pop()
+        if node_id is not _entry and node_id is not _exit:
+            fragment = chain[-1] if chain else structure.root
+            structure.fragment_of[node_id] = fragment
+            for exit_, kind in entered.get(node_id, ()):
+                fragment = Fragment(node_id, exit_, kind, fragment)
+                fragment.parent.children.append(fragment)
+                structure.fragments.append(fragment)
+                chain = chain + (fragment,)
+        for child in children.get(node_id, ()):
+            stack.append((child, tuple(fragment for fragment in chain
+                                       if fragment.exit != child and postdominates(fragment.exit, child))))
+    # exit of a fragment belongs to the enclosing fragment, not to its interior
+    for fragment in structure.fragments:
+        enclosing = fragment.parent
+        current = structure.fragment_of[fragment.exit]
+        if current is not enclosing and _is_inside(current, fragment):
+            structure.fragment_of[fragment.exit] = enclosing
+    for node_id, fragment in structure.fragment_of.items():
+        fragment.nodes.append(node_id)
+    return structure
+
+
+def _is_inside(fragment, ancestor):
+    while fragment is not None:
+        if fragment is ancestor:
+            return True
+        fragment = fragment.parent
+    return False
+
+
+def _connect_unreachable(root, successors, predecessors, node_ids):
+    """
+    Nodes not reachable from root (e.g. cycles without entry) are connected to root directly, so that every node
+    has a dominator.
+    """
+    reached = _reachable(root, successors)
+    for node_id in node_ids:
+        if node_id not in reached:
+            successors[root].append(node_id)
+            predecessors[node_id].append(root)
+            reached |= _reachable(node_id, successors, reached)
+
+
+def _reachable(root, successors, visited=None):
+    visited = set(visited or ())
+    visited.add(root)
+    stack = [root]
+    while stack:
+        for successor in successors[stack.pop()]:
+            if successor not in visited:
+                visited.add(successor)
+                stack.append(successor)
+    return visited
+
+
+def _dominators(root, successors, predecessors):
+    """
+    Cooper, Harvey, Kennedy "A Simple, Fast Dominance Algorithm".
+    :return: a tuple of dictionary mapping node to its immediate dominator (root to itself) and list of nodes
+        in reverse postorder.
+    """
+    postorder = []
+    visited = {root}
+    stack = [(root, iter(successors[root]))]
+    while stack:
+        node, iterator = stack[-1]
+        for successor in iterator:
+            if successor not in visited:
+                visited.add(successor)
+                stack.append((successor, iter(successors[successor])))
+                break
+        else:
+            stack.pop()
+            postorder.append(node)
+    index = {node: position for position, node in enumerate(postorder)}
+    order = postorder[::-1]
+
+    idom = {root: root}
+    changed = True
+    while changed:
+        changed = False
+        for node in order[1:]:
+            new_idom = None
+            for predecessor in predecessors[node]:
+                if predecessor not in idom:
+                    continue
+                if new_idom is None:
+                    new_idom = predecessor
+                    continue
+                finger_a, finger_b = predecessor, new_idom
+                while finger_a is not finger_b and finger_a != finger_b:
+                    while index[finger_a] < index[finger_b]:
+                        finger_a = idom[finger_a]
+                    while index[finger_b] < index[finger_a]:
+                        finger_b = idom[finger_b]
+                new_idom = finger_a
+            if idom.get(node) != new_idom:
+                idom[node] = new_idom
+                changed = True
+    return idom, order
+
+
+def _ancestor_test(idom, root):
+    """
+    :return: function testing whether first node (non-strictly) dominates the second one, in O(1) using
+        preorder / postorder intervals of the dominator tree.
+    """
+    children = {}
+    for node, parent in idom.items():
+        if node is not root:
+            children.setdefault(parent, []).append(node)
+    enter, leave = {}, {}
+    clock = 0
+    stack = [(root, False)]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            leave[node] = clock
+        else:
+            enter[node] = clock
+            stack.append((node, True))
+            stack.extend((child, False) for child in children.get(node, ()))
+        clock += 1
+
+    def dominates(node_a, node_b):
+        return enter[node_a] <= enter[node_b] and leave[node_b] <= leave[node_a]
+    return dominates
@@ -102,5 +102,8 @@ class Consts(object):
     event_definitions = "event_definitions"
     node_ids = "node_ids"
     definition_type = "definition_type"
+    # simulation parameters of nodes and sequence flows
+    duration = "duration"
+    probability = "probability"
 
     grid_column_width = 2
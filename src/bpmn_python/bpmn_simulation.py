@@ -0,0 +1,585 @@
+# coding=utf-8
+"""
+Discrete-event simulation of processes, estimating cycle times of cases and utilization of resources.
+
+Cases arrive at start events of all processes of the diagram and their tokens move along sequence flows:
+
+- activities (and other nodes with a duration) are executed by resources of their lane - every lane is a pool of
+  identical resources, tokens wait for a free one in FIFO order; nodes outside of lanes are not constrained,
+- exclusive and event based gateways route a token to one outgoing flow, chosen according to probabilities
+  of flows,
+- parallel gateways fork tokens to all outgoing flows and join them when all incoming flows hold a token,
+- inclusive and complex gateways route a token to every outgoing flow independently (at least one is taken), their
+  joins wait for as many tokens as the corresponding split (see bpmn_process_structure) has produced,
+- end events consume tokens (terminate end events also all remaining tokens of the case), case is completed when
+  it has no tokens left. Boundary events are not triggered.
+
+Events are kept in a heapq priority queue. Random values (durations, arrival times, gateway decisions) are sampled
+by NumPy in batches and consumed one by one, so the per-event cost stays in plain Python. Replications are
+independent (their random streams are spawned from a single seed, so results do not depend on the number of
+workers) and run across a pool of processes.
+"""
+import collections
+import heapq
+import itertools
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_process_structure as process_structure
+from . import bpmn_python_consts as consts
+
+ACTIVITY_TYPES = (consts.Consts.task, consts.Consts.user_task, consts.Consts.send_task, consts.Consts.call_activity,
+                  consts.Consts.service_task, consts.Consts.manual_task, consts.Consts.subprocess)
+
+# kinds of nodes
+_pass = 0
+_activity = 1
+_parallel = 2
+_exclusive = 3
+_inclusive = 4
+_end = 5
+_terminate = 6
+
+# kinds of events
+_start_case = 0
+_arrive = 1
+_complete = 2
+
+
+class Distribution(object):
+    """
+    Probability distribution of durations, given as "kind(parameters)", e.g. "exponential(5)", or as a number
+    (constant duration). Supported kinds: constant(value), uniform(low, high), exponential(mean),
+    normal(mean, deviation), lognormal(mean, deviation), triangular(left, mode, right). Negative samples of normal
+    distribution are clipped to 0.
+    """
+    __slots__ = ("kind", "parameters")
+    arity = {"constant": 1, "uniform": 2, "exponential": 1, "normal": 2, "lognormal": 2, "triangular": 3}
+
+    def __init__(self, kind, *parameters):
+        if kind not in Distribution.arity or len(parameters) != Distribution.arity[kind]:
+            raise bpmn_exception.BpmnPythonError(f"Invalid distribution: {kind}{parameters}")
+        if any(parameter < 0 for parameter in parameters):
+            raise bpmn_exception.BpmnPythonError(f"Parameters of distribution {kind} must not be negative")
+        self.kind = kind
+        self.parameters = tuple(float(parameter) for parameter in parameters)
+
+    @classmethod
+    def parse(cls, specification):
+        """
+        :param specification: a number, a string "kind(parameters)" or a Distribution object.
+        :return: Distribution object.
+        """
+        if isinstance(specification, Distribution):
+            return specification
+        if isinstance(specification, (int, float)):
+            return cls("constant", specification)
+        try:
+            return cls("constant", float(specification))
+        except (TypeError, ValueError):
+            pass
+        match = re.fullmatch(r"\s*(\w+)\s*\((.*)\)\s*", str(specification))
+        try:
+            parameters = [float(parameter) for parameter in match.group(2).split(",") if parameter.strip()]
+        except (AttributeError, ValueError):
+            raise bpmn_exception.BpmnPythonError(f"Invalid distribution: {specification}") from None
+        return cls(match.group(1).lower(), *parameters)
+
+    @property
+    def mean(self):
+        if self.kind in ("uniform", "triangular"):
+            return sum(self.parameters) / len(self.parameters)
+        return self.parameters[0]
+
+    def sample(self, generator, size):
+        """
+        :param generator: numpy.random.Generator object,
+        :param size: number of samples.
+        :return: numpy array of samples.
+        """
+        parameters = self.parameters
+        if self.kind == "constant":
+            return np.full(size, parameters[0])
+        if self.kind == "uniform":
+            return generator.uniform(parameters[0], parameters[1], size)
+        if self.kind == "exponential":
+            return generator.exponential(parameters[0], size)
+        if self.kind == "normal":
+            return np.maximum(generator.normal(parameters[0], parameters[1], size), 0.0)
+        if self.kind == "lognormal":
+            mean, deviation = parameters
+            if mean == 0:
+                return np.zeros(size)
+            sigma_squared = np.log1p((deviation / mean) ** 2)
+            return generator.lognormal(np.log(mean) - sigma_squared / 2, np.sqrt(sigma_squared), size)
+        return generator.triangular(parameters[0], parameters[1], parameters[2], size)
+
+    def __repr__(self):
+        return f"{self.kind}({', '.join(f'{parameter:g}' for parameter in self.parameters)})"
+
+
+class SimulationParameters(object):
+    """
+    Parameters of simulation:
+
+    - durations - dictionary mapping node id or name to duration distribution (see Distribution) of the node,
+      default_duration is used for activities without one,
+    - probabilities - dictionary mapping sequence flow id to probability of taking the flow after a gateway.
+      Outgoing flows of exclusive gateways without probability share the remaining probability equally, flows
+      of inclusive gateways are taken with probability 0.5 by default,
+    - resources - dictionary mapping lane id or name to number of resources of the lane (1 by default),
+    - arrival - distribution of time between arrivals of consecutive cases,
+    - cases - number of cases of every replication.
+
+    Durations and probabilities may also be given as 'duration' attribute of nodes and 'probability' attribute of
+    sequence flows of the diagram, values of parameters take precedence.
+    """
+
+    def __init__(self, durations=None, probabilities=None, resources=None, arrival="exponential(1)",
+                 default_duration="constant(1)", cases=100):
+        if cases < 1:
+            raise bpmn_exception.BpmnPythonError("Number of simulated cases must be positive")
+        self.durations = {key: Distribution.parse(value) for key, value in (durations or {}).items()}
+        self.probabilities = {key: float(value) for key, value in (probabilities or {}).items()}
+        self.resources = {key: int(value) for key, value in (resources or {}).items()}
+        self.arrival = Distribution.parse(arrival)
+        self.default_duration = Distribution.parse(default_duration)
+        self.cases = cases
+
+    @classmethod
+    def from_file(cls, filepath):
+        """
+        Loads parameters from JSON file, e.g.
+        {"durations": {"Task 1": "normal(10, 2)"}, "probabilities": {"flow_3": 0.8}, "resources": {"Lane 1": 2},
+        "arrival": "exponential(4)", "cases": 500}
+
+        :param filepath: string with path to JSON file.
+        :return: SimulationParameters object.
+        """
+        with open(filepath) as parameters_file:
+            data = json.load(parameters_file)
+        try:
+            return cls(**data)
+        except TypeError as error:
+            raise bpmn_exception.BpmnPythonError(f"Invalid simulation parameters in {filepath}: {error}") from None
+
+
+class SimulationModel(object):
+    """
+    Diagram compiled for simulation. Outgoing flows of nodes are lists of (target, port) pairs, port being index
+    of the flow among incoming flows of the target.
+    """
+
+    def __init__(self):
+        self.kinds = {}
+        self.outgoing = {}
+        self.incoming_count = {}
+        self.durations = {}
+        self.probabilities = {}
+        self.lanes = {}
+        self.capacities = {}
+        self.inclusive_splits = {}
+        self.starts = []
+        self.names = {}
+        self.lane_names = {}
+        self.arrival = None
+        self.cases = 0
+
+
+class SimulationSummary(object):
+    """
+    Summary statistics of simulation. Confidence intervals (95%, normal approximation) are computed over
+    replications, percentiles of cycle time over cases of all replications.
+    """
+
+    def __init__(self, replications, cases, completed, truncated, cycle_time, throughput, activities, resources):
+        self.replications = replications
+        self.cases = cases
+        self.completed = completed
+        self.truncated = truncated
+        self.cycle_time = cycle_time
+        self.throughput = throughput
+        self.activities = activities
+        self.resources = resources
+
+    def as_dict(self):
+        return {"replications": self.replications, "cases": self.cases, "completed": self.completed,
+                "truncated": self.truncated, "cycle_time": self.cycle_time, "throughput": self.throughput,
+                "activities": self.activities, "resources": self.resources}
+
+
+def simulate(bpmn_graph, parameters=None, replications=10, seed=None, max_workers=None, batch_size=256,
+             max_events=10 ** 7):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param parameters: SimulationParameters object, default parameters if not given,
+    :param replications: number of independent replications,
+    :param seed: seed of random streams of replications, results are reproducible for the same seed,
+    :param max_workers: maximal number of worker processes, number of CPUs by default, 1 runs replications in the
+        calling process,
+    :param batch_size: number of random values sampled at once for every node,
+    :param max_events: maximal number of processed events of a replication (guards against endless loops).
+    :return: SimulationSummary object.
+    """
+    if replications < 1:
+        raise bpmn_exception.BpmnPythonError("Number of replications must be positive")
+    model = compile_model(bpmn_graph, parameters or SimulationParameters())
+    tasks = [(model, child_seed, batch_size, max_events)
+             for child_seed in np.random.SeedSequence(seed).spawn(replications)]
+    if max_workers == 1 or replications < 2:
+        results = list(map(_replication_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_replication_task, tasks))
+    return summarize(model, results)
+
+
+def compile_model(bpmn_graph, parameters):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param parameters: SimulationParameters object.
+    :return: SimulationModel object.
+    """
+    nodes = bpmn_graph.diagram_graph._node
+    model = SimulationModel()
+    model.arrival = parameters.arrival
+    model.cases = parameters.cases
+    incoming = {node_id: [] for node_id in nodes}
+    outgoing = {node_id: [] for node_id in nodes}
+    for flow_id, flow in bpmn_graph.sequence_flows.items():
+        source, target = flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+        if source in nodes and target in nodes:
+            outgoing[source].append((flow_id, target, len(incoming[target])))
+            incoming[target].append(flow_id)
+
+    for node_id, node in nodes.items():
+        node_type = node[consts.Consts.type]
+        name = node.get(consts.Consts.node_name) or ""
+        model.names[node_id] = name or node_id
+        model.outgoing[node_id] = [(target, port) for _, target, port in outgoing[node_id]]
+        model.incoming_count[node_id] = len(incoming[node_id])
+        duration = node_duration(parameters, node_id, node)
+        if node_type == consts.Consts.parallel_gateway:
+            model.kinds[node_id] = _parallel
+        elif node_type in (consts.Consts.exclusive_gateway, consts.Consts.event_based_gateway):
+            model.kinds[node_id] = _exclusive
+        elif node_type in (consts.Consts.inclusive_gateway, consts.Consts.complex_gateway):
+            model.kinds[node_id] = _inclusive
+        elif duration is not None:
+            model.kinds[node_id] = _activity
+            model.durations[node_id] = duration
+        elif not outgoing[node_id]:
+            model.kinds[node_id] = _terminate if any(
+                definition.get(consts.Consts.definition_type) == "terminateEventDefinition"
+                for definition in node.get(consts.Consts.event_definitions) or ()) else _end
+        else:
+            model.kinds[node_id] = _pass
+        if model.kinds[node_id] in (_exclusive, _inclusive) and len(outgoing[node_id]) > 1:
+            model.probabilities[node_id] = branch_probabilities(bpmn_graph, parameters, node_id,
+                                                                [flow_id for flow_id, _, _ in outgoing[node_id]],
+                                                                model.kinds[node_id] == _exclusive)
+
+    for process_id, process in bpmn_graph.process_elements.items():
+        _assign_lanes(model, parameters, process.get(consts.Consts.lane_set))
+        candidates = [node_id for node_id, node in nodes.items()
+                      if node.get(consts.Consts.process) == process_id and not incoming[node_id]
+                      and node[consts.Consts.type] != consts.Consts.boundary_event]
+        starts = [node_id for node_id in candidates if nodes[node_id][consts.Consts.type] == consts.Consts.start_event]
+        if starts or candidates:
+            model.starts.append((starts or candidates)[0])
+    if not model.starts:
+        raise bpmn_exception.BpmnPythonError("Diagram has no start event to simulate")
+
+    joins = [node_id for node_id, kind in model.kinds.items() if kind == _inclusive and len(incoming[node_id]) > 1]
+    if joins:
+        for structure in process_structure.decompose(bpmn_graph).values():
+            for join, split in structure.splits.items():
+                if join in joins and model.kinds.get(split) == _inclusive:
+                    model.inclusive_splits[join] = split
+    return model
+
+
+def run_replication(model, seed, batch_size=256, max_events=10 ** 7):
+    """
+    Simulates model.cases cases.
+
+    :param model: SimulationModel object,
+    :param seed: seed of random stream (an integer or numpy.random.SeedSequence),
+    :param batch_size: number of random values sampled at once for every node,
+    :param max_events: maximal number of processed events.
+    :return: dictionary with cycle times of completed cases, statistics of activities and busy time of lanes.
+    """
+    generator = np.random.default_rng(seed)
+    sampler = _Sampler(model, generator, batch_size)
+    kinds, outgoing, incoming_count, lanes = model.kinds, model.outgoing, model.incoming_count, model.lanes
+    free = dict(model.capacities)
+    waiting = {lane: collections.deque() for lane in model.capacities}
+    busy = dict.fromkeys(model.capacities, 0.0)
+    activities = {node_id: [0, 0.0, 0.0] for node_id, kind in kinds.items() if kind == _activity}
+    started, tokens, finished, cycle_times = {}, {}, set(), []
+    join_tokens, inclusive_tokens, inclusive_produced = {}, {}, {}
+    queue = []
+    sequence = itertools.count()
+    interarrival_times = model.arrival.sample(generator, model.cases)
+    interarrival_times[0] = 0.0
+    for case, time in enumerate(np.cumsum(interarrival_times).tolist()):
+        queue.append((time, next(sequence), _start_case, case, None, 0))
+    heapq.heapify(queue)
+
+    def produce(time, case, targets, consumed):
+        tokens[case] += len(targets) - consumed
+        for target, port in targets:
+            heapq.heappush(queue, (time, next(sequence), _arrive, case, target, port))
+        if not tokens[case]:
+            finished.add(case)
+            cycle_times.append(time - started[case])
+
+    def start_activity(time, case, node_id, queued_at):
+        duration = sampler.duration(node_id)
+        statistics = activities[node_id]
+        statistics[0] += 1
+        statistics[1] += duration
+        statistics[2] += time - queued_at
+        lane = lanes.get(node_id)
+        if lane is not None:
+            busy[lane] += duration
+        heapq.heappush(queue, (time + duration, next(sequence), _complete, case, node_id, 0))
+
+    events = 0
+    time = 0.0
+    truncated = False
+    while queue:
+        events += 1
+        if events > max_events:
+            truncated = True
+            break
+        time, _, event, case, node_id, port = heapq.heappop(queue)
+        if event == _start_case:
+            started[case] = time
+            tokens[case] = 0
+            produce(time, case, [(start, 0) for start in model.starts], 0)
+            continue
+        if event == _complete:
+            lane = lanes.get(node_id)
+            if lane is not None:
+                lane_queue = waiting[lane]
+                while lane_queue and lane_queue[0][0] in finished:
+                    lane_queue.popleft()
+                if lane_queue:
+                    waiting_case, waiting_node, queued_at = lane_queue.popleft()
+                    start_activity(time, waiting_case, waiting_node, queued_at)
+                else:
+                    free[lane] += 1
+            if case not in finished:
+                produce(time, case, outgoing[node_id], 1)
+            continue
+        if case in finished:
+            continue
+        kind = kinds[node_id]
+        if kind == _activity:
+            lane = lanes.get(node_id)
+            if lane is None or free[lane]:
+                if lane is not None:
+                    free[lane] -= 1
+                start_activity(time, case, node_id, time)
+            else:
+                waiting[lane].append((case, node_id, time))
+        elif kind == _pass:
+            produce(time, case, outgoing[node_id], 1)
+        elif kind == _exclusive:
+            targets = outgoing[node_id]
+            produce(time, case, [targets[sampler.choice(node_id)]] if len(targets) > 1 else targets, 1)
+        elif kind == _parallel:
+            count = incoming_count[node_id]
+            if count < 2:
+                produce(time, case, outgoing[node_id], 1)
+                continue
+            arrived = join_tokens.setdefault((case, node_id), [0] * count)
+            arrived[port] += 1
+            if all(arrived):
+                for index in range(count):
+                    arrived[index] -= 1
+                produce(time, case, outgoing[node_id], count)
+        elif kind == _inclusive:
+            split = model.inclusive_splits.get(node_id)
+            consumed = 1
+            if split is not None:
+                key = (case, node_id)
+                inclusive_tokens[key] = inclusive_tokens.get(key, 0) + 1
+                if inclusive_tokens[key] < inclusive_produced.get((case, split), 1):
+                    continue
+                consumed = inclusive_tokens.pop(key)
+            targets = outgoing[node_id]
+            if len(targets) > 1:
+                targets = [target for target, taken in zip(targets, sampler.branches(node_id)) if taken]
+                inclusive_produced[(case, node_id)] = len(targets)
+            produce(time, case, targets, consumed)
+        elif kind == _end:
+            produce(time, case, (), 1)
+        else:
+            finished.add(case)
+            cycle_times.append(time - started[case])
+    return {"cycle_times": np.array(cycle_times), "started": len(started), "completed": len(cycle_times),
+            "horizon": time, "truncated": truncated, "activities": activities, "busy": busy}
+
+
+def summarize(model, results):
+    """
+    :param model: SimulationModel object,
+    :param results: list of results of run_replication.
+    :return: SimulationSummary object.
+    """
+    cycle_times = np.concatenate([result["cycle_times"] for result in results])
+    cycle_time = dict(_interval([result["cycle_times"].mean() if result["completed"] else np.nan
+                                 for result in results]))
+    if len(cycle_times):
+        cycle_time.update(zip(("min", "p50", "p90", "p95", "max"),
+                              np.percentile(cycle_times, [0, 50, 90, 95, 100]).tolist()))
+    throughput = dict(_interval([result["completed"] / result["horizon"] if result["horizon"] else np.nan
+                                 for result in results]))
+
+    activities = []
+    for node_id in results[0]["activities"]:
+        count, service, waiting = (sum(result["activities"][node_id][index] for result in results)
+                                   for index in range(3))
+        activities.append({"id": node_id, "name": model.names[node_id], "executions": count / len(results),
+                           "mean_duration": service / count if count else None,
+                           "mean_waiting": waiting / count if count else None})
+    resources = []
+    for lane, capacity in model.capacities.items():
+        utilization = _interval([result["busy"][lane] / (capacity * result["horizon"]) if result["horizon"]
+                                 else np.nan for result in results])
+        resources.append({"id": lane, "name": model.lane_names[lane], "capacity": capacity,
+                          "utilization": utilization["mean"], "ci95": utilization["ci95"]})
+    return SimulationSummary(len(results), sum(result["started"] for result in results),
+                             sum(result["completed"] for result in results),
+                             any(result["truncated"] for result in results),
+                             cycle_time, throughput, activities, resources)
+
+
+def _interval(values):
+    """
+    Mean and half-width of 95% confidence interval of values (NaN values are skipped).
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"mean": None, "ci95": None}
+    half_width = 1.96 * values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else 0.0
+    return {"mean": float(values.mean()), "ci95": float(half_width)}
+
+
+def _replication_task(task):
+    return run_replication(*task)
+
+
+def node_duration(parameters, node_id, node):
+    """
+    :param parameters: SimulationParameters object,
+    :param node_id: id of the node,
+    :param node: dictionary of node attributes.
+    :return: Distribution of duration of the node, None for nodes without duration (other than activities).
+    """
+    name = node.get(consts.Consts.node_name) or ""
+    duration = parameters.durations.get(node_id) or parameters.durations.get(name) \
+        or node.get(consts.Consts.duration)
+    if duration is None and (node[consts.Consts.type] in ACTIVITY_TYPES or node[consts.Consts.type].endswith("Task")):
+        return parameters.default_duration
+    return None if duration is None else Distribution.parse(duration)
+
+
+def branch_probabilities(bpmn_graph, parameters, node_id, flow_ids, exclusive=True):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param parameters: SimulationParameters object,
+    :param node_id: id of the gateway,
+    :param flow_ids: ids of outgoing flows of the gateway,
+    :param exclusive: boolean flag, True for exclusive gateways (probabilities sum up to 1), False for inclusive ones.
+    :return: numpy array of probabilities of taking the flows.
+    """
+    probabilities = []
+    for flow_id in flow_ids:
+        probability = parameters.probabilities.get(flow_id)
+        if probability is None:
+            probability = bpmn_graph.sequence_flows[flow_id].get(consts.Consts.probability)
+        probabilities.append(None if probability is None else float(probability))
+    if any(probability is not None and not 0 <= probability <= 1 for probability in probabilities):
+        raise bpmn_exception.BpmnPythonError(f"Probabilities of flows of gateway {node_id} must be within [0, 1]")
+    if not exclusive:
+        return np.array([0.5 if probability is None else probability for probability in probabilities])
+    given = sum(probability for probability in probabilities if probability is not None)
+    missing = probabilities.count(None)
+    if given > 1 + 1e-9 or (not missing and given <= 0):
+        raise bpmn_exception.BpmnPythonError(f"Probabilities of flows of gateway {node_id} sum up to {given}")
+    share = max(1 - given, 0.0) / missing if missing else 0.0
+    result = np.array([share if probability is None else probability for probability in probabilities])
+    return result / result.sum()
+
+
+def _assign_lanes(model, parameters, lane_set):
+    """
+    Assigns activities to lanes, activities of nested lanes belong to the innermost lane.
+    """
+    stack = [lane_set]
+    while stack:
+        current = stack.pop()
+        for lane_id, lane in ((current or {}).get(consts.Consts.lanes) or {}).items():
+            name = lane.get(consts.Consts.name) or lane_id
+            for node_id in lane.get(consts.Consts.flow_node_refs) or ():
+                if model.kinds.get(node_id) == _activity:
+                    model.lanes[node_id] = lane_id
+                    if lane_id not in model.capacities:
+                        capacity = parameters.resources.get(lane_id, parameters.resources.get(name, 1))
+                        if capacity < 1:
+                            raise bpmn_exception.BpmnPythonError(f"Lane {name} needs at least one resource")
+                        model.capacities[lane_id] = capacity
+                        model.lane_names[lane_id] = name
+            stack.append(lane.get(consts.Consts.child_lane_set))
+
+
+class _Sampler(object):
+    """
+    Random values of a replication, sampled for every node in batches of batch_size.
+    """
+
+    def __init__(self, model, generator, batch_size):
+        self.model = model
+        self.generator = generator
+        self.batch_size = batch_size
+        self.buffers = {}
+
+    def _next(self, key, sample):
+        buffer = self.buffers.get(key)
+        if buffer is None or buffer[1] == len(buffer[0]):
+            buffer = self.buffers[key] = [sample(self.batch_size).tolist(), 0]
+        value = buffer[0][buffer[1]]
+        buffer[1] += 1
+        return value
+
+    def duration(self, node_id):
+        return self._next((_activity, node_id),
+                          lambda size: self.model.durations[node_id].sample(self.generator, size))
+
+    def choice(self, node_id):
+        probabilities = self.model.probabilities[node_id]
+        return self._next((_exclusive, node_id),
+                          lambda size: self.generator.choice(len(probabilities), size, p=probabilities))
+
+    def branches(self, node_id):
+        """
+        :return: a list of booleans, True for taken outgoing flows - at least one flow is taken, if none is drawn,
+            the one closest to be drawn is used.
+        """
+        probabilities = self.model.probabilities[node_id]
+
+        def sample(size):
+            draws = self.generator.random((size, len(probabilities)))
+            taken = draws < probabilities
+            empty = ~taken.any(axis=1)
+            taken[empty, np.argmin(draws[empty] - probabilities, axis=1)] = True
+            return taken
+        return self._next((_inclusive, node_id), sample)
@@ -0,0 +1,408 @@
+# coding=utf-8
+"""
+Behavioural (soundness) analysis of processes, based on token game of the corresponding workflow net.
+
+Every process (and every subprocess) is translated into a Petri net, in which sequence flows are places and flow
+nodes are (sets of) transitions:
+
+- activities and intermediate events consume a token from any incoming flow and produce tokens on all outgoing
+  flows, boundary events attached to an activity give alternative transitions of the activity,
+- exclusive and event based gateways consume a token from any incoming flow and produce it on one outgoing flow,
+- parallel gateways consume tokens from all incoming flows and produce them on all outgoing flows,
+- inclusive and complex gateways produce tokens on any non-empty subset of outgoing flows and synchronize incoming
+  flows, which have a token or can still receive one (non-local OR-join semantics, approximated by static
+  reachability of flows),
+- start events consume the token of virtual source place, end events consume a token, terminate end events
+  remove all tokens.
+
+Markings are bitsets (Python integers, one bit per flow), explored by breadth-first search with hashed set of
+visited markings. A marking putting a second token on a flow is reported as unsafe (lack of synchronization, e.g.
+parallel split joined by exclusive gateway) and is not explored further. Reachable non-empty markings without
+enabled transition are deadlocks (e.g. exclusive split joined by parallel gateway). Activities never executed
+are dead tasks.
+
+Number of explored states is bounded by max_states. On highly parallel models state space can be reduced with
+stubborn sets (partial order reduction), which preserve all reachable deadlocks - unsafe states found are real,
+but some may be missed, and dead tasks are not reported. Reduction is not used for nets with OR-joins or
+terminate end events, whose transitions are not local.
+"""
+import collections
+import itertools
+
+from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_python_consts as consts
+
+ACTIVITY_TYPES = (consts.Consts.task, consts.Consts.user_task, consts.Consts.send_task, consts.Consts.call_activity,
+                  consts.Consts.service_task, consts.Consts.manual_task, consts.Consts.subprocess)
+EXCLUSIVE_TYPES = (consts.Consts.exclusive_gateway, consts.Consts.event_based_gateway)
+INCLUSIVE_TYPES = (consts.Consts.inclusive_gateway, consts.Consts.complex_gateway)
+
+# maximal number of outgoing flows of inclusive split, it has 2^n - 1 transitions
+max_inclusive_outgoing = 12
+
+
+class Transition(object):
+    """
+    Transition of workflow net - consume and produce are bitsets of flows, nodes are ids of flow nodes executed
+    by the transition. OR-join transition consumes tokens present on flows of consume, or_join lists pairs of
+    (flow bit, bitset of flows upstream of the flow).
+    """
+    __slots__ = ("consume", "produce", "nodes", "or_join", "terminate")
+
+    def __init__(self, consume, produce, nodes, or_join=None, terminate=False):
+        self.consume = consume
+        self.produce = produce
+        self.nodes = nodes
+        self.or_join = or_join
+        self.terminate = terminate
+
+    def is_enabled(self, marking):
+        if self.or_join is None:
+            return marking & self.consume == self.consume
+        if not marking & self.consume:
+            return False
+        return all(marking & bit or not marking & upstream for bit, upstream in self.or_join)
+
+    def fire(self, marking):
+        """
+        :return: a tuple of new marking and bitset of flows, which got a second token (0 for safe firing).
+        """
+        consumed = self.consume if self.or_join is None else marking & self.consume
+        remaining = marking & ~consumed
+        if self.terminate:
+            return 0, 0
+        return remaining | self.produce, remaining & self.produce
+
+
+class WorkflowNet(object):
+    """
+    Workflow net of a single process. Bit 0 is the virtual source place, bit i + 1 is flow flows[i].
+    """
+
+    def __init__(self, process_id):
+        self.process_id = process_id
+        self.flows = []
+        self.bits = {}
+        self.transitions = []
+        self.activities = []
+        self.consumers = collections.defaultdict(list)
+        self.producers = collections.defaultdict(list)
+
+    @property
+    def is_local(self):
+        """
+        True if every transition depends only on its input places (no OR-joins and terminate end events).
+        """
+        return all(transition.or_join is None and not transition.terminate for transition in self.transitions)
+
+    def marking_flows(self, marking):
+        """
+        :return: a list of ids of flows marked in the bitset, "source" for the virtual source place.
+        """
+        return ["source" if index == 0 else self.flows[index - 1] for index in _bit_indices(marking)]
+
+
+class SoundnessReport(object):
+    """
+    Result of analysis of a single process:
+
+    - states - number of explored markings, truncated - True if max_states was reached,
+    - deadlocks - examples of reachable deadlocks, as lists of ids of marked flows,
+    - unsafe - examples of unsafe states, as tuples of (ids of marked flows, id of flow getting a second token),
+    - dead_tasks - ids of activities, which are never executed (None, if partial order reduction was used).
+    """
+
+    def __init__(self, process_id):
+        self.process_id = process_id
+        self.states = 0
+        self.truncated = False
+        self.reduced = False
+        self.deadlocks = []
+        self.deadlock_count = 0
+        self.unsafe = []
+        self.unsafe_count = 0
+        self.dead_tasks = []
+
+    @property
+    def is_sound(self):
+        return not (self.truncated or self.deadlock_count or self.unsafe_count or self.dead_tasks)
+
+    def issues(self):
+        """
+        :return: a list of strings describing found problems.
+        """
+        issues = []
+        if self.deadlock_count:
+            issues.append(f"process {self.process_id} has {self.deadlock_count} reachable deadlock(s), "
+                          f"e.g. with tokens on {', '.join(self.deadlocks[0])}")
+        if self.unsafe_count:
+            marked, flow_id = self.unsafe[0]
+            issues.append(f"process {self.process_id} lacks synchronization, flow {flow_id} can get a second token "
+                          f"(with tokens on {', '.join(marked)})")
+        for node_id in self.dead_tasks or ():
+            issues.append(f"activity {node_id} of process {self.process_id} is never executed")
+        if self.truncated:
+            issues.append(f"state space of process {self.process_id} exceeds {self.states} states, "
+                          f"analysis is incomplete")
+        return issues
+
+    def as_dict(self):
+        return {"process": self.process_id, "sound": self.is_sound, "states": self.states,
+                "truncated": self.truncated, "reduced": self.reduced, "deadlocks": self.deadlocks,
+                "deadlock_count": self.deadlock_count,
+                "unsafe": [{"marking": marked, "flow": flow_id} for marked, flow_id in self.unsafe],
+                "unsafe_count": self.unsafe_count, "dead_tasks": self.dead_tasks}
+
+
+def check_soundness(bpmn_graph, partial_order_reduction=False, max_states=200000, max_examples=10):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param partial_order_reduction: boolean flag, explores state space reduced with stubborn sets,
+    :param max_states: maximal number of explored markings per process,
+    :param max_examples: maximal number of reported deadlocks and unsafe states per process.
+    :return: dictionary mapping process (or subprocess) id to its SoundnessReport.
+    """
+    return {process_id: check_net(net, partial_order_reduction, max_states, max_examples)
+            for process_id, net in build_nets(bpmn_graph).items()}
+
+
+def soundness_issues(bpmn_graph, partial_order_reduction=False, max_states=200000):
+    """
+    :return: a list of strings describing behavioural problems of all processes of the diagram.
+    """
+    reports = check_soundness(bpmn_graph, partial_order_reduction, max_states, max_examples=1)
+    return [issue for report in reports.values() for issue in report.issues()]
+
+
+def build_nets(bpmn_graph):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: dictionary mapping process (or subprocess) id to its WorkflowNet.
+    """
+    nodes_by_process = {}
+    for node_id, node in bpmn_graph.diagram_graph._node.items():
+        nodes_by_process.setdefault(node.get(consts.Consts.process), []).append(node_id)
+    return {process_id: build_net(bpmn_graph, process_id, node_ids)
+            for process_id, node_ids in nodes_by_process.items()}
+
+
+def build_net(bpmn_graph, process_id, node_ids):
+    """
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param process_id: id of process (or subprocess),
+    :param node_ids: ids of nodes of the process.
+    :return: WorkflowNet object.
+    """
+    nodes = bpmn_graph.diagram_graph._node
+    members = set(node_ids)
+    net = WorkflowNet(process_id)
+    incoming = {node_id: [] for node_id in node_ids}
+    outgoing = {node_id: [] for node_id in node_ids}
+    for flow_id, flow in bpmn_graph.sequence_flows.items():
+        source, target = flow[consts.Consts.source_ref], flow[consts.Consts.target_ref]
+        if source in members and target in members:
+            net.bits[flow_id] = 1 << (len(net.flows) + 1)
+            net.flows.append(flow_id)
+            outgoing[source].append(net.bits[flow_id])
+            incoming[target].append(net.bits[flow_id])
+
+    boundary_events = collections.defaultdict(list)
+    for node_id in node_ids:
+        node = nodes[node_id]
+        if node[consts.Consts.type] == consts.Consts.boundary_event and node.get(consts.Consts.attached_to_ref):
+            boundary_events[node[consts.Consts.attached_to_ref]].append(node_id)
+
+    starts = [node_id for node_id in node_ids
+              if nodes[node_id][consts.Consts.type] == consts.Consts.start_event and not incoming[node_id]]
+    if not starts:
+        starts = [node_id for node_id in node_ids if not incoming[node_id] and not _is_detached(nodes[node_id])]
+
+    for node_id in node_ids:
+        node = nodes[node_id]
+        node_type = node[consts.Consts.type]
+        if _is_detached(node):
+            continue
+        if node_type in ACTIVITY_TYPES or node_type.endswith("Task"):
+            net.activities.append(node_id)
+        inputs = [1] if node_id in starts else incoming[node_id]
+        produce = _mask(outgoing[node_id])
+        if node_type == consts.Consts.parallel_gateway:
+            _add(net, _mask(inputs), produce, (node_id,))
+        elif node_type in EXCLUSIVE_TYPES:
+            for bit, output in itertools.product(inputs, outgoing[node_id] or [0]):
+                _add(net, bit, output, (node_id,))
+        elif node_type in INCLUSIVE_TYPES:
+            outputs = _subsets(node_id, outgoing[node_id])
+            if len(inputs) > 1:
+                or_join = [(bit, _upstream(net, bit, node_id, incoming, outgoing, nodes, bpmn_graph))
+                           for bit in inputs]
+                for output in outputs:
+                    _add(net, _mask(inputs), output, (node_id,), or_join=or_join)
+            else:
+                for bit, output in itertools.product(inputs, outputs):
+                    _add(net, bit, output, (node_id,))
+        else:
+            terminate = node_type == consts.Consts.end_event and any(
+                definition.get(consts.Consts.definition_type) == "terminateEventDefinition"
+                for definition in node.get(consts.Consts.event_definitions) or ())
+            outputs = [(produce, (node_id,))]
+            for event_id in boundary_events.get(node_id, ()):
+                event_produce = _mask(outgoing[event_id])
+                if nodes[event_id].get(consts.Consts.cancel_activity, "true") != "false":
+                    outputs.append((event_produce, (node_id, event_id)))
+                else:
+                    outputs.append((produce | event_produce, (node_id, event_id)))
+            for bit, (output, executed) in itertools.product(inputs, outputs):
+                _add(net, bit, output, executed, terminate=terminate)
+    return net
+
+
+def check_net(net, partial_order_reduction=False, max_states=200000, max_examples=10):
+    """
+    Explores reachable markings of the workflow net.
+
+    :param net: WorkflowNet object,
+    :param partial_order_reduction: boolean flag, explores state space reduced with stubborn sets,
+    :param max_states: maximal number of explored markings,
+    :param max_examples: maximal number of reported deadlocks and unsafe states.
+    :return: SoundnessReport object.
+    """
+    report = SoundnessReport(net.process_id)
+    report.reduced = reduced = partial_order_reduction and net.is_local
+    executed = set()
+    visited = {1}
+    queue = collections.deque([1])
+    while queue:
+        marking = queue.popleft()
+        report.states += 1
+        enabled = [transition for transition in _candidates(net, marking) if transition.is_enabled(marking)]
+        if not enabled:
+            if marking:
+                report.deadlock_count += 1
+                if len(report.deadlocks) < max_examples:
+                    report.deadlocks.append(net.marking_flows(marking))
+            continue
+        if reduced and len(enabled) > 1:
+            enabled = _stubborn(net, marking, enabled)
+        for transition in enabled:
+            executed.update(transition.nodes)
+            successor, overflow = transition.fire(marking)
+            if overflow:
+                report.unsafe_count += 1
+                if len(report.unsafe) < max_examples:
+                    report.unsafe.append((net.marking_flows(marking), net.marking_flows(overflow)[0]))
+                continue
+            if successor not in visited:
+                if len(visited) >= max_states:
+                    report.truncated = True
+                    continue
+                visited.add(successor)
+                queue.append(successor)
+    report.dead_tasks = None if reduced else [node_id for node_id in net.activities if node_id not in executed]
+    return report
+
+
+def _candidates(net, marking):
+    """
+    Transitions with at least one marked input place, each listed once.
+    """
+    seen = set()
+    for index in _bit_indices(marking):
+        for transition in net.consumers[index]:
+            if id(transition) not in seen:
+                seen.add(id(transition))
+                yield transition
+
+
+def _stubborn(net, marking, enabled):
+    """
+    Enabled transitions of a stubborn set (Valmari) generated from the enabled transition with the fewest
+    conflicts. For an enabled transition the set contains all transitions consuming from its input places,
+    for a disabled one all producers of one of its unmarked input places.
+    """
+    start = min(enabled, key=lambda transition: sum(len(net.consumers[index])
+                                                    for index in _bit_indices(transition.consume)))
+    stubborn = {id(start): start}
+    work = [start]
+    while work:
+        transition = work.pop()
+        if transition.is_enabled(marking):
+            related = (other for index in _bit_indices(transition.consume) for other in net.consumers[index])
+        else:
+            scapegoat = next(_bit_indices(transition.consume & ~marking))
+            related = net.producers[scapegoat]
+        for other in related:
+            if id(other) not in stubborn:
+                stubborn[id(other)] = other
+                work.append(other)
+        if len(stubborn) == len(enabled) and all(id(transition) in stubborn for transition in enabled):
+            return enabled
+    return [transition for transition in enabled if id(transition) in stubborn]
+
+
+def _add(net, consume, produce, nodes, or_join=None, terminate=False):
+    transition = Transition(consume, produce, nodes, or_join, terminate)
+    net.transitions.append(transition)
+    for index in _bit_indices(consume):
+        net.consumers[index].append(transition)
+    for index in _bit_indices(produce):
+        net.producers[index].append(transition)
+
+
+def _upstream(net, bit, join_id, incoming, outgoing, nodes, bpmn_graph):
+    """
+    Bitset of flows (and the source place), from which a token can reach the flow without passing the OR-join.
+    """
+    flow = bpmn_graph.sequence_flows[net.flows[bit.bit_length() - 2]]
+    producers_of = {}
+    for node_id, bits in outgoing.items():
+        for output in bits:
+            producers_of[output] = node_id
+    upstream = 0
+    visited = {join_id}
+    stack = [flow[consts.Consts.source_ref]]
+    while stack:
+        node_id = stack.pop()
+        if node_id in visited:
+            continue
+        visited.add(node_id)
+        if not incoming[node_id]:
+            upstream |= 1
+        for input_bit in incoming[node_id]:
+            upstream |= input_bit
+            stack.append(producers_of[input_bit])
+    return upstream
+
+
+def _subsets(node_id, outputs):
+    if len(outputs) > max_inclusive_outgoing:
+        raise bpmn_exception.BpmnPythonError(f"Inclusive gateway {node_id} has more than {max_inclusive_outgoing} "
+                                             f"outgoing flows")
+    if not outputs:
+        return [0]
+    return [_mask(combination) for size in range(1, len(outputs) + 1)
+            for combination in itertools.combinations(outputs, size)]
+
+
+def _is_detached(node):
+    """
+    Boundary events (executed with activities they are attached to) and event subprocesses are not a part
+    of the main token flow.
+    """
+    return node[consts.Consts.type] == consts.Consts.boundary_event \
+        or (node[consts.Consts.type] == consts.Consts.subprocess
+            and node.get(consts.Consts.triggered_by_event) == "true")
+
+
+def _mask(bits):
+    mask = 0
+    for bit in bits:
+        mask |= bit
+    return mask
+
+
+def _bit_indices(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
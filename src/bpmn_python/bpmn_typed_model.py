@@ -0,0 +1,313 @@
+# coding=utf-8
+"""
+Conversion between BpmnDiagramGraph and typed object model from graph.classes package.
+
+Typed elements are built with validation of setters disabled (the graph was already validated on import), unless
+requested otherwise. Conversion covers processes, lane sets, flow nodes (with nested subprocesses) and sequence
+flows. Typed model has no Diagram Interchange, so converted diagram gets default node bounds, like nodes added with
+BpmnDiagramGraph.add_flow_node_to_diagram, sequence flows get waypoints connecting their source and target, and
+BPMNPlane gets a new ID. Every supported node type has its own class, so types of nodes are preserved.
+"""
+import contextlib
+import uuid
+
+from . import bpmn_diagram_exception as bpmn_exception
+from . import bpmn_python_consts as consts
+from .graph.classes import condition_expression_type as condition_expression
+from .graph.classes import lane_set_type as lane_set
+from .graph.classes import lane_type as lane
+from .graph.classes import sequence_flow_type as sequence_flow
+from .graph.classes import validation
+from .graph.classes.activities import call_activity_type as call_activity
+from .graph.classes.activities import manual_task_type as manual_task
+from .graph.classes.activities import send_task_type as send_task
+from .graph.classes.activities import service_task_type as service_task
+from .graph.classes.activities import subprocess_type as subprocess
+from .graph.classes.activities import task_type as task
+from .graph.classes.activities import user_task_type as user_task
+from .graph.classes.events import boundary_event_type as boundary_event
+from .graph.classes.events import catch_event_type as catch_event
+from .graph.classes.events import end_event_type as end_event
+from .graph.classes.events import intermediate_catch_event_type as intermediate_catch_event
+from .graph.classes.events import intermediate_throw_event_type as intermediate_throw_event
+from .graph.classes.events import start_event_type as start_event
+from .graph.classes.events import throw_event_type as throw_event
+from .graph.classes.gateways import complex_gateway_type as complex_gateway
+from .graph.classes.gateways import event_based_gateway_type as event_based_gateway
+from .graph.classes.gateways import exclusive_gateway_type as exclusive_gateway
+from .graph.classes.gateways import gateway_type as gateway
+from .graph.classes.gateways import inclusive_gateway_type as inclusive_gateway
+from .graph.classes.gateways import parallel_gateway_type as parallel_gateway
+from .graph.classes.root_element import event_definition_type as event_definition
+from .graph.classes.root_element import process_type as process
+
+node_classes = {
+    consts.Consts.task: task.Task,
+    consts.Consts.user_task: user_task.UserTask,
+    consts.Consts.send_task: send_task.SendTask,
+    consts.Consts.service_task: service_task.ServiceTask,
+    consts.Consts.manual_task: manual_task.ManualTask,
+    consts.Consts.call_activity: call_activity.CallActivity,
+    consts.Consts.subprocess: subprocess.SubProcess,
+    consts.Consts.exclusive_gateway: exclusive_gateway.ExclusiveGateway,
+    consts.Consts.inclusive_gateway: inclusive_gateway.InclusiveGateway,
+    consts.Consts.parallel_gateway: parallel_gateway.ParallelGateway,
+    consts.Consts.event_based_gateway: event_based_gateway.EventBasedGateway,
+    consts.Consts.complex_gateway: complex_gateway.ComplexGateway,
+    consts.Consts.start_event: start_event.StartEvent,
+    consts.Consts.end_event: end_event.EndEvent,
+    consts.Consts.intermediate_catch_event: intermediate_catch_event.IntermediateCatchEvent,
+    consts.Consts.intermediate_throw_event: intermediate_throw_event.IntermediateThrowEvent,
+    consts.Consts.boundary_event: boundary_event.BoundaryEvent,
+}
+
+node_types = {node_class: node_type for node_type, node_class in node_classes.items()}
+
+default_node_bounds = {consts.Consts.width: "100", consts.Consts.height: "100", consts.Consts.x: "100",
+                       consts.Consts.y: "100"}
+
+
+def _to_bool(value):
+    return value == "true" or value is True
+
+
+def _to_string(value):
+    return "true" if value else "false"
+
+
+def _build_lane_set(lane_set_attributes):
+    typed_lane_set = lane_set.LaneSet()
+    typed_lane_set.set_id(lane_set_attributes.get(consts.Consts.id))
+    lanes = []
+    for lane_attributes in lane_set_attributes.get(consts.Consts.lanes, {}).values():
+        typed_lane = lane.Lane()
+        typed_lane.set_id(lane_attributes.get(consts.Consts.id))
+        typed_lane.set_name(lane_attributes.get(consts.Consts.name))
+        typed_lane.set_flow_node_ref_list(list(lane_attributes.get(consts.Consts.flow_node_refs, [])))
+        child_lane_set = lane_attributes.get(consts.Consts.child_lane_set)
+        if child_lane_set:
+            typed_lane.set_child_lane_set(_build_lane_set(child_lane_set))
+        lanes.append(typed_lane)
+    typed_lane_set.set_lane_list(lanes)
+    return typed_lane_set
+
+
+def _build_node(node_attributes):
+    node_type = node_attributes.get(consts.Consts.type)
+    node_class = node_classes.get(node_type)
+    if node_class is None:
+        return None
+    node = node_class()
+    node.set_id(node_attributes[consts.Consts.id])
+    node.set_name(node_attributes.get(consts.Consts.node_name))
+    node.set_incoming(list(node_attributes.get(consts.Consts.incoming_flow, ())))
+    node.set_outgoing(list(node_attributes.get(consts.Consts.outgoing_flow, ())))
+    if isinstance(node, (exclusive_gateway.ExclusiveGateway, inclusive_gateway.InclusiveGateway)):
+        node.set_default(node_attributes.get(consts.Consts.default) or None)
+    if isinstance(node, gateway.Gateway) and consts.Consts.gateway_direction in node_attributes:
+        node.set_gateway_direction(node_attributes[consts.Consts.gateway_direction])
+    if isinstance(node, event_based_gateway.EventBasedGateway):
+        node.set_instantiate(_to_bool(node_attributes.get(consts.Consts.instantiate)))
+        node.set_event_gateway_type(node_attributes.get(consts.Consts.event_gateway_type) or "Exclusive")
+    if isinstance(node, subprocess.SubProcess):
+        node.set_triggered_by_event(_to_bool(node_attributes.get(consts.Consts.triggered_by_event)))
+    if isinstance(node, catch_event.CatchEvent):
+        node.set_parallel_multiple(_to_bool(node_attributes.get(consts.Consts.parallel_multiple)))
+    if isinstance(node, start_event.StartEvent):
+        node.set_is_interrupting(node_attributes.get(consts.Consts.is_interrupting) != "false")
+    if isinstance(node, boundary_event.BoundaryEvent):
+        node.set_cancel_activity(node_attributes.get(consts.Consts.cancel_activity) != "false")
+        node.set_attached_to_ref(node_attributes.get(consts.Consts.attached_to_ref))
+    if isinstance(node, (catch_event.CatchEvent, throw_event.ThrowEvent)):
+        definitions = []
+        for definition_attributes in node_attributes.get(consts.Consts.event_definitions, ()):
+            definition = event_definition.EventDefinition()
+            definition.set_id(definition_attributes.get(consts.Consts.id))
+            definition.set_definition_type(definition_attributes.get(consts.Consts.definition_type))
+            definitions.append(definition)
+        node.set_event_definition_list(definitions)
+    return node
+
+
+def _build_sequence_flow(flow_attributes):
+    flow = sequence_flow.SequenceFlow(flow_attributes[consts.Consts.source_ref],
+                                      flow_attributes[consts.Consts.target_ref])
+    flow.set_id(flow_attributes.get(consts.Consts.id))
+    flow.set_name(flow_attributes.get(consts.Consts.name))
+    condition_attributes = flow_attributes.get(consts.Consts.condition_expression)
+    if condition_attributes:
+        condition = condition_expression.ConditionExpression()
+        condition.set_condition(condition_attributes[consts.Consts.condition_expression])
+        flow.set_condition_expression(condition)
+    return flow
+
+
+def to_typed_model(bpmn_graph, validate=False):
+    """
+    Converts diagram into typed object model.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param validate: boolean flag, if set, every value is type checked by setters of typed classes.
+    :return: a dictionary, where key is process ID and value is an instance of Process class. Flow nodes and
+        sequence flows are stored in flow element lists of their parent processes or subprocesses.
+    """
+    with validation.disabled() if not validate else contextlib.nullcontext():
+        processes = {}
+        for process_id, process_attributes in bpmn_graph.process_elements.items():
+            typed_process = process.Process()
+            typed_process.set_id(process_id)
+            typed_process.set_name(process_attributes.get(consts.Consts.name))
+            typed_process.set_is_closed(_to_bool(process_attributes.get(consts.Consts.is_closed)))
+            typed_process.set_is_executable(_to_bool(process_attributes.get(consts.Consts.is_executable)))
+            typed_process.set_process_type(process_attributes.get(consts.Consts.process_type) or "None")
+            if process_attributes.get(consts.Consts.lane_set):
+                typed_process.set_lane_set_list([_build_lane_set(process_attributes[consts.Consts.lane_set])])
+            processes[process_id] = typed_process
+
+        containers = dict(processes)
+        nodes = []
+        for node_attributes in bpmn_graph.diagram_graph._node.values():
+            node = _build_node(node_attributes)
+            if node is not None:
+                nodes.append((node, node_attributes.get(consts.Consts.process)))
+                if isinstance(node, subprocess.SubProcess):
+                    containers[node.get_id()] = node
+        for node, parent_id in nodes:
+            if parent_id not in containers:
+                raise bpmn_exception.BpmnPythonError("Parent process '" + str(parent_id) + "' of node '"
+                                                     + node.get_id() + "' does not exist")
+            containers[parent_id].add_flow_element(node)
+        for _, _, flow_attributes in bpmn_graph.diagram_graph.edges(data=True):
+            parent_id = flow_attributes.get(consts.Consts.process)
+            if parent_id in containers:
+                containers[parent_id].add_flow_element(_build_sequence_flow(flow_attributes))
+    return processes
+
+
+def _lane_set_attributes(typed_lane_set):
+    lanes = {}
+    for typed_lane in typed_lane_set.get_lane_list():
+        child_lane_set = typed_lane.get_child_lane_set()
+        lanes[typed_lane.get_id()] = {
+            consts.Consts.id: typed_lane.get_id(),
+            consts.Consts.name: typed_lane.get_name() or "",
+            consts.Consts.child_lane_set: _lane_set_attributes(child_lane_set) if child_lane_set else {},
+            consts.Consts.flow_node_refs: list(typed_lane.get_flow_node_ref_list()),
+            consts.Consts.is_horizontal: "true",
+        }
+        lanes[typed_lane.get_id()].update(default_node_bounds)
+    return {consts.Consts.id: typed_lane_set.get_id(), consts.Consts.lanes: lanes}
+
+
+def _node_attributes(node, parent_id):
+    node_type = node_types.get(type(node))
+    if node_type is None:
+        raise bpmn_exception.BpmnPythonError("Unsupported flow node class '" + type(node).__name__ + "'")
+    node_id = node.get_id()
+    node_attributes = {consts.Consts.id: node_id, consts.Consts.type: node_type,
+                       consts.Consts.node_name: node.get_name() or "",
+                       consts.Consts.incoming_flow: list(node.get_incoming()),
+                       consts.Consts.outgoing_flow: list(node.get_outgoing()),
+                       consts.Consts.process: parent_id}
+    node_attributes.update(default_node_bounds)
+    if isinstance(node, gateway.Gateway):
+        node_attributes[consts.Consts.gateway_direction] = node.get_gateway_direction()
+    if isinstance(node, event_based_gateway.EventBasedGateway):
+        node_attributes[consts.Consts.instantiate] = _to_string(node.instantiate())
+        node_attributes[consts.Consts.event_gateway_type] = node.get_event_gateway_type()
+    if isinstance(node, (exclusive_gateway.ExclusiveGateway, inclusive_gateway.InclusiveGateway)):
+        node_attributes[consts.Consts.default] = node.get_default() or ""
+    if isinstance(node, subprocess.SubProcess):
+        node_attributes[consts.Consts.triggered_by_event] = _to_string(node.triggered_by_event())
+        node_attributes[consts.Consts.is_expanded] = "true"
+        node_attributes[consts.Consts.node_ids] = []
+    if isinstance(node, catch_event.CatchEvent):
+        node_attributes[consts.Consts.parallel_multiple] = _to_string(node.parallel_multiple())
+    if isinstance(node, start_event.StartEvent):
+        node_attributes[consts.Consts.is_interrupting] = _to_string(node.is_interrupting())
+    if isinstance(node, boundary_event.BoundaryEvent):
+        node_attributes[consts.Consts.cancel_activity] = _to_string(node.cancel_activity())
+        node_attributes[consts.Consts.attached_to_ref] = node.get_attached_to_ref() or ""
+    if isinstance(node, (catch_event.CatchEvent, throw_event.ThrowEvent)):
+        # definitions without type have no XML element, so they are skipped
+        node_attributes[consts.Consts.event_definitions] = [
+            {consts.Consts.id: definition.get_id() or "",
+             consts.Consts.definition_type: definition.get_definition_type()}
+            for definition in node.get_event_definition_list() if definition.get_definition_type()]
+    return node_attributes
+
+
+def _add_flow_elements(bpmn_graph, parent_id, parent_attributes, flow_elements, flows):
+    node_attributes = bpmn_graph.diagram_graph._node
+    for element in flow_elements:
+        if isinstance(element, sequence_flow.SequenceFlow):
+            flows.append((parent_id, element))
+            continue
+        attributes = _node_attributes(element, parent_id)
+        node_id = attributes[consts.Consts.id]
+        bpmn_graph.diagram_graph.add_node(node_id)
+        node_attributes[node_id].update(attributes)
+        parent_attributes[consts.Consts.node_ids].append(node_id)
+        if isinstance(element, subprocess.SubProcess):
+            _add_flow_elements(bpmn_graph, node_id, node_attributes[node_id], element.get_flow_element_list(),
+                               flows)
+
+
+def from_typed_model(processes, bpmn_graph=None):
+    """
+    Builds diagram from typed object model, all elements are inserted in a single pass.
+
+    :param processes: an iterable of Process objects or a dictionary with Process objects as values,
+    :param bpmn_graph: an instance of BpmnDiagramGraph class, to which elements are added. If None, a new diagram
+        is created.
+    :return: an instance of BpmnDiagramGraph class.
+    """
+    if bpmn_graph is None:
+        # imported here, since diagram representation module depends on this one
+        from . import bpmn_diagram_rep
+        bpmn_graph = bpmn_diagram_rep.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph()
+    if isinstance(processes, dict):
+        processes = processes.values()
+
+    flows = []
+    for typed_process in processes:
+        process_id = typed_process.get_id()
+        process_attributes = {consts.Consts.id: process_id,
+                              consts.Consts.name: typed_process.get_name() or "",
+                              consts.Consts.is_closed: _to_string(typed_process.is_closed()),
+                              consts.Consts.is_executable: _to_string(typed_process.is_executable()),
+                              consts.Consts.process_type: typed_process.get_process_type(),
+                              consts.Consts.node_ids: []}
+        lane_sets = typed_process.get_lane_set_list()
+        if lane_sets:
+            process_attributes[consts.Consts.lane_set] = _lane_set_attributes(lane_sets[0])
+        bpmn_graph.process_elements[process_id] = process_attributes
+        if consts.Consts.bpmn_element not in bpmn_graph.plane_attributes:
+            bpmn_graph.plane_attributes[consts.Consts.id] = bpmn_graph.id_prefix + str(uuid.uuid4())
+            bpmn_graph.plane_attributes[consts.Consts.bpmn_element] = process_id
+        _add_flow_elements(bpmn_graph, process_id, process_attributes, typed_process.get_flow_element_list(), flows)
+
+    diagram_graph = bpmn_graph.diagram_graph
+    node_attributes = diagram_graph._node
+    for parent_id, flow in flows:
+        source_ref, target_ref = flow.get_source_ref(), flow.get_target_ref()
+        flow_id, name = flow.get_id(), flow.get_name() or ""
+        if source_ref not in node_attributes or target_ref not in node_attributes:
+            raise bpmn_exception.BpmnPythonError("Sequence flow '" + str(flow_id) + "' connects nodes, which do not "
+                                                 "exist in the model")
+        bpmn_graph.sequence_flows[flow_id] = {consts.Consts.name: name, consts.Consts.source_ref: source_ref,
+                                              consts.Consts.target_ref: target_ref}
+        edge_attributes = {consts.Consts.id: flow_id, consts.Consts.process: parent_id, consts.Consts.name: name,
+                           consts.Consts.source_ref: source_ref, consts.Consts.target_ref: target_ref,
+                           consts.Consts.waypoints: [(node_attributes[source_ref][consts.Consts.x],
+                                                      node_attributes[source_ref][consts.Consts.y]),
+                                                     (node_attributes[target_ref][consts.Consts.x],
+                                                      node_attributes[target_ref][consts.Consts.y])]}
+        condition = flow.get_condition_expression()
+        if condition is not None:
+            edge_attributes[consts.Consts.condition_expression] = {
+                consts.Consts.id: "", consts.Consts.condition_expression: condition.get_condition()}
+        diagram_graph.add_edge(source_ref, target_ref, **edge_attributes)
+    return bpmn_graph
+
@@ -3,6 +3,8 @@
 Collection of different metrics used to compare diagram layout quality
 """
 import copy
+
+from . import bpmn_cycle_analysis as cycle_analysis
 from . import bpmn_python_consts as consts
 
 
@@ -175,117 +177,64 @@ def count_segments(bpmn_graph):
 
 def compute_longest_path(bpmn_graph):
     """
+    Finds the longest path (by number of nodes) starting in a node without incoming flows. Back flows found by
+    cycle analysis are ignored, so the path is computed in O(N + E) over topologically sorted nodes.
 
     :param bpmn_graph:
+    :return: a tuple of list of nodes on the path and its length.
     """
-    incoming_flows_list_param_name = "incoming"
-
-    nodes = copy.deepcopy(bpmn_graph.get_nodes())
-    no_incoming_flow_nodes = []
-    for node in nodes:
-        incoming_list = node[1][incoming_flows_list_param_name]
-        if len(incoming_list) == 0:
-            no_incoming_flow_nodes.append(node)
-
-    longest_path = []
-    for node in no_incoming_flow_nodes:
-        (output_path, output_path_len) = find_longest_path([], node, bpmn_graph)
-        if output_path_len > len(longest_path):
-            longest_path = output_path
+    longest_path = find_longest_path(bpmn_graph, lambda node: 1)
     return longest_path, len(longest_path)
 
 
-def find_longest_path(previous_nodes, node, bpmn_graph):
-    """
-
-    :param previous_nodes:
-    :param node:
-    :param bpmn_graph:
-    :return:
-    """
-    outgoing_flows_list_param_name = "outgoing"
-    outgoing_flows_list = node[1][outgoing_flows_list_param_name]
-    longest_path = []
-
-    if len(outgoing_flows_list) == 0:
-        tmp_previous_nodes = copy.deepcopy(previous_nodes)
-        tmp_previous_nodes.append(node)
-        return tmp_previous_nodes, len(tmp_previous_nodes)
-    else:
-        tmp_previous_nodes = copy.deepcopy(previous_nodes)
-        tmp_previous_nodes.append(node)
-        for outgoing_flow_id in outgoing_flows_list:
-            flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
-            outgoing_node = bpmn_graph.get_node_by_id(flow[2][consts.Consts.target_ref])
-            if outgoing_node not in previous_nodes:
-                (output_path, output_path_len) = find_longest_path(tmp_previous_nodes, outgoing_node, bpmn_graph)
-                if output_path_len > len(longest_path):
-                    longest_path = output_path
-        return longest_path, len(longest_path)
-
-
 def compute_longest_path_tasks(bpmn_graph):
     """
+    Finds the path starting in a node without incoming flows, which contains the most tasks and subprocesses.
+    Back flows found by cycle analysis are ignored.
 
     :param bpmn_graph:
+    :return: a tuple of list of tasks and subprocesses on the path and their count.
     """
-    incoming_flows_list_param_name = "incoming"
-
-    nodes = copy.deepcopy(bpmn_graph.get_nodes())
-    no_incoming_flow_nodes = []
-    for node in nodes:
-        incoming_list = node[1][incoming_flows_list_param_name]
-        if len(incoming_list) == 0:
-            no_incoming_flow_nodes.append(node)
-
-    longest_path = []
-    for node in no_incoming_flow_nodes:
-        (all_nodes, qualified_nodes) = find_longest_path_tasks([], [], node, bpmn_graph)
-        if len(qualified_nodes) > len(longest_path):
-            longest_path = qualified_nodes
-    return longest_path, len(longest_path)
+    node_names = {"task", "subProcess"}
+    longest_path = find_longest_path(bpmn_graph, lambda node: 1 if node[1][consts.Consts.type] in node_names else 0)
+    qualified_nodes = [node for node in longest_path if node[1][consts.Consts.type] in node_names]
+    return qualified_nodes, len(qualified_nodes)
 
 
-def find_longest_path_tasks(path, qualified_nodes, node, bpmn_graph):
+def find_longest_path(bpmn_graph, node_weight):
     """
+    Dynamic programming over nodes in topological order (after removal of back flows).
 
-    :param path:
-    :param qualified_nodes:
-    :param node:
     :param bpmn_graph:
-    :return:
-    """
-    node_names = {"task", "subProcess"}
-    outgoing_flows_list = node[1][consts.Consts.outgoing_flow]
-
-    if len(outgoing_flows_list) == 0:
-        tmp_path = copy.deepcopy(path)
-        tmp_path.append(node)
-        tmp_qualified_nodes = copy.deepcopy(qualified_nodes)
-        if node[1][consts.Consts.type] in node_names:
-            tmp_qualified_nodes.append(node)
-        return tmp_path, tmp_qualified_nodes
-    else:
-        longest_qualified_nodes = []
-        longest_path = copy.deepcopy(path)
-        longest_path.append(node)
-        for outgoing_flow_id in outgoing_flows_list:
-            flow = bpmn_graph.get_flow_by_id(outgoing_flow_id)
-            outgoing_node = bpmn_graph.get_node_by_id(flow[2][consts.Consts.target_ref])
-            tmp_path = copy.deepcopy(path)
-            tmp_path.append(node)
-            tmp_qualified_nodes = copy.deepcopy(qualified_nodes)
-            if node[1]["type"] in node_names:
-                tmp_qualified_nodes.append(node)
-
-            if outgoing_node not in path:
-                (path_all_nodes, path_qualified_nodes) = find_longest_path_tasks(tmp_path, tmp_qualified_nodes,
-                                                                                 outgoing_node, bpmn_graph)
-                if len(path_qualified_nodes) > len(longest_qualified_nodes):
-                    longest_qualified_nodes = path_qualified_nodes
-                    longest_path = path_all_nodes
-            else:
-                if len(tmp_qualified_nodes) > len(longest_qualified_nodes):
-                    longest_qualified_nodes = tmp_qualified_nodes
-                    longest_path = tmp_path
-        return longest_path, longest_qualified_nodes
+    :param node_weight: function returning weight of node, passed as (id, attributes) tuple,
+    :return: list of nodes of the path with maximal sum of weights.
+    """
+    analysis = cycle_analysis.get_cycle_analysis(bpmn_graph)
+    nodes = bpmn_graph.diagram_graph._node
+    best = {}
+    previous = {}
+    for node_id in analysis.topological_order:
+        node = nodes[node_id]
+        if not node[consts.Consts.incoming_flow]:
+            best[node_id] = node_weight((node_id, node))
+            previous[node_id] = None
+        if node_id not in best:
+            # not reachable from nodes without incoming flows
+            continue
+        for flow_id in node[consts.Consts.outgoing_flow]:
+            if flow_id in analysis.back_flows:
+                continue
+            target_id = bpmn_graph.sequence_flows[flow_id][consts.Consts.target_ref]
+            weight = best[node_id] + node_weight((target_id, nodes[target_id]))
+            if weight > best.get(target_id, -1):
+                best[target_id] = weight
+                previous[target_id] = node_id
+
+    if not best:
+        return []
+    node_id = max(best, key=best.__getitem__)
+    path = []
+    while node_id is not None:
+        path.append(bpmn_graph.get_node_by_id(node_id))
+        node_id = previous[node_id]
+    return path[::-1]
@@ -2,4 +2,5 @@
 """
 Package init file
 """
-__all__ = ["activity_type", "subprocess_type", "task_type"]
+__all__ = ["activity_type", "call_activity_type", "manual_task_type", "send_task_type", "service_task_type",
+           "subprocess_type", "task_type", "user_task_type"]
@@ -0,0 +1,18 @@
+# coding=utf-8
+"""
+Class used for representing tCallActivity of BPMN 2.0 graph
+"""
+from . import activity_type as activity
+
+
+class CallActivity(activity.Activity):
+    """
+    Class used for representing tCallActivity of BPMN 2.0 graph
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        """
+        Default constructor, initializes object fields with new instances.
+        """
+        super(CallActivity, self).__init__()
@@ -0,0 +1,18 @@
+# coding=utf-8
+"""
+Class used for representing tSendTask of BPMN 2.0 graph
+"""
+from . import task_type as task
+
+
+class SendTask(task.Task):
+    """
+    Class used for representing tSendTask of BPMN 2.0 graph
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        """
+        Default constructor, initializes object fields with new instances.
+        """
+        super(SendTask, self).__init__()
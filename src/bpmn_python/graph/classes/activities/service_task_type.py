@@ -0,0 +1,18 @@
+# coding=utf-8
+"""
+Class used for representing tServiceTask of BPMN 2.0 graph
+"""
+from . import task_type as task
+
+
+class ServiceTask(task.Task):
+    """
+    Class used for representing tServiceTask of BPMN 2.0 graph
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        """
+        Default constructor, initializes object fields with new instances.
+        """
+        super(ServiceTask, self).__init__()
@@ -2,9 +2,10 @@
 """
 Class used for representing tSubProcess of BPMN 2.0 graph
 """
-import graph.classes.activities.activity_type as activity
-import graph.classes.flow_element_type as flow_element
-import graph.classes.lane_set_type as lane_set
+from . import activity_type as activity
+from .. import flow_element_type as flow_element
+from .. import lane_set_type as lane_set
+from .. import validation
 
 
 class SubProcess(activity.Activity):
@@ -15,6 +16,7 @@ class SubProcess(activity.Activity):
     - flow_element_list: a list of FlowElement objects.
     - triggered_by_event: a boolean value..
     """
+    __slots__ = ("__triggered_by_event", "__lane_set_list", "__flow_element_list")
 
     def __init__(self):
         """
@@ -37,6 +39,9 @@ class SubProcess(activity.Activity):
         Setter for 'triggered_by_event' field.
         :param value - a new value of 'triggered_by_event' field. Must be a boolean type. Does not accept None value.
         """
+        if not validation.is_enabled():
+            self.__triggered_by_event = value
+            return
         if value is None or not isinstance(value, bool):
             raise TypeError("TriggeredByEvent must be set to a bool")
         else:
@@ -54,6 +59,9 @@ class SubProcess(activity.Activity):
         Setter for 'lane_set_list' field.
         :param value - a new value of 'lane_set_list' field. Must be a list
         """
+        if not validation.is_enabled():
+            self.__lane_set_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("LaneSetList new value must be a list")
         else:
@@ -74,6 +82,9 @@ class SubProcess(activity.Activity):
         Setter for 'flow_element_list' field.
         :param value - a new value of 'flow_element_list' field. Must be a list
         """
+        if not validation.is_enabled():
+            self.__flow_element_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("FlowElementList new value must be a list")
         else:
@@ -81,3 +92,12 @@ class SubProcess(activity.Activity):
                 if not isinstance(element, flow_element.FlowElement):
                     raise TypeError("FlowElementList elements in variable must be of FlowElement class")
             self.__flow_element_list = value
+
+    def add_flow_element(self, value):
+        """
+        Appends a single element to 'flow_element_list' field, validating only the new element.
+        :param value - an object of FlowElement type.
+        """
+        if validation.is_enabled() and not isinstance(value, flow_element.FlowElement):
+            raise TypeError("FlowElementList elements in variable must be of FlowElement class")
+        self.__flow_element_list.append(value)
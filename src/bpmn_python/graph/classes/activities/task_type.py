@@ -2,13 +2,14 @@
 """
 Class used for representing tTask of BPMN 2.0 graph
 """
-import graph.classes.activities.activity_type as activity
+from . import activity_type as activity
 
 
 class Task(activity.Activity):
     """
     Class used for representing tTask of BPMN 2.0 graph
     """
+    __slots__ = ()
 
     def __init__(self):
         """
@@ -2,6 +2,7 @@
 """
 Class used for representing tBaseElement of BPMN 2.0 graph
 """
+from . import validation
 
 
 class BaseElement(object):
@@ -10,6 +11,7 @@ class BaseElement(object):
     Fields:
     - id: an ID of element. Must be either None (ID is optional according to BPMN 2.0 XML Schema) or String.
     """
+    __slots__ = ("__id",)
 
     def __init__(self):
         """
@@ -30,9 +32,12 @@ class BaseElement(object):
         :param value - a new value of 'id' field. Must be either None (ID is optional according to BPMN 2.0 XML Schema)
         or String type.
         """
+        if not validation.is_enabled():
+            self.__id = value
+            return
         if value is None:
             self.__id = value
-        if not isinstance(value, str):
+        elif not isinstance(value, str):
             raise TypeError("ID must be set to a String")
         else:
             self.__id = value
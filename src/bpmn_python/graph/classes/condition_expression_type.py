@@ -3,6 +3,8 @@
 Class used for representing condition expression in sequence flow
 """
 
+from . import validation
+
 
 class ConditionExpression(object):
     """
@@ -10,6 +12,7 @@ class ConditionExpression(object):
     Fields:
     - condition: condition expression. Required field. Must be a String.
     """
+    __slots__ = ("__condition",)
 
     def __init__(self):
         """
@@ -30,6 +33,9 @@ class ConditionExpression(object):
         Setter for 'condition' field.
         :param value - a new value of 'condition' field. Required field. Must be a String.
         """
+        if not validation.is_enabled():
+            self.__condition = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("Condition is required and must be set to a String")
         else:
@@ -2,5 +2,5 @@
 """
 Package init file
 """
-__all__ = ["catch_event_type", "end_event_type", "event_type", "intermediate_catch_event_type",
+__all__ = ["boundary_event_type", "catch_event_type", "end_event_type", "event_type", "intermediate_catch_event_type",
            "intermediate_throw_event_type", "start_event_type", "throw_event_type"]
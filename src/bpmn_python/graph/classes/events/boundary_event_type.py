@@ -0,0 +1,64 @@
+# coding=utf-8
+"""
+Class used for representing tBoundaryEvent of BPMN 2.0 graph
+"""
+from . import catch_event_type as catch_event
+from .. import validation
+
+
+class BoundaryEvent(catch_event.CatchEvent):
+    """
+    Class used for representing tBoundaryEvent of BPMN 2.0 graph
+    Fields (except inherited):
+    - cancel_activity: a boolean value. default value "true".
+    - attached_to_ref: an ID of activity, to which event is attached. Required value.
+    """
+    __slots__ = ("__cancel_activity", "__attached_to_ref")
+
+    def __init__(self):
+        """
+        Default constructor, initializes object fields with new instances.
+        """
+        super(BoundaryEvent, self).__init__()
+        self.__cancel_activity = True
+        self.__attached_to_ref = None
+
+    def cancel_activity(self):
+        """
+        Getter for 'cancel_activity' field.
+        :return: value of 'cancel_activity' field.
+        """
+        return self.__cancel_activity
+
+    def set_cancel_activity(self, value):
+        """
+        Setter for 'cancel_activity' field.
+        :param value - a new value of 'cancel_activity' field. Must be a boolean type. Does not accept None value.
+        """
+        if not validation.is_enabled():
+            self.__cancel_activity = value
+            return
+        if value is None or not isinstance(value, bool):
+            raise TypeError("CancelActivity must be set to a bool")
+        else:
+            self.__cancel_activity = value
+
+    def get_attached_to_ref(self):
+        """
+        Getter for 'attached_to_ref' field.
+        :return: value of 'attached_to_ref' field.
+        """
+        return self.__attached_to_ref
+
+    def set_attached_to_ref(self, value):
+        """
+        Setter for 'attached_to_ref' field.
+        :param value - a new value of 'attached_to_ref' field. Must be a String type.
+        """
+        if not validation.is_enabled():
+            self.__attached_to_ref = value
+            return
+        if value is None or not isinstance(value, str):
+            raise TypeError("AttachedToRef must be set to a String")
+        else:
+            self.__attached_to_ref = value
@@ -2,8 +2,9 @@
 """
 Class used for representing tCatchEvent of BPMN 2.0 graph
 """
-import graph.classes.events.event_type as event
-import graph.classes.root_element.event_definition_type as event_definition
+from . import event_type as event
+from .. import validation
+from ..root_element import event_definition_type as event_definition
 
 
 class CatchEvent(event.Event):
@@ -13,6 +14,7 @@ class CatchEvent(event.Event):
     - parallel_multiple: a boolean value. default value "false".
     - event_definition_list: a list of EventDefinition objects. Optional value.
     """
+    __slots__ = ("__parallel_multiple", "__event_definition_list")
 
     def __init__(self):
         """
@@ -34,6 +36,9 @@ class CatchEvent(event.Event):
         Setter for 'parallel_multiple' field.
         :param value - a new value of 'parallel_multiple' field. Must be a boolean type. Does not accept None value.
         """
+        if not validation.is_enabled():
+            self.__parallel_multiple = value
+            return
         if value is None or not isinstance(value, bool):
             raise TypeError("ParallelMultiple must be set to a bool")
         else:
@@ -51,6 +56,9 @@ class CatchEvent(event.Event):
         Setter for 'event_definition_list' field.
         :param value - a new value of 'event_definition_list' field. Must be a list of EventDefinition objects
         """
+        if not validation.is_enabled():
+            self.__event_definition_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("EventDefinitionList new value must be a list")
         else:
@@ -2,13 +2,14 @@
 """
 Class used for representing tEvent of BPMN 2.0 graph
 """
-import graph.classes.flow_node_type as flow_node
+from .. import flow_node_type as flow_node
 
 
 class Event(flow_node.FlowNode):
     """
     Class used for representing tEvent of BPMN 2.0 graph
     """
+    __slots__ = ()
 
     def __init__(self):
         """
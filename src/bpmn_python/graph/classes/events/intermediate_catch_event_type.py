@@ -2,13 +2,14 @@
 """
 Class used for representing tIntermediateCatchEvent of BPMN 2.0 graph
 """
-import graph.classes.events.catch_event_type as catch_event
+from . import catch_event_type as catch_event
 
 
 class IntermediateCatchEvent(catch_event.CatchEvent):
     """
     Class used for representing tIntermediateCatchEvent of BPMN 2.0 graph
     """
+    __slots__ = ()
 
     def __init__(self):
         """
@@ -2,13 +2,14 @@
 """
 Class used for representing tIntermediateThrowEvent of BPMN 2.0 graph
 """
-import graph.classes.events.throw_event_type as throw_event
+from . import throw_event_type as throw_event
 
 
 class IntermediateThrowEvent(throw_event.ThrowEvent):
     """
     Class used for representing tIntermediateThrowEvent of BPMN 2.0 graph
     """
+    __slots__ = ()
 
     def __init__(self):
         """
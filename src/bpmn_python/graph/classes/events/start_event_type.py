@@ -2,16 +2,41 @@
 """
 Class used for representing tStartEvent of BPMN 2.0 graph
 """
-import graph.classes.events.catch_event_type as catch_event
+from . import catch_event_type as catch_event
+from .. import validation
 
 
 class StartEvent(catch_event.CatchEvent):
     """
     Class used for representing tStartEvent of BPMN 2.0 graph
+    Fields (except inherited):
+    - is_interrupting: a boolean value. default value "true".
     """
+    __slots__ = ("__is_interrupting",)
 
     def __init__(self):
         """
         Default constructor, initializes object fields with new instances.
         """
         super(StartEvent, self).__init__()
+        self.__is_interrupting = True
+
+    def is_interrupting(self):
+        """
+        Getter for 'is_interrupting' field.
+        :return: value of 'is_interrupting' field.
+        """
+        return self.__is_interrupting
+
+    def set_is_interrupting(self, value):
+        """
+        Setter for 'is_interrupting' field.
+        :param value - a new value of 'is_interrupting' field. Must be a boolean type. Does not accept None value.
+        """
+        if not validation.is_enabled():
+            self.__is_interrupting = value
+            return
+        if value is None or not isinstance(value, bool):
+            raise TypeError("IsInterrupting must be set to a bool")
+        else:
+            self.__is_interrupting = value
@@ -2,8 +2,9 @@
 """
 Class used for representing tThrowEvent of BPMN 2.0 graph
 """
-import graph.classes.events.event_type as event
-import graph.classes.root_element.event_definition_type as event_definition
+from . import event_type as event
+from .. import validation
+from ..root_element import event_definition_type as event_definition
 
 
 class ThrowEvent(event.Event):
@@ -12,6 +13,7 @@ class ThrowEvent(event.Event):
     Fields (except inherited):
     - event_definition_list: a list of EventDefinition objects. Optional value.
     """
+    __slots__ = ("__event_definition_list",)
 
     def __init__(self):
         """
@@ -32,6 +34,9 @@ class ThrowEvent(event.Event):
         Setter for 'event_definition_list' field.
         :param value - a new value of 'event_definition_list' field. Must be a list of EventDefinition objects
         """
+        if not validation.is_enabled():
+            self.__event_definition_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("EventDefinitionList new value must be a list")
         else:
@@ -2,7 +2,8 @@
 """
 Class used for representing tFlowElement of BPMN 2.0 graph
 """
-import graph.classes.base_element_type as base_element
+from . import base_element_type as base_element
+from . import validation
 
 
 class FlowElement(base_element.BaseElement):
@@ -11,6 +12,7 @@ class FlowElement(base_element.BaseElement):
     Fields (except inherited):
     - name: name of element. Must be either None (name is optional according to BPMN 2.0 XML Schema) or String.
     """
+    __slots__ = ("__name",)
 
     def __init__(self):
         """
@@ -32,6 +34,9 @@ class FlowElement(base_element.BaseElement):
         :param value - a new value of 'name' field. Must be either None (name is optional according to BPMN 2.0 XML
         Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__name = value
+            return
         if value is None:
             self.__name = value
         elif not isinstance(value, str):
@@ -2,13 +2,15 @@
 """
 Class used for representing tFlowNode of BPMN 2.0 graph
 """
-import bpmn_python.graph.classes.flow_element_type as flow_element_type
+from . import flow_element_type as flow_element_type
+from . import validation
 
 
 class FlowNode(flow_element_type.FlowElement):
     """
     Class used for representing tFlowNode of BPMN 2.0 graph
     """
+    __slots__ = ("__incoming_list", "__outgoing_list")
 
     def __init__(self):
         """
@@ -33,6 +35,9 @@ class FlowNode(flow_element_type.FlowElement):
         Setter for 'incoming' field.
         :param value - a new value of 'incoming' field. List of IDs (String type) of incoming flows.
         """
+        if not validation.is_enabled():
+            self.__incoming_list = value
+            return
         if not isinstance(value, list):
             raise TypeError("IncomingList new value must be a list")
         for element in value:
@@ -40,6 +45,15 @@ class FlowNode(flow_element_type.FlowElement):
                 raise TypeError("IncomingList elements in variable must be of String class")
         self.__incoming_list = value
 
+    def add_incoming(self, value):
+        """
+        Appends a single flow ID to 'incoming' field, validating only the new element.
+        :param value - an ID (String type) of incoming flow.
+        """
+        if validation.is_enabled() and not isinstance(value, str):
+            raise TypeError("IncomingList elements in variable must be of String class")
+        self.__incoming_list.append(value)
+
     def get_outgoing(self):
         """
         Getter for 'outgoing' field.
@@ -52,9 +66,21 @@ class FlowNode(flow_element_type.FlowElement):
         Setter for 'outgoing' field.
         :param value - a new value of 'outgoing' field. Must be a list of IDs (String type) of outgoing flows.
         """
+        if not validation.is_enabled():
+            self.__outgoing_list = value
+            return
         if not isinstance(value, list):
             raise TypeError("OutgoingList new value must be a list")
         for element in value:
             if not isinstance(element, str):
                 raise TypeError("OutgoingList elements in variable must be of String class")
         self.__outgoing_list = value
+
+    def add_outgoing(self, value):
+        """
+        Appends a single flow ID to 'outgoing' field, validating only the new element.
+        :param value - an ID (String type) of outgoing flow.
+        """
+        if validation.is_enabled() and not isinstance(value, str):
+            raise TypeError("OutgoingList elements in variable must be of String class")
+        self.__outgoing_list.append(value)
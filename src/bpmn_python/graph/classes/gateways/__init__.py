@@ -2,4 +2,5 @@
 """
 Package init file
 """
-__all__ = ["exclusive_gateway_type", "gateway_type", "inclusive_gateway_type", "parallel_gateway_type"]
+__all__ = ["complex_gateway_type", "event_based_gateway_type", "exclusive_gateway_type", "gateway_type",
+           "inclusive_gateway_type", "parallel_gateway_type"]
@@ -0,0 +1,18 @@
+# coding=utf-8
+"""
+Class used for representing tComplexGateway of BPMN 2.0 graph
+"""
+from . import gateway_type as gateway
+
+
+class ComplexGateway(gateway.Gateway):
+    """
+    Class used for representing tComplexGateway of BPMN 2.0 graph
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        """
+        Default constructor, initializes object fields with new instances.
+        """
+        super(ComplexGateway, self).__init__()
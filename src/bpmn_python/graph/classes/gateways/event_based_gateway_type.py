@@ -0,0 +1,67 @@
+# coding=utf-8
+"""
+Class used for representing tEventBasedGateway of BPMN 2.0 graph
+"""
+from . import gateway_type as gateway
+from .. import validation
+
+
+class EventBasedGateway(gateway.Gateway):
+    """
+    Class used for representing tEventBasedGateway of BPMN 2.0 graph
+    Fields (except inherited):
+    - instantiate: a boolean value. default value "false".
+    - event_gateway_type: a String, one of values "Exclusive", "Parallel". default value "Exclusive".
+    """
+    __slots__ = ("__instantiate", "__event_gateway_type")
+    __event_gateway_types_list = ["Exclusive", "Parallel"]
+
+    def __init__(self):
+        """
+        Default constructor, initializes object fields with new instances.
+        """
+        super(EventBasedGateway, self).__init__()
+        self.__instantiate = False
+        self.__event_gateway_type = "Exclusive"
+
+    def instantiate(self):
+        """
+        Getter for 'instantiate' field.
+        :return: value of 'instantiate' field.
+        """
+        return self.__instantiate
+
+    def set_instantiate(self, value):
+        """
+        Setter for 'instantiate' field.
+        :param value - a new value of 'instantiate' field. Must be a boolean type. Does not accept None value.
+        """
+        if not validation.is_enabled():
+            self.__instantiate = value
+            return
+        if value is None or not isinstance(value, bool):
+            raise TypeError("Instantiate must be set to a bool")
+        else:
+            self.__instantiate = value
+
+    def get_event_gateway_type(self):
+        """
+        Getter for 'event_gateway_type' field.
+        :return: value of 'event_gateway_type' field.
+        """
+        return self.__event_gateway_type
+
+    def set_event_gateway_type(self, value):
+        """
+        Setter for 'event_gateway_type' field.
+        :param value - a new value of 'event_gateway_type' field.
+        """
+        if not validation.is_enabled():
+            self.__event_gateway_type = value
+            return
+        if value is None or not isinstance(value, str):
+            raise TypeError("EventGatewayType must be set to a String")
+        elif value not in EventBasedGateway.__event_gateway_types_list:
+            raise ValueError("EventGatewayType must be one of specified values: 'Exclusive', 'Parallel'")
+        else:
+            self.__event_gateway_type = value
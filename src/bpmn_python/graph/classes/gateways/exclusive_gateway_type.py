@@ -2,7 +2,8 @@
 """
 Class used for representing tInclusiveGateway of BPMN 2.0 graph
 """
-import graph.classes.gateways.gateway_type as gateway
+from . import gateway_type as gateway
+from .. import validation
 
 
 class ExclusiveGateway(gateway.Gateway):
@@ -12,6 +13,7 @@ class ExclusiveGateway(gateway.Gateway):
     - default: ID of default flow of gateway. Must be either None (default is optional according to BPMN 2.0 XML Schema)
     or String.
     """
+    __slots__ = ("__default",)
 
     def __init__(self):
         """
@@ -33,6 +35,9 @@ class ExclusiveGateway(gateway.Gateway):
         :param value - a new value of 'default' field. Must be either None (default is optional according to
         BPMN 2.0 XML Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__default = value
+            return
         if value is None:
             self.__default = value
         elif not isinstance(value, str):
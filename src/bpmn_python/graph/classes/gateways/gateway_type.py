@@ -2,13 +2,15 @@
 """
 Class used for representing tGateway of BPMN 2.0 graph
 """
-import graph.classes.flow_node_type as flow_node
+from .. import flow_node_type as flow_node
+from .. import validation
 
 
 class Gateway(flow_node.FlowNode):
     """
     Class used for representing tGateway of BPMN 2.0 graph
     """
+    __slots__ = ("__gateway_direction",)
     __gateway_directions_list = ["Unspecified", "Converging", "Diverging", "Mixed"]
 
     def __init__(self):
@@ -30,6 +32,9 @@ class Gateway(flow_node.FlowNode):
         Setter for 'gateway_direction' field.
         :param value - a new value of 'gateway_direction' field.
         """
+        if not validation.is_enabled():
+            self.__gateway_direction = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("GatewayDirection must be set to a String")
         elif value not in Gateway.__gateway_directions_list:
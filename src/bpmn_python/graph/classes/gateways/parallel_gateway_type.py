@@ -2,13 +2,14 @@
 """
 Class used for representing tParallelGateway of BPMN 2.0 graph
 """
-import graph.classes.gateways.gateway_type as gateway
+from . import gateway_type as gateway
 
 
 class ParallelGateway(gateway.Gateway):
     """
     Class used for representing tParallelGateway of BPMN 2.0 graph
     """
+    __slots__ = ()
 
     def __init__(self):
         """
@@ -2,8 +2,9 @@
 """
 Class used for representing tSetLane of BPMN 2.0 graph
 """
-import graph.classes.base_element_type as base_element
-import graph.classes.lane_type as lane
+from . import base_element_type as base_element
+from . import lane_type as lane
+from . import validation
 
 
 class LaneSet(base_element.BaseElement):
@@ -13,6 +14,7 @@ class LaneSet(base_element.BaseElement):
     - name: name of element. Must be either None (name is optional according to BPMN 2.0 XML Schema) or String.
     - lane_list: a list of Lane objects.
     """
+    __slots__ = ("__name", "__lane_list")
 
     def __init__(self):
         """
@@ -35,6 +37,9 @@ class LaneSet(base_element.BaseElement):
         :param value - a new value of 'name' field. Must be either None (name is optional according to BPMN 2.0 XML
         Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__name = value
+            return
         if value is None:
             self.__name = value
         elif not isinstance(value, str):
@@ -54,6 +59,9 @@ class LaneSet(base_element.BaseElement):
         Setter for 'lane_list' field.
         :param value - a new value of 'lane_list' field. Must be a list of Lane objects
         """
+        if not validation.is_enabled():
+            self.__lane_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("LaneList new value must be a list")
         else:
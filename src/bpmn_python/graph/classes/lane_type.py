@@ -2,8 +2,9 @@
 """
 Class used for representing tLane of BPMN 2.0 graph
 """
-import graph.classes.base_element_type as base_element
-import graph.classes.lane_set_type as lane_set
+from . import base_element_type as base_element
+from . import lane_set_type as lane_set
+from . import validation
 
 
 class Lane(base_element.BaseElement):
@@ -14,6 +15,7 @@ class Lane(base_element.BaseElement):
     - flow_node_ref_list: a list of String objects (ID of referenced nodes).
     - child_lane_set: an object of LaneSet type.
     """
+    __slots__ = ("__name", "__flow_node_ref_list", "__child_lane_set")
 
     def __init__(self):
         """
@@ -37,6 +39,9 @@ class Lane(base_element.BaseElement):
         :param value - a new value of 'name' field. Must be either None (name is optional according to BPMN 2.0 XML
         Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__name = value
+            return
         if value is None:
             self.__name = value
         elif not isinstance(value, str):
@@ -56,6 +61,9 @@ class Lane(base_element.BaseElement):
         Setter for 'flow_node_ref' field.
         :param value - a new value of 'flow_node_ref' field. Must be a list of String objects (ID of referenced nodes).
         """
+        if not validation.is_enabled():
+            self.__flow_node_ref_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("FlowNodeRefList new value must be a list")
         else:
@@ -76,6 +84,9 @@ class Lane(base_element.BaseElement):
         Setter for 'child_lane_set' field.
         :param value - a new value of 'child_lane_set' field. Must be an object of LaneSet type.
         """
+        if not validation.is_enabled():
+            self.__child_lane_set = value
+            return
         if value is None:
             self.__child_lane_set = value
         elif not isinstance(value, lane_set.LaneSet):
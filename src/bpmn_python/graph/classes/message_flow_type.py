@@ -2,13 +2,15 @@
 """
 Class used for representing tMessageFlow of BPMN 2.0 graph
 """
-import graph.classes.base_element_type as base_element
+from . import base_element_type as base_element
+from . import validation
 
 
 class MessageFlow(base_element.BaseElement):
     """
     Class used for representing tMessageFlow of BPMN 2.0 graph
     """
+    __slots__ = ("__name", "__source_ref", "__target_ref", "__message_ref")
 
     def __init__(self, source_ref, target_ref):
         """
@@ -20,10 +22,11 @@ class MessageFlow(base_element.BaseElement):
         - message_ref: an ID of referenced message element. Must be either None (message_ref is optional according to
         BPMN 2.0 XML Schema) or String.
         """
-        if source_ref is None or not isinstance(source_ref, str):
-            raise TypeError("SourceRef is required and must be set to a String")
-        if target_ref is None or not isinstance(source_ref, str):
-            raise TypeError("TargetRef is required and must be set to a String")
+        if validation.is_enabled():
+            if source_ref is None or not isinstance(source_ref, str):
+                raise TypeError("SourceRef is required and must be set to a String")
+            if target_ref is None or not isinstance(target_ref, str):
+                raise TypeError("TargetRef is required and must be set to a String")
 
         super(MessageFlow, self).__init__()
         self.__name = None
@@ -44,6 +47,9 @@ class MessageFlow(base_element.BaseElement):
         :param value - a new value of 'name' field. Must be either None (name is optional according to BPMN 2.0 XML
         Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__name = value
+            return
         if value is None:
             self.__name = value
         elif not isinstance(value, str):
@@ -63,6 +69,9 @@ class MessageFlow(base_element.BaseElement):
         Setter for 'source_ref' field.
         :param value - a new value of 'source_ref' field. Must be a String type.
         """
+        if not validation.is_enabled():
+            self.__source_ref = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("SourceRef is required and must be set to a String")
         else:
@@ -80,6 +89,9 @@ class MessageFlow(base_element.BaseElement):
         Setter for 'target_ref' field.
         :param value - a new value of 'target_ref' field. Must be a String type.
         """
+        if not validation.is_enabled():
+            self.__target_ref = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("TargetRef is required and must be set to a String")
         else:
@@ -98,9 +110,12 @@ class MessageFlow(base_element.BaseElement):
         :param value - a new value of 'message_ref' field. Must be either None (message_ref is optional according to
         BPMN 2.0 XML Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__message_ref = value
+            return
         if value is None:
             self.__message_ref = value
-        if not isinstance(value, str):
+        elif not isinstance(value, str):
             raise TypeError("MessageRef must be set to a String")
         else:
             self.__message_ref = value
@@ -2,7 +2,8 @@
 """
 Class used for representing tParticipant of BPMN 2.0 graph
 """
-import graph.classes.base_element_type as base_element
+from . import base_element_type as base_element
+from . import validation
 
 
 class Participant(base_element.BaseElement):
@@ -13,6 +14,7 @@ class Participant(base_element.BaseElement):
     - process_ref: an ID of referenced message element. Must be either None (process_ref is optional according to
     BPMN 2.0 XML Schema) or String.
     """
+    __slots__ = ("__name", "__process_ref")
 
     def __init__(self):
         """
@@ -35,6 +37,9 @@ class Participant(base_element.BaseElement):
         :param value - a new value of 'name' field. Must be either None (name is optional according to BPMN 2.0 XML
         Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__name = value
+            return
         if value is None:
             self.__name = value
         elif not isinstance(value, str):
@@ -55,6 +60,9 @@ class Participant(base_element.BaseElement):
         :param value - a new value of 'process_ref' field. Must be either None (process_ref is optional according to
         BPMN 2.0 XML Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__process_ref = value
+            return
         if not isinstance(value, str):
             raise TypeError("ProcessRef must be set to a String")
         self.__process_ref = value
@@ -2,13 +2,15 @@
 """
 Class used for representing tCallableElement of BPMN 2.0 graph
 """
-import graph.classes.root_element.root_element_type as root_element
+from . import root_element_type as root_element
+from .. import validation
 
 
 class CallableElement(root_element.RootElement):
     """
     Class used for representing tCallableElement of BPMN 2.0 graph.
     """
+    __slots__ = ("__name",)
 
     def __init__(self):
         """
@@ -30,6 +32,9 @@ class CallableElement(root_element.RootElement):
         :param value - a new value of 'name' field. Must be either None (name is optional according to BPMN 2.0 XML
         Schema) or String.
         """
+        if not validation.is_enabled():
+            self.__name = value
+            return
         if value is None:
             self.__name = value
         elif not isinstance(value, str):
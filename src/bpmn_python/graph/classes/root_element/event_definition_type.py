@@ -2,16 +2,41 @@
 """
 Class used for representing tEventDefinition of BPMN 2.0 graph
 """
-import graph.classes.root_element.root_element_type as root_element
+from . import root_element_type as root_element
+from .. import validation
 
 
 class EventDefinition(root_element.RootElement):
     """
     Class used for representing tEventDefinition of BPMN 2.0 graph.
+    Fields (except inherited):
+    - definition_type: name of element of the definition, e.g. "timerEventDefinition", since subtypes
+    of tEventDefinition are represented by this class. Must be either None or String.
     """
+    __slots__ = ("__definition_type",)
 
     def __init__(self):
         """
         Default constructor, initializes object fields with new instances.
         """
         super(EventDefinition, self).__init__()
+        self.__definition_type = None
+
+    def get_definition_type(self):
+        """
+        Getter for 'definition_type' field.
+        :return: value of 'definition_type' field.
+        """
+        return self.__definition_type
+
+    def set_definition_type(self, value):
+        """
+        Setter for 'definition_type' field.
+        :param value - a new value of 'definition_type' field. Must be either None or String.
+        """
+        if not validation.is_enabled():
+            self.__definition_type = value
+            return
+        if value is not None and not isinstance(value, str):
+            raise TypeError("DefinitionType must be set to a String")
+        self.__definition_type = value
@@ -2,15 +2,17 @@
 """
 Class used for representing tProcess of BPMN 2.0 graph
 """
-import graph.classes.flow_element_type as flow_element
-import graph.classes.lane_set_type as lane_set
-import graph.classes.root_element.callable_element_type as callable_element
+from . import callable_element_type as callable_element
+from .. import flow_element_type as flow_element
+from .. import lane_set_type as lane_set
+from .. import validation
 
 
 class Process(callable_element.CallableElement):
     """
     Class used for representing tProcess of BPMN 2.0 graph.
     """
+    __slots__ = ("__process_type", "__is_closed", "__is_executable", "__lane_set_list", "__flow_element_list")
     __process_type_list = ["None", "Public", "Private"]
 
     def __init__(self):
@@ -36,6 +38,9 @@ class Process(callable_element.CallableElement):
         Setter for 'process_type' field.
         :param value - a new value of 'process_type' field.
         """
+        if not validation.is_enabled():
+            self.__process_type = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("ProcessType must be set to a String")
         elif value not in Process.__process_type_list:
@@ -55,6 +60,9 @@ class Process(callable_element.CallableElement):
         Setter for 'is_closed' field.
         :param value - a new value of 'is_closed' field. Must be a boolean type. Does not accept None value.
         """
+        if not validation.is_enabled():
+            self.__is_closed = value
+            return
         if value is None or not isinstance(value, bool):
             raise TypeError("IsClosed must be set to a bool")
         else:
@@ -72,6 +80,9 @@ class Process(callable_element.CallableElement):
         Setter for 'is_executable' field.
         :param value - a new value of 'is_executable' field. Must be a boolean type. Does not accept None value.
         """
+        if not validation.is_enabled():
+            self.__is_executable = value
+            return
         if value is None or not isinstance(value, bool):
             raise TypeError("IsExecutable must be set to a bool")
         else:
@@ -89,6 +100,9 @@ class Process(callable_element.CallableElement):
         Setter for 'lane_set_list' field.
         :param value - a new value of 'lane_set_list' field. Must be a list
         """
+        if not validation.is_enabled():
+            self.__lane_set_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("LaneSetList new value must be a list")
         else:
@@ -109,6 +123,9 @@ class Process(callable_element.CallableElement):
         Setter for 'flow_element_list' field.
         :param value - a new value of 'flow_element_list' field. Must be a list
         """
+        if not validation.is_enabled():
+            self.__flow_element_list = value
+            return
         if value is None or not isinstance(value, list):
             raise TypeError("FlowElementList new value must be a list")
         else:
@@ -116,3 +133,12 @@ class Process(callable_element.CallableElement):
                 if not isinstance(element, flow_element.FlowElement):
                     raise TypeError("FlowElementList elements in variable must be of FlowElement class")
             self.__flow_element_list = value
+
+    def add_flow_element(self, value):
+        """
+        Appends a single element to 'flow_element_list' field, validating only the new element.
+        :param value - an object of FlowElement type.
+        """
+        if validation.is_enabled() and not isinstance(value, flow_element.FlowElement):
+            raise TypeError("FlowElementList elements in variable must be of FlowElement class")
+        self.__flow_element_list.append(value)
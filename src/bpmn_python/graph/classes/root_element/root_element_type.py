@@ -2,13 +2,14 @@
 """
 Class used for representing tRootElement of BPMN 2.0 graph
 """
-import graph.classes.base_element_type as base_element
+from .. import base_element_type as base_element
 
 
 class RootElement(base_element.BaseElement):
     """
     Class used for representing tRootElement of BPMN 2.0 graph.
     """
+    __slots__ = ()
 
     def __init__(self):
         """
@@ -2,8 +2,9 @@
 """
 Class used for representing tSequenceFlow of BPMN 2.0 graph
 """
-import graph.classes.condition_expression_type as condition_expression
-import graph.classes.flow_element_type as flow_element
+from . import condition_expression_type as condition_expression
+from . import flow_element_type as flow_element
+from . import validation
 
 
 class SequenceFlow(flow_element.FlowElement):
@@ -16,15 +17,17 @@ class SequenceFlow(flow_element.FlowElement):
     (condition_expression is optional according to BPMN 2.0 XML Schema) or String.
     - is_immediate: a boolean value.
     """
+    __slots__ = ("__source_ref", "__target_ref", "__condition_expression", "__is_immediate")
 
     def __init__(self, source_ref, target_ref):
         """
         Default constructor, initializes object fields with new instances.
         """
-        if source_ref is None or not isinstance(source_ref, str):
-            raise TypeError("SourceRef is required and must be set to a String")
-        if target_ref is None or not isinstance(source_ref, str):
-            raise TypeError("TargetRef is required and must be set to a String")
+        if validation.is_enabled():
+            if source_ref is None or not isinstance(source_ref, str):
+                raise TypeError("SourceRef is required and must be set to a String")
+            if target_ref is None or not isinstance(target_ref, str):
+                raise TypeError("TargetRef is required and must be set to a String")
 
         super(SequenceFlow, self).__init__()
         self.__source_ref = source_ref
@@ -44,6 +47,9 @@ class SequenceFlow(flow_element.FlowElement):
         Setter for 'source_ref' field.
         :param value - a new value of 'source_ref' field. Required field. Must be a String type.
         """
+        if not validation.is_enabled():
+            self.__source_ref = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("SourceRef is required and must be set to a String")
         else:
@@ -61,6 +67,9 @@ class SequenceFlow(flow_element.FlowElement):
         Setter for 'target_ref' field.
         :param value - a new value of 'target_ref' field. Required field. Must be a String type.
         """
+        if not validation.is_enabled():
+            self.__target_ref = value
+            return
         if value is None or not isinstance(value, str):
             raise TypeError("TargetRef is required and must be set to a String")
         else:
@@ -78,6 +87,9 @@ class SequenceFlow(flow_element.FlowElement):
         Setter for 'is_immediate' field.
         :param value - a new value of 'is_immediate' field. Must be a boolean type.
         """
+        if not validation.is_enabled():
+            self.__is_immediate = value
+            return
         if value is None:
             self.__is_immediate = value
         elif not isinstance(value, bool):
@@ -98,9 +110,12 @@ class SequenceFlow(flow_element.FlowElement):
         Setter for 'condition_expression' field.
         :param value - a new value of 'condition_expression' field.
         """
+        if not validation.is_enabled():
+            self.__condition_expression = value
+            return
         if value is None:
             self.__condition_expression = value
-        if not isinstance(value, condition_expression.ConditionExpression):
+        elif not isinstance(value, condition_expression.ConditionExpression):
             raise TypeError("ConditionExpression must be set to an instance of class ConditionExpression")
         else:
             self.__condition_expression = value
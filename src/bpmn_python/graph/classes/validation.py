@@ -0,0 +1,38 @@
+# coding=utf-8
+"""
+Switch for type validation done by setters of BPMN 2.0 graph classes. State of the switch is a context variable,
+so disabling validation in one thread (or asyncio task) does not affect the others.
+"""
+import contextlib
+import contextvars
+
+_enabled = contextvars.ContextVar("bpmn_python_validation_enabled", default=True)
+
+
+def set_enabled(value):
+    """
+    Enables or disables type validation in setters of all BPMN 2.0 graph classes, in the current context
+    (thread or asyncio task).
+    :param value - boolean flag.
+    """
+    _enabled.set(bool(value))
+
+
+def is_enabled():
+    """
+    :return: True if setters validate assigned values in the current context.
+    """
+    return _enabled.get()
+
+
+@contextlib.contextmanager
+def disabled():
+    """
+    Context manager disabling validation in the current context, e.g. for bulk construction of elements from
+    already validated data. Previous state is restored on exit.
+    """
+    token = _enabled.set(False)
+    try:
+        yield
+    finally:
+        _enabled.reset(token)
@@ -0,0 +1,332 @@
+"""
+bpmn-report - command line interface of the report generator.
+
+Every command accepts files, directories (searched recursively) and glob patterns, processes them in parallel
+with -j N worker processes and writes one JSON object per model to standard output (JSON lines), e.g.
+{"file": "examples/01_Obsluga_zgloszen.bpmn", "command": "metrics", "ok": true, "metrics": {...}, "seconds": 0.03}
+Exit status is 1 if any model failed (or, for validate, is not valid).
+
+Reports are named after paths of models relative to the given directory (with extension), e.g. report of
+models/orders/model.bpmn given as "models" is saved as report_<date>_orders_model.bpmn.html. Model whose report
+would overwrite the report of another model of the batch fails.
+
+Parsed models are kept in a persistent cache (see --cache-dir), so repeated invocations on unchanged models
+skip XML parsing.
+
+Usage (from repository root):
+    python -m src.cli report examples --format html -j 4
+    python -m src.cli report model.bpmn --simulate simulation.json --replications 20
+    python -m src.cli report model.bpmn --simulate simulation.json --critical-path
+    python -m src.cli metrics "examples/*.bpmn" | jq .metrics
+    python -m src.cli layout examples/01_Obsluga_zgloszen.bpmn --output-dir layouts
+    python -m src.cli convert examples --to csv --output-dir csv
+    python -m src.cli validate models/
+    python -m src.cli watch models/ --output-dir reports -j 2
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import src.bpmn_python.bpmn_python_consts as consts
+from src.bpmn_python.bpmn_diagram_exception import BpmnPythonError
+import src.model_cache as model_cache
+
+MODEL_EXTENSIONS = (".bpmn", ".xml")
+CSV_EXTENSIONS = (".csv",)
+
+
+def expand_paths(paths: list[str], extensions: tuple[str, ...]) -> list[str]:
+    """
+    Returns sorted, unique model files. Directories are searched recursively for files with given extensions,
+    other arguments are treated as file paths or glob patterns.
+    """
+    return sorted(expand_path_roots(paths, extensions))
+
+
+def expand_path_roots(paths: list[str], extensions: tuple[str, ...]) -> dict[str, str]:
+    """
+    Returns dictionary mapping model files (see expand_paths) to their input roots - the searched directory
+    for files found in directories, the directory of the file otherwise. The first argument matching a file wins.
+    """
+    roots = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in os.walk(path):
+                for filename in filenames:
+                    if filename.lower().endswith(extensions):
+                        roots.setdefault(os.path.join(directory, filename), path)
+        elif os.path.isfile(path):
+            roots.setdefault(path, os.path.dirname(path))
+        else:
+            for match in glob.glob(path, recursive=True):
+                if os.path.isfile(match):
+                    roots.setdefault(match, os.path.dirname(match))
+    return roots
+
+
+def report_name(file_path: str, root: str | None = None) -> str:
+    """
+    Name of the report of the model - path of the model relative to root (directory of the model by default),
+    with extension, directories separated with "_".
+    """
+    relative_path = os.path.relpath(file_path, root or os.path.dirname(file_path) or ".")
+    return relative_path.replace(os.sep, "_").replace("/", "_")
+
+
+def report_names(roots: dict[str, str]) -> dict[str, tuple[str, str]]:
+    """
+    Assigns report names to model files. Returns dictionary mapping model file to a pair of its report name and
+    the file owning the name - the first (in sorted order) file with the name, other files with the same name
+    collide with it.
+    """
+    owners = {}
+    names = {}
+    for file_path in sorted(roots):
+        name = report_name(file_path, roots[file_path])
+        names[file_path] = (name, owners.setdefault(name, file_path))
+    return names
+
+
+def output_directory(file_path: str, options: dict) -> str:
+    """ Output directory given in options, directory of the model by default. """
+    return options.get("output_dir") or os.path.dirname(file_path)
+
+
+def run_report(file_path: str, options: dict) -> dict:
+    from src.report_generator import ReportGenerator
+    name = options.get("report_name") or report_name(file_path)
+    owner = options.get("report_owner") or file_path
+    if owner != file_path:
+        raise BpmnPythonError(f"report {name} would overwrite the report of {owner}")
+    diagram = load(file_path, options)
+    report_generator = ReportGenerator(diagram, report_path=options.get("output_dir") or "reports")
+    report_generator.file_name = name
+    if options.get("simulate") is not None:
+        from src.bpmn_python.bpmn_simulation import SimulationParameters
+        context_generator = report_generator.context_generator
+        context_generator.simulation_parameters = (
+            SimulationParameters.from_file(options["simulate"]) if options["simulate"] else SimulationParameters())
+        context_generator.replications = options.get("replications", 10)
+    report_generator.context_generator.include_critical_path = options.get("critical_path", False)
+    if options["format"] == "pdf":
+        report_generator.generate_pdf_report(options.get("wkhtmltopdf"))
+        return {"output": report_generator.pdf_report_path}
+    report_generator.generate_html_report()
+    return {"output": report_generator.html_report_path}
+
+
+def run_metrics(file_path: str, options: dict) -> dict:
+    import src.bpmn_python.bpmn_diagram_metrics as metrics
+    from src.report_service import METRIC_NAMES
+    diagram = load(file_path, options)
+    return {"metrics": {name: getattr(metrics, name)(diagram) for name in METRIC_NAMES}}
+
+
+def run_layout(file_path: str, options: dict) -> dict:
+    import src.bpmn_python.bpmn_diagram_layouter as layouter
+    diagram = load(file_path, options)
+    layouter.generate_layout(diagram)
+    directory = output_directory(file_path, options)
+    file_name = f"{Path(file_path).stem}_layout.bpmn"
+    diagram.export_xml_file(directory, file_name)
+    return {"output": os.path.join(directory, file_name)}
+
+
+def run_convert(file_path: str, options: dict) -> dict:
+    diagram = load(file_path, options)
+    is_csv = file_path.lower().endswith(CSV_EXTENSIONS)
+    target = options.get("to") or ("xml" if is_csv else "csv")
+    directory = output_directory(file_path, options)
+    if target == "csv":
+        file_name = f"{Path(file_path).stem}.csv"
+        diagram.export_csv_file(directory, file_name)
+    else:
+        if is_csv:
+            # CSV has no Diagram Interchange data, which XML export requires
+            import src.bpmn_python.bpmn_diagram_layouter as layouter
+            layouter.generate_layout(diagram)
+        file_name = f"{Path(file_path).stem}.bpmn"
+        diagram.export_xml_file(directory, file_name)
+    return {"output": os.path.join(directory, file_name)}
+
+
+def run_validate(file_path: str, options: dict) -> dict:
+    diagram = load(file_path, options)
+    issues = validate_diagram(diagram)
+    if not options.get("no_soundness"):
+        import src.bpmn_python.bpmn_soundness as soundness
+        issues += soundness.soundness_issues(diagram, options.get("reduce", False), options.get("max_states", 200000))
+    return {"ok": not issues, "valid": not issues, "issues": issues}
+
+
+def validate_diagram(diagram) -> list[str]:
+    """
+    Structural checks of imported model - flows have to connect existing nodes, every process needs
+    a start and an end event, nodes other than start events need incoming flows, nodes other than
+    end events need outgoing flows. Returns list of found issues, empty for valid model.
+    """
+    issues = []
+    nodes = diagram.diagram_graph._node
+    for flow_id, flow in diagram.sequence_flows.items():
+        for end in (consts.Consts.source_ref, consts.Consts.target_ref):
+            if flow[end] not in nodes:
+                issues.append(f"sequence flow {flow_id} refers to missing {end} {flow[end]}")
+    for process_id in diagram.process_elements:
+        types = {node[consts.Consts.type] for _, node in diagram.get_nodes_list_by_process_id(process_id)}
+        if types and consts.Consts.start_event not in types:
+            issues.append(f"process {process_id} has no start event")
+        if types and consts.Consts.end_event not in types:
+            issues.append(f"process {process_id} has no end event")
+    for node_id, node in nodes.items():
+        node_type = node.get(consts.Consts.type)
+        if node_type not in (consts.Consts.start_event, consts.Consts.boundary_event) \
+                and not node.get(consts.Consts.incoming_flow):
+            issues.append(f"{node_type} {node_id} has no incoming flow")
+        if node_type != consts.Consts.end_event and not node.get(consts.Consts.outgoing_flow):
+            issues.append(f"{node_type} {node_id} has no outgoing flow")
+    return issues
+
+
+COMMANDS = {"report": run_report, "metrics": run_metrics, "layout": run_layout,
+            "convert": run_convert, "validate": run_validate}
+
+
+def load(file_path: str, options: dict):
+    """ Loads model through the shared cache of the process, configured from options on first use. """
+    cache = model_cache.get_shared_cache()
+    cache_directory = None if options.get("no_cache") else options.get("cache_dir")
+    if str(cache.cache_directory or "") != str(cache_directory or ""):
+        cache = model_cache.configure_shared_cache(cache_directory)
+    return cache.load_file(file_path)
+
+
+def run_task(task: tuple[str, str, dict]) -> dict:
+    """ Runs command on a single model, failures are reported in the result. Executed inside worker process. """
+    command, file_path, options = task
+    started = time.perf_counter()
+    result = {"file": file_path, "command": command, "ok": True}
+    try:
+        result.update(COMMANDS[command](file_path, options))
+    except Exception as exception:  # failure of one model does not stop the batch
+        result.update(ok=False, error=f"{type(exception).__name__}: {exception}")
+    result["seconds"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def run_batch(command: str, files: list[str], options: dict, jobs: int = 1,
+              names: dict[str, tuple[str, str]] | None = None):
+    """
+    Yields results for files in input order, computed by jobs worker processes.
+    Names (see report_names) are passed to report command as report_name and report_owner options.
+    """
+    if names:
+        tasks = [(command, file_path, dict(options, report_name=names[file_path][0],
+                                           report_owner=names[file_path][1])) for file_path in files]
+    else:
+        tasks = [(command, file_path, options) for file_path in files]
+    if jobs == 1 or len(tasks) < 2:
+        yield from map(run_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        yield from executor.map(run_task, tasks)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bpmn-report", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", help="model files, directories or glob patterns")
+    common.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes, 0 for number of CPUs")
+    common.add_argument("--cache-dir", default=str(model_cache.default_cache_directory()),
+                        help="directory of parsed model cache (default: %(default)s)")
+    common.add_argument("--no-cache", action="store_true", help="do not use persistent parsed model cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    report = subparsers.add_parser("report", parents=[common], help="generate html or pdf reports")
+    report.add_argument("--format", choices=("html", "pdf"), default="html")
+    report.add_argument("--output-dir", help="directory of reports (default: reports)")
+    report.add_argument("--wkhtmltopdf", help="path to wkhtmltopdf executable")
+    report.add_argument("--simulate", nargs="?", const="", metavar="PARAMETERS",
+                        help="add simulation results, with parameters from JSON file if given")
+    report.add_argument("--replications", type=int, default=10, help="number of simulation replications")
+    report.add_argument("--critical-path", action="store_true",
+                        help="add critical path, with durations from simulation parameters if given")
+
+    subparsers.add_parser("metrics", parents=[common], help="compute complexity metrics")
+
+    layout = subparsers.add_parser("layout", parents=[common], help="generate layout, save as <name>_layout.bpmn")
+    layout.add_argument("--output-dir", help="output directory (default: directory of the model)")
+
+    convert = subparsers.add_parser("convert", parents=[common], help="convert between BPMN 2.0 XML and CSV")
+    convert.add_argument("--to", choices=("xml", "csv"), help="target format (default: the other one)")
+    convert.add_argument("--output-dir", help="output directory (default: directory of the model)")
+
+    validate = subparsers.add_parser("validate", parents=[common],
+                                     help="check structure and soundness (deadlocks, missing synchronization)")
+    validate.add_argument("--max-states", type=int, default=200000,
+                          help="maximal number of explored states per process (default: %(default)s)")
+    validate.add_argument("--reduce", action="store_true",
+                          help="explore state space reduced with stubborn sets, finds deadlocks only")
+    validate.add_argument("--no-soundness", action="store_true", help="only check structure of models")
+
+    watch = subparsers.add_parser("watch", help="regenerate reports of models changed in a directory")
+    watch.add_argument("directory", help="watched directory, searched recursively")
+    watch.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes, 0 for number of CPUs")
+    watch.add_argument("--format", choices=("html", "pdf"), default="html")
+    watch.add_argument("--output-dir", help="directory of reports (default: reports)")
+    watch.add_argument("--wkhtmltopdf", help="path to wkhtmltopdf executable")
+    watch.add_argument("--debounce", type=float, default=0.5,
+                       help="seconds a file has to stay unchanged before its report is generated")
+    watch.add_argument("--polling", action="store_true", help="poll the directory instead of using inotify")
+    watch.add_argument("--poll-interval", type=float, default=1.0)
+    watch.add_argument("--no-initial", action="store_true",
+                       help="do not generate reports of models present at start, only of changed ones")
+    watch.add_argument("--cache-dir", default=str(model_cache.default_cache_directory()),
+                       help="directory of parsed model cache (default: %(default)s)")
+    watch.add_argument("--no-cache", action="store_true", help="do not use persistent parsed model cache")
+    return parser
+
+
+def watch(arguments: argparse.Namespace) -> int:
+    from src.watcher import ReportWatcher
+    options = {"format": arguments.format, "output_dir": arguments.output_dir, "wkhtmltopdf": arguments.wkhtmltopdf,
+               "cache_dir": arguments.cache_dir, "no_cache": arguments.no_cache}
+    watcher = ReportWatcher(arguments.directory, options, arguments.jobs, arguments.debounce,
+                            arguments.polling, arguments.poll_interval)
+    try:
+        watcher.run(initial=not arguments.no_initial)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = build_parser().parse_args(argv)
+    if arguments.command == "watch":
+        return watch(arguments)
+    options = {key: value for key, value in vars(arguments).items() if key not in ("paths", "jobs", "command")}
+    extensions = MODEL_EXTENSIONS + CSV_EXTENSIONS if arguments.command == "convert" else MODEL_EXTENSIONS
+    roots = expand_path_roots(arguments.paths, extensions)
+    files = sorted(roots)
+    if not files:
+        print(f"bpmn-report: no models found in {', '.join(arguments.paths)}", file=sys.stderr)
+        return 1
+    names = report_names(roots) if arguments.command == "report" else None
+
+    failed = False
+    for result in run_batch(arguments.command, files, options, arguments.jobs, names):
+        failed = failed or not result["ok"]
+        print(json.dumps(result, ensure_ascii=False, default=str), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.bpmn_python.bpmn_diagram_rep import BpmnDiagramGraph
+
+# bumped whenever pickled BpmnDiagramGraph layout changes, so stale cache entries are ignored
+CACHE_FORMAT = 1
+
+
+def default_cache_directory() -> Path:
+    """ Cache directory taken from BPMN_REPORT_CACHE, XDG_CACHE_HOME/bpmn-report or ~/.cache/bpmn-report. """
+    if os.environ.get("BPMN_REPORT_CACHE"):
+        return Path(os.environ["BPMN_REPORT_CACHE"])
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "bpmn-report"
+
+
+class ModelCache:
+    """
+    Cache of parsed BPMN models, keyed by hash of model content.
+
+    Parsed diagrams are stored pickled, in a bounded in-memory LRU and optionally in cache_directory,
+    so that models parsed by one invocation (or worker process) are reused by the next ones.
+    Every get returns a fresh copy, callers may modify returned diagram (e.g. generate its layout).
+    """
+
+    def __init__(self, cache_directory: str | Path | None = None, max_entries: int = 128):
+        self.cache_directory = Path(cache_directory) if cache_directory else None
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: bytes, kind: str = "xml") -> str:
+        """ Returns cache key of model content of given kind (xml or csv). """
+        return f"{kind}-{CACHE_FORMAT}-{hashlib.sha256(model).hexdigest()}"
+
+    def load(self, model: bytes, kind: str = "xml") -> BpmnDiagramGraph:
+        """ Returns parsed model, parsing it (and storing in cache) only if it is not cached yet. """
+        key = self.key(model, kind)
+        pickled = self._get(key)
+        if pickled is not None:
+            self.hits += 1
+            return pickle.loads(pickled)
+        self.misses += 1
+        diagram = parse_model(model, kind)
+        self._put(key, pickle.dumps(diagram, protocol=pickle.HIGHEST_PROTOCOL))
+        return diagram
+
+    def load_file(self, file_path: str | Path) -> BpmnDiagramGraph:
+        """ Returns parsed model from .bpmn/.xml or .csv file. """
+        kind = "csv" if str(file_path).lower().endswith(".csv") else "xml"
+        with open(file_path, "rb") as model_file:
+            return self.load(model_file.read(), kind)
+
+    def _get(self, key: str) -> bytes | None:
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        if self.cache_directory is None:
+            return None
+        try:
+            pickled = (self.cache_directory / f"{key}.pickle").read_bytes()
+        except OSError:
+            return None
+        self._remember(key, pickled)
+        return pickled
+
+    def _put(self, key: str, pickled: bytes) -> None:
+        self._remember(key, pickled)
+        if self.cache_directory is None:
+            return
+        try:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            # written under temporary name and renamed, so concurrent readers never see partial entries
+            temporary_path = self.cache_directory / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            temporary_path.write_bytes(pickled)
+            os.replace(temporary_path, self.cache_directory / f"{key}.pickle")
+        except OSError:
+            pass  # cache is an optimization only, read-only or full disk does not break callers
+
+    def _remember(self, key: str, pickled: bytes) -> None:
+        with self.lock:
+            self.entries[key] = pickled
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+def parse_model(model: bytes, kind: str = "xml") -> BpmnDiagramGraph:
+    """ Parses BPMN model passed as bytes (BPMN 2.0 XML or CSV) into new BpmnDiagramGraph. """
+    diagram = BpmnDiagramGraph()
+    if kind == "csv":
+        diagram.load_diagram_from_csv_stream(io.StringIO(model.decode("UTF-8")))
+    else:
+        diagram.load_diagram_from_bytes(model)
+    return diagram
+
+
+_shared_cache: ModelCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> ModelCache:
+    """ Returns cache shared by all users within the process, in-memory only unless configured otherwise. """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ModelCache()
+        return _shared_cache
+
+
+def configure_shared_cache(cache_directory: str | Path | None = None, max_entries: int = 128) -> ModelCache:
+    """ Replaces shared cache with a new one, e.g. backed by cache_directory. """
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = ModelCache(cache_directory, max_entries)
+        return _shared_cache
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable
+
+PDF_OPTIONS = {
+    'page-size': 'A4',
+    'margin-top': '0.35in',
+    'margin-right': '0.75in',
+    'margin-bottom': '0.75in',
+    'margin-left': '0.75in',
+    'encoding': "UTF-8",
+    'no-outline': None,
+    'enable-local-file-access': None
+}
+
+
+class ConversionMetrics:
+    """ Thread-safe counters describing throughput of the PdfBackend. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.documents = 0
+        self.failures = 0
+        self.html_bytes = 0
+        self.conversion_seconds = 0.0
+        self.first_started = None
+        self.last_finished = None
+
+    def record(self, started: float, finished: float, html_size: int, success: bool) -> None:
+        """ Records a single conversion. """
+        with self.lock:
+            if success:
+                self.documents += 1
+            else:
+                self.failures += 1
+            self.html_bytes += html_size
+            self.conversion_seconds += finished - started
+            if self.first_started is None or started < self.first_started:
+                self.first_started = started
+            if self.last_finished is None or finished > self.last_finished:
+                self.last_finished = finished
+
+    def snapshot(self) -> dict:
+        """
+        Returns dictionary with current metrics. 'documents_per_second' is measured over wall clock time
+        between the first started and the last finished conversion, so it reflects the concurrency gain.
+        """
+        with self.lock:
+            wall_seconds = (self.last_finished - self.first_started) if self.documents + self.failures else 0.0
+            return {
+                "documents": self.documents,
+                "failures": self.failures,
+                "html_bytes": self.html_bytes,
+                "conversion_seconds": self.conversion_seconds,
+                "wall_seconds": wall_seconds,
+                "mean_seconds": self.conversion_seconds / self.documents if self.documents else 0.0,
+                "documents_per_second": self.documents / wall_seconds if wall_seconds else 0.0,
+            }
+
+
+class PdfBackend:
+    """
+    Converts html documents to pdf using wkhtmltopdf.
+
+    wkhtmltopdf has no resident/server mode and writes a single output per invocation, so process startup
+    can not be shared between documents. Instead, the backend resolves configuration and options once and
+    keeps a bounded pool of workers, each driving its own wkhtmltopdf process, so startup of one conversion
+    overlaps with work of the others.
+    """
+
+    def __init__(self, wkhtmltopdf_path: str | None = None, options: dict | None = None,
+                 max_workers: int | None = None):
+        # imported here, so that modules using only PDF_OPTIONS do not import pdfkit
+        import pdfkit
+        config = {"wkhtmltopdf": wkhtmltopdf_path} if wkhtmltopdf_path else {}
+        self.configuration = pdfkit.configuration(**config)
+        self.options = dict(PDF_OPTIONS if options is None else options)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metrics = ConversionMetrics()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="wkhtmltopdf")
+
+    def __enter__(self) -> PdfBackend:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Waits for pending conversions and shuts down the worker pool. """
+        self.executor.shutdown(wait=True)
+
+    def convert(self, html: str, output_path: str | bool = False) -> bytes | bool:
+        """
+        Converts html document to pdf. Saves it to output_path, or returns pdf content when output_path is False.
+        """
+        import pdfkit
+        started = time.perf_counter()
+        success = False
+        try:
+            result = pdfkit.from_string(html, output_path, options=self.options, configuration=self.configuration)
+            success = True
+            return result
+        finally:
+            self.metrics.record(started, time.perf_counter(), len(html), success)
+
+    def submit(self, html: str, output_path: str | bool = False):
+        """ Schedules conversion in the worker pool, returns concurrent.futures.Future. """
+        return self.executor.submit(self.convert, html, output_path)
+
+    def convert_many(self, documents: Iterable[tuple[str, str | bool]]) -> list[bytes | bool]:
+        """
+        Converts many (html, output_path) pairs concurrently. Results are returned in the order of documents.
+        """
+        futures = [self.submit(html, output_path) for html, output_path in documents]
+        return [future.result() for future in futures]
+
+    def get_metrics(self) -> dict:
+        """ Returns throughput metrics of the backend. """
+        return self.metrics.snapshot()
+
+
+@lru_cache(maxsize=None)
+def get_pdf_backend(wkhtmltopdf_path: str | None = None) -> PdfBackend:
+    """ Returns PdfBackend shared within the process for given wkhtmltopdf_path. """
+    return PdfBackend(wkhtmltopdf_path)
@@ -2,75 +2,145 @@ from __future__ import annotations
 
 import base64
 import datetime
+import io
 import os.path
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
 
-from jinja2 import FileSystemLoader, Environment
-import pdfkit
-
+import src.bpmn_python.bpmn_diagram_diff as bpmn_diff
+import src.bpmn_python.bpmn_instrumentation as instrumentation
 import src.bpmn_python.bpmn_python_consts as consts
+from src.bpmn_python.bpmn_diagram_exception import BpmnPythonError
 from src.bpmn_python.bpmn_diagram_rep import BpmnDiagramGraph
-from src.visualizer import DiagramVisualizer
+import src.template_registry as template_registry
+
+if TYPE_CHECKING:
+    from src.bpmn_python.bpmn_simulation import SimulationParameters
+    from src.pdf_backend import PdfBackend
+    from src.visualizer import DiagramVisualizer
 
 
 class ReportGenerator:
-    """ Class handling task related to generation of the reports. """
+    """
+    Class handling task related to generation of the reports.
+    Reports are saved in report_path directory, without it (None) they can only be rendered in memory.
+    """
 
-    def __init__(self, bpmn_diagram: BpmnDiagramGraph):
+    def __init__(self, bpmn_diagram: BpmnDiagramGraph, template_name: str = "bpmn_report",
+                 diagram_diff: bpmn_diff.DiagramDiff = None, report_path: str | None = "reports"):
         self.diagram = bpmn_diagram
-        self.file_loader = FileSystemLoader("templates")
-        self.env = Environment(loader=self.file_loader)
-        self.template_name = "bpmn_report.html"
-        self.template = self.env.get_template(self.template_name)
-        self.report_path = "reports"
-        self.context_generator = ContextGenerator(self.diagram)
-        self.visualizer = DiagramVisualizer(self.diagram)
+        self.template_name = template_name
+        self.template = template_registry.get_template(self.template_name)
+        self.report_path = report_path
+        self.context_generator = ContextGenerator(self.diagram, diagram_diff)
+        self._visualizer = None
         self.file_name = None
-        if not os.path.exists(self.report_path):
-            os.mkdir(self.report_path)
+        self.profile_directory = None
+        if self.report_path is not None:
+            os.makedirs(self.report_path, exist_ok=True)
 
     @classmethod
     def from_file(cls, file_path: str) -> ReportGenerator:
         """ Loads BPMN model form .xml/.bpmn file and returns new instance of ReportGenerator. """
         diagram = BpmnDiagramGraph()
-        diagram.load_diagram_from_xml_file(file_path)
+        with instrumentation.span("report.parse", file=file_path):
+            diagram.load_diagram_from_xml_file(file_path)
         instance = cls(diagram)
         instance.file_name = Path(file_path).stem
         return instance
 
+    @classmethod
+    def from_revisions(cls, previous_file_path: str, file_path: str) -> ReportGenerator:
+        """
+        Loads two revisions of BPMN model, returns new instance of ReportGenerator for the latter one,
+        its report contains changes made since the previous revision.
+        """
+        previous_diagram = BpmnDiagramGraph()
+        with instrumentation.span("report.parse", file=previous_file_path):
+            previous_diagram.load_diagram_from_xml_file(previous_file_path)
+        instance = cls.from_file(file_path)
+        with instrumentation.span("report.diff"):
+            instance.context_generator.diagram_diff = bpmn_diff.diff(previous_diagram, instance.diagram)
+        return instance
+
     def generate_html_report(self, save=True) -> str:
         """
         Renders html report using context data, may save report to html_report_path.
         Returns rendered report as a string.
+        When profile_directory is set, cProfile and tracemalloc data of the generation are saved there.
         """
-        self.visualizer.generate_image(self.image_path)
+        with instrumentation.capture_profile(f"{self.report_name}_html", self.profile_directory):
+            return self._generate_html_report(save)
+
+    def _generate_html_report(self, save: bool) -> str:
+        with instrumentation.span("report.matplotlib"):
+            self.visualizer.generate_image(self.image_path)
         context = self.get_context()
-        rendered_template = self.template.render(**context)
+        with instrumentation.span("report.jinja"):
+            rendered_template = self.template.render(**context)
 
         if save:
-            with open(self.html_report_path, "w") as html_file:
+            with instrumentation.span("report.save"), open(self.html_report_path, "w") as html_file:
                 html_file.write(rendered_template)
         return rendered_template
 
-    def generate_pdf_report(self, wkhtmltopdf_path=None) -> None:
+    def stream_html_report(self, output=None, buffer_size: int = 64) -> None:
+        """
+        Renders html report chunk by chunk straight into output, without building the whole report
+        as a single string. Nodes and edges are generated lazily while the template is rendered.
+        Output may be a path (html_report_path by default), a text file-like object or a binary one
+        (e.g. socket file), in the latter case chunks are UTF-8 encoded.
+        """
+        with instrumentation.span("report.matplotlib"):
+            self.visualizer.generate_image(self.image_path)
+        context = self.get_context(streaming=True)
+        template_stream = self.template.stream(**context)
+        template_stream.enable_buffering(buffer_size)
+
+        output = self.html_report_path if output is None else output
+        with instrumentation.span("report.jinja", streaming=True):
+            if isinstance(output, (str, os.PathLike)) or not isinstance(output, io.TextIOBase):
+                template_stream.dump(output, encoding="UTF-8")
+            else:
+                template_stream.dump(output)
+
+    def generate_pdf_report(self, wkhtmltopdf_path=None, pdf_backend: PdfBackend = None) -> None:
         """
         Generates pdf report using string representation of html_report and saves it to
-        pdf_report_path.
-        """
-        options = {
-            'page-size': 'A4',
-            'margin-top': '0.35in',
-            'margin-right': '0.75in',
-            'margin-bottom': '0.75in',
-            'margin-left': '0.75in',
-            'encoding': "UTF-8",
-            'no-outline': None,
-            'enable-local-file-access': None
-        }
-
-        config = {"configuration": pdfkit.configuration(wkhtmltopdf=wkhtmltopdf_path)} if wkhtmltopdf_path else {}
-        html_file = self.generate_html_report(save=False)
-        pdfkit.from_string(html_file, self.pdf_report_path, options=options, **config)
+        pdf_report_path. Uses pdf_backend if given, otherwise backend shared for wkhtmltopdf_path.
+        When profile_directory is set, cProfile and tracemalloc data of the generation are saved there.
+        """
+        from src.pdf_backend import get_pdf_backend
+        pdf_backend = pdf_backend or get_pdf_backend(wkhtmltopdf_path)
+        with instrumentation.capture_profile(f"{self.report_name}_pdf", self.profile_directory):
+            html_file = self._generate_html_report(save=False)
+            with instrumentation.span("report.wkhtmltopdf"):
+                pdf_backend.convert(html_file, self.pdf_report_path)
+
+    def render_html_report(self) -> str:
+        """
+        Renders html report entirely in memory, neither the report nor the model image is saved.
+        Returns rendered report as a string.
+        """
+        with instrumentation.span("report.matplotlib"):
+            image = self.visualizer.generate_image_bytes()
+        with instrumentation.span("report.context"):
+            context = self.context_generator.get_context()
+        with instrumentation.span("report.base64"):
+            context["encoded_image"] = base64.b64encode(image).decode("UTF-8")
+        with instrumentation.span("report.jinja"):
+            return self.template.render(**context)
+
+    @property
+    def visualizer(self) -> DiagramVisualizer:
+        """
+        Visualizer of the diagram, created on first use. Visualizer imports matplotlib (with Qt backend),
+        so it is not imported at all unless an image is generated.
+        """
+        if self._visualizer is None:
+            from src.visualizer import DiagramVisualizer
+            self._visualizer = DiagramVisualizer(self.diagram)
+        return self._visualizer
 
     @property
     def base_path(self) -> str:
@@ -78,10 +148,17 @@ class ReportGenerator:
         Base path used for saving all reports.
         Every report name contains date of report generation.
         """
+        if self.report_path is None:
+            raise BpmnPythonError("Report path is not set, reports can only be rendered in memory")
         date = datetime.date.today().strftime("%d_%m_%Y")
         file_name = f"_{self.file_name}" if self.file_name else ""
         return f"{self.report_path}/report_{date}{file_name}"
 
+    @property
+    def report_name(self) -> str:
+        """ Name of the report, base_path without the directory. """
+        return os.path.basename(self.base_path)
+
     @property
     def html_report_path(self) -> str:
         """ Path used for saving html reports. """
@@ -102,28 +179,44 @@ class ReportGenerator:
         with open(self.image_path, "rb") as image_file:
             return base64.b64encode(image_file.read()).decode("UTF-8")
 
-    def get_context(self):
+    def get_context(self, streaming: bool = False):
         """ Generates context used during image generation. """
-        context = self.context_generator.get_context()
-        context["encoded_image"] = self.encode_image()
+        with instrumentation.span("report.context"):
+            context = self.context_generator.get_context(streaming)
+        with instrumentation.span("report.base64"):
+            context["encoded_image"] = self.encode_image()
         return context
 
 
 class ContextGenerator:
     """ Class handling generation of context data from BpmnDiagramGraph. """
 
-    def __init__(self, bpmn_diagram: BpmnDiagramGraph):
+    def __init__(self, bpmn_diagram: BpmnDiagramGraph, diagram_diff: bpmn_diff.DiagramDiff = None,
+                 simulation_parameters: SimulationParameters = None, replications: int = 10,
+                 include_critical_path: bool = False):
         self.diagram = bpmn_diagram
+        self.diagram_diff = diagram_diff
+        self.simulation_parameters = simulation_parameters
+        self.replications = replications
+        self.include_critical_path = include_critical_path
         self.id_mappings = self.get_id_mappings()
 
-    def get_context(self) -> dict:
+    def get_context(self, streaming: bool = False) -> dict:
         """
         Generates context content by calling methods inside context_names with 'get_' suffix.
+        In streaming mode nodes and edges are not materialized, they are generated while
+        the template iterates over them.
         """
         context_names = ["start_events", "end_events", "processes", "gates", "edges",
-                         "model_title", "nodes"]
-        return {context_name: getattr(self, f"get_{context_name}")()
-                for context_name in context_names}
+                         "model_title", "nodes", "diff", "simulation"]
+        context = {context_name: getattr(self, f"get_{context_name}")()
+                   for context_name in context_names if not (streaming and context_name in ("nodes", "edges"))}
+        context["critical_path"] = self.get_critical_path(streaming)
+        if streaming:
+            graph = self.diagram.diagram_graph
+            context["edges"] = LazySection(self.iter_edges, graph.number_of_edges())
+            context["nodes"] = LazySection(self.iter_nodes, graph.number_of_nodes())
+        return context
 
     def get_id_mappings(self) -> dict:
         """ Generates dictionary, mapping ids to node names. """
@@ -135,6 +228,51 @@ class ContextGenerator:
             labels[node[0]] = node[1].get("node_name", "").replace("\n", " ")
         return labels
 
+    def get_diff(self) -> dict | None:
+        """ Returns changes since previous revision of the model, None if no revision was compared. """
+        if self.diagram_diff is None:
+            return None
+        return self.diagram_diff.as_dict()
+
+    def get_simulation(self) -> dict | None:
+        """
+        Returns summary statistics of simulation of the model, None if no simulation parameters were given.
+        Replications run in worker processes, with a fixed seed, so reports of the same model are reproducible.
+        """
+        if self.simulation_parameters is None:
+            return None
+        import src.bpmn_python.bpmn_simulation as simulation
+        with instrumentation.span("report.simulation", replications=self.replications):
+            summary = simulation.simulate(self.diagram, self.simulation_parameters, self.replications, seed=0)
+        return summary.as_dict()
+
+    def get_critical_path(self, streaming: bool = False) -> dict | None:
+        """
+        Returns expected and worst case duration of the model, with its critical path and slack of nodes
+        (expected case), None unless include_critical_path is set. Durations and branch probabilities are taken
+        from simulation parameters, if given. In streaming mode rows of nodes are generated while the template
+        iterates over them.
+        """
+        if not self.include_critical_path:
+            return None
+        import src.bpmn_python.bpmn_critical_path as critical_path
+        with instrumentation.span("report.critical_path"):
+            graph = critical_path.compile_graph(self.diagram, self.simulation_parameters)
+            durations = critical_path.sample_durations(self.diagram, graph, self.simulation_parameters)
+            expected = critical_path.schedule(graph, durations, critical_path.EXPECTED)
+            worst = critical_path.schedule(graph, durations, critical_path.WORST)
+        slack = expected.slack[0]
+
+        def iter_nodes():
+            for position, node_id in enumerate(graph.order):
+                yield {"name": self.id_mappings[node_id] or node_id,
+                       "earliest_start": float(expected.earliest_start[0, position]),
+                       "latest_start": float(expected.latest_start[0, position]),
+                       "slack": float(slack[position])}
+        return {"duration": float(expected.duration[0]), "worst_duration": float(worst.duration[0]),
+                "path": [self.id_mappings[node_id] or node_id for node_id in expected.path()],
+                "nodes": LazySection(iter_nodes, len(graph.order)) if streaming else list(iter_nodes())}
+
     def get_model_title(self) -> str:
         """ Returns the name of the model. """
         return next(iter(self.diagram.process_elements))
@@ -167,14 +305,15 @@ class ContextGenerator:
 
     def get_edges(self) -> tuple[dict[str, str]]:
         """ Returns the tuple of dictionaries containing edge start, end and its name. """
-        results = []
+        return tuple(self.iter_edges())
+
+    def iter_edges(self) -> Iterator[dict[str, str]]:
+        """ Yields dictionaries containing edge start, end and its name. """
         for edge in self.diagram.diagram_graph.edges(data=True):
             edge_name = edge[2].get("name", "") or "Unnamed"
             start_name = self.id_mappings[edge[0]] or "Unnamed"
             end_name = self.id_mappings[edge[1]] or "Unnamed"
-            elements = {"start": start_name, "end": end_name, "edge": edge_name}
-            results.append(elements)
-        return tuple(results)
+            yield {"start": start_name, "end": end_name, "edge": edge_name}
 
     def get_node_names_of_type(self, node_type: str) -> tuple:
         """ Returns tuple of nodes of given type. """
@@ -186,23 +325,42 @@ class ContextGenerator:
         Returns tuple of pairs [node_name, node_dict].
         Removes unnecessary data according to key_to_remove.
         """
-        nodes = self.diagram.get_nodes()
-        nodes_data = []
-        for _, node_dict in nodes:
+        return tuple(self.iter_nodes())
+
+    def iter_nodes(self) -> Iterator[tuple[str, dict]]:
+        """
+        Yields pairs [node_name, node_dict], one node at a time.
+        Unnecessary data (according to keys_to_remove) is skipped, diagram itself is not modified.
+        """
+        keys_to_remove = {consts.Consts.width, consts.Consts.height, consts.Consts.x,
+                          consts.Consts.y, consts.Consts.node_name}
+        for _, node_dict in self.diagram.get_nodes():
             name = node_dict.get(consts.Consts.node_name, "")
-            keys_to_remove = (consts.Consts.width, consts.Consts.height, consts.Consts.x,
-                              consts.Consts.y, consts.Consts.node_name)
-            for key in keys_to_remove:
-                try:
-                    del node_dict[key]
-                except KeyError:
-                    pass
+            node_data = {}
             for key, value in node_dict.items():
+                if key in keys_to_remove:
+                    continue
                 if isinstance(value, (list, tuple, set)):
                     value = ", ".join(value)
-                node_dict[key] = value or "No data provided."
-            nodes_data.append((name, node_dict))
-        return tuple(nodes_data)
+                node_data[key] = value or "No data provided."
+            yield name, node_data
+
+
+class LazySection:
+    """
+    Iterable context section, items are produced by factory each time section is iterated.
+    Length is known upfront, so templates may test section emptiness without materializing it.
+    """
+
+    def __init__(self, factory: Callable[[], Iterator], size: int):
+        self.factory = factory
+        self.size = size
+
+    def __iter__(self) -> Iterator:
+        return self.factory()
+
+    def __len__(self) -> int:
+        return self.size
 
 
 def generate_pdf_report(bpmn_file: str, wkhtmltopdf_path=None) -> None:
@@ -211,7 +369,45 @@ def generate_pdf_report(bpmn_file: str, wkhtmltopdf_path=None) -> None:
     report_generator.generate_pdf_report(wkhtmltopdf_path)
 
 
+def generate_pdf_reports(bpmn_files: list[str], wkhtmltopdf_path=None,
+                         pdf_backend: PdfBackend = None) -> list[str]:
+    """
+    Helper function used to generate pdf reports for many files. Html reports are rendered one by one,
+    while their conversion to pdf runs concurrently in pdf_backend. Returns paths of generated reports.
+    """
+    from src.pdf_backend import get_pdf_backend
+    pdf_backend = pdf_backend or get_pdf_backend(wkhtmltopdf_path)
+    futures, report_paths = [], []
+    for bpmn_file in bpmn_files:
+        report_generator = ReportGenerator.from_file(bpmn_file)
+        html_file = report_generator.generate_html_report(save=False)
+        futures.append(pdf_backend.submit(html_file, report_generator.pdf_report_path))
+        report_paths.append(report_generator.pdf_report_path)
+    for future in futures:
+        future.result()
+    return report_paths
+
+
 def generate_html_report(bpmn_file: str) -> None:
     """ Helper function used to generate html report using ReportGenerator class. """
     report_generator = ReportGenerator.from_file(bpmn_file)
     report_generator.generate_html_report()
+
+
+def generate_html_simulation_report(bpmn_file: str, parameters_file: str = None, replications: int = 10) -> None:
+    """
+    Helper function used to generate html report of bpmn_file with results of its simulation,
+    parameters are loaded from JSON parameters_file (default parameters if not given).
+    """
+    from src.bpmn_python.bpmn_simulation import SimulationParameters
+    report_generator = ReportGenerator.from_file(bpmn_file)
+    report_generator.context_generator.simulation_parameters = (
+        SimulationParameters.from_file(parameters_file) if parameters_file else SimulationParameters())
+    report_generator.context_generator.replications = replications
+    report_generator.generate_html_report()
+
+
+def generate_html_diff_report(previous_bpmn_file: str, bpmn_file: str) -> None:
+    """ Helper function used to generate html report of bpmn_file with changes since previous_bpmn_file. """
+    report_generator = ReportGenerator.from_revisions(previous_bpmn_file, bpmn_file)
+    report_generator.generate_html_report()
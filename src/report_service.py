@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import src.bpmn_python.bpmn_diagram_metrics as metrics
+from src.bpmn_python.bpmn_diagram_exception import BpmnPythonError
+from src.bpmn_python.bpmn_diagram_rep import BpmnDiagramGraph
+import src.model_cache as model_cache
+from src.pdf_backend import PDF_OPTIONS
+from src.report_generator import ReportGenerator
+
+REPORT_FORMATS = ("html", "pdf", "metrics")
+
+METRIC_NAMES = (
+    "TNSE_metric", "TNIE_metric", "TNEE_metric", "TNE_metric", "NOA_metric", "NOAC_metric",
+    "NOAJS_metric", "NumberOfNodes_metric", "GatewayHeterogenity_metric",
+    "CoefficientOfNetworkComplexity_metric", "DurfeeSquare_metric", "PerfectSquare_metric",
+    "NestingDepth_metric", "Structuredness_metric", "CriticalPathDuration_metric",
+)
+
+
+def load_diagram(model: bytes) -> BpmnDiagramGraph:
+    """
+    Parses BPMN model passed as bytes into new BpmnDiagramGraph.
+    Parsed models are kept in the shared model cache of the worker process, so repeated models are parsed once.
+    """
+    return model_cache.get_shared_cache().load(model)
+
+
+def render_html(model: bytes, report_path: str | None = None) -> bytes:
+    """
+    Imports the model and renders its html report in memory. Executed inside worker process.
+    Report directory is created only when report_path is given.
+    """
+    report_generator = ReportGenerator(load_diagram(model), report_path=report_path)
+    return report_generator.render_html_report().encode("UTF-8")
+
+
+def compute_metrics(model: bytes) -> dict:
+    """ Imports the model and computes its complexity metrics. Executed inside worker process. """
+    diagram = load_diagram(model)
+    return {name: getattr(metrics, name)(diagram) for name in METRIC_NAMES}
+
+
+def wkhtmltopdf_arguments(options: dict) -> list[str]:
+    """ Translates pdfkit-style options dictionary into wkhtmltopdf command line arguments. """
+    arguments = []
+    for key, value in options.items():
+        arguments.append(f"--{key}")
+        if value is not None:
+            arguments.append(str(value))
+    return arguments
+
+
+class ReportService:
+    """
+    Asyncio based service generating reports without blocking the event loop.
+
+    Import, metrics and rendering run inside bounded process pool, wkhtmltopdf is run as
+    a subprocess limited by pdf_concurrency. Identical requests (same model content and format)
+    which are in flight at the same time are coalesced into a single job.
+
+    Running job cannot be cancelled in its worker, so when a job exceeds render_timeout, the pool is replaced
+    with a new one and workers of the old pool are killed as soon as its other jobs finish.
+    Workers render reports in memory, report_path is passed to them as the directory of report files.
+    """
+
+    def __init__(self, max_workers: int | None = None, pdf_concurrency: int = 2,
+                 render_timeout: float | None = 60.0, pdf_timeout: float | None = 60.0,
+                 wkhtmltopdf_path: str | None = None, report_path: str | None = None):
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        # jobs awaited by requests, by pool - retired pools are killed once none of their jobs is awaited
+        self.jobs: dict[ProcessPoolExecutor, set[Future]] = {self.executor: set()}
+        self.report_path = report_path
+        self.pdf_semaphore = asyncio.Semaphore(pdf_concurrency)
+        self.render_timeout = render_timeout
+        self.pdf_timeout = pdf_timeout
+        self.wkhtmltopdf_path = wkhtmltopdf_path or shutil.which("wkhtmltopdf") or "wkhtmltopdf"
+        self.in_flight: dict[tuple[str, str], asyncio.Future] = {}
+
+    async def __aenter__(self) -> ReportService:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Shuts down the worker pool, kills workers of retired pools. """
+        for executor in list(self.jobs):
+            if executor is not self.executor:
+                self._kill_executor(executor)
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def model_hash(model: bytes) -> str:
+        """ Returns hash identifying model content, used as part of the coalescing key. """
+        return hashlib.sha256(model).hexdigest()
+
+    async def generate_report(self, model: bytes, report_format: str = "html") -> bytes | dict:
+        """
+        Generates report of requested format for the BPMN model passed as bytes.
+        Returns bytes of html/pdf document, or dictionary for 'metrics' format.
+        """
+        if report_format not in REPORT_FORMATS:
+            raise BpmnPythonError(f"Unsupported report format: {report_format}")
+
+        key = (self.model_hash(model), report_format)
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._generate(model, report_format))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # shield, so cancelling one of coalesced requests does not cancel the job for the others
+        return await asyncio.shield(future)
+
+    async def generate_html_report(self, model: bytes) -> bytes:
+        """ Generates html report for the BPMN model passed as bytes. """
+        return await self.generate_report(model, "html")
+
+    async def generate_pdf_report(self, model: bytes) -> bytes:
+        """ Generates pdf report for the BPMN model passed as bytes. """
+        return await self.generate_report(model, "pdf")
+
+    async def get_metrics(self, model: bytes) -> dict:
+        """ Computes complexity metrics for the BPMN model passed as bytes. """
+        return await self.generate_report(model, "metrics")
+
+    async def _generate(self, model: bytes, report_format: str) -> bytes | dict:
+        if report_format == "metrics":
+            return await self._run_in_pool(compute_metrics, model)
+        if report_format == "html":
+            return await self._run_in_pool(render_html, model, self.report_path)
+        # pdf job reuses (and coalesces with) html job of the same model
+        html = await self.generate_report(model, "html")
+        return await self.html_to_pdf(html)
+
+    async def _run_in_pool(self, function, *args):
+        executor = self.executor
+        job = executor.submit(function, *args)
+        self.jobs[executor].add(job)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), self.render_timeout)
+        except asyncio.TimeoutError:
+            # a job which already started keeps its worker busy, until the worker is killed
+            if not job.cancel() and not job.done():
+                self._retire_executor(executor)
+            raise BpmnPythonError(f"Report generation did not finish within {self.render_timeout} seconds")
+        finally:
+            jobs = self.jobs.get(executor)
+            if jobs is not None:
+                jobs.discard(job)
+                if executor is not self.executor and not jobs:
+                    self._kill_executor(executor)
+
+    def _retire_executor(self, executor: ProcessPoolExecutor) -> None:
+        """ Replaces the pool with a new one, retired pool still runs its jobs. """
+        if executor is self.executor:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self.jobs[self.executor] = set()
+
+    def _kill_executor(self, executor: ProcessPoolExecutor) -> None:
+        """ Kills workers of retired pool, including the ones running timed out jobs. """
+        del self.jobs[executor]
+        # ProcessPoolExecutor has no public method terminating busy workers
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def html_to_pdf(self, html: bytes) -> bytes:
+        """
+        Converts html document to pdf using wkhtmltopdf subprocess, reading from stdin and writing to stdout.
+        Process is killed when it does not finish within pdf_timeout.
+        """
+        arguments = [*wkhtmltopdf_arguments(PDF_OPTIONS), "--quiet", "-", "-"]
+        async with self.pdf_semaphore:
+            process = await asyncio.create_subprocess_exec(
+                self.wkhtmltopdf_path, *arguments,
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(html), self.pdf_timeout)
+            except asyncio.TimeoutError:
+                raise BpmnPythonError(f"wkhtmltopdf did not finish within {self.pdf_timeout} seconds")
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+        if process.returncode != 0:
+            raise BpmnPythonError(f"wkhtmltopdf failed with code {process.returncode}: "
+                                  f"{stderr.decode('UTF-8', errors='replace')}")
+        return stdout
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+TEMPLATES_DIRECTORY = Path(__file__).resolve().parent / "templates"
+
+REPORT_TEMPLATES = {
+    "bpmn_report": "bpmn_report.html",
+}
+
+
+class TemplateRegistry:
+    """
+    Thread-safe registry of named report templates.
+
+    Templates are resolved relative to templates_directory (by default the one shipped next to this module),
+    so the result does not depend on current working directory. Each template is compiled once per process,
+    compiled bytecode is additionally stored in FileSystemBytecodeCache, so cold-started workers skip
+    compilation altogether.
+    """
+
+    def __init__(self, templates_directory: str | Path = TEMPLATES_DIRECTORY,
+                 cache_directory: str | Path | None = None, templates: dict[str, str] | None = None):
+        self.templates_directory = Path(templates_directory)
+        self.cache_directory = cache_directory
+        self.templates = dict(REPORT_TEMPLATES if templates is None else templates)
+        self.compiled: dict[str, Template] = {}
+        self.lock = threading.Lock()
+        self._environment = None
+
+    @property
+    def environment(self) -> Environment:
+        """ Jinja environment shared by all templates of the registry, created on first use. """
+        if self._environment is None:
+            with self.lock:
+                if self._environment is None:
+                    cache_directory = str(self.cache_directory) if self.cache_directory else None
+                    self._environment = Environment(
+                        loader=FileSystemLoader(str(self.templates_directory)),
+                        bytecode_cache=FileSystemBytecodeCache(directory=cache_directory),
+                        auto_reload=False,
+                    )
+        return self._environment
+
+    def register(self, name: str, template_file: str) -> None:
+        """ Registers template_file (relative to templates_directory) under given name. """
+        with self.lock:
+            self.templates[name] = template_file
+            self.compiled.pop(name, None)
+
+    def get_template(self, name: str) -> Template:
+        """ Returns compiled template registered under given name. """
+        template = self.compiled.get(name)
+        if template is None:
+            environment = self.environment
+            with self.lock:
+                template = self.compiled.get(name)
+                if template is None:
+                    try:
+                        template_file = self.templates[name]
+                    except KeyError:
+                        raise KeyError(f"Report template '{name}' is not registered") from None
+                    template = environment.get_template(template_file)
+                    self.compiled[name] = template
+        return template
+
+
+registry = TemplateRegistry()
+
+
+def get_template(name: str = "bpmn_report") -> Template:
+    """ Returns compiled report template from the module-level registry. """
+    return registry.get_template(name)
+
+
+def register_template(name: str, template_file: str) -> None:
+    """ Registers additional report template in the module-level registry. """
+    registry.register(name, template_file)
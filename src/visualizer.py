@@ -1,3 +1,5 @@
+import io
+
 import networkx as nx
 import matplotlib
 matplotlib.use('Qt5Agg')
@@ -17,6 +19,18 @@ class DiagramVisualizer:
         """ Creates and saves image of the BPMN model to image_path. """
         figure = self.generate_diagram_figure()
         figure.savefig(image_path)
+        plt.close(figure)
+
+    def generate_image_bytes(self) -> bytes:
+        """
+        Creates PNG image of the BPMN model in memory and returns its content.
+        Figure is closed afterwards, so consecutive calls within one process do not overlap.
+        """
+        figure = self.generate_diagram_figure()
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format="png")
+        plt.close(figure)
+        return buffer.getvalue()
 
     def generate_diagram_figure(self):
         """ Generates graphical representation of the BPMN model. """
@@ -0,0 +1,247 @@
+"""
+Watch mode - regenerates reports of BPMN models saved in a watched directory.
+
+Changes are detected with inotify on Linux (through ctypes, no extra dependencies), on other platforms or when
+inotify is not available the directory is polled. Bursts of events (editors often write a file several times
+per save) are debounced - a file is processed once it was quiet for debounce seconds. Files whose content hash
+did not change since their last report are skipped, hashes are persisted in the report directory, so restarted
+watcher does not regenerate reports of unchanged models. Reports are generated in a pool of worker processes.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import src.cli as cli
+
+STATE_FILE_NAME = ".watch_state.json"
+
+
+class PollingBackend:
+    """ Detects changes by comparing (mtime, size) snapshots of the directory, taken every poll_interval. """
+
+    def __init__(self, directory: str, extensions: tuple[str, ...], poll_interval: float = 1.0):
+        self.directory = directory
+        self.extensions = extensions
+        self.poll_interval = poll_interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[str, tuple[float, int]]:
+        snapshot = {}
+        for directory, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.lower().endswith(self.extensions):
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """ Waits up to timeout seconds (poll_interval if None), returns paths changed, created or deleted. """
+        time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+        snapshot = self.scan()
+        changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                   if snapshot.get(path) != self.snapshot.get(path)}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyBackend:
+    """ Detects changes with Linux inotify, watches are added for every subdirectory, including new ones. """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory: str, extensions: tuple[str, ...]):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is available only on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.extensions = extensions
+        self.watches: dict[int, str] = {}
+        for subdirectory, _, _ in os.walk(directory):
+            self.add_watch(subdirectory)
+
+    def add_watch(self, directory: str) -> None:
+        watch = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+        if watch < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[watch] = directory
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """ Waits up to timeout seconds (indefinitely if None), returns paths changed, created or deleted. """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            watch, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if watch not in self.watches or not name:
+                continue
+            path = os.path.join(self.watches[watch], name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self.add_watch(path)
+                    changed.update(os.path.join(directory, filename) for directory, _, filenames in os.walk(path)
+                                   for filename in filenames)
+            elif name.lower().endswith(self.extensions) and not mask & self.IN_CREATE:
+                # creation is followed by close-write, which is the event reporting complete content
+                changed.add(path)
+        return {path for path in changed if path.lower().endswith(self.extensions)}
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_backend(directory: str, extensions: tuple[str, ...], polling: bool = False,
+                   poll_interval: float = 1.0):
+    """ Returns inotify backend when available (and polling is not forced), polling backend otherwise. """
+    if not polling:
+        try:
+            return InotifyBackend(directory, extensions)
+        except (OSError, AttributeError):
+            pass
+    return PollingBackend(directory, extensions, poll_interval)
+
+
+def content_hash(path: str) -> str | None:
+    try:
+        with open(path, "rb") as model_file:
+            return hashlib.sha256(model_file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class ReportWatcher:
+    """
+    Watches directory and regenerates reports of changed models with cli report command, results are
+    passed to on_result as dictionaries (the same as printed by bpmn-report).
+    """
+
+    def __init__(self, directory: str, options: dict, jobs: int = 1, debounce: float = 0.5,
+                 polling: bool = False, poll_interval: float = 1.0, on_result=None):
+        self.directory = directory
+        self.options = options
+        self.report_path = options.get("output_dir") or "reports"
+        self.debounce = debounce
+        self.on_result = on_result or (lambda result: print(json.dumps(result, ensure_ascii=False), flush=True))
+        self.backend = create_backend(directory, cli.MODEL_EXTENSIONS, polling, poll_interval)
+        self.executor = ProcessPoolExecutor(max_workers=jobs or None)
+        self.state_path = os.path.join(self.report_path, STATE_FILE_NAME)
+        self.hashes = self.load_state()
+        self.pending: dict[str, float] = {}
+        # report name (see cli.report_name) -> model file which owns it, reports of other files would overwrite it
+        self.report_owners: dict[str, str] = {}
+        self.running: dict[str, Future] = {}
+        self.stopped = False
+
+    def load_state(self) -> dict[str, str]:
+        try:
+            with open(self.state_path) as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self) -> None:
+        os.makedirs(self.report_path, exist_ok=True)
+        temporary_path = f"{self.state_path}.tmp"
+        with open(temporary_path, "w") as state_file:
+            json.dump(self.hashes, state_file, indent=0)
+        os.replace(temporary_path, self.state_path)
+
+    def run(self, initial: bool = True, duration: float | None = None) -> None:
+        """
+        Processes events until stop is called (or for duration seconds). With initial flag all models
+        present in directory are scheduled at start, models with unchanged content are skipped anyway.
+        """
+        deadline = None if duration is None else time.monotonic() + duration
+        if initial:
+            now = time.monotonic() - self.debounce
+            self.pending.update((path, now) for path in cli.expand_paths([self.directory], cli.MODEL_EXTENSIONS))
+        try:
+            while not self.stopped and (deadline is None or time.monotonic() < deadline):
+                timeout = self.debounce if self.pending or self.running else 1.0
+                if deadline is not None:
+                    timeout = max(0.0, min(timeout, deadline - time.monotonic()))
+                now = time.monotonic()
+                for path in self.backend.wait(timeout):
+                    self.pending[path] = now
+                self.schedule_ready()
+                self.collect_finished()
+        finally:
+            self.close()
+
+    def schedule_ready(self) -> None:
+        """ Submits jobs for files quiet for debounce seconds, whose content changed since their last report. """
+        now = time.monotonic()
+        for path, changed_at in list(self.pending.items()):
+            if now - changed_at < self.debounce or path in self.running:
+                continue
+            del self.pending[path]
+            name = cli.report_name(path, self.directory)
+            digest = content_hash(path)
+            if digest is None:
+                # deleted, a model saved again under the same content gets new report
+                self.hashes.pop(path, None)
+                if self.report_owners.get(name) == path:
+                    del self.report_owners[name]
+                continue
+            if self.hashes.get(path) == digest:
+                continue
+            self.hashes[path] = digest
+            options = dict(self.options, report_name=name, report_owner=self.report_owners.setdefault(name, path))
+            self.running[path] = self.executor.submit(cli.run_task, ("report", path, options))
+
+    def collect_finished(self) -> None:
+        finished = [path for path, future in self.running.items() if future.done()]
+        for path in finished:
+            future = self.running.pop(path)
+            try:
+                result = future.result()
+            except Exception as exception:  # e.g. broken worker process
+                result = {"file": path, "command": "report", "ok": False,
+                          "error": f"{type(exception).__name__}: {exception}"}
+            if not result["ok"]:
+                # failed model is retried after its next change
+                self.hashes.pop(path, None)
+            self.on_result(result)
+        if finished:
+            self.save_state()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def close(self) -> None:
+        self.backend.close()
+        self.executor.shutdown(wait=True)
+        self.collect_finished()
@@ -0,0 +1,61 @@
+# coding=utf-8
+"""
+Bulk insertion of nodes and sequence flows
+"""
+import gc
+import unittest
+
+from src.bpmn_python import bpmn_diagram_exception as bpmn_exception
+from src.bpmn_python import bpmn_diagram_rep as diagram
+from src.bpmn_python import bpmn_python_consts as consts
+
+
+class BulkInsertionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bpmn_graph = diagram.BpmnDiagramGraph()
+        self.bpmn_graph.create_new_diagram_graph()
+        self.process_id = self.bpmn_graph.add_process_to_diagram()
+
+    def add_chain(self, size, prefix="id_"):
+        node_ids = self.bpmn_graph.add_nodes(self.process_id, [(consts.Consts.task, "") for _ in range(size)],
+                                             diagram.BpmnDiagramGraph.counter_id_generator(
+                                                 prefix, bpmn_diagram=self.bpmn_graph))
+        self.bpmn_graph.add_sequence_flows(self.process_id, list(zip(node_ids, node_ids[1:])),
+                                           diagram.BpmnDiagramGraph.counter_id_generator(
+                                               prefix, bpmn_diagram=self.bpmn_graph))
+        return node_ids
+
+    def test_counter_starts_after_existing_ids(self):
+        first = self.add_chain(3)
+        second = self.add_chain(3)
+        self.assertEqual(first, ["id_1", "id_2", "id_3"])
+        self.assertEqual(second, ["id_6", "id_7", "id_8"])
+        self.assertEqual(set(self.bpmn_graph.sequence_flows), {"id_4", "id_5", "id_9", "id_10"})
+
+    def test_flow_ids_are_checked_against_node_ids(self):
+        node_ids = self.bpmn_graph.add_nodes(self.process_id, [(consts.Consts.task, "") for _ in range(2)],
+                                             diagram.BpmnDiagramGraph.counter_id_generator())
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            self.bpmn_graph.add_sequence_flows(self.process_id, [tuple(node_ids)],
+                                               diagram.BpmnDiagramGraph.counter_id_generator())
+        self.assertEqual(self.bpmn_graph.sequence_flows, {})
+
+    def test_node_ids_are_checked_against_flow_ids(self):
+        self.add_chain(2)
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            self.bpmn_graph.add_nodes(self.process_id, [{consts.Consts.type: consts.Consts.task,
+                                                         consts.Consts.id: "id_3"}])
+
+    def test_objects_frozen_by_application_stay_frozen(self):
+        gc.freeze()
+        try:
+            frozen = gc.get_freeze_count()
+            self.add_chain(10)
+            self.assertGreaterEqual(gc.get_freeze_count(), frozen)
+        finally:
+            gc.unfreeze()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# coding=utf-8
+"""
+Report names of command line interface
+"""
+import os
+import tempfile
+import unittest
+
+from src import cli
+
+
+class ReportNameTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        for relative_path in ("m/a/x.bpmn", "m/b/x.bpmn", "m/x.bpmn", "m/x.xml"):
+            path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, relative_path):
+        return os.path.join(self.root, relative_path)
+
+    def test_names_are_relative_paths_with_extension(self):
+        names = cli.report_names(cli.expand_path_roots([self.path("m")], cli.MODEL_EXTENSIONS))
+        self.assertEqual({file_path: name for file_path, (name, _) in names.items()},
+                         {self.path("m/a/x.bpmn"): "a_x.bpmn", self.path("m/b/x.bpmn"): "b_x.bpmn",
+                          self.path("m/x.bpmn"): "x.bpmn", self.path("m/x.xml"): "x.xml"})
+        self.assertTrue(all(owner == file_path for file_path, (_, owner) in names.items()))
+
+    def test_collision_is_reported_as_error(self):
+        roots = cli.expand_path_roots([self.path("m/a"), self.path("m/b")], cli.MODEL_EXTENSIONS)
+        names = cli.report_names(roots)
+        self.assertEqual(names[self.path("m/b/x.bpmn")], ("x.bpmn", self.path("m/a/x.bpmn")))
+        results = list(cli.run_batch("report", sorted(roots), {"format": "html", "output_dir": self.root},
+                                     names=names))
+        self.assertFalse(results[1]["ok"])
+        self.assertIn("would overwrite the report of", results[1]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# coding=utf-8
+"""
+Sequence flows of list-backed nodes and compact node records
+"""
+import unittest
+
+from src.bpmn_python import bpmn_compact_nodes as compact_nodes
+from src.bpmn_python import bpmn_diagram_rep as diagram
+from src.bpmn_python import bpmn_python_consts as consts
+
+
+class FlowListTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bpmn_graph = diagram.BpmnDiagramGraph()
+        self.bpmn_graph.create_new_diagram_graph()
+        self.process_id = self.bpmn_graph.add_process_to_diagram()
+        self.gateway_id, _ = self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)
+        self.task_ids = [self.bpmn_graph.add_task_to_diagram(self.process_id)[0] for _ in range(3)]
+
+    def connect(self):
+        return [self.bpmn_graph.add_sequence_flow_to_diagram(self.process_id, self.gateway_id, task_id)[0]
+                for task_id in self.task_ids]
+
+    def test_list_is_extended_in_place(self):
+        outgoing = self.bpmn_graph.diagram_graph._node[self.gateway_id][consts.Consts.outgoing_flow]
+        flow_ids = self.connect()
+        self.assertIs(self.bpmn_graph.diagram_graph._node[self.gateway_id][consts.Consts.outgoing_flow], outgoing)
+        self.assertEqual(outgoing, flow_ids)
+
+    def test_compact_records(self):
+        compact_nodes.compact_nodes(self.bpmn_graph)
+        flow_ids = self.connect()
+        gateway = self.bpmn_graph.diagram_graph._node[self.gateway_id]
+        self.assertIsInstance(gateway, compact_nodes.CompactNodeRecord)
+        self.assertEqual(gateway[consts.Consts.outgoing_flow], tuple(flow_ids))
+        flow_ids += self.bpmn_graph.add_sequence_flows(self.process_id, [(self.gateway_id, self.task_ids[0])])
+        self.assertEqual(gateway[consts.Consts.outgoing_flow], tuple(flow_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
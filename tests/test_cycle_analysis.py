@@ -0,0 +1,42 @@
+# coding=utf-8
+"""
+Cached cycle analysis
+"""
+import copy
+import pickle
+import unittest
+
+from src.bpmn_python import bpmn_critical_path as critical_path
+from src.bpmn_python import bpmn_cycle_analysis as cycle_analysis
+from src.bpmn_python import bpmn_diagram_generator as generator
+from src.bpmn_python import bpmn_python_consts as consts
+from tests.test_diagram_diff import regenerate_ids
+
+
+class CycleAnalysisCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bpmn_graph = generator.generate_diagram(tasks=40, pools=1, split_depth=2)
+
+    def test_copy_with_relabelled_nodes(self):
+        duration = critical_path.critical_path(self.bpmn_graph).duration
+        relabelled = regenerate_ids(self.bpmn_graph)
+        self.assertEqual(list(critical_path.critical_path(relabelled).duration), list(duration))
+
+    def test_flow_retargeted_in_place(self):
+        analysis = cycle_analysis.get_cycle_analysis(self.bpmn_graph)
+        self.assertFalse(analysis.back_flows)
+        order = analysis.topological_order
+        flow = next(flow for flow in self.bpmn_graph.sequence_flows.values()
+                    if flow[consts.Consts.source_ref] == order[-2])
+        flow[consts.Consts.target_ref] = order[0]
+        self.assertTrue(cycle_analysis.get_cycle_analysis(self.bpmn_graph).back_flows)
+
+    def test_cache_is_not_copied_with_diagram(self):
+        cycle_analysis.get_cycle_analysis(self.bpmn_graph)
+        self.assertEqual(vars(copy.deepcopy(self.bpmn_graph)).keys(), vars(self.bpmn_graph).keys())
+        self.assertNotIn(b"CycleAnalysis", pickle.dumps(self.bpmn_graph))
+
+
+if __name__ == "__main__":
+    unittest.main()
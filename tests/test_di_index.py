@@ -0,0 +1,32 @@
+# coding=utf-8
+"""
+Diagram Interchange index
+"""
+import unittest
+from xml.dom import minidom
+
+from src.bpmn_python import bpmn_diagram_import as bpmn_import
+from src.bpmn_python import bpmn_python_consts as consts
+
+plane_document = b'''<BPMNPlane xmlns="http://www.omg.org/spec/BPMN/20100524/DI"
+        xmlns:dc="http://www.omg.org/spec/DD/20100524/DC" id="plane">
+    <BPMNShape id="shape_without_element"><dc:Bounds x="0" y="0" width="10" height="10"/></BPMNShape>
+    <BPMNShape id="first_shape" bpmnElement="task"><dc:Bounds x="1" y="1" width="10" height="10"/></BPMNShape>
+    <BPMNShape id="second_shape" bpmnElement="task"><dc:Bounds x="2" y="2" width="10" height="10"/></BPMNShape>
+</BPMNPlane>'''
+
+
+class DiIndexTests(unittest.TestCase):
+
+    def test_entries_without_element_are_skipped_and_last_duplicate_wins(self):
+        plane_element = minidom.parseString(plane_document).documentElement
+        di_index = bpmn_import.BpmnDiagramGraphImport.build_di_index(plane_element)
+        self.assertEqual(list(di_index), ["task"])
+        entry = di_index["task"]
+        self.assertEqual(entry[bpmn_import.BpmnDiagramGraphImport.di_element].getAttribute(consts.Consts.id),
+                         "second_shape")
+        self.assertEqual(entry[bpmn_import.BpmnDiagramGraphImport.di_bounds][consts.Consts.x], "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
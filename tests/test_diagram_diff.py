@@ -0,0 +1,59 @@
+# coding=utf-8
+"""
+Diff of diagrams with regenerated ids
+"""
+import copy
+import unittest
+
+import networkx as nx
+
+from src.bpmn_python import bpmn_diagram_diff as diagram_diff
+from src.bpmn_python import bpmn_diagram_generator as generator
+from src.bpmn_python import bpmn_python_consts as consts
+
+
+def regenerate_ids(bpmn_graph, renamed_nodes=0):
+    """
+    :return: a copy of the diagram with new ids of processes and every second node, first renamed_nodes of the
+        nodes with new ids get new names.
+    """
+    result = copy.deepcopy(bpmn_graph)
+    node_ids = list(result.diagram_graph.nodes)[1::2]
+    node_mapping = {node_id: "new_" + node_id for node_id in node_ids}
+    process_mapping = {process_id: "new_" + process_id for process_id in result.process_elements}
+    result.diagram_graph = nx.relabel_nodes(result.diagram_graph, node_mapping)
+    for node_id, node in result.diagram_graph.nodes(data=True):
+        node[consts.Consts.id] = node_id
+        node[consts.Consts.process] = process_mapping[node[consts.Consts.process]]
+    for node_id in node_ids[:renamed_nodes]:
+        result.diagram_graph._node[node_mapping[node_id]][consts.Consts.node_name] += " (renamed)"
+    for flow in result.sequence_flows.values():
+        for key in (consts.Consts.source_ref, consts.Consts.target_ref):
+            flow[key] = node_mapping.get(flow[key], flow[key])
+    result.process_elements = {process_mapping[process_id]: attributes
+                               for process_id, attributes in result.process_elements.items()}
+    return result
+
+
+class DiagramDiffTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bpmn_graph = generator.generate_diagram(tasks=200, pools=2)
+
+    def test_regenerated_ids(self):
+        result = diagram_diff.diff(self.bpmn_graph, regenerate_ids(self.bpmn_graph))
+        self.assertTrue(result.is_empty(), result.summary())
+        self.assertEqual(len(result.node_mapping), len(self.bpmn_graph.diagram_graph))
+        self.assertEqual(set(result.process_mapping.values()),
+                         {"new_" + process_id for process_id in self.bpmn_graph.process_elements})
+
+    def test_renamed_nodes_with_regenerated_ids(self):
+        result = diagram_diff.diff(self.bpmn_graph, regenerate_ids(self.bpmn_graph, renamed_nodes=10))
+        self.assertEqual(result.summary(), {"added_nodes": 0, "removed_nodes": 0, "modified_nodes": 10,
+                                            "moved_nodes": 0, "added_flows": 0, "removed_flows": 0,
+                                            "modified_flows": 0})
+        self.assertEqual({tuple(change["changes"]) for change in result.modified_nodes}, {(consts.Consts.node_name,)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# coding=utf-8
+"""
+Execution paths compared with runs enumerated by the token game of workflow nets
+"""
+import glob
+import os
+import unittest
+
+from src.bpmn_python import bpmn_cycle_analysis as cycle_analysis
+from src.bpmn_python import bpmn_diagram_exception as bpmn_exception
+from src.bpmn_python import bpmn_diagram_generator as generator
+from src.bpmn_python import bpmn_diagram_rep as diagram
+from src.bpmn_python import bpmn_execution_paths as execution_paths
+from src.bpmn_python import bpmn_soundness as soundness
+
+examples_directory = os.path.join(os.path.dirname(__file__), os.pardir, "examples")
+
+
+def token_game_runs(bpmn_graph, process_id):
+    """
+    :return: a set of frozensets of flows taken by complete runs of the process, back flows are never taken.
+    """
+    net = soundness.build_nets(bpmn_graph)[process_id]
+    back_flows = cycle_analysis.get_cycle_analysis(bpmn_graph).back_flows
+
+    def produced(transition):
+        return {net.flows[index - 1] for index in range(1, transition.produce.bit_length())
+                if transition.produce >> index & 1}
+
+    runs = set()
+    seen = set()
+    stack = [(1, frozenset())]
+    while stack:
+        state = stack.pop()
+        if state in seen:
+            continue
+        seen.add(state)
+        marking, taken = state
+        if not marking:
+            runs.add(taken)
+            continue
+        for transition in net.transitions:
+            flows = produced(transition)
+            if transition.is_enabled(marking) and not flows & back_flows:
+                stack.append((transition.fire(marking)[0], taken | flows))
+    return runs
+
+
+def build_diagram(nodes, flows):
+    """
+    :param nodes: a list of (node id, node type) pairs,
+    :param flows: a list of (source id, target id) pairs.
+    :return: a tuple of diagram and id of its process.
+    """
+    bpmn_graph = diagram.BpmnDiagramGraph()
+    bpmn_graph.create_new_diagram_graph()
+    process_id = bpmn_graph.add_process_to_diagram()
+    for node_id, node_type in nodes:
+        bpmn_graph.add_flow_node_to_diagram(process_id, node_type, node_id, node_id)
+    for source, target in flows:
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, source, target)
+    return bpmn_graph, process_id
+
+
+class ExecutionPathsTests(unittest.TestCase):
+
+    def assert_matches_token_game(self, bpmn_graph):
+        analysis = cycle_analysis.get_cycle_analysis(bpmn_graph)
+        for process_id, engine in execution_paths.path_engines(bpmn_graph).items():
+            paths = [frozenset(path.flows) for path in engine.paths()]
+            self.assertEqual(len(paths), engine.count)
+            self.assertEqual(set(paths), token_game_runs(bpmn_graph, process_id))
+            covered = set().union(*(path.flows for path in engine.covering_paths()))
+            forward = {flow_id for flow_id, flow in bpmn_graph.sequence_flows.items()
+                       if flow_id not in analysis.back_flows and flow["sourceRef"] in engine.position}
+            self.assertEqual(covered, forward)
+
+    def test_examples(self):
+        for filepath in sorted(glob.glob(os.path.join(examples_directory, "*.bpmn"))):
+            with self.subTest(filepath=filepath):
+                bpmn_graph = diagram.BpmnDiagramGraph()
+                bpmn_graph.load_diagram_from_xml_file(filepath)
+                self.assert_matches_token_game(bpmn_graph)
+
+    def test_generated_diagrams(self):
+        for gateway_type in ("parallel", "exclusive", "mixed"):
+            for split_depth in (1, 2):
+                for loops in (0, 1):
+                    with self.subTest(gateway_type=gateway_type, split_depth=split_depth, loops=loops):
+                        self.assert_matches_token_game(generator.generate_diagram(
+                            tasks=12, split_depth=split_depth, branches=2, loops=loops, gateway_type=gateway_type))
+
+    def test_unmatched_split_with_independent_branches(self):
+        bpmn_graph, _ = build_diagram(
+            [("start", "startEvent"), ("p1", "parallelGateway"), ("a", "task"), ("x", "exclusiveGateway"),
+             ("b", "task"), ("c", "task"), ("end1", "endEvent"), ("end2", "endEvent"), ("end3", "endEvent")],
+            [("start", "p1"), ("p1", "a"), ("p1", "x"), ("a", "end1"), ("x", "b"), ("x", "c"), ("b", "end2"),
+             ("c", "end3")])
+        self.assert_matches_token_game(bpmn_graph)
+        self.assertEqual(list(execution_paths.count_paths(bpmn_graph).values()), [2])
+
+    def test_unstructured_sound_model(self):
+        bpmn_graph, process_id = build_diagram(
+            [("start", "startEvent"), ("p1", "parallelGateway"), ("a", "task"), ("b", "task"),
+             ("p2", "parallelGateway"), ("c", "task"), ("d", "task"), ("j1", "parallelGateway"),
+             ("x", "exclusiveGateway"), ("e1", "task"), ("e2", "task"), ("m", "exclusiveGateway"),
+             ("end1", "endEvent"), ("end2", "endEvent")],
+            [("start", "p1"), ("p1", "a"), ("p1", "b"), ("a", "p2"), ("p2", "c"), ("p2", "d"), ("b", "j1"),
+             ("c", "j1"), ("j1", "x"), ("x", "e1"), ("x", "e2"), ("e1", "m"), ("e2", "m"), ("m", "end1"),
+             ("d", "end2")])
+        self.assertTrue(soundness.check_soundness(bpmn_graph)[process_id].is_sound)
+        self.assertEqual(len(token_game_runs(bpmn_graph, process_id)), 2)
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            execution_paths.count_paths(bpmn_graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
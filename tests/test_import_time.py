@@ -0,0 +1,43 @@
+# coding=utf-8
+"""
+Import time of the package entry modules, see src/benchmarks/import_time.py. Every module is imported in fresh
+interpreters, so the test is slow - set BPMN_SKIP_IMPORT_TIME environment variable to skip it.
+"""
+import os
+import unittest
+
+import src.bpmn_python as bpmn_python
+from src.benchmarks import import_time
+
+
+@unittest.skipIf(os.environ.get("BPMN_SKIP_IMPORT_TIME"), "BPMN_SKIP_IMPORT_TIME is set")
+class ImportTimeTests(unittest.TestCase):
+
+    def test_budgeted_modules_do_not_import_heavy_modules(self):
+        startup_entries, _ = import_time.run_interpreter("pass")
+        startup_modules = {entry[3] for entry in startup_entries}
+        for module in import_time.budgets:
+            with self.subTest(module=module):
+                result = import_time.measure(module, startup_modules, repeats=1)
+                self.assertEqual(result["heavy"], [])
+
+
+class PackageAttributesTests(unittest.TestCase):
+
+    def test_all_submodules_are_listed(self):
+        package_directory = os.path.dirname(bpmn_python.__file__)
+        submodules = {file_name[:-len(".py")] for file_name in os.listdir(package_directory)
+                      if file_name.endswith(".py") and file_name != "__init__.py"}
+        unlisted = {"bpmn_process_csv_import", "bpmn_python_consts"}
+        self.assertEqual(submodules - unlisted, set(bpmn_python.__all__))
+        for name in bpmn_python.__all__:
+            try:
+                module = getattr(bpmn_python, name)
+            except ImportError:
+                # optional dependency of the module (e.g. pydotplus) is not installed
+                continue
+            self.assertEqual(module.__name__, f"{bpmn_python.__name__}.{name}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# coding=utf-8
+"""
+Topology-only import compared with full import
+"""
+import unittest
+
+from src.bpmn_python import bpmn_diagram_generator as generator
+from src.bpmn_python import bpmn_diagram_import as bpmn_import
+from src.bpmn_python import bpmn_diagram_rep as diagram
+from src.bpmn_python import bpmn_lazy_attributes as lazy_attributes
+from src.bpmn_python import bpmn_python_consts as consts
+
+
+def import_task_with_flag(diagram_graph, process_id, process_attributes, element):
+    bpmn_import.BpmnDiagramGraphImport.import_task_to_graph(diagram_graph, process_id, process_attributes, element)
+    diagram_graph._node[element.getAttribute(consts.Consts.id)]["custom"] = True
+
+
+class LazyAttributesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = generator.generate_diagram(tasks=30, pools=2, lanes=2, split_depth=2).export_xml_bytes()
+        self.full = diagram.BpmnDiagramGraph()
+        self.full.load_diagram_from_bytes(self.data)
+
+    def load_topology(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_bytes(self.data, topology_only=True)
+        return bpmn_graph
+
+    def test_first_access_loads_whole_diagram_and_releases_source(self):
+        bpmn_graph = self.load_topology()
+        source = bpmn_graph.attribute_source
+        nodes = bpmn_graph.diagram_graph._node
+        self.assertFalse(any(attributes.is_materialized() for attributes in nodes.values()))
+        next(iter(nodes.values())).get(consts.Consts.node_name)
+        self.assertTrue(source.is_loaded())
+        self.assertIsNone(bpmn_graph.attribute_source)
+        self.assertIsNone(source.bpmn_diagram)
+        self.assertTrue(all(attributes.is_materialized() for attributes in nodes.values()))
+        self.assertEqual(dict(bpmn_graph.diagram_graph.nodes(data=True)),
+                         dict(self.full.diagram_graph.nodes(data=True)))
+        self.assertEqual(list(bpmn_graph.diagram_graph.edges(data=True)),
+                         list(self.full.diagram_graph.edges(data=True)))
+        self.assertEqual(bpmn_graph.process_elements, self.full.process_elements)
+
+    def test_comparison_loads_attributes(self):
+        for compare in (lambda a, b: a == b, lambda a, b: not a != b):
+            bpmn_graph = self.load_topology()
+            node_id, attributes = next(iter(bpmn_graph.diagram_graph.nodes(data=True)))
+            self.assertTrue(compare(attributes, self.full.diagram_graph._node[node_id]))
+
+    def test_removed_node_requesting_attributes(self):
+        bpmn_graph = self.load_topology()
+        node_id, attributes = next(iter(bpmn_graph.diagram_graph.nodes(data=True)))
+        bpmn_graph.diagram_graph.remove_node(node_id)
+        self.assertIsInstance(attributes, lazy_attributes.LazyNodeAttributes)
+        self.assertEqual(dict(attributes), self.full.diagram_graph._node[node_id])
+
+    def test_registered_handlers_are_used(self):
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler(
+            consts.Consts.task, bpmn_import.BpmnDiagramGraphImport.flow_node_handler(import_task_with_flag))
+        try:
+            bpmn_graph = self.load_topology()
+        finally:
+            bpmn_import.BpmnDiagramGraphImport.register_element_handler(
+                consts.Consts.task, bpmn_import.BpmnDiagramGraphImport.default_element_handlers[consts.Consts.task])
+        tasks = [attributes for attributes in bpmn_graph.diagram_graph._node.values()
+                 if dict.get(attributes, consts.Consts.type) == consts.Consts.task]
+        self.assertTrue(tasks)
+        self.assertTrue(all(dict.get(attributes, "custom") for attributes in tasks))
+        self.assertFalse(bpmn_graph.attribute_source.is_loaded())
+        bpmn_graph.materialize_attributes()
+        self.assertTrue(all(consts.Consts.x in attributes for attributes in tasks))
+
+
+if __name__ == "__main__":
+    unittest.main()
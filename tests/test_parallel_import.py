@@ -0,0 +1,64 @@
+# coding=utf-8
+"""
+Parallel import compared with serial import
+"""
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from src.bpmn_python import bpmn_diagram_generator as generator
+from src.bpmn_python import bpmn_diagram_import as bpmn_import
+from src.bpmn_python import bpmn_diagram_rep as diagram
+
+extension_namespace = "http://example.com/extension"
+
+
+def import_audit_element(diagram_graph, sequence_flows, process_id, process_attributes, element):
+    process_attributes["audit"] = element.getAttribute("level")
+
+
+def snapshot(bpmn_graph):
+    return (list(bpmn_graph.diagram_graph.nodes(data=True)), list(bpmn_graph.diagram_graph.edges(data=True)),
+            bpmn_graph.sequence_flows, bpmn_graph.process_elements, bpmn_graph.collaboration,
+            bpmn_graph.diagram_attributes, bpmn_graph.plane_attributes)
+
+
+class ParallelImportTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = generator.generate_diagram(tasks=30, pools=3, lanes=2, split_depth=2).export_xml_bytes()
+
+    def test_split_process_documents(self):
+        skeleton, process_documents = bpmn_import.BpmnDiagramGraphImport.split_process_documents(self.data)
+        self.assertEqual(len(process_documents), 3)
+        self.assertNotIn(b"<process", skeleton)
+        self.assertIn(b"BPMNPlane", skeleton)
+
+    def test_same_result_as_serial_import(self):
+        serial = diagram.BpmnDiagramGraph()
+        serial.load_diagram_from_bytes(self.data)
+        parallel = diagram.BpmnDiagramGraph()
+        parallel.load_diagram_from_bytes(self.data, parallel=True, max_workers=2)
+        self.assertEqual(snapshot(parallel), snapshot(serial))
+
+    def test_registered_handlers_reach_spawned_workers(self):
+        process_document = (b'<partialImport xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL" xmlns:ext="'
+                            + extension_namespace.encode() + b'"><process id="p" isClosed="false" '
+                            b'isExecutable="false" processType="None"><ext:audit level="full"/></process>'
+                            b'</partialImport>')
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler("audit", import_audit_element,
+                                                                    extension_namespace)
+        try:
+            handlers = dict(bpmn_import.BpmnDiagramGraphImport.element_handlers)
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=bpmn_import._set_element_handlers,
+                                     initargs=(handlers,)) as executor:
+                process_elements = executor.submit(bpmn_import.BpmnDiagramGraphImport.import_process_partial,
+                                                   process_document).result()[0]
+        finally:
+            bpmn_import.BpmnDiagramGraphImport.unregister_element_handler("audit", extension_namespace)
+        self.assertEqual(process_elements["p"]["audit"], "full")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+# coding=utf-8
+"""
+Context of html reports
+"""
+import unittest
+
+from src import report_generator
+from src.bpmn_python import bpmn_diagram_generator as generator
+
+
+class CriticalPathContextTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bpmn_graph = generator.generate_diagram(tasks=20, pools=1, split_depth=2)
+
+    def test_critical_path_is_opt_in(self):
+        context_generator = report_generator.ContextGenerator(self.bpmn_graph)
+        self.assertIsNone(context_generator.get_context()["critical_path"])
+
+    def test_streaming_generates_rows_of_nodes_lazily(self):
+        context_generator = report_generator.ContextGenerator(self.bpmn_graph, include_critical_path=True)
+        rows = context_generator.get_context()["critical_path"]["nodes"]
+        section = context_generator.get_context(streaming=True)["critical_path"]["nodes"]
+        self.assertIsInstance(section, report_generator.LazySection)
+        self.assertEqual(len(section), len(self.bpmn_graph.diagram_graph))
+        self.assertEqual(list(section), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# coding=utf-8
+"""
+Timeouts of report service jobs
+"""
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from src import report_service
+from src.bpmn_python import bpmn_diagram_exception as bpmn_exception
+from src.bpmn_python import bpmn_diagram_rep as diagram
+
+
+class ReportServiceTests(unittest.TestCase):
+
+    def test_timed_out_job_worker_is_killed(self):
+        async def run():
+            async with report_service.ReportService(max_workers=1, render_timeout=0.5) as service:
+                old_executor = service.executor
+                await service._run_in_pool(abs, -1)
+                workers = list(old_executor._processes.values())
+                with self.assertRaises(bpmn_exception.BpmnPythonError):
+                    await service._run_in_pool(time.sleep, 60)
+                self.assertIsNot(service.executor, old_executor)
+                self.assertNotIn(old_executor, service.jobs)
+                for worker in workers:
+                    worker.join(5)
+                    self.assertFalse(worker.is_alive())
+                return await service._run_in_pool(abs, -2)
+        self.assertEqual(asyncio.run(run()), 2)
+
+    def test_in_memory_generator_does_not_create_report_directory(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph()
+        with tempfile.TemporaryDirectory() as directory:
+            current_directory = os.getcwd()
+            os.chdir(directory)
+            try:
+                report_generator = report_service.ReportGenerator(bpmn_graph, report_path=None)
+                self.assertEqual(os.listdir(directory), [])
+                with self.assertRaises(bpmn_exception.BpmnPythonError):
+                    report_generator.html_report_path
+            finally:
+                os.chdir(current_directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
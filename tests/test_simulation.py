@@ -0,0 +1,37 @@
+# coding=utf-8
+"""
+Duration distributions of simulation
+"""
+import unittest
+
+from src.bpmn_python import bpmn_diagram_exception as bpmn_exception
+from src.bpmn_python import bpmn_python_consts as consts
+from src.bpmn_python import bpmn_simulation as simulation
+
+
+class DistributionTests(unittest.TestCase):
+
+    def test_numbers(self):
+        for specification in (2.5, 3, "2.5", " 1e1 ", "4"):
+            distribution = simulation.Distribution.parse(specification)
+            self.assertEqual(distribution.kind, "constant")
+            self.assertEqual(distribution.mean, float(specification))
+
+    def test_kinds(self):
+        self.assertEqual(repr(simulation.Distribution.parse("exponential(1.5)")), "exponential(1.5)")
+        self.assertEqual(simulation.Distribution.parse("Uniform(1, 2.5)").mean, 1.75)
+
+    def test_invalid(self):
+        for specification in ("", "constant", "-1.5", "normal(1)", "exponential(x)", None):
+            with self.assertRaises(bpmn_exception.BpmnPythonError, msg=specification):
+                simulation.Distribution.parse(specification)
+
+    def test_durations_given_as_strings(self):
+        parameters = simulation.SimulationParameters(durations={"A": "2.5"})
+        node = {consts.Consts.type: consts.Consts.task, consts.Consts.node_name: "A", consts.Consts.duration: "9"}
+        self.assertEqual(simulation.node_duration(parameters, "task_1", node).mean, 2.5)
+        self.assertEqual(simulation.node_duration(simulation.SimulationParameters(), "task_1", node).mean, 9.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
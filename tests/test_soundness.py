@@ -0,0 +1,104 @@
+# coding=utf-8
+"""
+Soundness analysis of processes
+"""
+import unittest
+
+from src.bpmn_python import bpmn_diagram_rep as diagram
+from src.bpmn_python import bpmn_soundness as soundness
+
+
+class SoundnessTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bpmn_graph = diagram.BpmnDiagramGraph()
+        self.bpmn_graph.create_new_diagram_graph()
+        self.process_id = self.bpmn_graph.add_process_to_diagram()
+        self.start_id, _ = self.bpmn_graph.add_start_event_to_diagram(self.process_id)
+
+    def task(self, name):
+        return self.bpmn_graph.add_task_to_diagram(self.process_id, name)[0]
+
+    def end(self, end_event_definition=None):
+        return self.bpmn_graph.add_end_event_to_diagram(self.process_id, end_event_definition=end_event_definition)[0]
+
+    def connect(self, *node_ids):
+        for source_id, target_id in zip(node_ids, node_ids[1:]):
+            self.bpmn_graph.add_sequence_flow_to_diagram(self.process_id, source_id, target_id)
+
+    def split_and_join(self, split_id, join_id):
+        """ start -> split -> (A, B) -> join -> C -> end """
+        task_a, task_b, task_c = self.task("A"), self.task("B"), self.task("C")
+        self.connect(self.start_id, split_id, task_a, join_id, task_c, self.end())
+        self.connect(split_id, task_b, join_id)
+        return task_c
+
+    def report(self, partial_order_reduction=False):
+        return soundness.check_soundness(self.bpmn_graph, partial_order_reduction)[self.process_id]
+
+    def test_exclusive_split_parallel_join_deadlocks(self):
+        task_c = self.split_and_join(self.bpmn_graph.add_exclusive_gateway_to_diagram(self.process_id)[0],
+                                     self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)[0])
+        report = self.report()
+        self.assertFalse(report.is_sound)
+        self.assertEqual(report.deadlock_count, 2)
+        self.assertEqual(report.unsafe_count, 0)
+        self.assertEqual(report.dead_tasks, [task_c])
+        self.assertEqual(len(soundness.soundness_issues(self.bpmn_graph)), 2)
+
+    def test_parallel_split_exclusive_join_lacks_synchronization(self):
+        self.split_and_join(self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)[0],
+                            self.bpmn_graph.add_exclusive_gateway_to_diagram(self.process_id)[0])
+        report = self.report()
+        self.assertFalse(report.is_sound)
+        self.assertGreater(report.unsafe_count, 0)
+        self.assertEqual(report.deadlock_count, 0)
+        self.assertEqual(report.dead_tasks, [])
+
+    def test_inclusive_join_synchronizes_inclusive_split(self):
+        self.split_and_join(self.bpmn_graph.add_inclusive_gateway_to_diagram(self.process_id)[0],
+                            self.bpmn_graph.add_inclusive_gateway_to_diagram(self.process_id)[0])
+        report = self.report(partial_order_reduction=True)
+        self.assertTrue(report.is_sound, report.issues())
+        self.assertFalse(report.reduced)
+
+    def terminate_model(self, end_event_definition):
+        """ start -> AND split -> A -> XOR split -> (end, AND join); AND split -> B -> AND join -> C -> end """
+        split_id = self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)[0]
+        choice_id = self.bpmn_graph.add_exclusive_gateway_to_diagram(self.process_id)[0]
+        join_id = self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)[0]
+        self.connect(self.start_id, split_id, self.task("A"), choice_id, self.end(end_event_definition))
+        self.connect(choice_id, join_id, self.task("C"), self.end())
+        self.connect(split_id, self.task("B"), join_id)
+
+    def test_terminate_end_event_removes_all_tokens(self):
+        self.terminate_model("terminate")
+        report = self.report(partial_order_reduction=True)
+        self.assertTrue(report.is_sound, report.issues())
+        self.assertFalse(report.reduced)
+
+    def test_plain_end_event_leaves_tokens(self):
+        self.terminate_model(None)
+        self.assertEqual(self.report().deadlock_count, 1)
+
+    def test_partial_order_reduction_keeps_deadlocks(self):
+        split_id = self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)[0]
+        choice_id = self.bpmn_graph.add_exclusive_gateway_to_diagram(self.process_id)[0]
+        join_id = self.bpmn_graph.add_parallel_gateway_to_diagram(self.process_id)[0]
+        self.connect(self.start_id, split_id, self.task("A"), choice_id, self.task("D"), join_id, self.end())
+        self.connect(choice_id, self.task("E"), self.end())
+        self.connect(split_id, self.task("B"), join_id)
+        for name in "FGH":
+            self.connect(split_id, self.task(name), self.end())
+
+        full, reduced = self.report(), self.report(partial_order_reduction=True)
+        self.assertTrue(reduced.reduced)
+        self.assertLess(reduced.states, full.states)
+        self.assertGreater(full.deadlock_count, 0)
+        self.assertEqual({frozenset(marked) for marked in reduced.deadlocks},
+                         {frozenset(marked) for marked in full.deadlocks})
+        self.assertIsNone(reduced.dead_tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# coding=utf-8
+"""
+Round trip of diagrams through the typed object model
+"""
+import glob
+import os
+import threading
+import unittest
+
+from src.bpmn_python import bpmn_diagram_rep as diagram
+from src.bpmn_python import bpmn_python_consts as consts
+from src.bpmn_python.graph.classes import validation
+from src.bpmn_python.graph.classes.activities import task_type as task
+from src.bpmn_python.graph.classes.events import boundary_event_type as boundary_event
+from src.bpmn_python.graph.classes.events import end_event_type as end_event
+from src.bpmn_python.graph.classes.events import start_event_type as start_event
+from src.bpmn_python.graph.classes.gateways import event_based_gateway_type as event_based_gateway
+from src.bpmn_python.graph.classes.root_element import event_definition_type as event_definition
+from src.bpmn_python.graph.classes.root_element import process_type as process
+from src.bpmn_python.graph.classes import sequence_flow_type as sequence_flow
+
+examples_directory = os.path.join(os.path.dirname(__file__), os.pardir, "examples")
+
+
+def node_types(bpmn_graph):
+    return {node_id: node[consts.Consts.type] for node_id, node in bpmn_graph.diagram_graph._node.items()}
+
+
+class TypedModelRoundTripTests(unittest.TestCase):
+
+    def assert_round_trip(self, bpmn_graph):
+        rebuilt = diagram.BpmnDiagramGraph()
+        rebuilt.load_diagram_from_typed_model(bpmn_graph.to_typed_model())
+        self.assertEqual(node_types(rebuilt), node_types(bpmn_graph))
+        self.assertEqual(set(rebuilt.sequence_flows), set(bpmn_graph.sequence_flows))
+
+        exported = diagram.BpmnDiagramGraph()
+        exported.load_diagram_from_bytes(rebuilt.export_xml_bytes())
+        self.assertEqual(node_types(exported), node_types(bpmn_graph))
+        self.assertEqual(set(exported.sequence_flows), set(bpmn_graph.sequence_flows))
+        self.assertTrue(rebuilt.export_xml_bytes_no_di())
+        return exported
+
+    def test_examples(self):
+        files = sorted(glob.glob(os.path.join(examples_directory, "*.bpmn")))
+        self.assertTrue(files)
+        for filepath in files:
+            with self.subTest(filepath=filepath):
+                bpmn_graph = diagram.BpmnDiagramGraph()
+                bpmn_graph.load_diagram_from_xml_file(filepath)
+                self.assert_round_trip(bpmn_graph)
+
+    def test_event_attributes(self):
+        typed_process = process.Process()
+        typed_process.set_id("process")
+        start = start_event.StartEvent()
+        start.set_id("start")
+        start.set_is_interrupting(False)
+        gateway = event_based_gateway.EventBasedGateway()
+        gateway.set_id("gateway")
+        gateway.set_event_gateway_type("Parallel")
+        activity = task.Task()
+        activity.set_id("task")
+        timer = boundary_event.BoundaryEvent()
+        timer.set_id("timer")
+        timer.set_attached_to_ref("task")
+        timer.set_cancel_activity(False)
+        definition = event_definition.EventDefinition()
+        definition.set_id("definition")
+        definition.set_definition_type("timerEventDefinition")
+        timer.set_event_definition_list([definition])
+        end = end_event.EndEvent()
+        end.set_id("end")
+        for node in (start, gateway, activity, timer, end):
+            typed_process.add_flow_element(node)
+        for flow_id, source, target in (("f1", start, gateway), ("f2", gateway, activity), ("f3", activity, end),
+                                        ("f4", timer, end)):
+            flow = sequence_flow.SequenceFlow(source.get_id(), target.get_id())
+            flow.set_id(flow_id)
+            source.add_outgoing(flow_id)
+            target.add_incoming(flow_id)
+            typed_process.add_flow_element(flow)
+
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_typed_model([typed_process])
+        nodes = self.assert_round_trip(bpmn_graph).diagram_graph._node
+        self.assertEqual(nodes["start"][consts.Consts.is_interrupting], "false")
+        self.assertEqual(nodes["gateway"][consts.Consts.event_gateway_type], "Parallel")
+        self.assertEqual(nodes["timer"][consts.Consts.attached_to_ref], "task")
+        self.assertEqual(nodes["timer"][consts.Consts.cancel_activity], "false")
+        self.assertEqual([definition[consts.Consts.definition_type]
+                          for definition in nodes["timer"][consts.Consts.event_definitions]],
+                         ["timerEventDefinition"])
+
+
+class ValidationSwitchTests(unittest.TestCase):
+
+    def test_disabled_is_local_to_thread(self):
+        states = []
+        with validation.disabled():
+            thread = threading.Thread(target=lambda: states.append(validation.is_enabled()))
+            thread.start()
+            thread.join()
+            self.assertFalse(validation.is_enabled())
+        self.assertTrue(validation.is_enabled())
+        self.assertEqual(states, [True])
+        with self.assertRaises(TypeError):
+            task.Task().set_id(1)
+
+
+if __name__ == "__main__":
+    unittest.main()